@@ -0,0 +1,181 @@
+"""
+Measures the throughput and memory of the serialize and deserialize methods of each attribute type,
+and the memory footprint of model instances with 10, 50 and 100 attributes.
+
+    python bench/attribute_codecs.py
+    python bench/attribute_codecs.py --filter Map
+
+For each attribute, "retained" is the memory held by the values a call returns, and "peak" is the most
+memory a call uses at once, including temporary objects freed before it returns. Both are measured
+with tracemalloc, which is only running while memory is measured, so it doesn't slow down the timings.
+"""
+import argparse
+import gc
+import timeit
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+from pynamodb.attributes import (
+    Attribute, BinaryAttribute, BinarySetAttribute, BooleanAttribute, DiscriminatorAttribute, DynamicMapAttribute,
+    JSONAttribute, ListAttribute, MapAttribute, NullAttribute, NumberAttribute, NumberSetAttribute, TTLAttribute,
+    UnicodeAttribute, UnicodeSetAttribute, UTCDateTimeAttribute, VersionAttribute,
+)
+from pynamodb.models import Model
+
+COUNT = 10000
+MEMORY_COUNT = 1000
+MODEL_INSTANCE_COUNT = 1000
+MODEL_ATTRIBUTE_COUNTS = (10, 50, 100)
+
+DATE = datetime(2022, 10, 26, 20, 0, tzinfo=timezone.utc)
+BLOB = bytes(range(256)) * 4
+
+
+class AddressMap(MapAttribute):
+    street = UnicodeAttribute()
+    city = UnicodeAttribute()
+    zip_code = NumberAttribute()
+    verified = BooleanAttribute()
+
+
+class AddressDynamicMap(DynamicMapAttribute):
+    street = UnicodeAttribute()
+    verified_at = UTCDateTimeAttribute()
+
+
+class Animal:
+    pass
+
+
+DISCRIMINATOR = DiscriminatorAttribute()
+DISCRIMINATOR.register_class(Animal, 'animal')
+
+ADDRESS = {'street': '1 Main St', 'city': 'Springfield', 'zip_code': 12345, 'verified': True}
+
+
+class Case(NamedTuple):
+    name: str
+    attribute: Attribute
+    value: Any
+
+
+CASES = [
+    Case('UnicodeAttribute', UnicodeAttribute(), 'some_user@example.com'),
+    Case('NumberAttribute', NumberAttribute(), 12345.678),
+    Case('VersionAttribute', VersionAttribute(), 42),
+    Case('BooleanAttribute', BooleanAttribute(), True),
+    Case('NullAttribute', NullAttribute(), None),
+    Case('UTCDateTimeAttribute', UTCDateTimeAttribute(), DATE),
+    Case('TTLAttribute', TTLAttribute(), DATE + timedelta(days=30)),
+    Case('DiscriminatorAttribute', DISCRIMINATOR, Animal),
+    Case('JSONAttribute', JSONAttribute(), {'tags': ['a', 'b', 'c'], 'score': 9.5, 'nested': ADDRESS}),
+    Case('BinaryAttribute', BinaryAttribute(legacy_encoding=False), BLOB),
+    Case('BinaryAttribute(legacy)', BinaryAttribute(legacy_encoding=True), BLOB),
+    Case('BinarySetAttribute', BinarySetAttribute(legacy_encoding=False), {BLOB[i:i + 64] for i in range(0, 640, 64)}),
+    Case('BinarySetAttribute(legacy)', BinarySetAttribute(legacy_encoding=True), {BLOB[i:i + 64] for i in range(0, 640, 64)}),
+    Case('UnicodeSetAttribute', UnicodeSetAttribute(), {f'tag{i}' for i in range(10)}),
+    Case('NumberSetAttribute', NumberSetAttribute(), {i * 1.5 for i in range(10)}),
+    Case('MapAttribute(raw)', MapAttribute(), ADDRESS),
+    Case('MapAttribute(typed)', AddressMap(), AddressMap(**ADDRESS)),
+    Case('DynamicMapAttribute', AddressDynamicMap(), AddressDynamicMap(street='1 Main St', verified_at=DATE, note='x')),
+    Case('ListAttribute(raw)', ListAttribute(), ['a', 1, True, None, 'b'] * 2),
+    Case('ListAttribute(of=Unicode)', ListAttribute(of=UnicodeAttribute), [f'item{i}' for i in range(10)]),
+    Case('ListAttribute(of=Map)', ListAttribute(of=AddressMap), [AddressMap(**ADDRESS) for _ in range(10)]),
+]
+
+
+def measure_time(func: Callable[[], Any], count: int = COUNT) -> float:
+    """
+    Returns the number of calls per second
+    """
+    return count / min(timeit.repeat(func, repeat=5, number=count))
+
+
+def measure_memory(func: Callable[[], Any], count: int = MEMORY_COUNT) -> Tuple[float, int]:
+    """
+    Returns the retained bytes per call, and the peak bytes of a single call
+    """
+    results: List[Any] = [None] * count
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        for i in range(count):
+            results[i] = func()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (after - base) / count, peak - base
+
+
+def bench_attributes(patterns: List[str]) -> None:
+    print(f"{'attribute':<30} {'operation':<12} {'calls/sec':>12} {'retained B':>11} {'peak B':>9}")
+    for case in CASES:
+        if patterns and not any(pattern in case.name for pattern in patterns):
+            continue
+        serialized = case.attribute.serialize(case.value)
+        operations = (
+            ('serialize', lambda: case.attribute.serialize(case.value)),
+            ('deserialize', lambda: case.attribute.deserialize(serialized)),
+        )
+        for operation, func in operations:
+            calls_per_sec = measure_time(func)
+            retained, peak = measure_memory(func)
+            print(f"{case.name:<30} {operation:<12} {calls_per_sec:>12,.0f} {retained:>11,.0f} {peak:>9,}")
+
+
+def make_model(attribute_count: int) -> Tuple[Any, dict]:
+    """
+    Returns a model class with `attribute_count` attributes, and the serialized data of one of its items
+    """
+    attributes: Dict[str, Attribute[Any]] = {'key': UnicodeAttribute(hash_key=True)}
+    values: Dict[str, Any] = {}
+    for i in range(attribute_count - 1):
+        if i % 3 == 0:
+            attributes[f'a{i}'] = NumberAttribute()
+            values[f'a{i}'] = i * 1.5
+        elif i % 3 == 1:
+            attributes[f'a{i}'] = UnicodeAttribute()
+            values[f'a{i}'] = f'value {i}'
+        else:
+            attributes[f'a{i}'] = UTCDateTimeAttribute()
+            values[f'a{i}'] = DATE
+    model_cls = type(f'Model{attribute_count}', (Model,), {
+        '__module__': __name__,
+        'Meta': type('Meta', (), {'table_name': f'Model{attribute_count}'}),
+        **attributes,
+    })
+    return model_cls, model_cls('key', **values).serialize()
+
+
+def bench_models() -> None:
+    print(f"{'attributes':>10} {'deserialize/sec':>16} {'bytes/item':>11} {'raw bytes/item':>15}")
+    for attribute_count in MODEL_ATTRIBUTE_COUNTS:
+        model_cls, data = make_model(attribute_count)
+        items_per_sec = measure_time(lambda: model_cls.from_raw_data(data), count=MODEL_INSTANCE_COUNT)
+        # The memory of a materialized item, compared to the memory of its serialized data in a response
+        item_bytes, _ = measure_memory(lambda: model_cls.from_raw_data(data), count=MODEL_INSTANCE_COUNT)
+        raw_bytes, _ = measure_memory(
+            lambda: {name: dict(value) for name, value in data.items()}, count=MODEL_INSTANCE_COUNT,
+        )
+        print(f"{attribute_count:>10} {items_per_sec:>16,.0f} {item_bytes:>11,.0f} {raw_bytes:>15,.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', action='append', default=[], help="only run attributes whose name contains this")
+    args = parser.parse_args()
+
+    print("Attributes")
+    bench_attributes(args.filter)
+    if not args.filter:
+        print()
+        print("Models")
+        bench_models()
+
+
+if __name__ == "__main__":
+    main()
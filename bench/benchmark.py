@@ -1,157 +1,146 @@
-import timeit
-import io
+"""
+Benchmarks of model operations, sent through a transport returning canned responses, without any network I/O.
+
+    python bench/benchmark.py                                   # run all benchmarks
+    python bench/benchmark.py --filter batch --output new.json  # run some, and save the results as JSON
+    python bench/benchmark.py --compare old.json new.json       # flag regressions between two runs
+
+Results are in operations per second, larger is better. An operation is one call of the benchmarked
+model method, except for the threaded benchmarks, where it is one ``get_item`` call.
+"""
+import argparse
+import itertools
+import json
 import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
 import zlib
-from datetime import datetime
-
-import urllib3
-
-COUNT = 1000
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
 
-benchmark_results = []
-benchmark_registry = {}
+os.environ["AWS_ACCESS_KEY_ID"] = "1"
+os.environ["AWS_SECRET_ACCESS_KEY"] = "1"
+os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
 
+import botocore
 
-def register_benchmark(testname):
+import pynamodb
+from pynamodb.attributes import (
+    BooleanAttribute, DiscriminatorAttribute, ListAttribute, MapAttribute, NumberAttribute, UnicodeAttribute,
+    UnicodeSetAttribute, UTCDateTimeAttribute,
+)
+from pynamodb.connection import Connection
+from pynamodb.connection.transport import Transport, TransportResponse
+from pynamodb.models import Model
+from pynamodb.transactions import TransactGet, TransactWrite
+
+REPEAT = 10
+
+# A change in operations per second larger than this is reported by --compare
+DEFAULT_THRESHOLD = 0.05
+
+
+class Benchmark:
+    def __init__(
+        self,
+        name: str,
+        group: str,
+        func: Callable[[], Any],
+        count: int,
+        setup: Optional[Callable[[], Any]] = None,
+        ops_per_call: int = 1,
+    ) -> None:
+        self.name = name
+        self.group = group
+        self.func = func
+        self.count = count
+        self.setup = setup
+        self.ops_per_call = ops_per_call
+
+
+benchmark_registry: Dict[str, Benchmark] = {}
+
+
+def register_benchmark(
+    testname: str,
+    group: str,
+    count: int,
+    setup: Optional[Callable[[], Any]] = None,
+    ops_per_call: int = 1,
+):
     def _wrap(func):
-        benchmark_registry[testname] = func
+        benchmark_registry[testname] = Benchmark(testname, group, func, count, setup, ops_per_call)
         return func
     return _wrap
 
 
-def results_new_benchmark(name: str) -> None:
-    benchmark_results.append((name, {}))
-    print(name)
-
-
-def results_record_result(callback, count):
-    callback_name = callback.__name__
-    bench_name = callback_name.split('_', 1)[-1]
+def run_benchmark(benchmark: Benchmark, repeat: int, scale: float) -> Optional[Dict[str, Any]]:
+    number = max(1, int(benchmark.count * scale))
     try:
-        results = timeit.repeat(
-            f"{callback_name}()",
-            setup=f"from __main__ import patch_urllib3, {callback_name}; patch_urllib3()",
-            repeat=10,
-            number=count,
-        )
+        if benchmark.setup is not None:
+            benchmark.setup()
+        times = timeit.repeat(benchmark.func, repeat=repeat, number=number)
     except Exception:
-        logging.exception(f"error running {bench_name}")
-        return
-    result = count / min(results)
-    benchmark_results.append((bench_name, str(result)))
-
-    print(f"{bench_name}: {result:,.02f} calls/sec")
-
-
-# =============================================================================
-# Monkeypatching
-# =============================================================================
-
-def mock_urlopen(self, method, url, body, headers, **kwargs):
-    target = headers.get('X-Amz-Target')
-    if target.endswith(b'DescribeTable'):
-        body = """{
-            "Table": {
-                "TableName": "users",
-                "TableArn": "arn",
-                "CreationDateTime": "1421866952.062",
-                "ItemCount": 0,
-                "TableSizeBytes": 0,
-                "TableStatus": "ACTIVE",
-                "ProvisionedThroughput": {
-                    "NumberOfDecreasesToday": 0,
-                    "ReadCapacityUnits": 1,
-                    "WriteCapacityUnits": 25
-                },
-                "AttributeDefinitions": [{"AttributeName": "user_name", "AttributeType": "S"}],
-                "KeySchema": [{"AttributeName": "user_name", "KeyType": "HASH"}],
-                "LocalSecondaryIndexes": [],
-                "GlobalSecondaryIndexes": []
-            }
-        }
-        """
-    elif target.endswith(b'GetItem'):
-        # TODO: sometimes raise exc
-        body = """{
-            "Item": {
-                "user_name": {"S": "some_user"},
-                "email": {"S": "some_user@gmail.com"},
-                "first_name": {"S": "John"},
-                "last_name": {"S": "Doe"},
-                "phone_number": {"S": "4155551111"},
-                "country": {"S": "USA"},
-                "preferences": {
-                    "M": {
-                        "timezone": {"S": "America/New_York"},
-                        "allows_notifications": {"BOOL": 1},
-                        "date_of_birth": {"S": "2022-10-26T20:00:00.000000+0000"}
-                    }
-                },
-                "last_login": {"S": "2022-10-27T20:00:00.000000+0000"}
-            }
-        }
-        """
-    elif target.endswith(b'PutItem'):
-        body = """{
-            "Attributes": {
-                "user_name": {"S": "some_user"},
-                "email": {"S": "some_user@gmail.com"},
-                "first_name": {"S": "John"},
-                "last_name": {"S": "Doe"},
-                "phone_number": {"S": "4155551111"},
-                "country": {"S": "USA"},
-                "preferences": {
-                    "M": {
-                        "timezone": {"S": "America/New_York"},
-                        "allows_notifications": {"BOOL": 1},
-                        "date_of_birth": {"S": "2022-10-26T20:44:49.207740+0000"}
-                    }
-                },
-                "last_login": {"S": "2022-10-27T20:00:00.000000+0000"}
-            }
-        }
-        """
-    else:
-        body = ""
-
-    body_bytes = body.encode('utf-8')
-    headers = {
-        "content-type": "application/x-amz-json-1.0",
-        "content-length": str(len(body_bytes)),
-        "x-amz-crc32": str(zlib.crc32(body_bytes)),
-        "x-amz-requestid": "YB5DURFL1EQ6ULM39GSEEHFTYTPBBUXDJSYPFZPR4EL7M3AYV0RS",
+        logging.exception(f"error running {benchmark.name}")
+        return None
+    ops = number * benchmark.ops_per_call
+    return {
+        'group': benchmark.group,
+        'ops_per_sec': ops / min(times),
+        'median_ops_per_sec': ops / statistics.median(times),
+        'repeat': repeat,
+        'number': number,
     }
 
-    # TODO: consumed capacity?
 
-    body = io.BytesIO(body_bytes)
-    resp = urllib3.HTTPResponse(
-        body,
-        preload_content=False,
-        headers=headers,
-        status=200,
-    )
-    resp.chunked = False
-    return resp
+# =============================================================================
+# Transport
+# =============================================================================
 
+class BenchTransport(Transport):
+    """
+    Returns canned responses without any network I/O.
+    Operations with several responses, such as the pages of a query, return them in turn.
+    """
+
+    def __init__(self) -> None:
+        self._responses: Dict[str, Any] = {}
+
+    def set_responses(self, operation_name: str, *contents: Any) -> None:
+        responses = []
+        for content in contents:
+            body = json.dumps(content).encode('utf-8')
+            headers = {
+                "content-type": "application/x-amz-json-1.0",
+                "content-length": str(len(body)),
+                "x-amz-crc32": str(zlib.crc32(body)),
+                "x-amz-requestid": "YB5DURFL1EQ6ULM39GSEEHFTYTPBBUXDJSYPFZPR4EL7M3AYV0RS",
+            }
+            responses.append((headers, body))
+        self._responses[operation_name] = itertools.cycle(responses)
 
-def patch_urllib3():
-    urllib3.connectionpool.HTTPConnectionPool.urlopen = mock_urlopen
+    def send(self, request):
+        target = request.headers['X-Amz-Target']
+        if isinstance(target, bytes):
+            target = target.decode('utf-8')
+        headers, body = next(self._responses[target.rsplit('.', 1)[-1]])
+        return TransportResponse(200, dict(headers), body)
 
 
-# =============================================================================
-# Setup
-# =============================================================================
-
-import os
-from pynamodb.models import Model
-from pynamodb.attributes import UnicodeAttribute, BooleanAttribute, MapAttribute, UTCDateTimeAttribute
+TRANSPORT = BenchTransport()
+TRANSACTION_CONNECTION = Connection(transport=TRANSPORT, max_retry_attempts=0)
 
+PAGE_SIZE_BYTES = 1024 * 1024
 
-os.environ["AWS_ACCESS_KEY_ID"] = "1"
-os.environ["AWS_SECRET_ACCESS_KEY"] = "1"
-os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
 
+# =============================================================================
+# Models
+# =============================================================================
 
 class UserPreferences(MapAttribute):
     timezone = UnicodeAttribute()
@@ -162,7 +151,8 @@ class UserPreferences(MapAttribute):
 class UserModel(Model):
     class Meta:
         table_name = 'User'
-        max_retry_attempts = 0  # TODO: do this conditionally. need to replace the connection object
+        max_retry_attempts = 0
+        transport = TRANSPORT
     user_name = UnicodeAttribute(hash_key=True)
     first_name = UnicodeAttribute()
     last_name = UnicodeAttribute()
@@ -173,23 +163,82 @@ class UserModel(Model):
     last_login = UTCDateTimeAttribute()
 
 
-# =============================================================================
-# GetItem
-# =============================================================================
+class ProfileMap(MapAttribute):
+    bio = UnicodeAttribute()
+    links = ListAttribute(of=UnicodeAttribute)
 
-@register_benchmark("get_item")
-def bench_get_item():
-    UserModel.get("username")
+
+class AuthorMap(MapAttribute):
+    name = UnicodeAttribute()
+    karma = NumberAttribute()
+    profile = ProfileMap()
+
+
+class ReplyMap(MapAttribute):
+    body = UnicodeAttribute()
+    author = AuthorMap()
+    reactions = MapAttribute()
+    created_at = UTCDateTimeAttribute()
+
+
+class CommentMap(MapAttribute):
+    body = UnicodeAttribute()
+    author = AuthorMap()
+    replies = ListAttribute(of=ReplyMap)
+
+
+class ThreadModel(Model):
+    class Meta:
+        table_name = 'Thread'
+        max_retry_attempts = 0
+        transport = TRANSPORT
+    forum_name = UnicodeAttribute(hash_key=True)
+    subject = UnicodeAttribute(range_key=True)
+    author = AuthorMap()
+    comments = ListAttribute(of=CommentMap)
+    tags = UnicodeSetAttribute()
+
+
+class AnimalModel(Model):
+    class Meta:
+        table_name = 'Animal'
+        max_retry_attempts = 0
+        transport = TRANSPORT
+    name = UnicodeAttribute(hash_key=True)
+    kind = DiscriminatorAttribute()
+    owner = UnicodeAttribute()
+
+
+class DogModel(AnimalModel, discriminator='dog'):
+    breed = UnicodeAttribute()
+    good = BooleanAttribute()
+
+
+class CatModel(AnimalModel, discriminator='cat'):
+    lives = NumberAttribute()
+    indoor = BooleanAttribute()
+
+
+WIDE_ATTRIBUTE_COUNT = 50
+
+WideModel = type('WideModel', (Model,), {
+    '__module__': __name__,
+    'Meta': type('Meta', (), {'table_name': 'Wide', 'max_retry_attempts': 0, 'transport': TRANSPORT}),
+    'key': UnicodeAttribute(hash_key=True),
+    **{f'n{i}': NumberAttribute(null=True) for i in range(WIDE_ATTRIBUTE_COUNT)},
+})
 
 
 # =============================================================================
-# PutItem
+# Data
 # =============================================================================
 
-@register_benchmark("put_item")
-def bench_put_item():
-    UserModel(
-        "username",
+DATE = datetime(2022, 10, 26, 20, 0, tzinfo=timezone.utc)
+
+
+def make_user(i: int) -> UserModel:
+    return UserModel(
+        f"user{i}",
         email="some_user@gmail.com",
         first_name="John",
         last_name="Doe",
@@ -198,25 +247,358 @@ def bench_put_item():
         preferences=UserPreferences(
             timezone="America/New_York",
             allows_notifications=True,
-            date_of_birth=datetime.utcnow(),
+            date_of_birth=DATE,
         ),
-        last_login=datetime.utcnow(),
-    ).save()
+        last_login=DATE,
+    )
+
+
+def make_author(i: int) -> AuthorMap:
+    return AuthorMap(
+        name=f"author{i}",
+        karma=i,
+        profile=ProfileMap(bio="Writes about databases", links=[f"https://example.com/{i}/{j}" for j in range(3)]),
+    )
+
+
+def make_thread(comments: int = 10, replies: int = 5) -> ThreadModel:
+    return ThreadModel(
+        "forum",
+        "subject",
+        author=make_author(0),
+        comments=[
+            CommentMap(
+                body=f"comment {i}",
+                author=make_author(i),
+                replies=[
+                    ReplyMap(body=f"reply {j}", author=make_author(j), reactions={'up': j, 'down': 0}, created_at=DATE)
+                    for j in range(replies)
+                ],
+            )
+            for i in range(comments)
+        ],
+        tags={'python', 'dynamodb', 'benchmarks'},
+    )
+
+
+def make_animal(i: int) -> AnimalModel:
+    if i % 2:
+        return DogModel(f"animal{i}", owner="Jane", breed="collie", good=True)
+    return CatModel(f"animal{i}", owner="Jane", lives=9, indoor=False)
+
+
+USER_ITEM = make_user(0).serialize()
+THREAD = make_thread()
+THREAD_ITEM = THREAD.serialize()
+
+
+def make_page(item: Dict[str, Any], last_page: bool) -> Dict[str, Any]:
+    """
+    Returns a page of about 1 MB of copies of `item`
+    """
+    count = PAGE_SIZE_BYTES // len(json.dumps(item))
+    page: Dict[str, Any] = {"Count": count, "ScannedCount": count, "Items": [item] * count}
+    if not last_page:
+        page["LastEvaluatedKey"] = {"user_name": {"S": "user0"}}
+    return page
 
 
 # =============================================================================
-# Benchmarks.
+# Basic operations
 # =============================================================================
 
-def main():
-    results_new_benchmark("Basic operations")
+def setup_basic_operations():
+    TRANSPORT.set_responses('GetItem', {"Item": USER_ITEM})
+    TRANSPORT.set_responses('PutItem', {})
+
+
+@register_benchmark("get_item", "Basic operations", 1000, setup_basic_operations)
+def bench_get_item():
+    UserModel.get("username")
+
+
+@register_benchmark("put_item", "Basic operations", 1000, setup_basic_operations)
+def bench_put_item():
+    make_user(0).save()
+
+
+# =============================================================================
+# Pagination
+# =============================================================================
+
+def setup_pagination():
+    pages = (make_page(USER_ITEM, last_page=False), make_page(USER_ITEM, last_page=True))
+    TRANSPORT.set_responses('Query', *pages)
+    TRANSPORT.set_responses('Scan', *pages)
+
+
+@register_benchmark("query_2x1mb_pages", "Pagination", 2, setup_pagination)
+def bench_query():
+    for _ in UserModel.query("user0"):
+        pass
+
+
+@register_benchmark("scan_2x1mb_pages", "Pagination", 2, setup_pagination)
+def bench_scan():
+    for _ in UserModel.scan():
+        pass
+
+
+# =============================================================================
+# Batch operations
+# =============================================================================
+
+def setup_batch(size: int) -> Callable[[], None]:
+    def setup():
+        TRANSPORT.set_responses('BatchGetItem', {"Responses": {"User": [USER_ITEM] * size}, "UnprocessedKeys": {}})
+        TRANSPORT.set_responses('BatchWriteItem', {"UnprocessedItems": {}})
+    return setup
+
+
+BATCH_USERS = [make_user(i) for i in range(100)]
+
+
+def batch_get(size: int) -> None:
+    for _ in UserModel.batch_get([f"user{i}" for i in range(size)]):
+        pass
+
+
+def batch_write(size: int) -> None:
+    with UserModel.batch_write() as batch:
+        for user in BATCH_USERS[:size]:
+            batch.save(user)
+
+
+@register_benchmark("batch_get_25", "Batch operations", 100, setup_batch(25))
+def bench_batch_get_25():
+    batch_get(25)
+
+
+@register_benchmark("batch_get_100", "Batch operations", 50, setup_batch(100))
+def bench_batch_get_100():
+    batch_get(100)
+
+
+@register_benchmark("batch_write_25", "Batch operations", 100, setup_batch(25))
+def bench_batch_write_25():
+    batch_write(25)
+
+
+@register_benchmark("batch_write_100", "Batch operations", 50, setup_batch(100))
+def bench_batch_write_100():
+    batch_write(100)
+
+
+# =============================================================================
+# Transactions
+# =============================================================================
+
+TRANSACTION_SIZE = 10
+
+
+def setup_transactions():
+    TRANSPORT.set_responses('TransactGetItems', {"Responses": [{"Item": USER_ITEM}] * TRANSACTION_SIZE})
+    TRANSPORT.set_responses('TransactWriteItems', {})
+
+
+@register_benchmark("transact_get_10", "Transactions", 200, setup_transactions)
+def bench_transact_get():
+    with TransactGet(connection=TRANSACTION_CONNECTION) as transaction:
+        for i in range(TRANSACTION_SIZE):
+            transaction.get(UserModel, f"user{i}")
+
+
+@register_benchmark("transact_write_10", "Transactions", 200, setup_transactions)
+def bench_transact_write():
+    with TransactWrite(connection=TRANSACTION_CONNECTION) as transaction:
+        for user in BATCH_USERS[:TRANSACTION_SIZE]:
+            transaction.save(user)
+
+
+# =============================================================================
+# Nested and polymorphic models
+# =============================================================================
+
+def setup_models():
+    TRANSPORT.set_responses('GetItem', {"Item": THREAD_ITEM})
+    TRANSPORT.set_responses('PutItem', {})
+    animals = [make_animal(i).serialize() for i in range(500)]
+    TRANSPORT.set_responses('Scan', {"Count": len(animals), "ScannedCount": len(animals), "Items": animals})
+
+
+@register_benchmark("nested_get_item", "Nested and polymorphic models", 200, setup_models)
+def bench_nested_get_item():
+    ThreadModel.get("forum", "subject")
+
+
+@register_benchmark("nested_put_item", "Nested and polymorphic models", 200, setup_models)
+def bench_nested_put_item():
+    THREAD.save()
+
+
+@register_benchmark("polymorphic_scan_500", "Nested and polymorphic models", 20, setup_models)
+def bench_polymorphic_scan():
+    for _ in AnimalModel.scan():
+        pass
+
+
+# =============================================================================
+# Updates
+# =============================================================================
+
+WIDE_ITEM = WideModel('key', **{f'n{i}': i for i in range(WIDE_ATTRIBUTE_COUNT)})  # type: ignore
+WIDE_ACTIONS = [getattr(WideModel, f'n{i}').add(1) for i in range(WIDE_ATTRIBUTE_COUNT)]
+
+
+def setup_updates():
+    TRANSPORT.set_responses('UpdateItem', {"Attributes": WIDE_ITEM.serialize()})
+
+
+@register_benchmark("update_50_actions", "Updates", 500, setup_updates)
+def bench_update():
+    WIDE_ITEM.update(actions=WIDE_ACTIONS)
+
+
+# =============================================================================
+# Threaded throughput
+# =============================================================================
+
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32)
+CALLS_PER_THREAD = 100
+
+_executors: Dict[int, ThreadPoolExecutor] = {}
+
+
+def get_items(calls: int) -> None:
+    for _ in range(calls):
+        UserModel.get("username")
+
+
+def register_threaded_benchmark(threads: int) -> None:
+    calls = CALLS_PER_THREAD * 32 // threads
+
+    def bench():
+        executor = _executors.get(threads)
+        if executor is None:
+            executor = _executors[threads] = ThreadPoolExecutor(threads)
+        for future in [executor.submit(get_items, calls) for _ in range(threads)]:
+            future.result()
+
+    bench.__name__ = f"bench_get_item_{threads}_threads"
+    register_benchmark(
+        f"get_item_{threads}_threads", "Threaded throughput", 1, setup_basic_operations, ops_per_call=calls * threads,
+    )(bench)
+
+
+for thread_count in THREAD_COUNTS:
+    register_threaded_benchmark(thread_count)
+
+
+# =============================================================================
+# Results
+# =============================================================================
+
+def get_environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python_version': platform.python_version(),
+        'python_implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'pynamodb_version': pynamodb.__version__,
+        'botocore_version': botocore.__version__,
+        'git_commit': commit,
+    }
 
-    results_record_result(benchmark_registry["get_item"], COUNT)
-    results_record_result(benchmark_registry["put_item"], COUNT)
 
+def run(names: List[str], repeat: int, scale: float) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    group = None
+    for name in names:
+        benchmark = benchmark_registry[name]
+        if benchmark.group != group:
+            group = benchmark.group
+            print(group)
+        result = run_benchmark(benchmark, repeat, scale)
+        if result is not None:
+            results[name] = result
+            print(f"  {name}: {result['ops_per_sec']:,.02f} ops/sec")
+    for executor in _executors.values():
+        executor.shutdown()
+    _executors.clear()
     print()
-    print("Above metrics are in call/sec, larger is better.")
+    print("Above metrics are in operations/sec, larger is better.")
+    return {'environment': get_environment(), 'results': results}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Prints the change of each benchmark between two runs, and returns the names of the regressions
+    """
+    for key in ('python_version', 'python_implementation', 'machine', 'cpu_count'):
+        if baseline['environment'].get(key) != current['environment'].get(key):
+            print(f"warning: the runs have a different {key}: "
+                  f"{baseline['environment'].get(key)} and {current['environment'].get(key)}")
+
+    regressions = []
+    print(f"{'benchmark':<30} {'baseline':>14} {'current':>14} {'change':>8}")
+    for name, result in current['results'].items():
+        baseline_result = baseline['results'].get(name)
+        if baseline_result is None:
+            print(f"{name:<30} {'-':>14} {result['ops_per_sec']:>14,.02f} {'new':>8}")
+            continue
+        change = result['ops_per_sec'] / baseline_result['ops_per_sec'] - 1
+        status = ''
+        if change < -threshold:
+            status = 'REGRESSION'
+            regressions.append(name)
+        elif change > threshold:
+            status = 'improvement'
+        print(f"{name:<30} {baseline_result['ops_per_sec']:>14,.02f} {result['ops_per_sec']:>14,.02f} "
+              f"{change:>+8.1%} {status}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', action='append', default=[], help="only run benchmarks whose name contains this")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--repeat', type=int, default=REPEAT, help="the number of times each benchmark is timed")
+    parser.add_argument('--quick', action='store_true', help="run each benchmark a tenth of the usual times")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'), help="compare two JSON results")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="the relative change flagged by --compare (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+        return 0
+
+    names = [
+        name for name in benchmark_registry
+        if not args.filter or any(pattern in name for pattern in args.filter)
+    ]
+    output = run(names, repeat=args.repeat, scale=0.1 if args.quick else 1.0)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Measures the per-call overhead of Connection.dispatch, without any network I/O or serialization.
+
+"signals before" is the work every call used to do whether or not anything received the signals
+(generating a request id and sending both signals); dispatch now skips it without receivers.
+"""
+import os
+import time
+import timeit
+import uuid
+
+from pynamodb.connection import Connection
+from pynamodb.signals import flush_background_signals, post_dynamodb_send, pre_dynamodb_send
+
+os.environ["AWS_ACCESS_KEY_ID"] = "1"
+os.environ["AWS_SECRET_ACCESS_KEY"] = "1"
+os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+COUNT = 20000
+GET_ITEM_KWARGS = {'TableName': 'User', 'Key': {'user_name': {'S': 'some_user'}}}
+
+
+class BenchConnection(Connection):
+    def _make_api_call(self, operation_name, operation_kwargs):
+        return {}
+
+
+def noop_receiver(sender, **kwargs):
+    pass
+
+
+def slow_receiver(sender, **kwargs):
+    # e.g. a receiver that writes to a log handler or a metrics agent's socket
+    time.sleep(0.0001)
+
+
+def record_result(name, statement, count=COUNT):
+    results = timeit.repeat(statement, repeat=5, number=count)
+    print(f"{name}: {min(results) / count * 1e6:,.02f} us/call")
+
+
+def main():
+    connection = BenchConnection()
+    background_connection = BenchConnection(background_signals=True)
+
+    def dispatch():
+        connection.dispatch('GetItem', dict(GET_ITEM_KWARGS))
+
+    def background_dispatch():
+        background_connection.dispatch('GetItem', dict(GET_ITEM_KWARGS))
+
+    req_uuid = uuid.uuid4()
+
+    def signal_work():
+        uuid.uuid4()
+        connection.send_pre_boto_callback('GetItem', req_uuid, 'User')
+        connection.send_post_boto_callback('GetItem', req_uuid, 'User')
+
+    print("No receivers")
+    record_result("signals before", signal_work)
+    record_result("dispatch", dispatch)
+
+    print("Receivers connected")
+    for receiver_name, receiver in (("noop", noop_receiver), ("slow", slow_receiver)):
+        pre_dynamodb_send.connect(receiver)
+        post_dynamodb_send.connect(receiver)
+        try:
+            record_result(f"dispatch, {receiver_name} receivers", dispatch, count=1000)
+            # Few enough calls that the background queue never fills up
+            record_result(f"dispatch, {receiver_name} receivers in background", background_dispatch, count=500)
+            flush_background_signals()
+        finally:
+            pre_dynamodb_send.disconnect(receiver)
+            post_dynamodb_send.disconnect(receiver)
+
+    print()
+    print("Above metrics are in microseconds per call, smaller is better.")
+
+
+if __name__ == "__main__":
+    main()
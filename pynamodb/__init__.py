@@ -8,3 +8,43 @@ A simple abstraction over DynamoDB
 __author__ = 'Jharrod LaFon'
 __license__ = 'MIT'
 __version__ = '6.1.0'
+
+from typing import TYPE_CHECKING, Iterable, Type
+
+if TYPE_CHECKING:
+    from pynamodb.models import Model
+
+
+def warmup(
+    models: Iterable[Type['Model']] = (),
+    open_connections: int = 0,
+    rewarm_after_fork: bool = False,
+) -> int:
+    """
+    Prepares the given models for their first request: builds each model's connection and table
+    metadata, loads the DynamoDB service model and resolves credentials for each client and,
+    if `open_connections` is positive, opens that many pooled connections per client.
+
+    Returns the number of connections opened.
+
+    :param models: the :class:`~pynamodb.models.Model` classes to prepare
+    :param open_connections: the number of connections to open to each endpoint
+    :param rewarm_after_fork: if set, the models are warmed up again, from a background thread, in every process
+        forked from this one, e.g. in each worker of a pre-fork server
+    """
+    models = tuple(models)
+    if rewarm_after_fork:
+        from pynamodb.connection._fork import rewarm_after_fork as _rewarm_after_fork
+        _rewarm_after_fork(list(models), open_connections)
+    opened = 0
+    warmed = set()
+    for model in models:
+        connection = model._get_connection().connection
+        key = (id(connection.client), id(connection._transport))
+        if key in warmed:
+            # Connections sharing a client (and transport) share its connection pool
+            connection.warmup()
+        else:
+            warmed.add(key)
+            opened += connection.warmup(open_connections=open_connections)
+    return opened
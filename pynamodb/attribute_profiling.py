@@ -0,0 +1,214 @@
+"""
+Attribute profiling
+~~~~~~~~~~~~~~~~~~~
+
+:class:`AttributeProfiler` measures the time spent serializing and deserializing each attribute of a model,
+including the attributes of nested ``MapAttribute`` classes and of the maps in a ``ListAttribute(of=...)``,
+with the number of calls and the size of the serialized values:
+
+.. code-block:: python
+
+    from pynamodb.attribute_profiling import AttributeProfiler
+
+    with AttributeProfiler() as profiler:
+        profiler.profile(Thread)
+        for thread in Thread.scan():
+            thread.save()
+    print(profiler.format_report(limit=20))
+
+Attributes are profiled by wrapping the ``serialize`` and ``deserialize`` methods of the model's attribute
+instances until :meth:`AttributeProfiler.stop` is called, so models that aren't profiled aren't slowed down.
+Times are inclusive: the time of a map attribute includes the time of its nested attributes.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Type
+
+from pynamodb.attributes import Attribute, AttributeContainer, ListAttribute, MapAttribute
+
+SERIALIZE = 'serialize'
+DESERIALIZE = 'deserialize'
+
+_state = threading.local()
+
+
+class AttributeKey(NamedTuple):
+    model_name: str
+    #: The attribute's path in the model, e.g. ``replies[].author.name``
+    path: str
+    #: :data:`SERIALIZE` or :data:`DESERIALIZE`
+    operation: str
+
+
+class AttributeStats:
+    """
+    The calls to an attribute's ``serialize`` or ``deserialize`` method
+    """
+
+    def __init__(self, calls: int = 0, total_seconds: float = 0.0, total_bytes: int = 0) -> None:
+        self.calls = calls
+        self.total_seconds = total_seconds
+        #: The approximate size of the serialized values
+        self.total_bytes = total_bytes
+
+    def __repr__(self) -> str:
+        return 'AttributeStats(calls={}, total_seconds={}, total_bytes={})'.format(
+            self.calls, self.total_seconds, self.total_bytes,
+        )
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+class AttributeProfiler:
+    """
+    Records the time spent serializing and deserializing the attributes of the models profiled
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[AttributeKey, AttributeStats] = {}
+        self._lock = threading.Lock()
+        self._wrapped: List[Attribute] = []
+        self._wrapped_ids: Set[int] = set()
+
+    def __enter__(self) -> 'AttributeProfiler':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def profile(self, model_cls: Type[AttributeContainer]) -> None:
+        """
+        Starts profiling the attributes of `model_cls`.
+        Attributes shared with a model profiled earlier, e.g. by a subclass, are recorded for that model.
+        """
+        for name, attr in model_cls.get_attributes().items():
+            self._wrap(attr, name, model_cls.__name__, set())
+
+    def stop(self) -> None:
+        """
+        Stops profiling all models. The recorded stats are kept.
+        """
+        for attr in self._wrapped:
+            attr.__dict__.pop(SERIALIZE, None)
+            attr.__dict__.pop(DESERIALIZE, None)
+        self._wrapped = []
+        self._wrapped_ids = set()
+
+    def get_stats(self) -> Dict[AttributeKey, AttributeStats]:
+        """
+        Returns a copy of the stats recorded per model, attribute path and operation
+        """
+        with self._lock:
+            return {
+                key: AttributeStats(stats.calls, stats.total_seconds, stats.total_bytes)
+                for key, stats in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {}
+
+    def format_report(self, limit: Optional[int] = None) -> str:
+        """
+        Returns a table of the attributes, slowest first
+        """
+        ranked = sorted(self.get_stats().items(), key=lambda item: item[1].total_seconds, reverse=True)
+        lines: List[str] = ['{:<20} {:<30} {:<12} {:>8} {:>10} {:>10} {:>12}'.format(
+            'model', 'attribute', 'operation', 'calls', 'total ms', 'mean us', 'bytes',
+        )]
+        for key, stats in ranked[:limit]:
+            lines.append('{:<20} {:<30} {:<12} {:>8} {:>10.3f} {:>10.2f} {:>12}'.format(
+                key.model_name, key.path, key.operation, stats.calls,
+                stats.total_seconds * 1000, stats.mean_seconds * 1000000, stats.total_bytes,
+            ))
+        return '\n'.join(lines)
+
+    def _record(self, key: AttributeKey, seconds: float, size: int) -> None:
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = AttributeStats()
+            stats.calls += 1
+            stats.total_seconds += seconds
+            stats.total_bytes += size
+
+    def _wrap(self, attr: Attribute, segment: str, model_name: Optional[str], containers: Set[type]) -> None:
+        if id(attr) in self._wrapped_ids:
+            return
+        child_segment = segment
+        nested: Optional[Type[AttributeContainer]] = None
+        if isinstance(attr, MapAttribute) and not attr.is_raw():
+            nested = type(attr)
+        elif isinstance(attr, ListAttribute) and attr.element_type is not None:
+            child_segment = segment + '[]'
+            if issubclass(attr.element_type, MapAttribute) and not attr.element_type.is_raw():
+                nested = attr.element_type
+
+        # Set in __dict__ directly, as MapAttribute.__setattr__ may store the value as a map entry
+        attr.__dict__[SERIALIZE] = self._get_wrapper(attr.serialize, SERIALIZE, segment, child_segment, model_name)
+        attr.__dict__[DESERIALIZE] = self._get_wrapper(attr.deserialize, DESERIALIZE, segment, child_segment, model_name)
+        self._wrapped.append(attr)
+        self._wrapped_ids.add(id(attr))
+
+        if nested is not None and nested not in containers:
+            for name, nested_attr in nested.get_attributes().items():
+                self._wrap(nested_attr, name, None, containers | {nested})
+
+    def _get_wrapper(
+        self,
+        method: Callable,
+        operation: str,
+        segment: str,
+        child_segment: str,
+        model_name: Optional[str],
+    ) -> Callable:
+        def wrapper(value: Any, *args: Any, **kwargs: Any) -> Any:
+            path = _get_path()
+            if model_name is not None:
+                # An attribute of a profiled model: start a new path
+                parent, path[:] = path[:], [model_name]
+            elif not path:
+                # A nested attribute used outside of a profiled model
+                return method(value, *args, **kwargs)
+            key = AttributeKey(path[0], '.'.join(path[1:] + [segment]), operation)
+            path.append(child_segment)
+            start = time.perf_counter()
+            try:
+                result = method(value, *args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                path.pop()
+                if model_name is not None:
+                    path[:] = parent
+            self._record(key, seconds, get_value_size(result if operation == SERIALIZE else value))
+            return result
+        return wrapper
+
+
+def _get_path() -> List[str]:
+    path = getattr(_state, 'path', None)
+    if path is None:
+        path = _state.path = []
+    return path
+
+
+def get_value_size(value: Any) -> int:
+    """
+    Returns the approximate size of a serialized value: the length of its strings and binary values,
+    and of the names and type keys of its map entries
+    """
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, bool):
+        return 1
+    if isinstance(value, dict):
+        return sum(len(key) + get_value_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sum(get_value_size(item) for item in value)
+    return len(str(value))
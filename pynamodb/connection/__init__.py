@@ -2,11 +2,15 @@
 PynamoDB lowest level connection
 """
 
+from pynamodb.connection.async_base import AsyncConnection
+from pynamodb.connection.async_table import AsyncTableConnection
 from pynamodb.connection.base import Connection
 from pynamodb.connection.table import TableConnection
 
 
 __all__ = [
+    "AsyncConnection",
+    "AsyncTableConnection",
     "Connection",
     "TableConnection",
 ]
@@ -0,0 +1,273 @@
+"""
+A minimal asyncio HTTP/1.1 client with keep-alive connection pooling.
+
+DynamoDB only needs single-shot POST requests with small JSON bodies, so this
+avoids pulling an asyncio HTTP library in as a dependency.
+"""
+import asyncio
+import socket
+import ssl
+import time
+from collections import deque
+from typing import Deque, Dict, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+from botocore.exceptions import ConnectTimeoutError, EndpointConnectionError, ReadTimeoutError
+
+from pynamodb.connection.pooling import PoolAutoSizing, PoolMetrics
+
+_Stream = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+# A pooled stream, with the times it was opened and last released
+_IdleStream = Tuple[_Stream, float, float]
+
+
+class AsyncHTTPResponse:
+    """
+    A fully read HTTP response
+    """
+
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+
+class _StaleConnectionError(Exception):
+    """
+    Raised when a pooled connection was closed by the server before a response was received
+    """
+
+
+class AsyncHTTPConnectionPool:
+    """
+    A pool of keep-alive connections to a single endpoint.
+
+    The pool is bound to the event loop it was created on. With `auto_sizing`, the pool grows after
+    a request has waited for longer than the threshold for a free connection.
+    """
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        max_pool_connections: int,
+        connect_timeout_seconds: Optional[float] = None,
+        read_timeout_seconds: Optional[float] = None,
+        max_connection_idle_seconds: Optional[float] = None,
+        max_connection_lifetime_seconds: Optional[float] = None,
+        pool_metrics: Optional[PoolMetrics] = None,
+        auto_sizing: Optional[PoolAutoSizing] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        tcp_nodelay: bool = True,
+        tcp_keepalive: bool = False,
+    ) -> None:
+        url = urlsplit(endpoint_url)
+        if url.scheme not in ('http', 'https'):
+            raise ValueError("Unsupported endpoint scheme: {}".format(url.scheme))
+        self.host = url.hostname or ''
+        self.is_secure = url.scheme == 'https'
+        self.port = url.port or (443 if self.is_secure else 80)
+        default_port = 443 if self.is_secure else 80
+        self.host_header = self.host if self.port == default_port else '{}:{}'.format(self.host, self.port)
+        self.endpoint_url = endpoint_url
+        self.connect_timeout_seconds = connect_timeout_seconds
+        self.read_timeout_seconds = read_timeout_seconds
+        self.max_connection_idle_seconds = max_connection_idle_seconds
+        self.max_connection_lifetime_seconds = max_connection_lifetime_seconds
+        self.tcp_nodelay = tcp_nodelay
+        self.tcp_keepalive = tcp_keepalive
+        self.loop = asyncio.get_running_loop()
+        if self.is_secure:
+            self._ssl_context: Optional[ssl.SSLContext] = ssl_context or ssl.create_default_context()
+        else:
+            self._ssl_context = None
+        self.pool_metrics = pool_metrics if pool_metrics is not None else PoolMetrics(max_pool_connections)
+        self.auto_sizing = auto_sizing
+        # A pool replacing another one starts at the size the other one has grown to
+        self._size = max(max_pool_connections, self.pool_metrics.pool_size)
+        self._semaphore = asyncio.Semaphore(self._size)
+        self._idle: Deque[_IdleStream] = deque()
+        self.pool_metrics.add_pool(self)
+
+    async def request(self, method: str, path: str, headers: Mapping[str, str], body: bytes) -> AsyncHTTPResponse:
+        """
+        Sends a request and returns the response once it has been fully read
+        """
+        payload = self._encode_request(method, path, headers, body)
+        await self._acquire()
+        try:
+            while self._idle:
+                stream, opened_at, released_at = self._idle.pop()
+                if self._is_expired(opened_at, released_at):
+                    self._close(stream[1])
+                    continue
+                try:
+                    return await self._send(stream, opened_at, payload)
+                except _StaleConnectionError:
+                    # The server closed the idle connection; try the next one
+                    continue
+            try:
+                return await self._send(await self._open(), time.monotonic(), payload)
+            except _StaleConnectionError as e:
+                raise EndpointConnectionError(endpoint_url=self.endpoint_url, error=e) from e
+        finally:
+            self._semaphore.release()
+            self.pool_metrics.record_checkin()
+
+    async def close(self) -> None:
+        """
+        Closes all idle connections
+        """
+        self.close_idle()
+
+    def close_idle(self) -> None:
+        """
+        Closes all idle connections, including from outside the pool's event loop once it has been closed
+        """
+        while self._idle:
+            (_, writer), _, _ = self._idle.pop()
+            self._close(writer)
+
+    async def _acquire(self) -> None:
+        start = time.perf_counter()
+        await self._semaphore.acquire()
+        wait_seconds = time.perf_counter() - start
+        self.pool_metrics.record_checkout(wait_seconds)
+        auto_sizing = self.auto_sizing
+        if auto_sizing is not None and wait_seconds > auto_sizing.wait_threshold_seconds:
+            self._grow(auto_sizing)
+
+    def _grow(self, auto_sizing: PoolAutoSizing) -> None:
+        size = auto_sizing.get_pool_size(self._size, self.pool_metrics.peak_in_flight)
+        if size <= self._size:
+            return
+        for _ in range(size - self._size):
+            self._semaphore.release()
+        self._size = size
+        self.pool_metrics.record_resize(size)
+
+    def _close(self, writer: asyncio.StreamWriter) -> None:
+        try:
+            writer.close()
+        except RuntimeError:
+            # The pool's event loop is closed, so the connection is shut down without it,
+            # and the socket is released when the stream is garbage collected
+            sock = writer.get_extra_info('socket')
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        self.pool_metrics.record_closed()
+
+    def _count_idle(self) -> int:
+        return len(self._idle)
+
+    async def _open(self) -> _Stream:
+        try:
+            stream = await asyncio.wait_for(
+                asyncio.open_connection(
+                    self.host,
+                    self.port,
+                    ssl=self._ssl_context,
+                    server_hostname=self.host if self.is_secure else None,
+                ),
+                self.connect_timeout_seconds,
+            )
+        except asyncio.TimeoutError as e:
+            raise ConnectTimeoutError(endpoint_url=self.endpoint_url, error=e) from e
+        except OSError as e:
+            raise EndpointConnectionError(endpoint_url=self.endpoint_url, error=e) from e
+        sock = stream[1].get_extra_info('socket')
+        if sock is not None:
+            # asyncio sets TCP_NODELAY on its own, so it is set either way
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(self.tcp_nodelay))
+            if self.tcp_keepalive:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self.pool_metrics.record_opened()
+        return stream
+
+    def _encode_request(self, method: str, path: str, headers: Mapping[str, str], body: bytes) -> bytes:
+        lines = ['{} {} HTTP/1.1'.format(method, path or '/')]
+        header_names = {name.lower() for name in headers}
+        if 'host' not in header_names:
+            lines.append('Host: {}'.format(self.host_header))
+        if 'content-length' not in header_names:
+            lines.append('Content-Length: {}'.format(len(body)))
+        for name, value in headers.items():
+            if isinstance(value, bytes):
+                value = value.decode('utf-8')
+            lines.append('{}: {}'.format(name, value))
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8') + body
+
+    def _is_expired(self, opened_at: float, released_at: float) -> bool:
+        # Connections idle for too long may have been silently dropped by a NAT gateway or load balancer
+        now = time.monotonic()
+        if self.max_connection_idle_seconds is not None and now - released_at >= self.max_connection_idle_seconds:
+            return True
+        if self.max_connection_lifetime_seconds is not None and now - opened_at >= self.max_connection_lifetime_seconds:
+            return True
+        return False
+
+    async def _send(self, stream: _Stream, opened_at: float, payload: bytes) -> AsyncHTTPResponse:
+        reader, writer = stream
+        try:
+            try:
+                writer.write(payload)
+                await writer.drain()
+                status_line = await asyncio.wait_for(reader.readline(), self.read_timeout_seconds)
+            except OSError as e:
+                raise _StaleConnectionError() from e
+            if not status_line:
+                raise _StaleConnectionError()
+            response, keep_alive = await asyncio.wait_for(
+                self._read_response(reader, status_line),
+                self.read_timeout_seconds,
+            )
+        except (_StaleConnectionError, asyncio.CancelledError):
+            # A cancelled request leaves the connection in an unknown state
+            self._close(writer)
+            raise
+        except asyncio.TimeoutError as e:
+            self._close(writer)
+            raise ReadTimeoutError(endpoint_url=self.endpoint_url, error=e) from e
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            self._close(writer)
+            raise EndpointConnectionError(endpoint_url=self.endpoint_url, error=e) from e
+        if keep_alive:
+            self._idle.append((stream, opened_at, time.monotonic()))
+        else:
+            self._close(writer)
+        return response
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader, status_line: bytes) -> Tuple[AsyncHTTPResponse, bool]:
+        version, status, _ = (status_line.decode('latin-1').rstrip('\r\n') + ' ').split(' ', 2)
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';', 1)[0], 16)
+                if size == 0:
+                    # Skip trailers
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            content = b''.join(chunks)
+        elif 'content-length' in headers:
+            content = await reader.readexactly(int(headers['content-length']))
+        else:
+            content = await reader.read()
+            return AsyncHTTPResponse(int(status), headers, content), False
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' and (version != 'HTTP/1.0' or connection == 'keep-alive')
+        return AsyncHTTPResponse(int(status), headers, content), keep_alive
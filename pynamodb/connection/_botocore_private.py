@@ -17,6 +17,9 @@ class BotocoreEndpointPrivate(botocore.endpoint.Endpoint):
 
 class BotocoreRequestSignerPrivate(botocore.signers.RequestSigner):
     _credentials: botocore.credentials.Credentials
+    _region_name: str
+    _signature_version: str
+    _signing_name: str
 
 
 class BotocoreBaseClientPrivate(botocore.client.BaseClient):
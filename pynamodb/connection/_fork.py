@@ -0,0 +1,100 @@
+"""
+Resets connection state inherited across ``os.fork()``.
+
+A forked child inherits its parent's botocore clients, whose pooled sockets (and TLS sessions) are
+then shared by both processes, and whose credential providers may hold locks taken by another thread
+at the time of the fork. Pre-fork servers (e.g. gunicorn with ``--preload``) fork after the models
+are imported, so every connection's client is dropped in the child, without closing the parent's
+sockets, and rebuilt on first use or by a registered warmup. The locks of shared objects such as retry
+budgets, hedging policies and metrics are replaced too, since another thread may have held them.
+"""
+import logging
+import os
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Type
+
+from pynamodb.connection.registry import client_registry
+
+if TYPE_CHECKING:
+    from pynamodb.connection.base import Connection
+    from pynamodb.models import Model
+
+log = logging.getLogger(__name__)
+
+_connections: 'weakref.WeakSet[Connection]' = weakref.WeakSet()
+_lock_owners: 'weakref.WeakSet[Any]' = weakref.WeakSet()
+_after_fork_callbacks: List[Callable[[], Any]] = []
+# Model -> the number of connections to open for it, in each forked child
+_rewarm_models: Dict[Type['Model'], int] = {}
+
+
+def track_connection(connection: 'Connection') -> None:
+    """
+    Resets `connection` in forked children for as long as it is alive
+    """
+    _connections.add(connection)
+
+
+def track_lock(owner: Any) -> None:
+    """
+    Replaces ``owner._lock`` with a new lock in forked children, for as long as `owner` is alive,
+    then calls its ``_reset_after_fork`` method if it has one
+    """
+    _lock_owners.add(owner)
+
+
+def rewarm_after_fork(models: List[Type['Model']], open_connections: int) -> None:
+    """
+    Warms `models` up again in each forked child, from a background thread
+    """
+    for model in models:
+        _rewarm_models[model] = max(open_connections, _rewarm_models.get(model, 0))
+
+
+def register_after_fork(callback: Callable[[], Any]) -> None:
+    """
+    Calls `callback` in each forked child, once all connections have been reset
+    """
+    _after_fork_callbacks.append(callback)
+
+
+def after_fork_in_child() -> None:
+    for owner in list(_lock_owners):
+        # The lock may have been held by another thread of the parent when it forked
+        owner._lock = threading.Lock()
+        reset_after_fork = getattr(owner, '_reset_after_fork', None)
+        if reset_after_fork is not None:
+            reset_after_fork()
+    client_registry.reset_after_fork()
+    for connection in list(_connections):
+        connection._reset_after_fork()
+    for callback in _after_fork_callbacks:
+        try:
+            callback()
+        except Exception:
+            # Connections are rebuilt on their first request anyway
+            log.warning("Failed to run after fork callback %r", callback, exc_info=True)
+    if _rewarm_models:
+        # Run in the background, so that the fork doesn't wait on the network
+        thread = threading.Thread(target=_rewarm, args=(dict(_rewarm_models),), name='pynamodb-warmup')
+        thread.daemon = True
+        thread.start()
+
+
+def _rewarm(models: Dict[Type['Model'], int]) -> None:
+    from pynamodb import warmup
+
+    by_open_connections: Dict[int, List[Type['Model']]] = {}
+    for model, open_connections in models.items():
+        by_open_connections.setdefault(open_connections, []).append(model)
+    for open_connections, group in by_open_connections.items():
+        try:
+            warmup(group, open_connections=open_connections)
+        except Exception:
+            # Connections are rebuilt on their first request anyway
+            log.warning("Failed to warm up %s after fork", group, exc_info=True)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=after_fork_in_child)
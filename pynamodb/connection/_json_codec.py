@@ -0,0 +1,146 @@
+"""
+A lean codec for the DynamoDB JSON 1.0 protocol.
+
+botocore serializes requests and parses responses by walking the service model's shapes,
+which is generic but slow for the item-heavy payloads of the data plane operations.
+Every PynamoDB request is already in wire format (``operation_kwargs`` only contains
+AttributeValue maps, strings, numbers and booleans), so the request body can be written
+directly and the response body only needs binary values decoded.
+"""
+import json
+from base64 import b64encode
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from pynamodb._util import bin_decode_attr
+from pynamodb.constants import (
+    ATTRIBUTES, BATCH_GET_ITEM, BATCH_WRITE_ITEM, DELETE_ITEM, DELETE_REQUEST, GET_ITEM, ITEM, ITEMS,
+    KEY, KEYS, LAST_EVALUATED_KEY, PUT_ITEM, PUT_REQUEST, QUERY, RESPONSES, SCAN, TRANSACT_GET_ITEMS,
+    TRANSACT_WRITE_ITEMS, UNPROCESSED_ITEMS, UNPROCESSED_KEYS, UPDATE_ITEM,
+)
+
+TARGET_PREFIX = 'DynamoDB_20120810.'
+CONTENT_TYPE = 'application/x-amz-json-1.0'
+ITEM_COLLECTION_METRICS = 'ItemCollectionMetrics'
+ITEM_COLLECTION_KEY = 'ItemCollectionKey'
+CANCELLATION_REASONS = 'CancellationReasons'
+
+# Operations whose requests and responses the codec understands; all others go through botocore
+LEAN_CODEC_OPERATIONS = frozenset([
+    BATCH_GET_ITEM, BATCH_WRITE_ITEM, DELETE_ITEM, GET_ITEM, PUT_ITEM, QUERY, SCAN,
+    TRANSACT_GET_ITEMS, TRANSACT_WRITE_ITEMS, UPDATE_ITEM,
+])
+
+
+def _encode_binary(value: Any) -> str:
+    # Binary values are the only ones the json module can't encode natively
+    if isinstance(value, (bytes, bytearray)):
+        return b64encode(value).decode()
+    raise TypeError("Object of type {} is not JSON serializable".format(type(value).__name__))
+
+
+_encoder = json.JSONEncoder(separators=(',', ':'), default=_encode_binary)
+
+
+def encode_request(operation_name: str, operation_kwargs: Mapping[str, Any]) -> Tuple[Dict[str, str], bytes]:
+    """
+    Returns the headers and body of a request, without copying the AttributeValue maps
+    """
+    headers = {
+        'X-Amz-Target': TARGET_PREFIX + operation_name,
+        'Content-Type': CONTENT_TYPE,
+    }
+    return headers, _encoder.encode(operation_kwargs).encode('utf-8')
+
+
+def _decode_item(item: Optional[Dict[str, Any]]) -> None:
+    if item:
+        for value in item.values():
+            bin_decode_attr(value)
+
+
+def _decode_item_collection_metrics(metrics: Dict[str, Any]) -> None:
+    _decode_item(metrics.get(ITEM_COLLECTION_KEY))
+
+
+def _decode_body(data: Dict[str, Any]) -> None:
+    """
+    Decodes, in place, the binary values of every AttributeValue map in a response
+    """
+    _decode_item(data.get(ITEM))
+    _decode_item(data.get(ATTRIBUTES))
+    _decode_item(data.get(LAST_EVALUATED_KEY))
+    for item in data.get(ITEMS, ()):
+        _decode_item(item)
+    responses = data.get(RESPONSES)
+    if isinstance(responses, dict):
+        # BatchGetItem: {table_name: [item, ...]}
+        for items in responses.values():
+            for item in items:
+                _decode_item(item)
+    elif responses:
+        # TransactGetItems: [{'Item': item}, ...]
+        for response in responses:
+            _decode_item(response.get(ITEM))
+    for unprocessed in data.get(UNPROCESSED_KEYS, {}).values():
+        for key in unprocessed.get(KEYS, ()):
+            _decode_item(key)
+    for requests in data.get(UNPROCESSED_ITEMS, {}).values():
+        for request in requests:
+            if PUT_REQUEST in request:
+                _decode_item(request[PUT_REQUEST].get(ITEM))
+            elif DELETE_REQUEST in request:
+                _decode_item(request[DELETE_REQUEST].get(KEY))
+    metrics = data.get(ITEM_COLLECTION_METRICS)
+    if isinstance(metrics, dict):
+        if ITEM_COLLECTION_KEY in metrics:
+            _decode_item_collection_metrics(metrics)
+        else:
+            # BatchWriteItem and TransactWriteItems: {table_name: [metrics, ...]}
+            for table_metrics in metrics.values():
+                for table_metric in table_metrics:
+                    _decode_item_collection_metrics(table_metric)
+
+
+def decode_response(
+    operation_name: str,
+    status_code: int,
+    headers: Mapping[str, str],
+    body: bytes,
+    retry_attempts: int = 0,
+) -> Dict[str, Any]:
+    """
+    Returns the parsed response, or raises a ClientError shaped like botocore's for an error response
+    """
+    try:
+        data = json.loads(body) if body else {}
+    except ValueError:
+        if status_code < 300:
+            raise
+        # Error responses from proxies and load balancers aren't necessarily JSON
+        data = {}
+    lowered_headers = {name.lower(): value for name, value in headers.items()}
+    response_metadata = {
+        'RequestId': lowered_headers.get('x-amzn-requestid', ''),
+        'HTTPStatusCode': status_code,
+        'HTTPHeaders': lowered_headers,
+        'RetryAttempts': retry_attempts,
+    }
+    if status_code >= 300:
+        code = data.get('__type', '').rsplit('#', 1)[-1] or str(status_code)
+        error_response: Dict[str, Any] = {
+            'Error': {
+                'Code': code,
+                'Message': data.get('message', data.get('Message', '')),
+            },
+            'ResponseMetadata': response_metadata,
+        }
+        if CANCELLATION_REASONS in data:
+            for reason in data[CANCELLATION_REASONS]:
+                _decode_item(reason.get(ITEM))
+            error_response[CANCELLATION_REASONS] = data[CANCELLATION_REASONS]
+        raise ClientError(error_response, operation_name)  # type: ignore[arg-type]
+    _decode_body(data)
+    data['ResponseMetadata'] = response_metadata
+    return data
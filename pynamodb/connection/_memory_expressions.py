@@ -0,0 +1,648 @@
+"""
+Parses and evaluates DynamoDB expressions against items in wire format, for the in-memory database.
+
+Expressions are parsed once per expression string into tuples, with their placeholders left unresolved,
+so the expressions of repeated requests (which only differ in their values) aren't parsed again.
+"""
+import base64
+import re
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from pynamodb.constants import (
+    BINARY, BINARY_SET, BOOLEAN, LIST, MAP, NULL, NUMBER, NUMBER_SET, STRING, STRING_SET,
+)
+
+Segment = Union[str, int]
+
+_TOKEN_PATTERN = re.compile(
+    r'\s*(?:(?P<name>#[A-Za-z0-9_]+)|(?P<value>:[A-Za-z0-9_]+)|(?P<number>[0-9]+)'
+    r'|(?P<word>[A-Za-z_][A-Za-z0-9_]*)|(?P<symbol><>|<=|>=|[=<>()\[\],.+-]))'
+)
+
+_COMPARATORS = frozenset(['=', '<>', '<', '<=', '>', '>='])
+_CONDITION_FUNCTIONS = frozenset(['attribute_exists', 'attribute_not_exists', 'attribute_type', 'begins_with', 'contains'])
+_UPDATE_CLAUSES = ('SET', 'REMOVE', 'ADD', 'DELETE')
+_SET_TYPES = frozenset([STRING_SET, NUMBER_SET, BINARY_SET])
+
+
+class ValidationError(Exception):
+    """
+    An invalid expression, or an expression that can't be applied to an item
+    """
+
+
+# =============================================================================
+# Values
+# =============================================================================
+
+def normalize(value: Dict[str, Any]) -> Tuple:
+    """
+    Returns a hashable, comparable form of an attribute value, where equal values are equal
+    """
+    (value_type, data), = value.items()
+    if value_type == NUMBER:
+        return NUMBER, Decimal(data)
+    if value_type == BINARY:
+        return BINARY, _decode_binary(data)
+    if value_type == STRING_SET:
+        return STRING_SET, frozenset(data)
+    if value_type == NUMBER_SET:
+        return NUMBER_SET, frozenset(Decimal(number) for number in data)
+    if value_type == BINARY_SET:
+        return BINARY_SET, frozenset(_decode_binary(binary) for binary in data)
+    if value_type == LIST:
+        return LIST, tuple(normalize(element) for element in data)
+    if value_type == MAP:
+        return MAP, frozenset((name, normalize(element)) for name, element in data.items())
+    return value_type, data
+
+
+def _decode_binary(data: Union[str, bytes]) -> bytes:
+    return base64.b64decode(data) if isinstance(data, str) else data
+
+
+def format_number(number: Decimal) -> str:
+    return '{:f}'.format(number.normalize()) if number else '0'
+
+
+def get_value_size(value: Dict[str, Any]) -> int:
+    """
+    Returns the approximate size in bytes of an attribute value, as DynamoDB counts it
+    """
+    (value_type, data), = value.items()
+    if value_type == STRING:
+        return len(data.encode('utf-8'))
+    if value_type == NUMBER:
+        return len(data.lstrip('-').replace('.', '')) // 2 + 1
+    if value_type == BINARY:
+        return len(_decode_binary(data))
+    if value_type in (BOOLEAN, NULL):
+        return 1
+    if value_type in _SET_TYPES:
+        return sum(get_value_size({value_type[0]: element}) for element in data)
+    if value_type == LIST:
+        return 3 + sum(get_value_size(element) + 1 for element in data)
+    if value_type == MAP:
+        return 3 + sum(len(name.encode('utf-8')) + get_value_size(element) + 1 for name, element in data.items())
+    return 0
+
+
+def get_item_size(item: Dict[str, Dict[str, Any]]) -> int:
+    return sum(len(name.encode('utf-8')) + get_value_size(value) for name, value in item.items())
+
+
+# =============================================================================
+# Parsing
+# =============================================================================
+
+class _Parser:
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.tokens: List[Tuple[str, str]] = []
+        position = 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = _TOKEN_PATTERN.match(expression, position)
+            if match is None or match.end() == position:
+                raise ValidationError("Invalid expression: unexpected character at {} in '{}'".format(position, self.expression))
+            kind = match.lastgroup
+            assert kind is not None
+            self.tokens.append((kind, match.group(kind)))
+            position = match.end()
+        self.position = 0
+
+    def peek(self, offset: int = 0) -> Tuple[str, str]:
+        if self.position + offset < len(self.tokens):
+            return self.tokens[self.position + offset]
+        return '', ''
+
+    def next(self) -> Tuple[str, str]:
+        token = self.peek()
+        if not token[0]:
+            raise ValidationError("Invalid expression: unexpected end of '{}'".format(self.expression))
+        self.position += 1
+        return token
+
+    def is_keyword(self, keyword: str, offset: int = 0) -> bool:
+        kind, text = self.peek(offset)
+        return kind == 'word' and text.upper() == keyword
+
+    def accept(self, symbol: str) -> bool:
+        if self.peek() == ('symbol', symbol):
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, symbol: str) -> None:
+        if not self.accept(symbol):
+            raise ValidationError("Invalid expression: expected '{}' in '{}'".format(symbol, self.expression))
+
+    def expect_keyword(self, keyword: str) -> None:
+        if not self.is_keyword(keyword):
+            raise ValidationError("Invalid expression: expected {} in '{}'".format(keyword, self.expression))
+        self.position += 1
+
+    def at_end(self) -> bool:
+        return self.position >= len(self.tokens)
+
+    def check_end(self) -> None:
+        if not self.at_end():
+            raise ValidationError("Invalid expression: unexpected '{}' in '{}'".format(self.peek()[1], self.expression))
+
+    # Conditions
+
+    def condition(self) -> Tuple:
+        condition = self.and_condition()
+        while self.is_keyword('OR'):
+            self.position += 1
+            condition = ('or', condition, self.and_condition())
+        return condition
+
+    def and_condition(self) -> Tuple:
+        condition = self.not_condition()
+        while self.is_keyword('AND'):
+            self.position += 1
+            condition = ('and', condition, self.not_condition())
+        return condition
+
+    def not_condition(self) -> Tuple:
+        if self.is_keyword('NOT'):
+            self.position += 1
+            return ('not', self.not_condition())
+        return self.primary_condition()
+
+    def primary_condition(self) -> Tuple:
+        if self.accept('('):
+            condition = self.condition()
+            self.expect(')')
+            return condition
+        kind, text = self.peek()
+        if kind == 'word' and text in _CONDITION_FUNCTIONS and self.peek(1) == ('symbol', '('):
+            self.position += 2
+            arguments = [self.operand()]
+            while self.accept(','):
+                arguments.append(self.operand())
+            self.expect(')')
+            return ('function', text, arguments)
+        operand = self.operand()
+        kind, text = self.peek()
+        if kind == 'symbol' and text in _COMPARATORS:
+            self.position += 1
+            return ('compare', text, operand, self.operand())
+        if self.is_keyword('BETWEEN'):
+            self.position += 1
+            lower = self.operand()
+            self.expect_keyword('AND')
+            return ('between', operand, lower, self.operand())
+        if self.is_keyword('IN'):
+            self.position += 1
+            self.expect('(')
+            operands = [self.operand()]
+            while self.accept(','):
+                operands.append(self.operand())
+            self.expect(')')
+            return ('in', operand, operands)
+        raise ValidationError("Invalid expression: expected a comparison in '{}'".format(self.expression))
+
+    def operand(self) -> Tuple:
+        kind, text = self.peek()
+        if kind == 'value':
+            self.position += 1
+            return ('value', text)
+        if kind == 'word' and text == 'size' and self.peek(1) == ('symbol', '('):
+            self.position += 2
+            path = self.path()
+            self.expect(')')
+            return ('size', path)
+        return self.path()
+
+    def path(self) -> Tuple:
+        kind, text = self.next()
+        if kind not in ('name', 'word'):
+            raise ValidationError("Invalid expression: expected an attribute name in '{}'".format(self.expression))
+        segments: List[Segment] = [text]
+        while True:
+            if self.accept('.'):
+                kind, text = self.next()
+                if kind not in ('name', 'word'):
+                    raise ValidationError("Invalid expression: expected an attribute name in '{}'".format(self.expression))
+                segments.append(text)
+            elif self.accept('['):
+                kind, text = self.next()
+                if kind != 'number':
+                    raise ValidationError("Invalid expression: expected a list index in '{}'".format(self.expression))
+                segments.append(int(text))
+                self.expect(']')
+            else:
+                return ('path', tuple(segments))
+
+    # Updates
+
+    def update(self) -> Dict[str, List[Tuple]]:
+        clauses: Dict[str, List[Tuple]] = {}
+        while not self.at_end():
+            kind, text = self.next()
+            clause = text.upper()
+            if kind != 'word' or clause not in _UPDATE_CLAUSES:
+                raise ValidationError("Invalid update expression: unexpected '{}' in '{}'".format(text, self.expression))
+            if clause in clauses:
+                raise ValidationError("Invalid update expression: the {} clause is repeated".format(clause))
+            actions = clauses[clause] = []
+            while True:
+                path = self.path()
+                if clause == 'SET':
+                    self.expect('=')
+                    actions.append((path, self.set_value()))
+                elif clause == 'REMOVE':
+                    actions.append((path, None))
+                else:
+                    kind, text = self.next()
+                    if kind != 'value':
+                        raise ValidationError("Invalid update expression: expected a value in '{}'".format(self.expression))
+                    actions.append((path, ('value', text)))
+                if not self.accept(','):
+                    break
+        return clauses
+
+    def set_value(self) -> Tuple:
+        operand = self.set_operand()
+        for symbol in ('+', '-'):
+            if self.accept(symbol):
+                return (symbol, operand, self.set_operand())
+        return operand
+
+    def set_operand(self) -> Tuple:
+        kind, text = self.peek()
+        if kind == 'word' and text in ('if_not_exists', 'list_append') and self.peek(1) == ('symbol', '('):
+            self.position += 2
+            first = self.path() if text == 'if_not_exists' else self.set_value()
+            self.expect(',')
+            second = self.set_value()
+            self.expect(')')
+            return (text, first, second)
+        if kind == 'value':
+            self.position += 1
+            return ('value', text)
+        return self.path()
+
+
+@lru_cache(maxsize=1024)
+def parse_condition(expression: str) -> Tuple:
+    parser = _Parser(expression)
+    condition = parser.condition()
+    parser.check_end()
+    return condition
+
+
+@lru_cache(maxsize=1024)
+def parse_update(expression: str) -> Dict[str, List[Tuple]]:
+    return _Parser(expression).update()
+
+
+@lru_cache(maxsize=1024)
+def parse_projection(expression: str) -> List[Tuple]:
+    parser = _Parser(expression)
+    paths = [parser.path()]
+    while parser.accept(','):
+        paths.append(parser.path())
+    parser.check_end()
+    return paths
+
+
+# =============================================================================
+# Evaluation
+# =============================================================================
+
+class Context:
+    """
+    The expression attribute names and values of a request
+    """
+
+    def __init__(self, names: Optional[Dict[str, str]], values: Optional[Dict[str, Dict[str, Any]]]) -> None:
+        self.names = names or {}
+        self.values = values or {}
+
+    def resolve_path(self, path: Tuple) -> List[Segment]:
+        segments: List[Segment] = []
+        for segment in path[1]:
+            if isinstance(segment, str) and segment.startswith('#'):
+                if segment not in self.names:
+                    raise ValidationError("An expression attribute name used in the document path is not defined: {}".format(segment))
+                segment = self.names[segment]
+            segments.append(segment)
+        return segments
+
+    def resolve_value(self, placeholder: str) -> Dict[str, Any]:
+        if placeholder not in self.values:
+            raise ValidationError("An expression attribute value used in expression is not defined: {}".format(placeholder))
+        return self.values[placeholder]
+
+
+def get_path(item: Dict[str, Any], segments: List[Segment]) -> Optional[Dict[str, Any]]:
+    value = item.get(segments[0])  # type: ignore[arg-type]
+    for segment in segments[1:]:
+        if value is None:
+            return None
+        if isinstance(segment, int):
+            elements = value.get(LIST)
+            value = elements[segment] if elements is not None and segment < len(elements) else None
+        else:
+            members = value.get(MAP)
+            value = members.get(segment) if members is not None else None
+    return value
+
+
+def evaluate_operand(operand: Tuple, item: Dict[str, Any], context: Context) -> Optional[Dict[str, Any]]:
+    kind = operand[0]
+    if kind == 'path':
+        return get_path(item, context.resolve_path(operand))
+    if kind == 'value':
+        return context.resolve_value(operand[1])
+    if kind == 'size':
+        value = get_path(item, context.resolve_path(operand[1]))
+        if value is None:
+            return None
+        (value_type, data), = value.items()
+        if value_type == BINARY:
+            return {NUMBER: str(len(_decode_binary(data)))}
+        if value_type in (NUMBER, BOOLEAN, NULL):
+            raise ValidationError("Invalid function operand: size() does not support {} values".format(value_type))
+        return {NUMBER: str(len(data))}
+    if kind in ('+', '-'):
+        left = evaluate_operand(operand[1], item, context)
+        right = evaluate_operand(operand[2], item, context)
+        if left is None or right is None or NUMBER not in left or NUMBER not in right:
+            raise ValidationError("An operand in the update expression has an incorrect data type")
+        number = Decimal(left[NUMBER]) + Decimal(right[NUMBER]) if kind == '+' else Decimal(left[NUMBER]) - Decimal(right[NUMBER])
+        return {NUMBER: format_number(number)}
+    if kind == 'if_not_exists':
+        value = get_path(item, context.resolve_path(operand[1]))
+        return value if value is not None else evaluate_operand(operand[2], item, context)
+    if kind == 'list_append':
+        left = evaluate_operand(operand[1], item, context)
+        right = evaluate_operand(operand[2], item, context)
+        if left is None or right is None or LIST not in left or LIST not in right:
+            raise ValidationError("An operand in the update expression has an incorrect data type")
+        return {LIST: left[LIST] + right[LIST]}
+    raise ValidationError("Invalid operand: {}".format(kind))
+
+
+def _compare(operator: str, left: Optional[Dict[str, Any]], right: Optional[Dict[str, Any]]) -> bool:
+    if left is None or right is None:
+        return operator == '<>'
+    left_value, right_value = normalize(left), normalize(right)
+    if operator == '=':
+        return left_value == right_value
+    if operator == '<>':
+        return left_value != right_value
+    if left_value[0] != right_value[0] or left_value[0] not in (STRING, NUMBER, BINARY):
+        return False
+    if operator == '<':
+        return left_value[1] < right_value[1]
+    if operator == '<=':
+        return left_value[1] <= right_value[1]
+    if operator == '>':
+        return left_value[1] > right_value[1]
+    return left_value[1] >= right_value[1]
+
+
+def evaluate_condition(condition: Tuple, item: Dict[str, Any], context: Context) -> bool:
+    kind = condition[0]
+    if kind == 'and':
+        return evaluate_condition(condition[1], item, context) and evaluate_condition(condition[2], item, context)
+    if kind == 'or':
+        return evaluate_condition(condition[1], item, context) or evaluate_condition(condition[2], item, context)
+    if kind == 'not':
+        return not evaluate_condition(condition[1], item, context)
+    if kind == 'compare':
+        left = evaluate_operand(condition[2], item, context)
+        return _compare(condition[1], left, evaluate_operand(condition[3], item, context))
+    if kind == 'between':
+        value = evaluate_operand(condition[1], item, context)
+        return (
+            _compare('>=', value, evaluate_operand(condition[2], item, context))
+            and _compare('<=', value, evaluate_operand(condition[3], item, context))
+        )
+    if kind == 'in':
+        value = evaluate_operand(condition[1], item, context)
+        return any(_compare('=', value, evaluate_operand(operand, item, context)) for operand in condition[2])
+    return _evaluate_function(condition[1], condition[2], item, context)
+
+
+def _evaluate_function(name: str, arguments: List[Tuple], item: Dict[str, Any], context: Context) -> bool:
+    expected_arguments = 1 if name in ('attribute_exists', 'attribute_not_exists') else 2
+    if len(arguments) != expected_arguments or arguments[0][0] != 'path':
+        raise ValidationError("Invalid function call: {} takes a path and {} operand(s)".format(name, expected_arguments - 1))
+    value = evaluate_operand(arguments[0], item, context)
+    if name == 'attribute_exists':
+        return value is not None
+    if name == 'attribute_not_exists':
+        return value is None
+    operand = evaluate_operand(arguments[1], item, context)
+    if value is None or operand is None:
+        return False
+    (value_type, data), = value.items()
+    (operand_type, operand_data), = operand.items()
+    if name == 'attribute_type':
+        return value_type == operand_data
+    if name == 'begins_with':
+        if value_type != operand_type or value_type not in (STRING, BINARY):
+            return False
+        if value_type == BINARY:
+            return _decode_binary(data).startswith(_decode_binary(operand_data))
+        return data.startswith(operand_data)
+    # contains
+    if value_type == STRING:
+        return operand_type == STRING and operand_data in data
+    if value_type in _SET_TYPES:
+        return operand_type == value_type[0] and normalize(operand)[1] in normalize(value)[1]
+    if value_type == LIST:
+        operand_value = normalize(operand)
+        return any(normalize(element) == operand_value for element in data)
+    return False
+
+
+def project(item: Dict[str, Any], paths: List[Tuple], context: Context) -> Dict[str, Any]:
+    """
+    Returns the attributes of `item` in `paths`
+    """
+    projected: Dict[str, Any] = {}
+    for path in paths:
+        segments = context.resolve_path(path)
+        value = get_path(item, segments)
+        if value is not None:
+            _project_path(projected, item, segments, value)
+    return projected
+
+
+def _project_path(projected: Dict[str, Any], item: Dict[str, Any], segments: List[Segment], value: Dict[str, Any]) -> None:
+    name = segments[0]
+    assert isinstance(name, str)
+    if len(segments) == 1:
+        projected[name] = value
+        return
+    container = projected.setdefault(name, {LIST: []} if isinstance(segments[1], int) else {MAP: {}})
+    source = item[name]
+    for index, segment in enumerate(segments[1:-1], start=1):
+        source = source[LIST][segment] if isinstance(segment, int) else source[MAP][segment]
+        empty = {LIST: []} if isinstance(segments[index + 1], int) else {MAP: {}}
+        if isinstance(segment, int):
+            container[LIST].append(empty)
+            container = empty
+        else:
+            container = container[MAP].setdefault(segment, empty)
+    last = segments[-1]
+    if isinstance(last, int):
+        container[LIST].append(value)
+    else:
+        container[MAP][last] = value
+
+
+# =============================================================================
+# Updates
+# =============================================================================
+
+def apply_update(
+    item: Dict[str, Any],
+    clauses: Dict[str, List[Tuple]],
+    context: Context,
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Returns a copy of `item` with the update applied, and the names of the top level attributes updated.
+    Operands are evaluated against the item before the update.
+    """
+    updated = dict(item)
+    names: List[str] = []
+    for clause in _UPDATE_CLAUSES:
+        for path, operand in clauses.get(clause, []):
+            segments = context.resolve_path(path)
+            value = evaluate_operand(operand, item, context) if operand is not None else None
+            if clause == 'SET':
+                if value is None:
+                    raise ValidationError("The provided expression refers to an attribute that does not exist in the item")
+                _set_path(updated, segments, value)
+            elif clause == 'REMOVE':
+                _remove_path(updated, segments)
+            else:
+                assert value is not None
+                current = get_path(updated, segments)
+                new_value = _add(current, value) if clause == 'ADD' else _delete(current, value)
+                if new_value is None:
+                    _remove_path(updated, segments)
+                else:
+                    _set_path(updated, segments, new_value)
+            name = segments[0]
+            assert isinstance(name, str)
+            if name not in names:
+                names.append(name)
+    return updated, names
+
+
+def _copy_container(value: Dict[str, Any]) -> Dict[str, Any]:
+    if LIST in value:
+        return {LIST: list(value[LIST])}
+    if MAP in value:
+        return {MAP: dict(value[MAP])}
+    raise ValidationError("The document path provided in the update expression is invalid for update")
+
+
+def _get_parent(item: Dict[str, Any], segments: List[Segment]) -> Dict[str, Any]:
+    """
+    Returns the container of the last segment, copying the containers on the way so the original item is unchanged
+    """
+    name = segments[0]
+    if name not in item:
+        raise ValidationError("The document path provided in the update expression is invalid for update")
+    parent = item[name] = _copy_container(item[name])  # type: ignore[index]
+    for segment in segments[1:-1]:
+        if isinstance(segment, int):
+            elements = parent.get(LIST)
+            if elements is None or segment >= len(elements):
+                raise ValidationError("The document path provided in the update expression is invalid for update")
+            parent = elements[segment] = _copy_container(elements[segment])
+        else:
+            members = parent.get(MAP)
+            if members is None or segment not in members:
+                raise ValidationError("The document path provided in the update expression is invalid for update")
+            parent = members[segment] = _copy_container(members[segment])
+    return parent
+
+
+def _set_path(item: Dict[str, Any], segments: List[Segment], value: Dict[str, Any]) -> None:
+    if len(segments) == 1:
+        item[segments[0]] = value  # type: ignore[index]
+        return
+    parent = _get_parent(item, segments)
+    last = segments[-1]
+    if isinstance(last, int):
+        if LIST not in parent:
+            raise ValidationError("The document path provided in the update expression is invalid for update")
+        if last < len(parent[LIST]):
+            parent[LIST][last] = value
+        else:
+            parent[LIST].append(value)
+    else:
+        if MAP not in parent:
+            raise ValidationError("The document path provided in the update expression is invalid for update")
+        parent[MAP][last] = value
+
+
+def _remove_path(item: Dict[str, Any], segments: List[Segment]) -> None:
+    if len(segments) == 1:
+        item.pop(segments[0], None)  # type: ignore[arg-type]
+        return
+    if get_path(item, segments) is None:
+        return
+    parent = _get_parent(item, segments)
+    last = segments[-1]
+    if isinstance(last, int):
+        del parent[LIST][last]
+    else:
+        del parent[MAP][last]
+
+
+def _add(current: Optional[Dict[str, Any]], value: Dict[str, Any]) -> Dict[str, Any]:
+    (value_type, data), = value.items()
+    if value_type != NUMBER and value_type not in _SET_TYPES:
+        raise ValidationError("Incorrect operand type for operator or function; operator: ADD, operand type: {}".format(value_type))
+    if current is None:
+        return value
+    if value_type not in current:
+        raise ValidationError("An operand in the update expression has an incorrect data type")
+    if value_type == NUMBER:
+        return {NUMBER: format_number(Decimal(current[NUMBER]) + Decimal(data))}
+    existing = normalize(current)[1]
+    added = [
+        element for element in data
+        if normalize({value_type: [element]})[1] - existing
+    ]
+    return {value_type: current[value_type] + _unique(value_type, added)}
+
+
+def _delete(current: Optional[Dict[str, Any]], value: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    (value_type, data), = value.items()
+    if value_type not in _SET_TYPES:
+        raise ValidationError("Incorrect operand type for operator or function; operator: DELETE, operand type: {}".format(value_type))
+    if current is None:
+        return None
+    if value_type not in current:
+        raise ValidationError("An operand in the update expression has an incorrect data type")
+    deleted = normalize(value)[1]
+    remaining = [
+        element for element in current[value_type]
+        if not normalize({value_type: [element]})[1] & deleted
+    ]
+    return {value_type: remaining} if remaining else None
+
+
+def _unique(value_type: str, elements: List[Any]) -> List[Any]:
+    seen = set()
+    unique = []
+    for element in elements:
+        key = normalize({value_type: [element]})[1]
+        if key not in seen:
+            seen.add(key)
+            unique.append(element)
+    return unique
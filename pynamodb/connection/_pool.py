@@ -0,0 +1,272 @@
+"""
+Socket options, metrics, per-request timeouts and idle connection management for botocore's urllib3
+connection pools.
+
+urllib3 only notices that a pooled connection was closed if the peer's FIN has already arrived, so a
+connection silently dropped by a NAT gateway or load balancer after a long idle period fails on its
+next use, costing a reconnect and a retry. The pools below instead close connections that have been
+idle, or open, for too long when they are checked out, so that a fresh connection is opened up front.
+"""
+import logging
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+
+from botocore.awsrequest import AWSHTTPConnectionPool, AWSHTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+from urllib3.util.timeout import Timeout
+
+from pynamodb.connection.pooling import PoolAutoSizing, PoolMetrics
+
+log = logging.getLogger(__name__)
+
+_SocketOption = Tuple[int, int, int]
+
+TCP_NODELAY: _SocketOption = (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+TCP_KEEPALIVE: _SocketOption = (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+# The read timeout and the time.monotonic() deadline of the requests sent in a request_timeouts block
+_request_timeouts: 'ContextVar[Optional[Tuple[Optional[float], Optional[float]]]]' = ContextVar(
+    'pynamodb_request_timeouts', default=None,
+)
+
+
+def get_socket_options(
+    socket_options: Optional[List[_SocketOption]],
+    tcp_nodelay: bool,
+    tcp_keepalive: bool,
+) -> List[_SocketOption]:
+    """
+    Returns `socket_options` with TCP_NODELAY set or removed, and SO_KEEPALIVE added if requested
+    """
+    options = [option for option in socket_options or () if option[:2] != TCP_NODELAY[:2]]
+    if tcp_nodelay:
+        options.insert(0, TCP_NODELAY)
+    if tcp_keepalive and not any(option[:2] == TCP_KEEPALIVE[:2] for option in options):
+        options.append(TCP_KEEPALIVE)
+    return options
+
+
+@contextmanager
+def request_timeouts(read_timeout: Optional[float], deadline: Optional[float] = None) -> Iterator[None]:
+    """
+    Applies `read_timeout` to the requests sent through the pools below in a ``with`` block, and limits
+    their connect timeout and the wait for a pooled connection to the time left until `deadline`
+    """
+    if read_timeout is None and deadline is None:
+        yield
+        return
+    token = _request_timeouts.set((read_timeout, deadline))
+    try:
+        yield
+    finally:
+        _request_timeouts.reset(token)
+
+
+class _RequestTimeoutConnectionPoolMixin:
+    """
+    Applies the timeouts set by :func:`request_timeouts`. botocore's HTTP session only passes
+    the read timeout on to the pool in recent versions, and never limits the other waits.
+    """
+    timeout: Any
+
+    def urlopen(self, method: str, url: str, *args: Any, **kwargs: Any) -> Any:
+        timeouts = _request_timeouts.get()
+        if timeouts is not None:
+            read_timeout, deadline = timeouts
+            connect_timeout = self.timeout.connect_timeout
+            if read_timeout is None:
+                read_timeout = self.timeout.read_timeout
+            if deadline is not None:
+                remaining = max(deadline - time.monotonic(), 0.001)
+                connect_timeout = _min_timeout(connect_timeout, remaining)
+                read_timeout = _min_timeout(read_timeout, remaining)
+                # Only waited for by pools that block until a connection is free
+                kwargs['pool_timeout'] = _min_timeout(kwargs.get('pool_timeout'), remaining)
+            kwargs['timeout'] = Timeout(connect=connect_timeout, read=read_timeout)
+        return super().urlopen(method, url, *args, **kwargs)  # type: ignore[misc]
+
+
+def _min_timeout(timeout: Any, limit: float) -> float:
+    # urllib3 represents an unset timeout with a sentinel rather than None
+    return min(timeout, limit) if isinstance(timeout, (int, float)) else limit
+
+
+class _ExpiringConnectionPoolMixin:
+    """
+    Closes pooled connections that have been idle for more than `max_idle_seconds`,
+    or open for more than `max_lifetime_seconds`
+    """
+    max_idle_seconds: Optional[float] = None
+    max_lifetime_seconds: Optional[float] = None
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        conn = super()._get_conn(timeout)  # type: ignore[misc]
+        if getattr(conn, 'sock', None) is not None and self._is_expired(conn, time.monotonic()):
+            # urllib3 reconnects closed connections when they are used
+            conn.close()
+        return conn
+
+    def _put_conn(self, conn: Any) -> None:
+        if conn is not None and getattr(conn, 'sock', None) is not None:
+            now = time.monotonic()
+            if getattr(conn, '_pynamodb_sock', None) is not conn.sock:
+                # The connection has (re)connected since it was last returned
+                conn._pynamodb_sock = conn.sock
+                conn._pynamodb_connected_at = now
+            conn._pynamodb_released_at = now
+            if self.max_lifetime_seconds is not None and now - conn._pynamodb_connected_at >= self.max_lifetime_seconds:
+                conn.close()
+        super()._put_conn(conn)  # type: ignore[misc]
+
+    def _is_expired(self, conn: Any, now: float) -> bool:
+        if getattr(conn, '_pynamodb_sock', None) is not conn.sock:
+            return False
+        if self.max_idle_seconds is not None and now - conn._pynamodb_released_at >= self.max_idle_seconds:
+            return True
+        if self.max_lifetime_seconds is not None and now - conn._pynamodb_connected_at >= self.max_lifetime_seconds:
+            return True
+        return False
+
+
+class _InstrumentedConnectionMixin:
+    """
+    Counts the network connections opened and closed by a pool's connections
+    """
+    pool_metrics: PoolMetrics
+
+    def connect(self) -> None:
+        super().connect()  # type: ignore[misc]
+        self.pool_metrics.record_opened()
+
+    def close(self) -> None:
+        if getattr(self, 'sock', None) is not None:
+            self.pool_metrics.record_closed()
+        super().close()  # type: ignore[misc]
+
+
+class _InstrumentedConnectionPoolMixin:
+    """
+    Keeps the pool's metrics and, with `auto_sizing`, grows the pool while requests wait for a connection
+    """
+    pool_metrics: PoolMetrics
+    auto_sizing: Optional[PoolAutoSizing] = None
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        if self.auto_sizing is not None:
+            # Requests wait for a pooled connection rather than opening one that is closed again
+            # when the pool is full, and pools for new hosts start at the size the others have grown to
+            kwargs['block'] = True
+            kwargs['maxsize'] = max(kwargs.get('maxsize', 1), self.pool_metrics.pool_size)
+        super().__init__(*args, **kwargs)
+        self._resize_lock = threading.Lock()
+        self.pool_metrics.add_pool(self)
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        start = time.perf_counter()
+        auto_sizing = self.auto_sizing
+        if auto_sizing is None:
+            conn = super()._get_conn(timeout)  # type: ignore[misc]
+        else:
+            threshold = auto_sizing.wait_threshold_seconds
+            try:
+                conn = super()._get_conn(threshold if timeout is None else min(timeout, threshold))  # type: ignore[misc]
+            except EmptyPoolError:
+                self._grow(auto_sizing)
+                conn = super()._get_conn(timeout)  # type: ignore[misc]
+        self.pool_metrics.record_checkout(time.perf_counter() - start)
+        return conn
+
+    def _put_conn(self, conn: Any) -> None:
+        # urllib3 returns every checked out connection, or None in its place, exactly once
+        try:
+            super()._put_conn(conn)  # type: ignore[misc]
+        finally:
+            self.pool_metrics.record_checkin()
+
+    def _grow(self, auto_sizing: PoolAutoSizing) -> None:
+        with self._resize_lock:
+            queue = getattr(self, 'pool', None)
+            if queue is None:
+                return
+            size = auto_sizing.get_pool_size(queue.maxsize, self.pool_metrics.peak_in_flight)
+            if size <= queue.maxsize:
+                return
+            added = size - queue.maxsize
+            with queue.mutex:
+                queue.maxsize = size
+            # Empty slots are filled with new connections when they are checked out
+            for _ in range(added):
+                queue.put(None, block=False)
+            self.pool_metrics.record_resize(size)
+        log.info("Grew the connection pool for %s to %s connections", getattr(self, 'host', None), size)
+
+    def _count_idle(self) -> int:
+        queue = getattr(self, 'pool', None)
+        if queue is None:
+            return 0
+        with queue.mutex:
+            conns = list(queue.queue)
+        return sum(1 for conn in conns if conn is not None and getattr(conn, 'sock', None) is not None)
+
+
+def get_pool_classes(
+    pool_metrics: PoolMetrics,
+    max_idle_seconds: Optional[float] = None,
+    max_lifetime_seconds: Optional[float] = None,
+    auto_sizing: Optional[PoolAutoSizing] = None,
+) -> Dict[str, Type[Any]]:
+    """
+    Returns botocore's pool classes by scheme, extended to keep `pool_metrics`, to grow according to
+    `auto_sizing`, to expire connections after the given times and to apply per-request read timeouts
+    """
+    mixins: Tuple[type, ...] = (_RequestTimeoutConnectionPoolMixin, _InstrumentedConnectionPoolMixin)
+    if max_idle_seconds is not None or max_lifetime_seconds is not None:
+        mixins = (_ExpiringConnectionPoolMixin,) + mixins
+    pool_classes = {}
+    bases: Tuple[Tuple[str, Any], ...] = (('http', AWSHTTPConnectionPool), ('https', AWSHTTPSConnectionPool))
+    for scheme, base in bases:
+        connection_class = type(
+            'Instrumented' + base.ConnectionCls.__name__,
+            (_InstrumentedConnectionMixin, base.ConnectionCls),
+            {'pool_metrics': pool_metrics},
+        )
+        pool_classes[scheme] = type('Instrumented' + base.__name__, mixins + (base,), {
+            'ConnectionCls': connection_class,
+            'pool_metrics': pool_metrics,
+            'auto_sizing': auto_sizing,
+            'max_idle_seconds': max_idle_seconds,
+            'max_lifetime_seconds': max_lifetime_seconds,
+        })
+    return pool_classes
+
+
+def configure_http_session(
+    http_session: Any,
+    tcp_nodelay: bool,
+    tcp_keepalive: bool,
+    max_idle_seconds: Optional[float],
+    max_lifetime_seconds: Optional[float],
+    auto_sizing: Optional[PoolAutoSizing] = None,
+) -> PoolMetrics:
+    """
+    Configures a botocore ``URLLib3Session`` before it opens its first connection, returning its pool metrics
+    """
+    # The pool managers share these objects with the session, so they are updated in place
+    http_session._socket_options[:] = get_socket_options(http_session._socket_options, tcp_nodelay, tcp_keepalive)
+    pool_metrics = PoolMetrics(http_session._max_pool_connections)
+    http_session._pool_classes_by_scheme.update(
+        get_pool_classes(pool_metrics, max_idle_seconds, max_lifetime_seconds, auto_sizing),
+    )
+    http_session._pynamodb_pool_metrics = pool_metrics
+    return pool_metrics
+
+
+def get_pool_metrics(http_session: Any) -> Optional[PoolMetrics]:
+    """
+    Returns the pool metrics of a botocore ``URLLib3Session`` configured by :func:`configure_http_session`
+    """
+    return getattr(http_session, '_pynamodb_pool_metrics', None)
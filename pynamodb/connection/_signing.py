@@ -0,0 +1,150 @@
+"""
+A SigV4 signer for the requests PynamoDB serializes itself.
+
+botocore's signer is generic: for every request it re-reads the credentials (taking a lock to check
+whether they need refreshing), rebuilds the canonical request from an ``HTTPHeaders`` object and derives
+the signing key with four HMACs. DynamoDB requests are always a ``POST`` with a handful of headers, so
+this signer works on a plain header dict, caches the signing key per day and the canonical form of the
+endpoint URL, and only re-reads refreshable credentials when they are about to expire.
+"""
+import hmac
+import time
+from hashlib import sha256
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+from botocore.credentials import Credentials, ReadOnlyCredentials, RefreshableCredentials
+from botocore.exceptions import NoCredentialsError
+from botocore.utils import normalize_url_path
+
+ALGORITHM = 'AWS4-HMAC-SHA256'
+TIMESTAMP_FORMAT = '%Y%m%dT%H%M%SZ'
+
+# Headers botocore leaves unsigned, since proxies may add, change or remove them
+UNSIGNED_HEADERS = frozenset([
+    'authorization', 'connection', 'expect', 'keep-alive', 'proxy-authenticate', 'proxy-authorization', 'te',
+    'trailer', 'transfer-encoding', 'upgrade', 'user-agent', 'x-amzn-trace-id',
+])
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def _hmac(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode('utf-8'), sha256).digest()
+
+
+def _canonical_url(url: str) -> Tuple[str, str, str]:
+    """
+    Returns the host header, canonical path and canonical query string of `url`
+    """
+    parts = urlsplit(url)
+    host = parts.hostname or ''
+    if ':' in host:
+        host = '[{}]'.format(host)
+    if parts.port is not None and parts.port != DEFAULT_PORTS.get(parts.scheme):
+        host = '{}:{}'.format(host, parts.port)
+    path = quote(normalize_url_path(parts.path), safe='/~')
+    query = '&'.join(sorted(pair if '=' in pair else pair + '=' for pair in parts.query.split('&') if pair))
+    return host, path, query
+
+
+class SigV4Signer:
+    """
+    Signs requests with Signature Version 4, caching the signing key and the canonical endpoint URL
+    """
+
+    def __init__(self, credentials: Credentials, region_name: str, service_name: str) -> None:
+        self.credentials = credentials
+        self.region_name = region_name
+        self.service_name = service_name
+        self._scope_suffix = '/{}/{}/aws4_request'.format(region_name, service_name)
+        self._frozen_credentials: Optional[ReadOnlyCredentials] = None
+        self._refresh_at = 0.0
+        # (secret key, date) -> signing key
+        self._signing_key: Tuple[str, str, bytes] = ('', '', b'')
+        self._urls: Dict[str, Tuple[str, str, str]] = {}
+
+    def needs_credentials(self) -> bool:
+        """
+        Returns whether `get_credentials` will ask botocore for the credentials, which may refresh them
+        """
+        return self._frozen_credentials is None or time.time() >= self._refresh_at
+
+    def get_credentials(self) -> ReadOnlyCredentials:
+        """
+        Returns the current credentials, only asking botocore for them again once they are due a refresh
+        """
+        frozen_credentials = self._frozen_credentials
+        if frozen_credentials is not None and time.time() < self._refresh_at:
+            return frozen_credentials
+        frozen_credentials = self.credentials.get_frozen_credentials()
+        if isinstance(self.credentials, RefreshableCredentials):
+            expiry_time = getattr(self.credentials, '_expiry_time', None)
+            if expiry_time is None:
+                refresh_at = 0.0
+            else:
+                # Re-read them once botocore would start refreshing them
+                refresh_at = expiry_time.timestamp() - getattr(self.credentials, '_advisory_refresh_timeout', 0)
+        else:
+            refresh_at = float('inf')
+        self._frozen_credentials, self._refresh_at = frozen_credentials, refresh_at
+        return frozen_credentials
+
+    def _get_signing_key(self, secret_key: str, datestamp: str) -> bytes:
+        cached_secret_key, cached_datestamp, signing_key = self._signing_key
+        if cached_secret_key != secret_key or cached_datestamp != datestamp:
+            k_date = _hmac(('AWS4' + secret_key).encode('utf-8'), datestamp)
+            k_region = _hmac(k_date, self.region_name)
+            k_service = _hmac(k_region, self.service_name)
+            signing_key = _hmac(k_service, 'aws4_request')
+            self._signing_key = (secret_key, datestamp, signing_key)
+        return signing_key
+
+    def _get_url(self, url: str) -> Tuple[str, str, str]:
+        canonical_url = self._urls.get(url)
+        if canonical_url is None:
+            canonical_url = self._urls[url] = _canonical_url(url)
+        return canonical_url
+
+    def sign(self, method: str, url: str, headers: Dict[str, str], body: bytes) -> None:
+        """
+        Adds the ``X-Amz-Date``, ``X-Amz-Security-Token`` and ``Authorization`` headers to `headers`
+        """
+        credentials = self.get_credentials()
+        if credentials is None or not credentials.access_key or not credentials.secret_key:
+            raise NoCredentialsError()
+        timestamp = time.strftime(TIMESTAMP_FORMAT, time.gmtime())
+        for name in [name for name in headers if name.lower() in ('authorization', 'x-amz-date', 'x-amz-security-token')]:
+            del headers[name]
+        headers['X-Amz-Date'] = timestamp
+        if credentials.token:
+            headers['X-Amz-Security-Token'] = credentials.token
+
+        host, path, query = self._get_url(url)
+        canonical_headers = {'host': host}
+        for name, value in headers.items():
+            lowered_name = name.lower()
+            if lowered_name not in UNSIGNED_HEADERS:
+                canonical_headers[lowered_name] = ' '.join(value.split())
+        header_names = tuple(sorted(canonical_headers))
+        signed_headers = ';'.join(header_names)
+        canonical_request = '\n'.join((
+            method,
+            path,
+            query,
+            ''.join('{}:{}\n'.format(name, canonical_headers[name]) for name in header_names),
+            signed_headers,
+            sha256(body).hexdigest(),
+        ))
+        datestamp = timestamp[:8]
+        string_to_sign = '\n'.join((
+            ALGORITHM,
+            timestamp,
+            datestamp + self._scope_suffix,
+            sha256(canonical_request.encode('utf-8')).hexdigest(),
+        ))
+        signature = hmac.new(
+            self._get_signing_key(credentials.secret_key, datestamp), string_to_sign.encode('utf-8'), sha256,
+        ).hexdigest()
+        headers['Authorization'] = '{} Credential={}/{}{}, SignedHeaders={}, Signature={}'.format(
+            ALGORITHM, credentials.access_key, datestamp, self._scope_suffix, signed_headers, signature,
+        )
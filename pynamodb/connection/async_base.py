@@ -0,0 +1,650 @@
+"""
+Lowest level asyncio connection
+"""
+import asyncio
+import contextvars
+import logging
+import sys
+import time
+import uuid
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+if sys.version_info >= (3, 8):
+    from typing import Literal
+else:
+    from typing_extensions import Literal
+
+import botocore.config
+from botocore.client import ClientError
+from botocore.exceptions import ReadTimeoutError
+
+from pynamodb.connection.base import BOTOCORE_EXCEPTIONS, Connection, MetaTable, _get_body_size
+from pynamodb.connection.call_settings import CallSettings, get_call_settings
+from pynamodb.connection.capacity import CapacityLedger
+from pynamodb.connection.circuit_breaker import CircuitBreaker
+from pynamodb.connection.hedging import HedgingPolicy
+from pynamodb.connection.hot_keys import HotKeyDetector
+from pynamodb.connection.metrics import MetricsRegistry
+from pynamodb.connection.pooling import PoolAutoSizing, PoolMetrics
+from pynamodb.connection.profiling import RETRY_WAIT, SEND, finish_timings, mark_phase, start_operation
+from pynamodb.connection.retry import CONNECTION_EXCEPTIONS, RetryPolicy
+from pynamodb.connection.routing import Endpoint, EndpointRouter
+from pynamodb.connection.transport import AsyncHTTPTransport, AsyncTransport
+from pynamodb.constants import (
+    BATCH_GET_ITEM, BATCH_WRITE_ITEM, DELETE_ITEM, DESCRIBE_TABLE, GET_ITEM, ITEM, PUT_ITEM, QUERY,
+    SCAN, TABLE_KEY, TABLE_NAME, TRANSACT_GET_ITEMS, TRANSACT_WRITE_ITEMS, UPDATE_ITEM,
+)
+from pynamodb.exceptions import (
+    DeleteError, GetError, PutError, QueryError, ScanError, TableDoesNotExist, TableError,
+    TransactGetError, TransactWriteError, UpdateError,
+)
+from pynamodb.expressions.condition import Condition
+from pynamodb.expressions.update import Action
+from pynamodb.settings import get_settings_value
+from pynamodb.signals import dynamodb_request_hedged, post_dynamodb_send, pre_dynamodb_send
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class AsyncConnection(object):
+    """
+    An asyncio counterpart to :class:`~pynamodb.connection.Connection`.
+
+    Requests are built, serialized and signed exactly as the blocking connection does,
+    then sent over a pool of keep-alive connections owned by the running event loop.
+    """
+
+    def __init__(self,
+                 region: Optional[str] = None,
+                 host: Optional[str] = None,
+                 read_timeout_seconds: Optional[float] = None,
+                 connect_timeout_seconds: Optional[float] = None,
+                 max_retry_attempts: Optional[int] = None,
+                 retry_configuration: Optional[
+                     Union[
+                         Literal["LEGACY"],
+                         Literal["UNSET"],
+                         "botocore.config._RetryDict",
+                     ]
+                 ] = None,
+                 max_pool_connections: Optional[int] = None,
+                 extra_headers: Optional[Mapping[str, str]] = None,
+                 aws_access_key_id: Optional[str] = None,
+                 aws_secret_access_key: Optional[str] = None,
+                 aws_session_token: Optional[str] = None,
+                 lean_codec: Optional[bool] = None,
+                 transport: Optional[AsyncTransport] = None,
+                 tcp_nodelay: Optional[bool] = None,
+                 tcp_keepalive: Optional[bool] = None,
+                 share_clients: Optional[bool] = None,
+                 max_connection_idle_seconds: Optional[float] = None,
+                 max_connection_lifetime_seconds: Optional[float] = None,
+                 hedging: Optional[HedgingPolicy] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 endpoints: Optional[Union[Sequence[Endpoint], EndpointRouter]] = None,
+                 pool_auto_sizing: Optional[PoolAutoSizing] = None,
+                 background_signals: Optional[bool] = None,
+                 metrics: Optional[MetricsRegistry] = None,
+                 capacity_ledger: Optional[CapacityLedger] = None,
+                 hot_keys: Optional[HotKeyDetector] = None):
+        # The blocking connection owns settings, table metadata and the botocore client
+        # used to build, serialize and sign requests.
+        self.connection = Connection(region=region,
+                                     host=host,
+                                     read_timeout_seconds=read_timeout_seconds,
+                                     connect_timeout_seconds=connect_timeout_seconds,
+                                     max_retry_attempts=max_retry_attempts,
+                                     retry_configuration=retry_configuration,
+                                     max_pool_connections=max_pool_connections,
+                                     extra_headers=extra_headers,
+                                     aws_access_key_id=aws_access_key_id,
+                                     aws_secret_access_key=aws_secret_access_key,
+                                     aws_session_token=aws_session_token,
+                                     lean_codec=lean_codec,
+                                     tcp_nodelay=tcp_nodelay,
+                                     tcp_keepalive=tcp_keepalive,
+                                     share_clients=share_clients,
+                                     max_connection_idle_seconds=max_connection_idle_seconds,
+                                     max_connection_lifetime_seconds=max_connection_lifetime_seconds,
+                                     hedging=hedging,
+                                     retry_policy=retry_policy,
+                                     circuit_breaker=circuit_breaker,
+                                     endpoints=endpoints,
+                                     pool_auto_sizing=pool_auto_sizing,
+                                     background_signals=background_signals,
+                                     metrics=metrics,
+                                     capacity_ledger=capacity_ledger,
+                                     hot_keys=hot_keys)
+        if transport is None:
+            transport = get_settings_value('async_transport')
+        if transport is not None:
+            self._transport = transport
+        else:
+            self._transport = AsyncHTTPTransport(
+                max_pool_connections=self.connection._max_pool_connections,
+                connect_timeout_seconds=self.connection._connect_timeout_seconds,
+                read_timeout_seconds=self.connection._read_timeout_seconds,
+                max_connection_idle_seconds=self.connection._max_connection_idle_seconds,
+                max_connection_lifetime_seconds=self.connection._max_connection_lifetime_seconds,
+                pool_auto_sizing=self.connection._pool_auto_sizing,
+                # The CA bundle botocore would use, e.g. from AWS_CA_BUNDLE
+                verify=self.connection.session.get_config_variable('ca_bundle') or True,
+                tcp_nodelay=self.connection._tcp_nodelay,
+                tcp_keepalive=self.connection._tcp_keepalive,
+            )
+
+    def __repr__(self) -> str:
+        return "AsyncConnection<{}>".format(self.connection.client.meta.endpoint_url)
+
+    async def __aenter__(self) -> 'AsyncConnection':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Closes the idle connections held in the pool
+        """
+        await self._transport.close()
+
+    @property
+    def capacity_ledger(self) -> CapacityLedger:
+        """
+        Returns the ledger of the capacity consumed by requests sent through this connection
+        """
+        return self.connection.capacity_ledger
+
+    @property
+    def pool_metrics(self) -> Optional[PoolMetrics]:
+        """
+        Returns the metrics of the connection pool requests are sent through,
+        or None if the connection's transport doesn't have one
+        """
+        return getattr(self._transport, 'pool_metrics', None)
+
+    async def dispatch(self, operation_name: str, operation_kwargs: Dict, hedge: Optional[bool] = None) -> Dict:
+        """
+        Dispatches `operation_name` with arguments `operation_kwargs`
+
+        Reads are hedged according to the connection's hedging policy, unless `hedge` is set.
+        """
+        timings = start_operation(operation_name)
+        if timings is None:
+            return await self._dispatch(operation_name, operation_kwargs, hedge)
+        try:
+            return await self._dispatch(operation_name, operation_kwargs, hedge)
+        finally:
+            finish_timings(timings)
+
+    async def _dispatch(self, operation_name: str, operation_kwargs: Dict, hedge: Optional[bool]) -> Dict:
+        dispatch = self.connection._start_dispatch(operation_name, operation_kwargs, hedge, self, self.pool_metrics)
+        try:
+            if dispatch.hedging is None:
+                data = await self._make_api_call(operation_name, operation_kwargs)
+            else:
+                data = await self._make_hedged_api_call(
+                    operation_name, operation_kwargs, dispatch.hedging, dispatch.req_uuid, dispatch.table_name,
+                )
+        except BaseException as e:
+            self.connection._fail_dispatch(dispatch, e)
+            raise
+        self.connection._finish_dispatch(dispatch, data, self)
+        return data
+
+    def send_post_boto_callback(self, operation_name, req_uuid, table_name, **kwargs):
+        self.connection._send_signal(post_dynamodb_send, self, operation_name, req_uuid, table_name, **kwargs)
+
+    def send_pre_boto_callback(self, operation_name, req_uuid, table_name, **kwargs):
+        self.connection._send_signal(pre_dynamodb_send, self, operation_name, req_uuid, table_name, **kwargs)
+
+    def send_hedge_callback(self, operation_name, req_uuid, hedge_req_uuid, table_name):
+        self.connection._send_signal(
+            dynamodb_request_hedged, self, operation_name, req_uuid, table_name, hedge_req_uuid=hedge_req_uuid,
+        )
+
+    async def _make_hedged_api_call(
+        self,
+        operation_name: str,
+        operation_kwargs: Dict,
+        hedging: HedgingPolicy,
+        req_uuid: Optional[uuid.UUID],
+        table_name: Optional[str],
+    ) -> Dict:
+        """
+        Makes the API call, sending a duplicate request if the first one is slower than the policy allows.
+        The first successful response wins.
+        """
+        hedging.record_request()
+        delay = hedging.get_delay(operation_name)
+        if delay is None:
+            return await self._make_timed_api_call(operation_name, operation_kwargs, hedging)
+        first = asyncio.ensure_future(self._make_timed_api_call(operation_name, operation_kwargs, hedging))
+        first.add_done_callback(_retrieve_exception)
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+        self.connection._record_hedge(hedging, operation_name, delay)
+        hedge = asyncio.ensure_future(self._make_hedge_api_call(operation_name, dict(operation_kwargs), req_uuid, table_name))
+        hedge.add_done_callback(_retrieve_exception)
+        pending = {first, hedge}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+        return first.result()
+
+    async def _make_timed_api_call(self, operation_name: str, operation_kwargs: Dict, hedging: HedgingPolicy) -> Dict:
+        start = time.perf_counter()
+        data = await self._make_api_call(operation_name, operation_kwargs)
+        hedging.record_latency(operation_name, time.perf_counter() - start)
+        return data
+
+    async def _make_hedge_api_call(self, operation_name: str, operation_kwargs: Dict, req_uuid: Optional[uuid.UUID], table_name: Optional[str]) -> Dict:
+        hedge_uuid = self.connection._start_hedge(self, operation_name, req_uuid, table_name)
+        data = await self._make_api_call(operation_name, operation_kwargs)
+        if hedge_uuid is not None:
+            self.connection._send_signal(post_dynamodb_send, self, operation_name, hedge_uuid, table_name)
+        return data
+
+    async def _prepare_to_sign(self, connection: Connection) -> None:
+        """
+        Creates the connection's client and refreshes its credentials in a thread,
+        so that requests are then built and signed on the event loop without blocking it
+        """
+        if connection._is_ready_to_sign():
+            return
+        # The copied context keeps the call settings and the operation's timings
+        context = contextvars.copy_context()
+        await asyncio.get_running_loop().run_in_executor(None, context.run, connection._prepare_to_sign)
+
+    async def _make_api_call(self, operation_name: str, operation_kwargs: Dict) -> Dict:
+        # The client's retry configuration is needed before the first request
+        await self._prepare_to_sign(self.connection)
+        max_attempts = self.connection._get_max_attempts()
+        self.connection._retry_policy.record_request()
+        call_settings = get_call_settings()
+        endpoint: Optional[Endpoint] = None
+        attempt_number = 0
+        delay: Optional[float] = None
+        while True:
+            attempt_number += 1
+            endpoint, connection = self.connection._get_attempt_connection(operation_name, operation_kwargs, endpoint)
+            start = time.perf_counter()
+            try:
+                data = await self._send_request(operation_name, operation_kwargs, attempt_number - 1, connection, call_settings)
+            except (ClientError,) + CONNECTION_EXCEPTIONS as e:
+                delay = self.connection._get_attempt_retry_delay(
+                    e, operation_name, operation_kwargs, endpoint, attempt_number, max_attempts, delay, call_settings,
+                )
+            else:
+                self.connection._record_attempt_success(endpoint, start)
+                return data
+            await asyncio.sleep(delay)
+            mark_phase(RETRY_WAIT)
+
+    async def _send_request(
+        self,
+        operation_name: str,
+        operation_kwargs: Dict,
+        retry_attempts: int,
+        connection: Optional[Connection] = None,
+        call_settings: Optional[CallSettings] = None,
+    ) -> Dict:
+        # `connection` builds the request for the endpoint it is sent to
+        if connection is None:
+            connection = self.connection
+        await self._prepare_to_sign(connection)
+        request = connection._get_transport_request(operation_name, operation_kwargs)
+        if connection._metrics is None:
+            return await self._send_attempt(operation_name, request, retry_attempts, connection, call_settings)
+        request_bytes = _get_body_size(request.body)
+        try:
+            data = await self._send_attempt(operation_name, request, retry_attempts, connection, call_settings)
+        except (ClientError,) + CONNECTION_EXCEPTIONS as e:
+            connection._record_attempt(operation_name, operation_kwargs, request_bytes, error=e)
+            raise
+        connection._record_attempt(operation_name, operation_kwargs, request_bytes, data=data)
+        return data
+
+    async def _send_attempt(
+        self,
+        operation_name: str,
+        request: Any,
+        retry_attempts: int,
+        connection: Connection,
+        call_settings: Optional[CallSettings],
+    ) -> Dict:
+        read_timeout = call_settings.get_read_timeout(None) if call_settings is not None else None
+        if read_timeout is None:
+            response = await self._transport.send(request)
+        else:
+            try:
+                response = await asyncio.wait_for(self._transport.send(request), read_timeout)
+            except asyncio.TimeoutError as e:
+                raise ReadTimeoutError(endpoint_url=request.url, error=e) from e
+        mark_phase(SEND)
+        return connection._parse_transport_response(operation_name, response, retry_attempts)
+
+    def add_meta_table(self, meta_table: MetaTable) -> None:
+        """
+        Adds information about the table's schema.
+        """
+        self.connection.add_meta_table(meta_table)
+
+    def get_meta_table(self, table_name: str) -> MetaTable:
+        """
+        Returns information about the table's schema.
+        """
+        return self.connection.get_meta_table(table_name)
+
+    def get_operation_kwargs(self, table_name: str, hash_key: str, **kwargs: Any) -> Dict:
+        """
+        Builds the arguments for a single-item operation, see :meth:`Connection.get_operation_kwargs`
+        """
+        return self.connection.get_operation_kwargs(table_name, hash_key, **kwargs)
+
+    async def describe_table(self, table_name: str) -> Dict:
+        """
+        Performs the DescribeTable operation
+        """
+        operation_kwargs = {
+            TABLE_NAME: table_name
+        }
+        try:
+            data = await self.dispatch(DESCRIBE_TABLE, operation_kwargs)
+            table_data = data.get(TABLE_KEY)
+            if table_data:
+                meta_table = MetaTable(table_data)
+                if meta_table.table_name not in self.connection._tables:
+                    self.add_meta_table(meta_table)
+            return table_data
+        except ClientError as e:
+            if 'ResourceNotFound' in e.response['Error']['Code']:
+                raise TableDoesNotExist(e.response['Error']['Message'])
+            raise
+        except BOTOCORE_EXCEPTIONS as e:
+            raise TableError("Unable to describe table: {}".format(e), e)
+
+    async def delete_item(
+        self,
+        table_name: str,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        condition: Optional[Condition] = None,
+        return_values: Optional[str] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the DeleteItem operation and returns the result
+        """
+        operation_kwargs = self.connection.get_operation_kwargs(
+            table_name,
+            hash_key,
+            range_key=range_key,
+            condition=condition,
+            return_values=return_values,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics
+        )
+        try:
+            return await self.dispatch(DELETE_ITEM, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise DeleteError("Failed to delete item: {}".format(e), e)
+
+    async def update_item(
+        self,
+        table_name: str,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        actions: Optional[Sequence[Action]] = None,
+        condition: Optional[Condition] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+        return_values: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the UpdateItem operation
+        """
+        if not actions:
+            raise ValueError("'actions' cannot be empty")
+
+        operation_kwargs = self.connection.get_operation_kwargs(
+            table_name=table_name,
+            hash_key=hash_key,
+            range_key=range_key,
+            actions=actions,
+            condition=condition,
+            return_values=return_values,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+        try:
+            return await self.dispatch(UPDATE_ITEM, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise UpdateError("Failed to update item: {}".format(e), e)
+
+    async def put_item(
+        self,
+        table_name: str,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        attributes: Optional[Any] = None,
+        condition: Optional[Condition] = None,
+        return_values: Optional[str] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the PutItem operation and returns the result
+        """
+        operation_kwargs = self.connection.get_operation_kwargs(
+            table_name=table_name,
+            hash_key=hash_key,
+            range_key=range_key,
+            key=ITEM,
+            attributes=attributes,
+            condition=condition,
+            return_values=return_values,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics
+        )
+        try:
+            return await self.dispatch(PUT_ITEM, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise PutError("Failed to put item: {}".format(e), e)
+
+    async def transact_write_items(
+        self,
+        condition_check_items: Sequence[Dict],
+        delete_items: Sequence[Dict],
+        put_items: Sequence[Dict],
+        update_items: Sequence[Dict],
+        client_request_token: Optional[str] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the TransactWrite operation and returns the result
+        """
+        operation_kwargs = self.connection._get_transact_write_items_kwargs(
+            condition_check_items,
+            delete_items,
+            put_items,
+            update_items,
+            client_request_token=client_request_token,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+        try:
+            return await self.dispatch(TRANSACT_WRITE_ITEMS, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise TransactWriteError("Failed to write transaction items", e)
+
+    async def transact_get_items(
+        self,
+        get_items: Sequence[Dict],
+        return_consumed_capacity: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the TransactGet operation and returns the result
+        """
+        operation_kwargs = self.connection._get_transact_get_items_kwargs(
+            get_items,
+            return_consumed_capacity=return_consumed_capacity,
+        )
+        try:
+            return await self.dispatch(TRANSACT_GET_ITEMS, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise TransactGetError("Failed to get transaction items", e)
+
+    async def batch_write_item(
+        self,
+        table_name: str,
+        put_items: Optional[Any] = None,
+        delete_items: Optional[Any] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the batch_write_item operation
+        """
+        operation_kwargs = self.connection._get_batch_write_item_kwargs(
+            table_name,
+            put_items=put_items,
+            delete_items=delete_items,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+        try:
+            return await self.dispatch(BATCH_WRITE_ITEM, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise PutError("Failed to batch write items: {}".format(e), e)
+
+    async def batch_get_item(
+        self,
+        table_name: str,
+        keys: Sequence[str],
+        consistent_read: Optional[bool] = None,
+        return_consumed_capacity: Optional[str] = None,
+        attributes_to_get: Optional[Any] = None,
+        hedge: Optional[bool] = None,
+    ) -> Dict:
+        """
+        Performs the batch get item operation
+        """
+        operation_kwargs = self.connection._get_batch_get_item_kwargs(
+            table_name,
+            keys,
+            consistent_read=consistent_read,
+            return_consumed_capacity=return_consumed_capacity,
+            attributes_to_get=attributes_to_get,
+        )
+        try:
+            return await self.dispatch(BATCH_GET_ITEM, operation_kwargs, hedge=hedge)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise GetError("Failed to batch get items: {}".format(e), e)
+
+    async def get_item(
+        self,
+        table_name: str,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        consistent_read: bool = False,
+        attributes_to_get: Optional[Any] = None,
+        hedge: Optional[bool] = None,
+    ) -> Dict:
+        """
+        Performs the GetItem operation and returns the result
+        """
+        operation_kwargs = self.connection.get_operation_kwargs(
+            table_name=table_name,
+            hash_key=hash_key,
+            range_key=range_key,
+            consistent_read=consistent_read,
+            attributes_to_get=attributes_to_get
+        )
+        try:
+            return await self.dispatch(GET_ITEM, operation_kwargs, hedge=hedge)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise GetError("Failed to get item: {}".format(e), e)
+
+    async def scan(
+        self,
+        table_name: str,
+        filter_condition: Optional[Any] = None,
+        attributes_to_get: Optional[Any] = None,
+        limit: Optional[int] = None,
+        return_consumed_capacity: Optional[str] = None,
+        exclusive_start_key: Optional[str] = None,
+        segment: Optional[int] = None,
+        total_segments: Optional[int] = None,
+        consistent_read: Optional[bool] = None,
+        index_name: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the scan operation
+        """
+        operation_kwargs = self.connection._get_scan_kwargs(
+            table_name,
+            filter_condition=filter_condition,
+            attributes_to_get=attributes_to_get,
+            limit=limit,
+            return_consumed_capacity=return_consumed_capacity,
+            exclusive_start_key=exclusive_start_key,
+            segment=segment,
+            total_segments=total_segments,
+            consistent_read=consistent_read,
+            index_name=index_name,
+        )
+        try:
+            return await self.dispatch(SCAN, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise ScanError("Failed to scan table: {}".format(e), e)
+
+    async def query(
+        self,
+        table_name: str,
+        hash_key: str,
+        range_key_condition: Optional[Condition] = None,
+        filter_condition: Optional[Any] = None,
+        attributes_to_get: Optional[Any] = None,
+        consistent_read: bool = False,
+        exclusive_start_key: Optional[Any] = None,
+        index_name: Optional[str] = None,
+        limit: Optional[int] = None,
+        return_consumed_capacity: Optional[str] = None,
+        scan_index_forward: Optional[bool] = None,
+        select: Optional[str] = None,
+        hedge: Optional[bool] = None,
+    ) -> Dict:
+        """
+        Performs the Query operation and returns the result
+        """
+        operation_kwargs = self.connection._get_query_kwargs(
+            table_name,
+            hash_key,
+            range_key_condition=range_key_condition,
+            filter_condition=filter_condition,
+            attributes_to_get=attributes_to_get,
+            consistent_read=consistent_read,
+            exclusive_start_key=exclusive_start_key,
+            index_name=index_name,
+            limit=limit,
+            return_consumed_capacity=return_consumed_capacity,
+            scan_index_forward=scan_index_forward,
+            select=select,
+        )
+        try:
+            return await self.dispatch(QUERY, operation_kwargs, hedge=hedge)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise QueryError("Failed to query items: {}".format(e), e)
+
+
+def _retrieve_exception(task: 'asyncio.Future[Any]') -> None:
+    # The losing request of a hedged call keeps running in the background; its result is discarded
+    if not task.cancelled():
+        task.exception()
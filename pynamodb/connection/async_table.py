@@ -0,0 +1,325 @@
+"""
+PynamoDB asyncio Connection classes
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+
+from pynamodb.connection.async_base import AsyncConnection
+from pynamodb.connection.base import MetaTable
+from pynamodb.connection.capacity import CapacityLedger
+from pynamodb.connection.circuit_breaker import CircuitBreaker
+from pynamodb.connection.hedging import HedgingPolicy
+from pynamodb.connection.hot_keys import HotKeyDetector
+from pynamodb.connection.metrics import MetricsRegistry
+from pynamodb.connection.pooling import PoolAutoSizing
+from pynamodb.connection.routing import Endpoint, EndpointRouter
+from pynamodb.connection.retry import RetryPolicy
+from pynamodb.connection.transport import AsyncTransport
+from pynamodb.constants import KEY
+from pynamodb.expressions.condition import Condition
+from pynamodb.expressions.update import Action
+
+
+class AsyncTableConnection:
+    """
+    An asyncio counterpart to :class:`~pynamodb.connection.TableConnection`
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        region: Optional[str] = None,
+        host: Optional[str] = None,
+        connect_timeout_seconds: Optional[float] = None,
+        read_timeout_seconds: Optional[float] = None,
+        max_retry_attempts: Optional[int] = None,
+        max_pool_connections: Optional[int] = None,
+        extra_headers: Optional[Mapping[str, str]] = None,
+        aws_access_key_id: Optional[str] = None,
+        aws_secret_access_key: Optional[str] = None,
+        aws_session_token: Optional[str] = None,
+        *,
+        meta_table: Optional[MetaTable] = None,
+        transport: Optional[AsyncTransport] = None,
+        tcp_nodelay: Optional[bool] = None,
+        tcp_keepalive: Optional[bool] = None,
+        share_clients: Optional[bool] = None,
+        max_connection_idle_seconds: Optional[float] = None,
+        max_connection_lifetime_seconds: Optional[float] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        endpoints: Optional[Union[Sequence[Endpoint], EndpointRouter]] = None,
+        pool_auto_sizing: Optional[PoolAutoSizing] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        capacity_ledger: Optional[CapacityLedger] = None,
+        hot_keys: Optional[HotKeyDetector] = None,
+    ) -> None:
+        self.table_name = table_name
+        self.connection = AsyncConnection(region=region,
+                                          host=host,
+                                          connect_timeout_seconds=connect_timeout_seconds,
+                                          read_timeout_seconds=read_timeout_seconds,
+                                          max_retry_attempts=max_retry_attempts,
+                                          max_pool_connections=max_pool_connections,
+                                          extra_headers=extra_headers,
+                                          aws_access_key_id=aws_access_key_id,
+                                          aws_secret_access_key=aws_secret_access_key,
+                                          aws_session_token=aws_session_token,
+                                          transport=transport,
+                                          tcp_nodelay=tcp_nodelay,
+                                          tcp_keepalive=tcp_keepalive,
+                                          share_clients=share_clients,
+                                          max_connection_idle_seconds=max_connection_idle_seconds,
+                                          max_connection_lifetime_seconds=max_connection_lifetime_seconds,
+                                          hedging=hedging,
+                                          retry_policy=retry_policy,
+                                          circuit_breaker=circuit_breaker,
+                                          endpoints=endpoints,
+                                          pool_auto_sizing=pool_auto_sizing,
+                                          metrics=metrics,
+                                          capacity_ledger=capacity_ledger,
+                                          hot_keys=hot_keys)
+
+        if meta_table is not None:
+            self.connection.add_meta_table(meta_table)
+
+    def get_meta_table(self) -> MetaTable:
+        """
+        Returns a MetaTable
+        """
+        return self.connection.get_meta_table(self.table_name)
+
+    def get_operation_kwargs(
+        self,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        key: str = KEY,
+        attributes: Optional[Any] = None,
+        attributes_to_get: Optional[Any] = None,
+        actions: Optional[Sequence[Action]] = None,
+        condition: Optional[Condition] = None,
+        consistent_read: Optional[bool] = None,
+        return_values: Optional[str] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+        return_values_on_condition_failure: Optional[str] = None,
+    ) -> Dict:
+        return self.connection.get_operation_kwargs(
+            self.table_name,
+            hash_key,
+            range_key=range_key,
+            key=key,
+            attributes=attributes,
+            attributes_to_get=attributes_to_get,
+            actions=actions,
+            condition=condition,
+            consistent_read=consistent_read,
+            return_values=return_values,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+            return_values_on_condition_failure=return_values_on_condition_failure
+        )
+
+    async def delete_item(
+        self,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        condition: Optional[Condition] = None,
+        return_values: Optional[str] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the DeleteItem operation and returns the result
+        """
+        return await self.connection.delete_item(
+            self.table_name,
+            hash_key,
+            range_key=range_key,
+            condition=condition,
+            return_values=return_values,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+
+    async def update_item(
+        self,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        actions: Optional[Sequence[Action]] = None,
+        condition: Optional[Condition] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+        return_values: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the UpdateItem operation
+        """
+        return await self.connection.update_item(
+            self.table_name,
+            hash_key,
+            range_key=range_key,
+            actions=actions,
+            condition=condition,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+            return_values=return_values,
+        )
+
+    async def put_item(
+        self,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        attributes: Optional[Any] = None,
+        condition: Optional[Condition] = None,
+        return_values: Optional[str] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the PutItem operation and returns the result
+        """
+        return await self.connection.put_item(
+            self.table_name,
+            hash_key,
+            range_key=range_key,
+            attributes=attributes,
+            condition=condition,
+            return_values=return_values,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+
+    async def batch_write_item(
+        self,
+        put_items: Optional[Any] = None,
+        delete_items: Optional[Any] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the batch_write_item operation
+        """
+        return await self.connection.batch_write_item(
+            self.table_name,
+            put_items=put_items,
+            delete_items=delete_items,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+
+    async def batch_get_item(
+        self,
+        keys: Sequence[str],
+        consistent_read: Optional[bool] = None,
+        return_consumed_capacity: Optional[str] = None,
+        attributes_to_get: Optional[Any] = None,
+        hedge: Optional[bool] = None,
+    ) -> Dict:
+        """
+        Performs the batch get item operation
+        """
+        return await self.connection.batch_get_item(
+            self.table_name,
+            keys,
+            consistent_read=consistent_read,
+            return_consumed_capacity=return_consumed_capacity,
+            attributes_to_get=attributes_to_get,
+            hedge=hedge,
+        )
+
+    async def get_item(
+        self,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        consistent_read: bool = False,
+        attributes_to_get: Optional[Any] = None,
+        hedge: Optional[bool] = None,
+    ) -> Dict:
+        """
+        Performs the GetItem operation and returns the result
+        """
+        return await self.connection.get_item(
+            self.table_name,
+            hash_key,
+            range_key=range_key,
+            consistent_read=consistent_read,
+            attributes_to_get=attributes_to_get,
+            hedge=hedge,
+        )
+
+    async def scan(
+        self,
+        filter_condition: Optional[Any] = None,
+        attributes_to_get: Optional[Any] = None,
+        limit: Optional[int] = None,
+        return_consumed_capacity: Optional[str] = None,
+        segment: Optional[int] = None,
+        total_segments: Optional[int] = None,
+        exclusive_start_key: Optional[str] = None,
+        consistent_read: Optional[bool] = None,
+        index_name: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the scan operation
+        """
+        return await self.connection.scan(
+            self.table_name,
+            filter_condition=filter_condition,
+            attributes_to_get=attributes_to_get,
+            limit=limit,
+            return_consumed_capacity=return_consumed_capacity,
+            segment=segment,
+            total_segments=total_segments,
+            exclusive_start_key=exclusive_start_key,
+            consistent_read=consistent_read,
+            index_name=index_name,
+        )
+
+    async def query(
+        self,
+        hash_key: str,
+        range_key_condition: Optional[Condition] = None,
+        filter_condition: Optional[Any] = None,
+        attributes_to_get: Optional[Any] = None,
+        consistent_read: bool = False,
+        exclusive_start_key: Optional[Any] = None,
+        index_name: Optional[str] = None,
+        limit: Optional[int] = None,
+        return_consumed_capacity: Optional[str] = None,
+        scan_index_forward: Optional[bool] = None,
+        select: Optional[str] = None,
+        hedge: Optional[bool] = None,
+    ) -> Dict:
+        """
+        Performs the Query operation and returns the result
+        """
+        return await self.connection.query(
+            self.table_name,
+            hash_key,
+            range_key_condition=range_key_condition,
+            filter_condition=filter_condition,
+            attributes_to_get=attributes_to_get,
+            consistent_read=consistent_read,
+            exclusive_start_key=exclusive_start_key,
+            index_name=index_name,
+            limit=limit,
+            return_consumed_capacity=return_consumed_capacity,
+            scan_index_forward=scan_index_forward,
+            select=select,
+            hedge=hedge,
+        )
+
+    async def describe_table(self) -> Dict:
+        """
+        Performs the DescribeTable operation and returns the result
+        """
+        return await self.connection.describe_table(self.table_name)
+
+    async def close(self) -> None:
+        """
+        Closes the idle connections held in the pool
+        """
+        await self.connection.close()
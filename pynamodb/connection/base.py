@@ -1,11 +1,15 @@
 """
 Lowest level connection
 """
+import copy
 import sys
 import logging
+import os
+import time
 import uuid
-from threading import local
-from typing import Any, Dict, List, Mapping, Optional, Sequence, Union, cast
+from concurrent.futures import FIRST_COMPLETED, wait
+from threading import Lock, local
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union, cast
 if sys.version_info >= (3, 8):
     from typing import Literal
 else:
@@ -14,12 +18,31 @@ else:
 import botocore.config
 import botocore.client
 import botocore.exceptions
+from botocore.awsrequest import AWSPreparedRequest, AWSRequest, create_request_object, prepare_request_dict
 from botocore.client import ClientError
 from botocore.exceptions import BotoCoreError
+from botocore.loaders import Loader
+from botocore.parsers import create_parser
+from botocore.serialize import create_serializer
 from botocore.session import get_session
 
+from pynamodb.connection import _fork, _json_codec
 from pynamodb.connection._botocore_private import BotocoreBaseClientPrivate
-from pynamodb._util import bin_decode_attr
+from pynamodb.connection._pool import configure_http_session, get_pool_metrics, request_timeouts
+from pynamodb.connection._signing import SigV4Signer
+from pynamodb.connection.call_settings import CallSettings, get_call_settings
+from pynamodb.connection.capacity import CapacityLedger, record_consumed_capacity
+from pynamodb.connection.circuit_breaker import CircuitBreaker, CircuitKey
+from pynamodb.connection.hedging import HEDGED_OPERATIONS, HedgingPolicy, get_hedging_policy
+from pynamodb.connection.hot_keys import HotKeyDetector
+from pynamodb.connection.metrics import MetricsKey, MetricsRegistry, count_items, get_response_bytes
+from pynamodb.connection.pooling import PoolAutoSizing, PoolMetrics
+from pynamodb.connection.profiling import PARSE, RETRY_WAIT, SEND, SERIALIZE, SIGN, finish_timings, mark_phase, start_operation
+from pynamodb.connection.registry import client_registry
+from pynamodb.connection.retry import CONNECTION_EXCEPTIONS, THROTTLING, RetryPolicy, classify_error, get_retry_policy
+from pynamodb.connection.routing import Endpoint, EndpointRouter, get_endpoint_router
+from pynamodb.connection.tracing import get_current_span
+from pynamodb.connection.transport import BotocoreTransport, Transport
 from pynamodb.constants import (
     RETURN_CONSUMED_CAPACITY_VALUES, RETURN_ITEM_COLL_METRICS_VALUES,
     RETURN_ITEM_COLL_METRICS, RETURN_CONSUMED_CAPACITY, RETURN_VALUES_VALUES,
@@ -45,7 +68,7 @@ from pynamodb.constants import (
 )
 from pynamodb.exceptions import (
     TableError, QueryError, PutError, DeleteError, UpdateError, GetError, ScanError, TableDoesNotExist,
-    VerboseClientError,
+    VerboseClientError, DeadlineExceededError,
     TransactGetError, TransactWriteError, CancellationReason,
 )
 from pynamodb.expressions.condition import Condition
@@ -53,15 +76,51 @@ from pynamodb.expressions.operand import Path
 from pynamodb.expressions.projection import create_projection_expression
 from pynamodb.expressions.update import Action, Update
 from pynamodb.settings import get_settings_value
-from pynamodb.signals import pre_dynamodb_send, post_dynamodb_send
+from pynamodb.signals import dynamodb_request_hedged, pre_dynamodb_send, post_dynamodb_send, send_in_background
 from pynamodb.types import HASH, RANGE
 
 BOTOCORE_EXCEPTIONS = (BotoCoreError, ClientError)
-RATE_LIMITING_ERROR_CODES = ['ProvisionedThroughputExceededException', 'ThrottlingException']
+CONTROL_PLANE_OPERATIONS = frozenset([
+    DESCRIBE_TABLE, LIST_TABLES, UPDATE_TABLE, UPDATE_TIME_TO_LIVE, DELETE_TABLE, CREATE_TABLE,
+])
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
+_data_loader: Optional[Loader] = None
+_data_loader_lock = Lock()
+
+# The size of the body of the last request sent by each thread, for request metrics
+_last_request = local()
+
+
+def _get_data_loader(session: botocore.session.Session) -> Loader:
+    """
+    Returns the process-wide botocore data loader, adopting `session`'s loader if there isn't one yet
+    """
+    global _data_loader
+    if _data_loader is None:
+        with _data_loader_lock:
+            if _data_loader is None:
+                _data_loader = session.get_component('data_loader')
+    return _data_loader
+
+
+def _mark_serialized(**_: Any) -> None:
+    mark_phase(SERIALIZE)
+
+
+def _mark_received(**_: Any) -> None:
+    mark_phase(SEND)
+
+
+def _get_body_size(body: Any) -> Optional[int]:
+    if isinstance(body, bytes):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode('utf-8'))
+    return None
+
 
 class MetaTable(object):
     """
@@ -242,6 +301,28 @@ class MetaTable(object):
             }
 
 
+class _Dispatch:
+    """
+    The bookkeeping of a request between the start and the end of its dispatch
+    """
+    __slots__ = (
+        'operation_name', 'operation_kwargs', 'table_name', 'req_uuid', 'hedging',
+        'circuit_keys', 'span', 'pool_metrics', 'start', 'debug',
+    )
+
+    def __init__(self, operation_name: str, operation_kwargs: Dict) -> None:
+        self.operation_name = operation_name
+        self.operation_kwargs = operation_kwargs
+        self.table_name: Optional[str] = operation_kwargs.get(TABLE_NAME)
+        self.req_uuid: Optional[uuid.UUID] = None
+        self.hedging: Optional[HedgingPolicy] = None
+        self.circuit_keys: Optional[List[CircuitKey]] = None
+        self.span: Optional[Any] = None
+        self.pool_metrics: Optional[PoolMetrics] = None
+        self.start = 0.0
+        self.debug = False
+
+
 class Connection(object):
     """
     A higher level abstraction over botocore
@@ -264,12 +345,27 @@ class Connection(object):
                  extra_headers: Optional[Mapping[str, str]] = None,
                  aws_access_key_id: Optional[str] = None,
                  aws_secret_access_key: Optional[str] = None,
-                 aws_session_token: Optional[str] = None):
+                 aws_session_token: Optional[str] = None,
+                 lean_codec: Optional[bool] = None,
+                 transport: Optional[Transport] = None,
+                 share_clients: Optional[bool] = None,
+                 tcp_nodelay: Optional[bool] = None,
+                 tcp_keepalive: Optional[bool] = None,
+                 max_connection_idle_seconds: Optional[float] = None,
+                 max_connection_lifetime_seconds: Optional[float] = None,
+                 hedging: Optional[HedgingPolicy] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 endpoints: Optional[Union[Sequence[Endpoint], EndpointRouter]] = None,
+                 pool_auto_sizing: Optional[PoolAutoSizing] = None,
+                 background_signals: Optional[bool] = None,
+                 metrics: Optional[MetricsRegistry] = None,
+                 capacity_ledger: Optional[CapacityLedger] = None,
+                 hot_keys: Optional[HotKeyDetector] = None):
         self._tables: Dict[str, MetaTable] = {}
         self.host = host
         self._local = local()
         self._client: Optional[BotocoreBaseClientPrivate] = None
-        self._convert_to_request_dict__endpoint_url = False
         if region:
             self.region = region
         else:
@@ -312,93 +408,698 @@ class Connection(object):
         else:
             self._extra_headers = get_settings_value('extra_headers')
 
+        if lean_codec is not None:
+            self._lean_codec = lean_codec
+        else:
+            self._lean_codec = get_settings_value('lean_codec')
+
+        # A transport replaces botocore's own HTTP handling; requests are then
+        # serialized, signed and retried by the connection itself.
+        if transport is not None:
+            self._transport: Optional[Transport] = transport
+        else:
+            self._transport = get_settings_value('transport')
+        self._botocore_transport: Optional[Transport] = None
+
+        if share_clients is not None:
+            self._share_clients = share_clients
+        else:
+            self._share_clients = get_settings_value('share_clients')
+
+        if tcp_nodelay is not None:
+            self._tcp_nodelay = tcp_nodelay
+        else:
+            self._tcp_nodelay = get_settings_value('tcp_nodelay')
+
+        if tcp_keepalive is not None:
+            self._tcp_keepalive = tcp_keepalive
+        else:
+            self._tcp_keepalive = get_settings_value('tcp_keepalive')
+
+        # Pooled connections idle or open for longer than these are closed before they are reused
+        if max_connection_idle_seconds is not None:
+            self._max_connection_idle_seconds = max_connection_idle_seconds
+        else:
+            self._max_connection_idle_seconds = get_settings_value('max_connection_idle_seconds')
+
+        if max_connection_lifetime_seconds is not None:
+            self._max_connection_lifetime_seconds = max_connection_lifetime_seconds
+        else:
+            self._max_connection_lifetime_seconds = get_settings_value('max_connection_lifetime_seconds')
+
+        if pool_auto_sizing is not None:
+            self._pool_auto_sizing: Optional[PoolAutoSizing] = pool_auto_sizing
+        else:
+            self._pool_auto_sizing = get_settings_value('pool_auto_sizing')
+
+        if hedging is not None:
+            self._hedging: Optional[HedgingPolicy] = hedging
+        else:
+            self._hedging = get_settings_value('hedging')
+
+        self._retry_policy = get_retry_policy(retry_policy)
+
+        if circuit_breaker is not None:
+            self._circuit_breaker: Optional[CircuitBreaker] = circuit_breaker
+        else:
+            self._circuit_breaker = get_settings_value('circuit_breaker')
+
+        # Signals are sent from a background thread, so that slow receivers don't delay requests
+        if background_signals is not None:
+            self._background_signals = background_signals
+        else:
+            self._background_signals = get_settings_value('background_signals')
+
+        if metrics is not None:
+            self._metrics: Optional[MetricsRegistry] = metrics
+        else:
+            self._metrics = get_settings_value('metrics')
+
+        if hot_keys is not None:
+            self._hot_keys: Optional[HotKeyDetector] = hot_keys
+        else:
+            self._hot_keys = get_settings_value('hot_keys')
+
+        # The capacity consumed by requests sent through this connection, and its endpoint copies
+        self.capacity_ledger = capacity_ledger if capacity_ledger is not None else CapacityLedger()
+
+        # With several endpoints, this connection's own region and host are those of the home endpoint,
+        # and requests to the other endpoints are sent through copies of it.
+        self._router = get_endpoint_router(endpoints if endpoints is not None else get_settings_value('endpoints'))
+        self._endpoint_connections: Dict[Endpoint, 'Connection'] = {}
+        if self._router is not None:
+            self.region = self._router.home.region or self.region
+            self.host = self._router.home.host
+
+        self._serializer: Optional[Any] = None
+        self._parser: Optional[Any] = None
+        self._signer: Optional[SigV4Signer] = None
+
         self._aws_access_key_id = aws_access_key_id
         self._aws_secret_access_key = aws_secret_access_key
         self._aws_session_token = aws_session_token
 
+        self._pid = os.getpid()
+        _fork.track_connection(self)
+
     def __repr__(self) -> str:
         return "Connection<{}>".format(self.client.meta.endpoint_url)
 
-    def dispatch(self, operation_name: str, operation_kwargs: Dict) -> Dict:
+    def dispatch(self, operation_name: str, operation_kwargs: Dict, hedge: Optional[bool] = None) -> Dict:
         """
         Dispatches `operation_name` with arguments `operation_kwargs`
 
-        Raises TableDoesNotExist if the specified table does not exist
+        Reads are hedged according to the connection's hedging policy, unless `hedge` is set.
+
+        Raises TableDoesNotExist if the specified table does not exist,
+        CircuitBreakerOpenError if the circuit breaker of a table or index it uses is open,
+        and DeadlineExceededError if the deadline of the call settings in effect has passed
         """
-        if operation_name not in [DESCRIBE_TABLE, LIST_TABLES, UPDATE_TABLE, UPDATE_TIME_TO_LIVE, DELETE_TABLE, CREATE_TABLE]:
+        timings = start_operation(operation_name)
+        if timings is None:
+            return self._dispatch(operation_name, operation_kwargs, hedge)
+        try:
+            return self._dispatch(operation_name, operation_kwargs, hedge)
+        finally:
+            finish_timings(timings)
+
+    def _observe_hot_keys(self, operation_name: str, operation_kwargs: Dict) -> None:
+        if self._hot_keys is None or operation_name in CONTROL_PLANE_OPERATIONS:
+            return
+        try:
+            self._hot_keys.observe(operation_name, operation_kwargs, self._tables.get)
+        except Exception:
+            # Sampling keys must never fail the request
+            log.exception("Hot key detection failed for %s", operation_name)
+
+    def _dispatch(self, operation_name: str, operation_kwargs: Dict, hedge: Optional[bool]) -> Dict:
+        dispatch = self._start_dispatch(operation_name, operation_kwargs, hedge, self, self._get_pool_metrics())
+        try:
+            if dispatch.hedging is None:
+                data = self._make_api_call(operation_name, operation_kwargs)
+            else:
+                data = self._make_hedged_api_call(
+                    operation_name, operation_kwargs, dispatch.hedging, dispatch.req_uuid, dispatch.table_name,
+                )
+        except BaseException as e:
+            self._fail_dispatch(dispatch, e)
+            raise
+        self._finish_dispatch(dispatch, data, self)
+        return data
+
+    def _start_dispatch(
+        self,
+        operation_name: str,
+        operation_kwargs: Dict,
+        hedge: Optional[bool],
+        sender: Any,
+        pool_metrics: Optional[PoolMetrics],
+    ) -> _Dispatch:
+        """
+        Prepares a request to be sent, and records that it has started
+
+        Shared by :class:`~pynamodb.connection.AsyncConnection`, which sends signals as `sender`.
+        """
+        if operation_name not in CONTROL_PLANE_OPERATIONS:
             if RETURN_CONSUMED_CAPACITY not in operation_kwargs:
                 operation_kwargs.update(self.get_consumed_capacity_map(TOTAL))
-        log.debug("Calling %s with arguments %s", operation_name, operation_kwargs)
-
-        table_name = operation_kwargs.get(TABLE_NAME)
-        req_uuid = uuid.uuid4()
+        call_settings = get_call_settings()
+        if call_settings is not None:
+            call_settings.check_deadline(operation_name=operation_name)
+            if call_settings.consistent_read:
+                self._set_consistent_read(operation_name, operation_kwargs)
+        self._observe_hot_keys(operation_name, operation_kwargs)
+        dispatch = _Dispatch(operation_name, operation_kwargs)
+        dispatch.debug = log.isEnabledFor(logging.DEBUG)
+        if dispatch.debug:
+            log.debug("Calling %s with arguments %s", operation_name, operation_kwargs)
+
+        # Request ids are only generated, and signals only sent, if anything receives them
+        if self._has_signal_receivers(sender):
+            dispatch.req_uuid = uuid.uuid4()
+        if operation_name in HEDGED_OPERATIONS:
+            dispatch.hedging = get_hedging_policy(self._hedging, hedge)
+        if self._circuit_breaker is not None and operation_name not in CONTROL_PLANE_OPERATIONS:
+            dispatch.circuit_keys = self._get_circuit_keys(operation_kwargs)
+            self._circuit_breaker.before_request(dispatch.circuit_keys)
+
+        dispatch.span = get_current_span()
+        if dispatch.span is not None:
+            dispatch.span.requests += 1
+        if dispatch.req_uuid is not None:
+            self._send_signal(pre_dynamodb_send, sender, operation_name, dispatch.req_uuid, dispatch.table_name)
+        dispatch.pool_metrics = pool_metrics
+        if pool_metrics is not None:
+            pool_metrics.request_started()
+        if self._metrics is not None:
+            dispatch.start = time.perf_counter()
+        return dispatch
+
+    def _fail_dispatch(self, dispatch: _Dispatch, error: BaseException) -> None:
+        """
+        Records that a request has failed
+        """
+        if dispatch.pool_metrics is not None:
+            dispatch.pool_metrics.request_finished()
+        if not isinstance(error, Exception):
+            # e.g. the task was cancelled, which says nothing about the table's health
+            return
+        if self._metrics is not None:
+            self._metrics.record_operation(
+                self._get_metrics_key(dispatch.operation_name, dispatch.operation_kwargs),
+                time.perf_counter() - dispatch.start,
+                failed=True,
+            )
+        if dispatch.circuit_keys is not None and self._circuit_breaker is not None:
+            self._circuit_breaker.record(dispatch.circuit_keys, error)
 
-        self.send_pre_boto_callback(operation_name, req_uuid, table_name)
-        data = self._make_api_call(operation_name, operation_kwargs)
-        self.send_post_boto_callback(operation_name, req_uuid, table_name)
+    def _finish_dispatch(self, dispatch: _Dispatch, data: Dict, sender: Any) -> None:
+        """
+        Records the response of a request
+        """
+        operation_name, operation_kwargs = dispatch.operation_name, dispatch.operation_kwargs
+        if dispatch.pool_metrics is not None:
+            dispatch.pool_metrics.request_finished()
+        if self._metrics is not None:
+            self._metrics.record_operation(
+                self._get_metrics_key(operation_name, operation_kwargs),
+                time.perf_counter() - dispatch.start,
+                items=count_items(operation_name, operation_kwargs, data or {}),
+            )
+        if dispatch.circuit_keys is not None and self._circuit_breaker is not None:
+            self._circuit_breaker.record(dispatch.circuit_keys)
+        if dispatch.span is not None:
+            dispatch.span.record_response(operation_name, operation_kwargs, data)
+        if dispatch.req_uuid is not None:
+            self._send_signal(post_dynamodb_send, sender, operation_name, dispatch.req_uuid, dispatch.table_name)
 
         if data and CONSUMED_CAPACITY in data:
+            record_consumed_capacity(self.capacity_ledger, operation_name, operation_kwargs, data[CONSUMED_CAPACITY])
+        if dispatch.debug and data and CONSUMED_CAPACITY in data:
             capacity = data.get(CONSUMED_CAPACITY)
             if isinstance(capacity, dict) and CAPACITY_UNITS in capacity:
                 capacity = capacity.get(CAPACITY_UNITS)
             log.debug("%s %s consumed %s units",  data.get(TABLE_NAME, ''), operation_name, capacity)
-        return data
 
-    def send_post_boto_callback(self, operation_name, req_uuid, table_name):
-        try:
-            post_dynamodb_send.send(self, operation_name=operation_name, table_name=table_name, req_uuid=req_uuid)
-        except Exception:
-            log.exception("post_boto callback threw an exception.")
+    @staticmethod
+    def _has_signal_receivers(sender: Any) -> bool:
+        return (
+            pre_dynamodb_send.has_receivers_for(sender)
+            or post_dynamodb_send.has_receivers_for(sender)
+            or dynamodb_request_hedged.has_receivers_for(sender)
+        )
 
-    def send_pre_boto_callback(self, operation_name, req_uuid, table_name):
+    def _send_signal(self, signal: Any, sender: Any, operation_name: str, req_uuid: uuid.UUID, table_name: Optional[str], **kwargs: Any) -> None:
+        if self._background_signals:
+            send_in_background(signal, sender, operation_name=operation_name, table_name=table_name, req_uuid=req_uuid, **kwargs)
+            return
         try:
-            pre_dynamodb_send.send(self, operation_name=operation_name, table_name=table_name, req_uuid=req_uuid)
+            signal.send(sender, operation_name=operation_name, table_name=table_name, req_uuid=req_uuid, **kwargs)
         except Exception:
-            log.exception("pre_boto callback threw an exception.")
+            log.exception("%s callback threw an exception.", signal.name)
+
+    def send_post_boto_callback(self, operation_name, req_uuid, table_name, **kwargs):
+        self._send_signal(post_dynamodb_send, self, operation_name, req_uuid, table_name, **kwargs)
+
+    def send_pre_boto_callback(self, operation_name, req_uuid, table_name, **kwargs):
+        self._send_signal(pre_dynamodb_send, self, operation_name, req_uuid, table_name, **kwargs)
+
+    def send_hedge_callback(self, operation_name, req_uuid, hedge_req_uuid, table_name):
+        self._send_signal(dynamodb_request_hedged, self, operation_name, req_uuid, table_name, hedge_req_uuid=hedge_req_uuid)
+
+    def _make_hedged_api_call(
+        self,
+        operation_name: str,
+        operation_kwargs: Dict,
+        hedging: HedgingPolicy,
+        req_uuid: Optional[uuid.UUID],
+        table_name: Optional[str],
+    ) -> Dict:
+        """
+        Makes the API call, sending a duplicate request if the first one is slower than the policy allows.
+        The first successful response wins, without waiting for the other request.
+        """
+        hedging.record_request()
+        delay = hedging.get_delay(operation_name)
+        first = None if delay is None else hedging.submit(self._make_timed_api_call, operation_name, operation_kwargs, hedging)
+        if delay is None or first is None:
+            # Either there aren't enough recent latencies yet, or every hedging thread is busy
+            return self._make_timed_api_call(operation_name, operation_kwargs, hedging)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+        hedge = hedging.submit(self._make_hedge_api_call, operation_name, dict(operation_kwargs), req_uuid, table_name)
+        if hedge is None:
+            return first.result()
+        self._record_hedge(hedging, operation_name, delay)
+        pending = {first, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+        return first.result()
+
+    @staticmethod
+    def _record_hedge(hedging: HedgingPolicy, operation_name: str, delay: float) -> None:
+        hedging.record_hedge()
+        log.debug("Hedging %s after %.3f seconds", operation_name, delay)
+
+    def _make_timed_api_call(self, operation_name: str, operation_kwargs: Dict, hedging: HedgingPolicy) -> Dict:
+        start = time.perf_counter()
+        data = self._make_api_call(operation_name, operation_kwargs)
+        hedging.record_latency(operation_name, time.perf_counter() - start)
+        return data
+
+    def _make_hedge_api_call(self, operation_name: str, operation_kwargs: Dict, req_uuid: Optional[uuid.UUID], table_name: Optional[str]) -> Dict:
+        hedge_uuid = self._start_hedge(self, operation_name, req_uuid, table_name)
+        data = self._make_api_call(operation_name, operation_kwargs)
+        if hedge_uuid is not None:
+            self._send_signal(post_dynamodb_send, self, operation_name, hedge_uuid, table_name)
+        return data
+
+    def _start_hedge(self, sender: Any, operation_name: str, req_uuid: Optional[uuid.UUID], table_name: Optional[str]) -> Optional[uuid.UUID]:
+        """
+        Sends the signals of a hedged request, and returns its request id
+        """
+        if req_uuid is None:
+            return None
+        # The duplicate has its own request id, linked to the original one by the dynamodb_request_hedged signal
+        hedge_uuid = uuid.uuid4()
+        self._send_signal(dynamodb_request_hedged, sender, operation_name, req_uuid, table_name, hedge_req_uuid=hedge_uuid)
+        self._send_signal(pre_dynamodb_send, sender, operation_name, hedge_uuid, table_name)
+        return hedge_uuid
 
     def _before_send(self, request, **_) -> None:
+        mark_phase(SIGN)
+        _last_request.body_size = _get_body_size(getattr(request, 'body', None))
         if self._extra_headers is not None:
             request.headers.update(self._extra_headers)
 
+    @staticmethod
+    def _set_consistent_read(operation_name: str, operation_kwargs: Dict) -> None:
+        # Reads on indexes are left alone, since global secondary indexes don't support consistent reads
+        if operation_name == BATCH_GET_ITEM:
+            for keys_and_attributes in operation_kwargs.get(REQUEST_ITEMS, {}).values():
+                keys_and_attributes[CONSISTENT_READ] = True
+        elif operation_name in (GET_ITEM, QUERY, SCAN) and INDEX_NAME not in operation_kwargs:
+            operation_kwargs[CONSISTENT_READ] = True
+
     def _make_api_call(self, operation_name: str, operation_kwargs: Dict) -> Dict:
+        """
+        Sends the request, retrying failures according to the connection's retry policy
+        """
+        uses_transport = self._transport is not None or self._uses_lean_codec(operation_name)
+        max_attempts = self._get_max_attempts(uses_transport)
+        self._retry_policy.record_request()
+        call_settings = get_call_settings()
+        endpoint: Optional[Endpoint] = None
+        attempt_number = 0
+        delay: Optional[float] = None
+        while True:
+            attempt_number += 1
+            endpoint, connection = self._get_attempt_connection(operation_name, operation_kwargs, endpoint)
+            start = time.perf_counter()
+            try:
+                data = connection._send_request(operation_name, operation_kwargs, uses_transport, attempt_number - 1)
+            except (ClientError,) + CONNECTION_EXCEPTIONS as e:
+                delay = self._get_attempt_retry_delay(
+                    e, operation_name, operation_kwargs, endpoint, attempt_number, max_attempts, delay, call_settings,
+                )
+            else:
+                self._record_attempt_success(endpoint, start)
+                return data
+            time.sleep(delay)
+            mark_phase(RETRY_WAIT)
+
+    def _get_attempt_connection(
+        self,
+        operation_name: str,
+        operation_kwargs: Dict,
+        previous: Optional[Endpoint],
+    ) -> Tuple[Optional[Endpoint], 'Connection']:
+        """
+        Returns the endpoint an attempt at a request is sent to, and the connection that sends it
+        """
+        if self._router is None:
+            return None, self
+        endpoint = self._router.get_endpoint(operation_name, previous, operation_kwargs)
+        return endpoint, self._get_endpoint_connection(endpoint)
+
+    def _record_attempt_success(self, endpoint: Optional[Endpoint], start: float) -> None:
+        mark_phase(PARSE)
+        if self._router is not None and endpoint is not None:
+            self._router.record_latency(endpoint, time.perf_counter() - start)
+
+    def _get_attempt_retry_delay(
+        self,
+        error: Exception,
+        operation_name: str,
+        operation_kwargs: Dict,
+        endpoint: Optional[Endpoint],
+        attempt_number: int,
+        max_attempts: int,
+        delay: Optional[float],
+        call_settings: Optional[CallSettings],
+    ) -> float:
+        """
+        Returns how long to wait before retrying a failed attempt, or raises the error if it isn't retried
+        """
+        mark_phase(PARSE if isinstance(error, ClientError) else SEND)
+        if self._router is not None and endpoint is not None:
+            self._router.record_failure(endpoint, error)
+        delay = self._retry_policy.get_error_retry_delay(error, attempt_number, max_attempts, delay)
+        if delay is None:
+            if isinstance(error, ClientError):
+                raise self._get_verbose_client_error(error, operation_name, operation_kwargs) from error
+            raise error
+        if call_settings is not None:
+            self._check_retry_deadline(call_settings, operation_name, delay, error)
+        span = get_current_span()
+        if span is not None:
+            span.retries += 1
+        log.debug("Retrying %s (attempt %d of %d) in %.3f seconds", operation_name, attempt_number + 1, max_attempts, delay)
+        return delay
+
+    @staticmethod
+    def _check_retry_deadline(call_settings: CallSettings, operation_name: str, delay: float, error: Exception) -> None:
+        remaining = call_settings.get_remaining_seconds()
+        if remaining is not None and remaining <= delay:
+            raise DeadlineExceededError("Deadline exceeded before {} could be retried".format(operation_name), error) from error
+
+    def _send_request(self, operation_name: str, operation_kwargs: Dict, uses_transport: bool, retry_attempts: int) -> Dict:
+        """
+        Makes a single attempt at sending the request
+        """
+        if self._metrics is None:
+            return self._send_attempt(operation_name, operation_kwargs, uses_transport, retry_attempts)
+        # Set by _before_send, which shared clients call on the connection that created them
+        _last_request.body_size = None
         try:
-            return self.client._make_api_call(operation_name, operation_kwargs)
-        except ClientError as e:
-            resp_metadata = e.response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
-            cancellation_reasons = e.response.get('CancellationReasons', [])
+            data = self._send_attempt(operation_name, operation_kwargs, uses_transport, retry_attempts)
+        except (ClientError,) + CONNECTION_EXCEPTIONS as e:
+            self._record_attempt(operation_name, operation_kwargs, _last_request.body_size, error=e)
+            raise
+        self._record_attempt(operation_name, operation_kwargs, _last_request.body_size, data=data)
+        return data
 
-            botocore_props = {'Error': e.response.get('Error', {})}
-            verbose_props = {
-                'request_id': resp_metadata.get('x-amzn-requestid', ''),
-                'table_name': self._get_table_name_for_error_context(operation_kwargs),
-            }
-            raise VerboseClientError(
-                botocore_props,
-                operation_name,
-                verbose_props,
-                cancellation_reasons=(
-                    (
-                        CancellationReason(
-                            code=d['Code'],
-                            message=d.get('Message'),
-                            raw_item=cast(Optional[Dict[str, Dict[str, Any]]], d.get('Item')),
-                        ) if d['Code'] != 'None' else None
-                    )
-                    for d in cancellation_reasons
-                ),
-            ) from e
+    def _send_attempt(self, operation_name: str, operation_kwargs: Dict, uses_transport: bool, retry_attempts: int) -> Dict:
+        call_settings = get_call_settings()
+        if call_settings is None:
+            read_timeout = deadline = None
+        else:
+            # Applied by the connection pools of the botocore client and of URLLib3Transport,
+            # along with the deadline; other transports only check the deadline between attempts
+            read_timeout = call_settings.get_read_timeout(self._read_timeout_seconds)
+            deadline = call_settings.deadline
+        with request_timeouts(read_timeout, deadline):
+            if uses_transport:
+                return self._make_transport_api_call(operation_name, operation_kwargs, retry_attempts)
+            data = self.client._make_api_call(operation_name, operation_kwargs)
+        if self._retry_configuration == "LEGACY":
+            # botocore only made the one attempt it was allowed
+            response_metadata = data.setdefault('ResponseMetadata', {})
+            response_metadata.pop('MaxAttemptsReached', None)
+            response_metadata['RetryAttempts'] = retry_attempts
+        return data
+
+    def _get_endpoint_connection(self, endpoint: Endpoint) -> 'Connection':
+        """
+        Returns the connection requests to `endpoint` are sent through
+        """
+        if self._router is None or endpoint == self._router.home:
+            return self
+        connection = self._endpoint_connections.get(endpoint)
+        if connection is None:
+            # A copy shares this connection's settings, table metadata and transport, but has its own client
+            connection = copy.copy(self)
+            connection.region = endpoint.region or self.region
+            connection.host = endpoint.host
+            connection._router = None
+            connection._endpoint_connections = {}
+            connection._local = local()
+            connection._client = None
+            connection._signer = None
+            connection._botocore_transport = None
+            connection = self._endpoint_connections.setdefault(endpoint, connection)
+        return connection
+
+    def _make_transport_api_call(self, operation_name: str, operation_kwargs: Dict, retry_attempts: int) -> Dict:
+        """
+        Serializes, signs and sends the request through the transport
+        """
+        request = self._get_transport_request(operation_name, operation_kwargs)
+        response = self._get_transport().send(request)
+        mark_phase(SEND)
+        return self._parse_transport_response(operation_name, response, retry_attempts)
+
+    def _get_transport(self) -> Transport:
+        if self._transport is not None:
+            return self._transport
+        if self._botocore_transport is None:
+            self._botocore_transport = BotocoreTransport(self)
+        return self._botocore_transport
+
+    def _uses_lean_codec(self, operation_name: str) -> bool:
+        return self._lean_codec and operation_name in _json_codec.LEAN_CODEC_OPERATIONS
+
+    def _get_transport_request(self, operation_name: str, operation_kwargs: Dict) -> AWSPreparedRequest:
+        """
+        Builds a signed request for `operation_name`
+        """
+        client = self.client
+        url = client.meta.endpoint_url + '/'
+        if self._uses_lean_codec(operation_name):
+            headers, body = _json_codec.encode_request(operation_name, operation_kwargs)
+            headers['User-Agent'] = client.meta.config.user_agent  # type: ignore[attr-defined]
+        else:
+            operation_model = client.meta.service_model.operation_model(operation_name)
+            if self._serializer is None:
+                self._serializer = create_serializer(client.meta.service_model.protocol, include_validation=False)
+            request_dict = self._serializer.serialize_to_request(operation_kwargs, operation_model)
+            prepare_request_dict(request_dict, endpoint_url=client.meta.endpoint_url, user_agent=client.meta.config.user_agent)  # type: ignore[attr-defined]
+            url, headers, body = request_dict['url'], request_dict['headers'], request_dict['body']
+        mark_phase(SERIALIZE)
+        signer = self._get_signer()
+        if signer is not None:
+            signer.sign('POST', url, headers, body)
+        request = AWSRequest(method='POST', url=url, data=body, headers=headers)
+        if signer is None:
+            client._request_signer.sign(operation_name, request)
+        prepared_request = request.prepare()
+        # Extra headers are meant to be stripped by a proxy, so they are added after signing
+        self._before_send(prepared_request)
+        return prepared_request
+
+    def _is_ready_to_sign(self) -> bool:
+        """
+        Returns whether requests can be built and signed without any I/O, i.e. the client
+        has been created and its credentials aren't due a refresh
+        """
+        client = self._client
+        if client is None or self._pid != os.getpid():
+            return False
+        signer = self._signer
+        # Requests botocore signs itself are never considered ready, since it may refresh the credentials
+        return signer is not None and signer.credentials is client._request_signer._credentials and not signer.needs_credentials()
+
+    def _prepare_to_sign(self) -> None:
+        """
+        Creates the client and refreshes its credentials, which may block on e.g. the instance metadata service
+        """
+        signer = self._get_signer()
+        if signer is not None:
+            signer.get_credentials()
+
+    def _get_signer(self) -> Optional[SigV4Signer]:
+        """
+        Returns the signer for the client's credentials, or None if botocore should sign requests itself
+        """
+        request_signer = self.client._request_signer
+        credentials = request_signer._credentials
+        if credentials is None or request_signer._signature_version != 'v4':
+            return None
+        signer = self._signer
+        if signer is None or signer.credentials is not credentials:
+            signer = self._signer = SigV4Signer(credentials, request_signer._region_name, request_signer._signing_name)
+        return signer
+
+    def _parse_transport_response(self, operation_name: str, response: Any, retry_attempts: int) -> Dict:
+        """
+        Parses a raw response, raising ClientError for an error response
+        """
+        if self._uses_lean_codec(operation_name):
+            return _json_codec.decode_response(
+                operation_name, response.status_code, response.headers, response.content, retry_attempts=retry_attempts,
+            )
+        service_model = self.client.meta.service_model
+        if self._parser is None:
+            self._parser = create_parser(service_model.protocol)
+        parsed_response = self._parser.parse(
+            {
+                'status_code': response.status_code,
+                'headers': response.headers,
+                'body': response.content,
+            },
+            service_model.operation_model(operation_name).output_shape,
+        )
+        parsed_response.setdefault('ResponseMetadata', {})['RetryAttempts'] = retry_attempts
+        if response.status_code >= 300:
+            # As botocore does, add the error's modeled fields, e.g. CancellationReasons
+            error_shape = service_model.shape_for_error_code(parsed_response.get('Error', {}).get('Code'))
+            if error_shape is not None:
+                parsed_response.update(self._parser.parse(
+                    {'status_code': response.status_code, 'headers': response.headers, 'body': response.content},
+                    error_shape,
+                ))
+            raise ClientError(parsed_response, operation_name)
+        return parsed_response
+
+    def _get_max_attempts(self, uses_transport: bool = True) -> int:
+        """
+        Returns the number of attempts PynamoDB makes at a request
+        """
+        if self._retry_configuration != "LEGACY" and not uses_transport:
+            # botocore retries requests itself with an explicit retry configuration
+            return 1
+        call_settings = get_call_settings()
+        if call_settings is not None and call_settings.max_retry_attempts is not None:
+            return 1 + call_settings.max_retry_attempts
+        if self._retry_configuration == "LEGACY":
+            return 1 + self._max_retry_attempts_exception
+        retries = self.client.meta.config.retries or {}  # type: ignore[attr-defined]
+        if 'total_max_attempts' in retries:
+            return retries['total_max_attempts']
+        if 'max_attempts' in retries:
+            return 1 + retries['max_attempts']
+        # botocore's defaults: DynamoDB is allowed more attempts in the "legacy" mode
+        return 10 if retries.get('mode', 'legacy') == 'legacy' else 3
+
+    def _get_verbose_client_error(
+        self,
+        e: ClientError,
+        operation_name: str,
+        operation_kwargs: Dict,
+    ) -> VerboseClientError:
+        """
+        Builds a VerboseClientError carrying the request id and table name of the failed request
+        """
+        resp_metadata = e.response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+        cancellation_reasons = e.response.get('CancellationReasons', [])
+
+        botocore_props = {'Error': e.response.get('Error', {})}
+        verbose_props = {
+            'request_id': resp_metadata.get('x-amzn-requestid', ''),
+            'table_name': self._get_table_name_for_error_context(operation_kwargs),
+        }
+        return VerboseClientError(
+            botocore_props,
+            operation_name,
+            verbose_props,
+            cancellation_reasons=(
+                (
+                    CancellationReason(
+                        code=d['Code'],
+                        message=d.get('Message'),
+                        raw_item=cast(Optional[Dict[str, Dict[str, Any]]], d.get('Item')),
+                    ) if d['Code'] != 'None' else None
+                )
+                for d in cancellation_reasons
+            ),
+        )
+
+    def _get_metrics_key(self, operation_name: str, operation_kwargs: Dict) -> MetricsKey:
+        return MetricsKey(
+            self._get_table_name_for_error_context(operation_kwargs), operation_kwargs.get(INDEX_NAME), operation_name,
+        )
+
+    def _record_attempt(
+        self,
+        operation_name: str,
+        operation_kwargs: Dict,
+        request_bytes: Optional[int],
+        data: Optional[Dict] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """
+        Records an attempt at sending a request with the connection's metrics registry
+        """
+        if self._metrics is None:
+            return
+        if error is None:
+            response_bytes = get_response_bytes(data) if data else None
+            throttled = False
+        else:
+            response = getattr(error, 'response', None)
+            response_bytes = get_response_bytes(response) if response else None
+            throttled = classify_error(error) == THROTTLING
+        self._metrics.record_attempt(
+            self._get_metrics_key(operation_name, operation_kwargs), request_bytes, response_bytes, throttled,
+        )
 
     def _get_table_name_for_error_context(self, operation_kwargs) -> str:
+        return ','.join(self._get_table_names(operation_kwargs))
+
+    @staticmethod
+    def _get_table_names(operation_kwargs: Dict) -> List[str]:
         # First handle the two multi-table cases: batch and transaction operations
         if REQUEST_ITEMS in operation_kwargs:
-            return ','.join(operation_kwargs[REQUEST_ITEMS])
+            return list(operation_kwargs[REQUEST_ITEMS])
         elif TRANSACT_ITEMS in operation_kwargs:
             table_names = []
             for item in operation_kwargs[TRANSACT_ITEMS]:
                 for op in item.values():
                     table_names.append(op[TABLE_NAME])
-            return ",".join(table_names)
-        return operation_kwargs.get(TABLE_NAME)
+            return table_names
+        table_name = operation_kwargs.get(TABLE_NAME)
+        return [table_name] if table_name is not None else []
+
+    def _get_circuit_keys(self, operation_kwargs: Dict) -> List[CircuitKey]:
+        """
+        Returns the circuit breaker keys of the tables and index used by a request
+        """
+        index_name = operation_kwargs.get(INDEX_NAME)
+        return list(dict.fromkeys((table_name, index_name) for table_name in self._get_table_names(operation_kwargs)))
 
     @property
     def session(self) -> botocore.session.Session:
@@ -408,6 +1109,9 @@ class Connection(object):
         # botocore client creation is not thread safe as of v1.2.5+ (see issue #153)
         if getattr(self._local, 'session', None) is None:
             self._local.session = get_session()
+            # Loading and parsing the service model is the bulk of the cost of creating a client,
+            # so all sessions share the loader that caches it.
+            self._local.session.register_component('data_loader', _get_data_loader(self._local.session))
             if self._aws_access_key_id and self._aws_secret_access_key:
                 self._local.session.set_credentials(self._aws_access_key_id,
                                                         self._aws_secret_access_key,
@@ -421,30 +1125,140 @@ class Connection(object):
         """
         # botocore has a known issue where it will cache empty credentials
         # https://github.com/boto/botocore/blob/4d55c9b4142/botocore/credentials.py#L1016-L1021
-        # if the client does not have credentials, we create a new client
+        # if the client does not have credentials, we don't cache it and create a new client next time
         # otherwise the client is permanently poisoned in the case of metadata service flakiness when using IAM roles
-        if not self._client or (self._client._request_signer and not self._client._request_signer._credentials):
-            # Check if we are using the "LEGACY" retry mode to keep previous PynamoDB
-            # retry behavior, or if we are using the new retry configuration settings.
-            if self._retry_configuration != "LEGACY":
-                retries = self._retry_configuration
-            else:
-                retries = {
-                    'total_max_attempts': 1 + self._max_retry_attempts_exception,
-                    'mode': 'standard',
-                }
+        # (credentials are checked once, when the client is created, rather than on every access)
+        client = self._client
+        if client is not None and self._pid == os.getpid():
+            return client
+        if self._pid != os.getpid():
+            # Inherited across a fork that bypassed os.register_at_fork (e.g. a fork from C code)
+            self._reset_after_fork()
+        if self._share_clients:
+            client = client_registry.get_client(self._get_client_key(), self._create_client)
+        else:
+            client = self._create_client(self._max_pool_connections)
+        if not (client._request_signer and not client._request_signer._credentials):
+            self._client = client
+        return client
 
-            config = botocore.client.Config(
-                parameter_validation=False,  # Disable unnecessary validation for performance
-                connect_timeout=self._connect_timeout_seconds,
-                read_timeout=self._read_timeout_seconds,
-                max_pool_connections=self._max_pool_connections,
-                retries=retries,
-            )
-            self._client = cast(BotocoreBaseClientPrivate, self.session.create_client(SERVICE_NAME, self.region, endpoint_url=self.host, config=config))
+    def _reset_after_fork(self) -> None:
+        """
+        Drops the client and sessions inherited from the parent process, leaving the parent's connections open
+        """
+        self._pid = os.getpid()
+        self._client = None
+        self._local = local()
+        self._signer = None
+        self._botocore_transport = None
+        self._endpoint_connections = {}
+        if self._transport is not None:
+            self._transport.after_fork()
+
+    def _create_client(self, max_pool_connections: int) -> BotocoreBaseClientPrivate:
+        config = botocore.client.Config(
+            parameter_validation=False,  # Disable unnecessary validation for performance
+            connect_timeout=self._connect_timeout_seconds,
+            read_timeout=self._read_timeout_seconds,
+            max_pool_connections=max_pool_connections,
+            retries=self._get_retries_config(),
+        )
+        client = cast(BotocoreBaseClientPrivate, self.session.create_client(SERVICE_NAME, self.region, endpoint_url=self.host, config=config))
+        client.meta.events.register_first('before-send.*.*', self._before_send)
+        client.meta.events.register('before-sign.*.*', _mark_serialized)
+        client.meta.events.register('before-parse.*.*', _mark_received)
+        configure_http_session(
+            client._endpoint.http_session,
+            tcp_nodelay=self._tcp_nodelay,
+            tcp_keepalive=self._tcp_keepalive,
+            max_idle_seconds=self._max_connection_idle_seconds,
+            max_lifetime_seconds=self._max_connection_lifetime_seconds,
+            auto_sizing=self._pool_auto_sizing,
+        )
+        return client
 
-            self._client.meta.events.register_first('before-send.*.*', self._before_send)
-        return self._client
+    @property
+    def pool_metrics(self) -> Optional[PoolMetrics]:
+        """
+        Returns the metrics of the connection pool requests are sent through,
+        or None if the connection's transport doesn't have one
+        """
+        if self._transport is not None:
+            return getattr(self._transport, 'pool_metrics', None)
+        return get_pool_metrics(self.client._endpoint.http_session)
+
+    def _get_pool_metrics(self) -> Optional[PoolMetrics]:
+        # Unlike `pool_metrics`, this doesn't create the client, so requests dispatched before
+        # the client has been created aren't counted as in flight
+        if self._transport is not None:
+            return getattr(self._transport, 'pool_metrics', None)
+        if self._client is None:
+            return None
+        return get_pool_metrics(self._client._endpoint.http_session)
+
+    def _get_retries_config(self) -> Any:
+        # In the "LEGACY" retry mode PynamoDB retries requests itself (see `_make_api_call`),
+        # otherwise botocore is left to retry them with the given retry configuration.
+        if self._retry_configuration != "LEGACY":
+            return self._retry_configuration
+        return {
+            'total_max_attempts': 1,
+            'mode': 'standard',
+        }
+
+    def _get_client_key(self) -> Tuple:
+        """
+        Returns the key of this connection's client in the client registry
+        """
+        retries = self._get_retries_config()
+        return (
+            self.region,
+            self.host,
+            self._aws_access_key_id,
+            self._aws_secret_access_key,
+            self._aws_session_token,
+            self._connect_timeout_seconds,
+            self._read_timeout_seconds,
+            tuple(sorted(retries.items())) if retries is not None else None,
+            # Extra headers are added by the client's before-send handler
+            tuple(sorted(self._extra_headers.items())) if self._extra_headers is not None else None,
+            self._tcp_nodelay,
+            self._tcp_keepalive,
+            self._max_connection_idle_seconds,
+            self._max_connection_lifetime_seconds,
+            self._pool_auto_sizing,
+        )
+
+    def warmup(self, open_connections: int = 0) -> int:
+        """
+        Does the one-off work of the first request ahead of time: creating the client, loading the
+        operation models, resolving credentials and, optionally, opening pooled connections.
+
+        Returns the number of connections opened.
+        """
+        if self._router is not None:
+            return sum(
+                self._get_endpoint_connection(endpoint)._warmup(open_connections)
+                for endpoint in self._router.endpoints
+            )
+        return self._warmup(open_connections)
+
+    def _warmup(self, open_connections: int) -> int:
+        client = self.client
+        service_model = client.meta.service_model
+        for operation_name in _json_codec.LEAN_CODEC_OPERATIONS:
+            service_model.operation_model(operation_name)
+        signer = self._get_signer()
+        if signer is not None:
+            signer.get_credentials()
+        if self._transport is not None or self._lean_codec:
+            if self._serializer is None:
+                self._serializer = create_serializer(service_model.protocol, include_validation=False)
+            if self._parser is None:
+                self._parser = create_parser(service_model.protocol)
+        if open_connections <= 0:
+            return 0
+        return self._get_transport().open_connections(client.meta.endpoint_url, open_connections)
 
     def add_meta_table(self, meta_table: MetaTable) -> None:
         """
@@ -690,6 +1504,15 @@ class Connection(object):
             item_key=item_key,
             pythonic_key=pythonic_key)
 
+    def _get_attribute_value_map(self, table_name: str, attributes: Any) -> Dict:
+        """
+        Returns `attributes` as an AttributeValue map, reusing it if it already is one
+        """
+        for value in attributes.values():
+            if not isinstance(value, dict):
+                return self.get_item_attribute_map(table_name, attributes)[ITEM]
+        return attributes
+
     def parse_attribute(
         self,
         attribute: Any,
@@ -970,6 +1793,30 @@ class Connection(object):
         """
         Performs the TransactWrite operation and returns the result
         """
+        operation_kwargs = self._get_transact_write_items_kwargs(
+            condition_check_items,
+            delete_items,
+            put_items,
+            update_items,
+            client_request_token=client_request_token,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+        try:
+            return self.dispatch(TRANSACT_WRITE_ITEMS, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise TransactWriteError("Failed to write transaction items", e)
+
+    def _get_transact_write_items_kwargs(
+        self,
+        condition_check_items: Sequence[Dict],
+        delete_items: Sequence[Dict],
+        put_items: Sequence[Dict],
+        update_items: Sequence[Dict],
+        client_request_token: Optional[str] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
         transact_items: List[Dict] = []
         transact_items.extend(
             {TRANSACT_CONDITION_CHECK: item} for item in condition_check_items
@@ -990,11 +1837,7 @@ class Connection(object):
             return_item_collection_metrics=return_item_collection_metrics
         )
         operation_kwargs[TRANSACT_ITEMS] = transact_items
-
-        try:
-            return self.dispatch(TRANSACT_WRITE_ITEMS, operation_kwargs)
-        except BOTOCORE_EXCEPTIONS as e:
-            raise TransactWriteError("Failed to write transaction items", e)
+        return operation_kwargs
 
     def transact_get_items(
         self,
@@ -1004,16 +1847,26 @@ class Connection(object):
         """
         Performs the TransactGet operation and returns the result
         """
-        operation_kwargs = self._get_transact_operation_kwargs(return_consumed_capacity=return_consumed_capacity)
-        operation_kwargs[TRANSACT_ITEMS] = [
-            {TRANSACT_GET: item} for item in get_items
-        ]
-
+        operation_kwargs = self._get_transact_get_items_kwargs(
+            get_items,
+            return_consumed_capacity=return_consumed_capacity,
+        )
         try:
             return self.dispatch(TRANSACT_GET_ITEMS, operation_kwargs)
         except BOTOCORE_EXCEPTIONS as e:
             raise TransactGetError("Failed to get transaction items", e)
 
+    def _get_transact_get_items_kwargs(
+        self,
+        get_items: Sequence[Dict],
+        return_consumed_capacity: Optional[str] = None,
+    ) -> Dict:
+        operation_kwargs = self._get_transact_operation_kwargs(return_consumed_capacity=return_consumed_capacity)
+        operation_kwargs[TRANSACT_ITEMS] = [
+            {TRANSACT_GET: item} for item in get_items
+        ]
+        return operation_kwargs
+
     def batch_write_item(
         self,
         table_name: str,
@@ -1025,6 +1878,26 @@ class Connection(object):
         """
         Performs the batch_write_item operation
         """
+        operation_kwargs = self._get_batch_write_item_kwargs(
+            table_name,
+            put_items=put_items,
+            delete_items=delete_items,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+        try:
+            return self.dispatch(BATCH_WRITE_ITEM, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise PutError("Failed to batch write items: {}".format(e), e)
+
+    def _get_batch_write_item_kwargs(
+        self,
+        table_name: str,
+        put_items: Optional[Any] = None,
+        delete_items: Optional[Any] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
         if put_items is None and delete_items is None:
             raise ValueError("Either put_items or delete_items must be specified")
         operation_kwargs: Dict[str, Any] = {
@@ -1040,19 +1913,16 @@ class Connection(object):
         if put_items:
             for item in put_items:
                 put_items_list.append({
-                    PUT_REQUEST: self.get_item_attribute_map(table_name, item, pythonic_key=False)
+                    PUT_REQUEST: {ITEM: self._get_attribute_value_map(table_name, item)}
                 })
         delete_items_list = []
         if delete_items:
             for item in delete_items:
                 delete_items_list.append({
-                    DELETE_REQUEST: self.get_item_attribute_map(table_name, item, item_key=KEY, pythonic_key=False)
+                    DELETE_REQUEST: {KEY: self._get_attribute_value_map(table_name, item)}
                 })
         operation_kwargs[REQUEST_ITEMS][table_name] = delete_items_list + put_items_list
-        try:
-            return self.dispatch(BATCH_WRITE_ITEM, operation_kwargs)
-        except BOTOCORE_EXCEPTIONS as e:
-            raise PutError("Failed to batch write items: {}".format(e), e)
+        return operation_kwargs
 
     def batch_get_item(
         self,
@@ -1061,10 +1931,31 @@ class Connection(object):
         consistent_read: Optional[bool] = None,
         return_consumed_capacity: Optional[str] = None,
         attributes_to_get: Optional[Any] = None,
+        hedge: Optional[bool] = None,
     ) -> Dict:
         """
         Performs the batch get item operation
         """
+        operation_kwargs = self._get_batch_get_item_kwargs(
+            table_name,
+            keys,
+            consistent_read=consistent_read,
+            return_consumed_capacity=return_consumed_capacity,
+            attributes_to_get=attributes_to_get,
+        )
+        try:
+            return self.dispatch(BATCH_GET_ITEM, operation_kwargs, hedge=hedge)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise GetError("Failed to batch get items: {}".format(e), e)
+
+    def _get_batch_get_item_kwargs(
+        self,
+        table_name: str,
+        keys: Sequence[str],
+        consistent_read: Optional[bool] = None,
+        return_consumed_capacity: Optional[str] = None,
+        attributes_to_get: Optional[Any] = None,
+    ) -> Dict:
         operation_kwargs: Dict[str, Any] = {
             REQUEST_ITEMS: {
                 table_name: {}
@@ -1087,13 +1978,10 @@ class Connection(object):
         keys_map: Dict[str, List] = {KEYS: []}
         for key in keys:
             keys_map[KEYS].append(
-                self.get_item_attribute_map(table_name, key)[ITEM]
+                self._get_attribute_value_map(table_name, key)
             )
         operation_kwargs[REQUEST_ITEMS][table_name].update(keys_map)
-        try:
-            return self.dispatch(BATCH_GET_ITEM, operation_kwargs)
-        except BOTOCORE_EXCEPTIONS as e:
-            raise GetError("Failed to batch get items: {}".format(e), e)
+        return operation_kwargs
 
     def get_item(
         self,
@@ -1102,6 +1990,7 @@ class Connection(object):
         range_key: Optional[str] = None,
         consistent_read: bool = False,
         attributes_to_get: Optional[Any] = None,
+        hedge: Optional[bool] = None,
     ) -> Dict:
         """
         Performs the GetItem operation and returns the result
@@ -1114,7 +2003,7 @@ class Connection(object):
             attributes_to_get=attributes_to_get
         )
         try:
-            return self.dispatch(GET_ITEM, operation_kwargs)
+            return self.dispatch(GET_ITEM, operation_kwargs, hedge=hedge)
         except BOTOCORE_EXCEPTIONS as e:
             raise GetError("Failed to get item: {}".format(e), e)
 
@@ -1134,6 +2023,36 @@ class Connection(object):
         """
         Performs the scan operation
         """
+        operation_kwargs = self._get_scan_kwargs(
+            table_name,
+            filter_condition=filter_condition,
+            attributes_to_get=attributes_to_get,
+            limit=limit,
+            return_consumed_capacity=return_consumed_capacity,
+            exclusive_start_key=exclusive_start_key,
+            segment=segment,
+            total_segments=total_segments,
+            consistent_read=consistent_read,
+            index_name=index_name,
+        )
+        try:
+            return self.dispatch(SCAN, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise ScanError("Failed to scan table: {}".format(e), e)
+
+    def _get_scan_kwargs(
+        self,
+        table_name: str,
+        filter_condition: Optional[Any] = None,
+        attributes_to_get: Optional[Any] = None,
+        limit: Optional[int] = None,
+        return_consumed_capacity: Optional[str] = None,
+        exclusive_start_key: Optional[str] = None,
+        segment: Optional[int] = None,
+        total_segments: Optional[int] = None,
+        consistent_read: Optional[bool] = None,
+        index_name: Optional[str] = None,
+    ) -> Dict:
         self._check_condition('filter_condition', filter_condition)
 
         operation_kwargs: Dict[str, Any] = {TABLE_NAME: table_name}
@@ -1164,11 +2083,7 @@ class Connection(object):
             operation_kwargs[EXPRESSION_ATTRIBUTE_NAMES] = self._reverse_dict(name_placeholders)
         if expression_attribute_values:
             operation_kwargs[EXPRESSION_ATTRIBUTE_VALUES] = expression_attribute_values
-
-        try:
-            return self.dispatch(SCAN, operation_kwargs)
-        except BOTOCORE_EXCEPTIONS as e:
-            raise ScanError("Failed to scan table: {}".format(e), e)
+        return operation_kwargs
 
     def query(
         self,
@@ -1184,10 +2099,45 @@ class Connection(object):
         return_consumed_capacity: Optional[str] = None,
         scan_index_forward: Optional[bool] = None,
         select: Optional[str] = None,
+        hedge: Optional[bool] = None,
     ) -> Dict:
         """
         Performs the Query operation and returns the result
         """
+        operation_kwargs = self._get_query_kwargs(
+            table_name,
+            hash_key,
+            range_key_condition=range_key_condition,
+            filter_condition=filter_condition,
+            attributes_to_get=attributes_to_get,
+            consistent_read=consistent_read,
+            exclusive_start_key=exclusive_start_key,
+            index_name=index_name,
+            limit=limit,
+            return_consumed_capacity=return_consumed_capacity,
+            scan_index_forward=scan_index_forward,
+            select=select,
+        )
+        try:
+            return self.dispatch(QUERY, operation_kwargs, hedge=hedge)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise QueryError("Failed to query items: {}".format(e), e)
+
+    def _get_query_kwargs(
+        self,
+        table_name: str,
+        hash_key: str,
+        range_key_condition: Optional[Condition] = None,
+        filter_condition: Optional[Any] = None,
+        attributes_to_get: Optional[Any] = None,
+        consistent_read: bool = False,
+        exclusive_start_key: Optional[Any] = None,
+        index_name: Optional[str] = None,
+        limit: Optional[int] = None,
+        return_consumed_capacity: Optional[str] = None,
+        scan_index_forward: Optional[bool] = None,
+        select: Optional[str] = None,
+    ) -> Dict:
         self._check_condition('range_key_condition', range_key_condition)
         self._check_condition('filter_condition', filter_condition)
 
@@ -1238,11 +2188,7 @@ class Connection(object):
             operation_kwargs[EXPRESSION_ATTRIBUTE_NAMES] = self._reverse_dict(name_placeholders)
         if expression_attribute_values:
             operation_kwargs[EXPRESSION_ATTRIBUTE_VALUES] = expression_attribute_values
-
-        try:
-            return self.dispatch(QUERY, operation_kwargs)
-        except BOTOCORE_EXCEPTIONS as e:
-            raise QueryError("Failed to query items: {}".format(e), e)
+        return operation_kwargs
 
     def _check_condition(self, name, condition):
         if condition is not None:
@@ -0,0 +1,154 @@
+"""
+Call settings
+~~~~~~~~~~~~~
+
+Timeouts and retries are configured per connection, so on their own they can't keep an operation within
+the time a caller has left, e.g. what remains of a request handler's budget. Call settings apply to all
+requests made in a ``with`` block (and, in asyncio code, to the current task):
+
+.. code-block:: python
+
+    from pynamodb.connection.call_settings import call_settings
+
+    with call_settings(timeout_seconds=0.2):
+        threads = list(Thread.query('forum'))
+
+No request is sent, and no retry is scheduled, once the deadline has passed or would pass while waiting;
+:class:`~pynamodb.exceptions.DeadlineExceededError` is raised instead. The read timeout of each request is
+also shortened to the time remaining, for requests sent by the botocore client, ``URLLib3Transport`` or an
+asyncio transport; requests sent through other transports can still run past the deadline, which is only
+checked between attempts. Result iterators, ``batch_get`` and batch writers keep the settings in effect when they were
+created, so pages fetched after the ``with`` block has exited still have the same deadline.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import ContextManager, Iterator, Optional
+
+from pynamodb.exceptions import DeadlineExceededError
+
+_current_call_settings: 'ContextVar[Optional[CallSettings]]' = ContextVar('pynamodb_call_settings', default=None)
+
+
+class CallSettings:
+    """
+    Settings for the requests made by an operation.
+
+    :param timeout_seconds: the time the operation may take, from now
+    :param deadline: the :func:`time.monotonic` time by which the operation must complete
+    :param read_timeout_seconds: overrides the read timeout of each request
+    :param max_retry_attempts: overrides the number of times each failed request is retried
+    :param consistent_read: if True, reads that aren't on an index are strongly consistent
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: Optional[float] = None,
+        deadline: Optional[float] = None,
+        read_timeout_seconds: Optional[float] = None,
+        max_retry_attempts: Optional[int] = None,
+        consistent_read: bool = False,
+    ) -> None:
+        if timeout_seconds is not None:
+            timeout_deadline = time.monotonic() + timeout_seconds
+            deadline = timeout_deadline if deadline is None else min(deadline, timeout_deadline)
+        self.deadline = deadline
+        self.read_timeout_seconds = read_timeout_seconds
+        self.max_retry_attempts = max_retry_attempts
+        self.consistent_read = consistent_read
+
+    def __repr__(self) -> str:
+        return 'CallSettings(deadline={}, read_timeout_seconds={}, max_retry_attempts={}, consistent_read={})'.format(
+            self.deadline, self.read_timeout_seconds, self.max_retry_attempts, self.consistent_read,
+        )
+
+    def get_remaining_seconds(self) -> Optional[float]:
+        """
+        Returns the time left until the deadline, or None if there is no deadline
+        """
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def check_deadline(self, delay: float = 0.0, operation_name: Optional[str] = None) -> None:
+        """
+        Raises DeadlineExceededError if the deadline will have passed after waiting for `delay` seconds
+        """
+        remaining = self.get_remaining_seconds()
+        if remaining is not None and remaining <= delay:
+            if operation_name is None:
+                raise DeadlineExceededError()
+            raise DeadlineExceededError("Deadline exceeded before {} could be sent".format(operation_name))
+
+    def get_read_timeout(self, read_timeout_seconds: Optional[float]) -> Optional[float]:
+        """
+        Returns the read timeout of a request made now, given the connection's read timeout
+        """
+        if self.read_timeout_seconds is not None:
+            read_timeout_seconds = self.read_timeout_seconds
+        remaining = self.get_remaining_seconds()
+        if remaining is None:
+            return read_timeout_seconds
+        remaining = max(remaining, 0.001)
+        return remaining if read_timeout_seconds is None else min(read_timeout_seconds, remaining)
+
+    def merge(self, outer: Optional['CallSettings']) -> 'CallSettings':
+        """
+        Returns these settings, nested in `outer`: the earlier deadline applies, other settings override `outer`'s
+        """
+        if outer is None:
+            return self
+        merged = CallSettings(
+            read_timeout_seconds=self.read_timeout_seconds,
+            max_retry_attempts=self.max_retry_attempts,
+            consistent_read=self.consistent_read or outer.consistent_read,
+        )
+        if self.read_timeout_seconds is None:
+            merged.read_timeout_seconds = outer.read_timeout_seconds
+        if self.max_retry_attempts is None:
+            merged.max_retry_attempts = outer.max_retry_attempts
+        deadlines = [deadline for deadline in (self.deadline, outer.deadline) if deadline is not None]
+        merged.deadline = min(deadlines) if deadlines else None
+        return merged
+
+
+def get_call_settings() -> Optional[CallSettings]:
+    """
+    Returns the call settings in effect, if any
+    """
+    return _current_call_settings.get()
+
+
+@contextmanager
+def use_call_settings(settings: Optional[CallSettings]) -> Iterator[Optional[CallSettings]]:
+    """
+    Applies `settings` (nested in the settings already in effect) to the requests made in a ``with`` block
+    """
+    if settings is None:
+        yield get_call_settings()
+        return
+    merged = settings.merge(get_call_settings())
+    token = _current_call_settings.set(merged)
+    try:
+        yield merged
+    finally:
+        _current_call_settings.reset(token)
+
+
+def call_settings(
+    timeout_seconds: Optional[float] = None,
+    deadline: Optional[float] = None,
+    read_timeout_seconds: Optional[float] = None,
+    max_retry_attempts: Optional[int] = None,
+    consistent_read: bool = False,
+) -> ContextManager[Optional[CallSettings]]:
+    """
+    Applies :class:`CallSettings` with the given arguments to the requests made in a ``with`` block
+    """
+    return use_call_settings(CallSettings(
+        timeout_seconds=timeout_seconds,
+        deadline=deadline,
+        read_timeout_seconds=read_timeout_seconds,
+        max_retry_attempts=max_retry_attempts,
+        consistent_read=consistent_read,
+    ))
@@ -0,0 +1,248 @@
+"""
+Consumed capacity
+~~~~~~~~~~~~~~~~~
+
+Data plane requests return the capacity they consumed. It is added up in :class:`CapacityLedger` objects,
+per table, index and operation:
+
+* the process-wide ledger, :func:`get_process_ledger`
+* each connection's ledger, and so each model's: ``Thread.get_consumed_capacity()``
+* the ``consumed_capacity`` of result iterators, batch writes and transactions, for the requests they sent
+* the ledger of a :func:`track_consumed_capacity` block, for the requests made by a code path or job:
+
+.. code-block:: python
+
+    from pynamodb.connection.capacity import track_consumed_capacity
+
+    with track_consumed_capacity() as ledger:
+        run_job()
+    print(ledger.read_capacity_units, ledger.write_capacity_units)
+
+Responses to requests with the default ``ReturnConsumedCapacity`` of ``TOTAL`` only report the capacity
+consumed by the table or index read from or written to. Requests made with ``INDEXES`` also report the capacity
+consumed by each global and local secondary index updated by a write.
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+from pynamodb.connection import _fork
+from pynamodb.constants import (
+    BATCH_GET_ITEM, CAPACITY_UNITS, GET_ITEM, GLOBAL_SECONDARY_INDEXES, INDEX_NAME, LOCAL_SECONDARY_INDEXES, QUERY,
+    READ_CAPACITY_UNITS, SCAN, TABLE_NAME, TRANSACT_GET_ITEMS, WRITE_CAPACITY_UNITS,
+)
+
+READ_OPERATIONS = frozenset([GET_ITEM, BATCH_GET_ITEM, QUERY, SCAN, TRANSACT_GET_ITEMS])
+
+_TABLE = 'Table'
+
+_active_ledgers: 'ContextVar[Tuple[CapacityLedger, ...]]' = ContextVar('pynamodb_capacity_ledgers', default=())
+
+
+class CapacityKey(NamedTuple):
+    table_name: str
+    index_name: Optional[str]
+    operation_name: str
+
+
+class CapacityUsage:
+    """
+    Read and write capacity units consumed
+    """
+
+    def __init__(self, read_capacity_units: float = 0.0, write_capacity_units: float = 0.0) -> None:
+        self.read_capacity_units = read_capacity_units
+        self.write_capacity_units = write_capacity_units
+
+    def __repr__(self) -> str:
+        return 'CapacityUsage(read_capacity_units={}, write_capacity_units={})'.format(
+            self.read_capacity_units, self.write_capacity_units,
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, CapacityUsage)
+            and self.read_capacity_units == other.read_capacity_units
+            and self.write_capacity_units == other.write_capacity_units
+        )
+
+    @property
+    def capacity_units(self) -> float:
+        return self.read_capacity_units + self.write_capacity_units
+
+
+class CapacityLedger:
+    """
+    Running totals of the capacity consumed per table, index and operation
+    """
+
+    def __init__(self) -> None:
+        self._usage: Dict[CapacityKey, CapacityUsage] = {}
+        self._total = CapacityUsage()
+        self._lock = threading.Lock()
+        _fork.track_lock(self)
+
+    def __repr__(self) -> str:
+        return 'CapacityLedger(read_capacity_units={}, write_capacity_units={})'.format(
+            self.read_capacity_units, self.write_capacity_units,
+        )
+
+    @property
+    def read_capacity_units(self) -> float:
+        return self._total.read_capacity_units
+
+    @property
+    def write_capacity_units(self) -> float:
+        return self._total.write_capacity_units
+
+    @property
+    def capacity_units(self) -> float:
+        return self._total.capacity_units
+
+    def record(self, key: CapacityKey, read_capacity_units: float, write_capacity_units: float) -> None:
+        with self._lock:
+            usage = self._usage.get(key)
+            if usage is None:
+                usage = self._usage[key] = CapacityUsage()
+            usage.read_capacity_units += read_capacity_units
+            usage.write_capacity_units += write_capacity_units
+            self._total.read_capacity_units += read_capacity_units
+            self._total.write_capacity_units += write_capacity_units
+
+    def snapshot(self) -> Dict[CapacityKey, CapacityUsage]:
+        """
+        Returns a copy of the capacity consumed per table, index and operation
+        """
+        with self._lock:
+            return {
+                key: CapacityUsage(usage.read_capacity_units, usage.write_capacity_units)
+                for key, usage in self._usage.items()
+            }
+
+    def get_usage(
+        self,
+        table_name: Optional[str] = None,
+        operation_name: Optional[str] = None,
+        **kwargs: Any,
+    ) -> CapacityUsage:
+        """
+        Returns the capacity consumed by the table, index and operation given, or by all of them if not given.
+        Pass ``index_name=None`` for the capacity consumed by a table's base table only.
+        """
+        total = CapacityUsage()
+        for key, usage in self.snapshot().items():
+            if table_name is not None and key.table_name != table_name:
+                continue
+            if operation_name is not None and key.operation_name != operation_name:
+                continue
+            if 'index_name' in kwargs and key.index_name != kwargs['index_name']:
+                continue
+            total.read_capacity_units += usage.read_capacity_units
+            total.write_capacity_units += usage.write_capacity_units
+        return total
+
+    def reset(self) -> Dict[CapacityKey, CapacityUsage]:
+        """
+        Clears the ledger, returning the capacity consumed so far
+        """
+        with self._lock:
+            usage, self._usage = self._usage, {}
+            self._total = CapacityUsage()
+        return usage
+
+
+_process_ledger = CapacityLedger()
+
+
+def get_process_ledger() -> CapacityLedger:
+    """
+    Returns the ledger of the capacity consumed by all requests made by this process
+    """
+    return _process_ledger
+
+
+@contextmanager
+def use_capacity_ledger(ledger: Optional[CapacityLedger]) -> Iterator[Optional[CapacityLedger]]:
+    """
+    Adds the capacity consumed by requests made in the block to `ledger`, if it isn't None
+    """
+    if ledger is None:
+        yield None
+        return
+    token = _active_ledgers.set(_active_ledgers.get() + (ledger,))
+    try:
+        yield ledger
+    finally:
+        _active_ledgers.reset(token)
+
+
+@contextmanager
+def track_consumed_capacity() -> Iterator[CapacityLedger]:
+    """
+    Returns a new ledger of the capacity consumed by the requests made in the block
+    """
+    ledger = CapacityLedger()
+    with use_capacity_ledger(ledger):
+        yield ledger
+
+
+def record_consumed_capacity(
+    connection_ledger: Optional[CapacityLedger],
+    operation_name: str,
+    operation_kwargs: Mapping[str, Any],
+    consumed_capacity: Any,
+) -> None:
+    """
+    Adds the capacity consumed by a request to the process-wide ledger, `connection_ledger` and the active ledgers
+    """
+    entries = parse_consumed_capacity(operation_name, operation_kwargs, consumed_capacity)
+    ledgers: Iterable[CapacityLedger] = (_process_ledger,) + _active_ledgers.get()
+    if connection_ledger is not None:
+        ledgers = (connection_ledger,) + tuple(ledgers)
+    for key, read_capacity_units, write_capacity_units in entries:
+        for ledger in ledgers:
+            ledger.record(key, read_capacity_units, write_capacity_units)
+
+
+def parse_consumed_capacity(
+    operation_name: str,
+    operation_kwargs: Mapping[str, Any],
+    consumed_capacity: Any,
+) -> List[Tuple[CapacityKey, float, float]]:
+    """
+    Returns the read and write capacity units consumed per table and index, from the ``ConsumedCapacity``
+    of a response (a list for batch and transaction operations)
+    """
+    if isinstance(consumed_capacity, dict):
+        consumed_capacity = [consumed_capacity]
+    is_read = operation_name in READ_OPERATIONS
+    entries = []
+    for entry in consumed_capacity or ():
+        table_name = entry.get(TABLE_NAME, '')
+        if _TABLE in entry or GLOBAL_SECONDARY_INDEXES in entry or LOCAL_SECONDARY_INDEXES in entry:
+            # Broken down by index, with ReturnConsumedCapacity=INDEXES
+            if _TABLE in entry:
+                entries.append(_get_entry(table_name, None, operation_name, entry[_TABLE], is_read))
+            for indexes in (entry.get(GLOBAL_SECONDARY_INDEXES) or {}, entry.get(LOCAL_SECONDARY_INDEXES) or {}):
+                for index_name, units in indexes.items():
+                    entries.append(_get_entry(table_name, index_name, operation_name, units, is_read))
+        else:
+            entries.append(_get_entry(table_name, operation_kwargs.get(INDEX_NAME), operation_name, entry, is_read))
+    return entries
+
+
+def _get_entry(
+    table_name: str,
+    index_name: Optional[str],
+    operation_name: str,
+    units: Mapping[str, Any],
+    is_read: bool,
+) -> Tuple[CapacityKey, float, float]:
+    key = CapacityKey(table_name, index_name, operation_name)
+    read_capacity_units = units.get(READ_CAPACITY_UNITS)
+    write_capacity_units = units.get(WRITE_CAPACITY_UNITS)
+    if read_capacity_units is None and write_capacity_units is None:
+        capacity_units = units.get(CAPACITY_UNITS) or 0.0
+        return (key, capacity_units, 0.0) if is_read else (key, 0.0, capacity_units)
+    return key, read_capacity_units or 0.0, write_capacity_units or 0.0
@@ -0,0 +1,175 @@
+"""
+Circuit breaker
+~~~~~~~~~~~~~~~
+
+When a table or index is throttled or failing, every request to it waits for its timeouts and retries
+before failing, tying up threads (or connections) that requests to healthy tables then have to wait for.
+A circuit breaker counts the failures of recent requests to each table and index, and once too many of
+them fail, "opens" to fail further requests immediately with a
+:class:`~pynamodb.exceptions.CircuitBreakerOpenError`. After a while it lets a few probe requests through
+("half-open"), and closes again once they succeed.
+
+Only throttling, ``5xx`` and connection errors count as failures; an error such as a failed condition check
+means the table is healthy. State changes are sent as the ``circuit_breaker_state_changed`` signal.
+"""
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pynamodb.connection import _fork
+from pynamodb.connection.retry import classify_error
+from pynamodb.exceptions import CircuitBreakerOpenError
+from pynamodb.signals import circuit_breaker_state_changed
+
+log = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# (table name, index name)
+CircuitKey = Tuple[str, Optional[str]]
+
+
+class _Circuit:
+    __slots__ = ('state', 'opened_at', 'window_started_at', 'requests', 'failures', 'probes', 'probe_successes')
+
+    def __init__(self, now: float) -> None:
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.window_started_at = now
+        self.requests = 0
+        self.failures = 0
+        self.probes = 0
+        self.probe_successes = 0
+
+
+class CircuitBreaker:
+    """
+    Fails requests to tables and indexes that are failing, instead of waiting for them to time out.
+
+    :param failure_rate_threshold: the fraction of failed requests in a window that opens the circuit
+    :param min_requests: the circuit isn't opened until at least this many requests were sent in the window
+    :param window_seconds: how long failure rates are measured over
+    :param open_seconds: how long the circuit stays open before probe requests are let through
+    :param probe_count: how many probe requests must succeed to close the circuit again
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        min_requests: int = 20,
+        window_seconds: float = 10.0,
+        open_seconds: float = 5.0,
+        probe_count: int = 3,
+    ) -> None:
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_requests = min_requests
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.probe_count = probe_count
+        self._circuits: Dict[CircuitKey, _Circuit] = {}
+        self._lock = threading.Lock()
+        _fork.track_lock(self)
+
+    def get_state(self, table_name: str, index_name: Optional[str] = None) -> str:
+        """
+        Returns the state of the circuit of a table or index: ``CLOSED``, ``OPEN`` or ``HALF_OPEN``
+        """
+        circuit = self._circuits.get((table_name, index_name))
+        return circuit.state if circuit is not None else CLOSED
+
+    def before_request(self, keys: Sequence[CircuitKey]) -> None:
+        """
+        Raises CircuitBreakerOpenError if a request to any of the tables or indexes in `keys` shouldn't be sent
+        """
+        transitions: List[Tuple[CircuitKey, str, str]] = []
+        rejected_key: Optional[CircuitKey] = None
+        now = time.monotonic()
+        with self._lock:
+            probed_circuits = []
+            for key in keys:
+                circuit = self._circuits.get(key)
+                if circuit is None or circuit.state == CLOSED:
+                    continue
+                if circuit.state == OPEN:
+                    if now - circuit.opened_at < self.open_seconds:
+                        rejected_key = key
+                        break
+                    self._set_state(key, circuit, HALF_OPEN, now, transitions)
+                if circuit.probes + circuit.probe_successes >= self.probe_count:
+                    # Enough probes are already in flight
+                    rejected_key = key
+                    break
+                probed_circuits.append(circuit)
+            else:
+                for circuit in probed_circuits:
+                    circuit.probes += 1
+        self._send(transitions)
+        if rejected_key is not None:
+            raise CircuitBreakerOpenError(*rejected_key)
+
+    def record(self, keys: Sequence[CircuitKey], error: Optional[Exception] = None) -> None:
+        """
+        Records the outcome of a request to the tables or indexes in `keys`
+        """
+        failed = error is not None and classify_error(error) is not None
+        transitions: List[Tuple[CircuitKey, str, str]] = []
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                circuit = self._circuits.get(key)
+                if circuit is None:
+                    circuit = self._circuits[key] = _Circuit(now)
+                if circuit.state == HALF_OPEN:
+                    circuit.probes = max(0, circuit.probes - 1)
+                    if failed:
+                        self._set_state(key, circuit, OPEN, now, transitions)
+                    else:
+                        circuit.probe_successes += 1
+                        if circuit.probe_successes >= self.probe_count:
+                            self._set_state(key, circuit, CLOSED, now, transitions)
+                    continue
+                if circuit.state == OPEN:
+                    # A request sent before the circuit opened
+                    continue
+                if now - circuit.window_started_at >= self.window_seconds:
+                    circuit.window_started_at = now
+                    circuit.requests = circuit.failures = 0
+                circuit.requests += 1
+                if failed:
+                    circuit.failures += 1
+                    if (
+                        circuit.requests >= self.min_requests
+                        and circuit.failures >= circuit.requests * self.failure_rate_threshold
+                    ):
+                        self._set_state(key, circuit, OPEN, now, transitions)
+        self._send(transitions)
+
+    def _set_state(
+        self,
+        key: CircuitKey,
+        circuit: _Circuit,
+        state: str,
+        now: float,
+        transitions: List[Tuple[CircuitKey, str, str]],
+    ) -> None:
+        transitions.append((key, circuit.state, state))
+        circuit.state = state
+        circuit.probes = circuit.probe_successes = 0
+        if state == OPEN:
+            circuit.opened_at = now
+        elif state == CLOSED:
+            circuit.window_started_at = now
+            circuit.requests = circuit.failures = 0
+
+    def _send(self, transitions: List[Tuple[CircuitKey, str, str]]) -> None:
+        for (table_name, index_name), old_state, new_state in transitions:
+            log.info("Circuit breaker for %s%s is now %s", table_name, '/' + index_name if index_name else '', new_state)
+            try:
+                circuit_breaker_state_changed.send(
+                    self, table_name=table_name, index_name=index_name, old_state=old_state, new_state=new_state,
+                )
+            except Exception:
+                log.exception("circuit_breaker_state_changed callback threw an exception.")
@@ -0,0 +1,185 @@
+"""
+Request hedging
+~~~~~~~~~~~~~~~
+
+A hedged read sends a duplicate of a request that is taking longer than most recent requests of the
+same kind, and returns whichever response arrives first. This trades a few percent of extra reads for
+a much shorter tail latency, since a slow request is usually slow because of the host or connection
+it happened to use rather than because of the request itself.
+
+Only idempotent reads (``GetItem``, ``BatchGetItem`` and ``Query``) are hedged.
+
+In blocking code, a hedged request and its duplicate are sent from the policy's threads, so that the caller can
+return whichever response arrives first without waiting for the other. Neither is ever queued behind other
+requests: while every thread is busy, requests are sent from the caller's thread and aren't hedged.
+
+This has a cost even for requests that are never hedged: once ``min_samples`` latencies have been recorded,
+every hedgeable read is handed to another thread and the caller waits for it, which adds a thread handoff
+(tens of microseconds) to each read. The request can't stay on the caller's thread, since a thread blocked
+in its own request couldn't return the duplicate's response before that request finishes. asyncio code
+doesn't pay this cost, and ``hedge=False`` avoids it for reads that don't need hedging.
+"""
+import contextvars
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from pynamodb.connection import _fork
+from pynamodb.constants import BATCH_GET_ITEM, GET_ITEM, QUERY
+
+# Operations that can be sent twice without changing the result
+HEDGED_OPERATIONS = frozenset([BATCH_GET_ITEM, GET_ITEM, QUERY])
+
+
+class HedgingPolicy:
+    """
+    Decides when to hedge a read, based on the latency of recent reads of the same kind.
+
+    :param percentile: a duplicate is sent once a request has taken longer than this percentile
+        of recent latencies
+    :param min_delay_seconds: the minimum time to wait before sending a duplicate
+    :param window_size: the number of recent latencies kept per operation
+    :param min_samples: no duplicates are sent until this many latencies have been recorded
+    :param max_workers: the number of threads used to send hedged requests and their duplicates from blocking code
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_delay_seconds: float = 0.005,
+        window_size: int = 1000,
+        min_samples: int = 100,
+        max_workers: int = 32,
+    ) -> None:
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        self.percentile = percentile
+        self.min_delay_seconds = min_delay_seconds
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+        self.requests = 0
+        self.hedges = 0
+        self._latencies: Dict[str, Deque[float]] = {}
+        # operation name -> (delay, number of latencies recorded since it was computed)
+        self._delays: Dict[str, Tuple[Optional[float], int]] = {}
+        self._lock = threading.Lock()
+        _fork.track_lock(self)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid = 0
+        # The number of functions submitted to the executor that haven't returned yet
+        self._in_flight = 0
+
+    @property
+    def hedge_rate(self) -> float:
+        """
+        The fraction of requests that were hedged
+        """
+        return self.hedges / self.requests if self.requests else 0.0
+
+    def record_request(self) -> None:
+        """
+        Records a request that may be hedged
+        """
+        with self._lock:
+            self.requests += 1
+
+    def record_hedge(self) -> None:
+        """
+        Records a duplicate request
+        """
+        with self._lock:
+            self.hedges += 1
+
+    def record_latency(self, operation_name: str, seconds: float) -> None:
+        """
+        Records the latency of a request that was not a duplicate
+        """
+        with self._lock:
+            latencies = self._latencies.get(operation_name)
+            if latencies is None:
+                latencies = self._latencies[operation_name] = deque(maxlen=self.window_size)
+            latencies.append(seconds)
+            delay, recorded = self._delays.get(operation_name, (None, 0))
+            self._delays[operation_name] = (delay, recorded + 1)
+
+    def get_delay(self, operation_name: str) -> Optional[float]:
+        """
+        Returns how long to wait for a response before sending a duplicate request,
+        or None if there aren't enough recent latencies to tell
+        """
+        delay, recorded = self._delays.get(operation_name, (None, 0))
+        # Sorting the window for every request would cost more than hedging saves,
+        # so the percentile is only recomputed after a tenth of the window has been replaced
+        if recorded >= max(1, self.window_size // 10) or (delay is None and recorded):
+            with self._lock:
+                latencies = sorted(self._latencies[operation_name])
+                if len(latencies) < self.min_samples:
+                    delay = None
+                else:
+                    index = min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))
+                    delay = max(self.min_delay_seconds, latencies[index])
+                self._delays[operation_name] = (delay, 0)
+        return delay
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Optional[Future]:
+        """
+        Runs `fn` on the policy's thread pool, in a copy of the caller's context (e.g. its call settings),
+        or returns None without running it if every thread is busy
+        """
+        with self._lock:
+            if self._in_flight >= self.max_workers:
+                return None
+            self._in_flight += 1
+        context = contextvars.copy_context()
+
+        def run() -> Any:
+            try:
+                return context.run(fn, *args)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+
+        try:
+            return self._get_executor().submit(run)
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+
+    def _reset_after_fork(self) -> None:
+        # The parent's threads, and the functions they were running, don't exist in a forked child
+        self._executor = None
+        self._in_flight = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        executor = self._executor
+        # A forked child inherits the executor, but not its threads
+        if executor is None or self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._executor_pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='pynamodb-hedging')
+                    self._executor_pid = os.getpid()
+                executor = self._executor
+        return executor
+
+
+_default_policy: Optional[HedgingPolicy] = None
+
+
+def get_hedging_policy(policy: Optional[HedgingPolicy], hedge: Optional[bool]) -> Optional[HedgingPolicy]:
+    """
+    Returns the policy to use for a request, given the connection's policy and the per-call `hedge` flag
+    """
+    if hedge is None:
+        return policy
+    if not hedge:
+        return None
+    if policy is not None:
+        return policy
+    global _default_policy
+    if _default_policy is None:
+        _default_policy = HedgingPolicy()
+    return _default_policy
@@ -0,0 +1,241 @@
+"""
+Hot key detection
+~~~~~~~~~~~~~~~~~
+
+Throttling is often caused by a single hot partition key, which DynamoDB doesn't report.
+A :class:`HotKeyDetector` samples the partition key of the requests a connection sends, and estimates the
+heaviest keys per table and index with a count-min sketch and a top-K list, in bounded memory:
+
+.. code-block:: python
+
+    from pynamodb.connection.hot_keys import HotKeyDetector
+
+    class Thread(Model):
+        class Meta:
+            table_name = 'Thread'
+            hot_keys = HotKeyDetector(sample_rate=0.1)
+
+    for hot_key in Thread.Meta.hot_keys.get_hot_keys('Thread'):
+        print(hot_key.key, hot_key.share)
+
+The partition key is read from the ``Key`` or ``Item`` of item, batch and transaction requests, and from the
+key condition of queries. Requests are only sampled once the table's metadata has been loaded by the connection,
+which is the case for models.
+"""
+import random
+import re
+import threading
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from pynamodb.connection import _fork
+from pynamodb.constants import (
+    BATCH_GET_ITEM, BATCH_WRITE_ITEM, DELETE_ITEM, DELETE_REQUEST, EXPRESSION_ATTRIBUTE_NAMES,
+    EXPRESSION_ATTRIBUTE_VALUES, GET_ITEM, INDEX_NAME, ITEM, KEY, KEY_CONDITION_EXPRESSION, KEYS, PUT_ITEM,
+    PUT_REQUEST, QUERY, REQUEST_ITEMS, TABLE_NAME, TRANSACT_GET_ITEMS, TRANSACT_ITEMS, TRANSACT_WRITE_ITEMS,
+    UPDATE_ITEM,
+)
+
+_KEY_OPERATIONS = frozenset([GET_ITEM, UPDATE_ITEM, DELETE_ITEM])
+
+_EQUALITY_PATTERN = re.compile(r'(#[A-Za-z0-9_]+) = (:[A-Za-z0-9_]+)')
+
+
+class HotKey(NamedTuple):
+    #: The partition key value
+    key: str
+    #: The estimated number of sampled requests for the key
+    requests: int
+    #: The estimated fraction of the table's or index's sampled requests for the key
+    share: float
+
+
+class CountMinSketch:
+    """
+    Estimates the number of times keys were added, in fixed memory.
+    Estimates are never too low, and too high by at most ``2 / width`` of the total count with a
+    probability of ``1 - 0.5 ** depth``.
+    """
+
+    def __init__(self, width: int = 1024, depth: int = 4) -> None:
+        self.width = width
+        self.depth = depth
+        self._rows = [[0] * width for _ in range(depth)]
+
+    def _get_columns(self, key: str) -> Iterator[Tuple[List[int], int]]:
+        for seed, row in enumerate(self._rows):
+            yield row, hash((seed, key)) % self.width
+
+    def add(self, key: str, count: int = 1) -> int:
+        """
+        Adds `count` to the key, returning its new estimate
+        """
+        estimate = None
+        for row, column in self._get_columns(key):
+            row[column] += count
+            if estimate is None or row[column] < estimate:
+                estimate = row[column]
+        return estimate or 0
+
+    def estimate(self, key: str) -> int:
+        return min(row[column] for row, column in self._get_columns(key))
+
+
+class _KeySketch:
+    """
+    The sampled keys of a table or index
+    """
+
+    def __init__(self, width: int, depth: int, top_k: int) -> None:
+        self.sketch = CountMinSketch(width, depth)
+        self.top_k = top_k
+        self.top: Dict[str, int] = {}
+        self.total = 0
+
+    def add(self, key: str) -> None:
+        self.total += 1
+        estimate = self.sketch.add(key)
+        top = self.top
+        if key in top or len(top) < self.top_k:
+            top[key] = estimate
+            return
+        min_key = min(top, key=top.__getitem__)
+        if estimate > top[min_key]:
+            del top[min_key]
+            top[key] = estimate
+
+
+class HotKeyDetector:
+    """
+    Samples the partition keys of requests, and estimates the heaviest keys per table and index
+
+    :param sample_rate: the fraction of requests sampled
+    :param top_k: the number of heaviest keys tracked per table and index
+    :param width: the width of the count-min sketch of each table and index
+    :param depth: the depth of the count-min sketch of each table and index
+    """
+
+    def __init__(self, sample_rate: float = 1.0, top_k: int = 10, width: int = 1024, depth: int = 4) -> None:
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate must be in (0, 1]")
+        self.sample_rate = sample_rate
+        self.top_k = top_k
+        self.width = width
+        self.depth = depth
+        self._sketches: Dict[Tuple[str, Optional[str]], _KeySketch] = {}
+        self._lock = threading.Lock()
+        _fork.track_lock(self)
+
+    def observe(self, operation_name: str, operation_kwargs: Dict, get_meta_table: Callable[[str], Any]) -> None:
+        """
+        Samples the partition keys of a request.
+        `get_meta_table` returns the metadata of a table, or None if it isn't loaded.
+        """
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+        for table_name, index_name, key in _get_request_keys(operation_name, operation_kwargs, get_meta_table):
+            self.record(table_name, index_name, key)
+
+    def record(self, table_name: str, index_name: Optional[str], key: str) -> None:
+        with self._lock:
+            sketch = self._sketches.get((table_name, index_name))
+            if sketch is None:
+                sketch = self._sketches[(table_name, index_name)] = _KeySketch(self.width, self.depth, self.top_k)
+            sketch.add(key)
+
+    def get_hot_keys(self, table_name: str, index_name: Optional[str] = None, limit: Optional[int] = None) -> List[HotKey]:
+        """
+        Returns the heaviest keys of the table, or of one of its indexes, heaviest first
+        """
+        with self._lock:
+            sketch = self._sketches.get((table_name, index_name))
+            if sketch is None:
+                return []
+            top = sorted(sketch.top.items(), key=lambda item: item[1], reverse=True)
+            total = sketch.total
+        return [HotKey(key, requests, requests / total) for key, requests in top[:limit]]
+
+    def get_sampled_count(self, table_name: str, index_name: Optional[str] = None) -> int:
+        """
+        Returns the number of keys sampled for the table, or one of its indexes
+        """
+        with self._lock:
+            sketch = self._sketches.get((table_name, index_name))
+            return sketch.total if sketch is not None else 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sketches = {}
+
+
+def _get_request_keys(
+    operation_name: str,
+    operation_kwargs: Dict,
+    get_meta_table: Callable[[str], Any],
+) -> Iterator[Tuple[str, Optional[str], str]]:
+    if operation_name in _KEY_OPERATIONS:
+        yield from _get_item_keys(operation_kwargs[TABLE_NAME], [operation_kwargs.get(KEY)], get_meta_table)
+    elif operation_name == PUT_ITEM:
+        yield from _get_item_keys(operation_kwargs[TABLE_NAME], [operation_kwargs.get(ITEM)], get_meta_table)
+    elif operation_name == QUERY:
+        yield from _get_query_key(operation_kwargs, get_meta_table)
+    elif operation_name == BATCH_GET_ITEM:
+        for table_name, request in operation_kwargs.get(REQUEST_ITEMS, {}).items():
+            yield from _get_item_keys(table_name, request.get(KEYS, []), get_meta_table)
+    elif operation_name == BATCH_WRITE_ITEM:
+        for table_name, requests in operation_kwargs.get(REQUEST_ITEMS, {}).items():
+            items = [
+                request[PUT_REQUEST].get(ITEM) if PUT_REQUEST in request else request.get(DELETE_REQUEST, {}).get(KEY)
+                for request in requests
+            ]
+            yield from _get_item_keys(table_name, items, get_meta_table)
+    elif operation_name in (TRANSACT_GET_ITEMS, TRANSACT_WRITE_ITEMS):
+        for transact_item in operation_kwargs.get(TRANSACT_ITEMS, []):
+            for request in transact_item.values():
+                item = request.get(KEY) or request.get(ITEM)
+                yield from _get_item_keys(request.get(TABLE_NAME), [item], get_meta_table)
+
+
+def _get_item_keys(
+    table_name: Optional[str],
+    items: List[Optional[Dict]],
+    get_meta_table: Callable[[str], Any],
+) -> Iterator[Tuple[str, Optional[str], str]]:
+    if table_name is None:
+        return
+    meta_table = get_meta_table(table_name)
+    if meta_table is None:
+        return
+    hash_keyname = meta_table.hash_keyname
+    for item in items:
+        if item and hash_keyname in item:
+            yield table_name, None, _format_key(item[hash_keyname])
+
+
+def _get_query_key(operation_kwargs: Dict, get_meta_table: Callable[[str], Any]) -> Iterator[Tuple[str, Optional[str], str]]:
+    table_name = operation_kwargs[TABLE_NAME]
+    meta_table = get_meta_table(table_name)
+    expression = operation_kwargs.get(KEY_CONDITION_EXPRESSION)
+    if meta_table is None or expression is None:
+        return
+    index_name = operation_kwargs.get(INDEX_NAME)
+    if index_name:
+        try:
+            hash_keyname = meta_table.get_index_hash_keyname(index_name)
+        except ValueError:
+            # The index isn't in the table's description, so its keys can't be resolved
+            return
+    else:
+        hash_keyname = meta_table.hash_keyname
+    names = operation_kwargs.get(EXPRESSION_ATTRIBUTE_NAMES) or {}
+    values = operation_kwargs.get(EXPRESSION_ATTRIBUTE_VALUES) or {}
+    for name, value in _EQUALITY_PATTERN.findall(expression):
+        if names.get(name) == hash_keyname and value in values:
+            yield table_name, index_name, _format_key(values[value])
+            return
+
+
+def _format_key(value: Dict[str, Any]) -> str:
+    # Serialized as e.g. {'S': 'forum'}; a hash key only has one type, so the value is enough
+    for attribute_value in value.values():
+        return str(attribute_value)
+    return ''
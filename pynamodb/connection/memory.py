@@ -0,0 +1,972 @@
+"""
+In-memory DynamoDB
+~~~~~~~~~~~~~~~~~~
+
+:class:`MemoryDatabase` is an in-process, thread-safe stand-in for DynamoDB, for tests and benchmarks.
+It plugs in under a connection as a transport, so requests go through the same serialization, signing,
+retries and error mapping as requests sent to DynamoDB:
+
+.. code-block:: python
+
+    from pynamodb.connection.memory import MemoryTransport
+
+    class Thread(Model):
+        class Meta:
+            table_name = 'Thread'
+            transport = MemoryTransport()
+
+    Thread.create_table(billing_mode='PAY_PER_REQUEST')
+
+Connections sharing a transport, or transports sharing a :class:`MemoryDatabase`, see the same tables.
+``AsyncConnection``, and a model's ``Meta.async_transport``, take an :class:`AsyncMemoryTransport`.
+Requests are still signed, so credentials must be configured, though they can be anything.
+
+The item, query, scan, batch and transaction operations are supported, with condition, filter, key condition,
+projection and update expressions, local and global secondary indexes, and pagination (including the
+1 MB limit on a page). Table operations complete immediately. Time to live settings are stored, but items
+don't expire, and the consumed capacity is only an estimate.
+"""
+import json
+import math
+import re
+import threading
+import time
+import uuid
+import zlib
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, cast
+
+from botocore.awsrequest import AWSPreparedRequest
+
+from pynamodb.connection._memory_expressions import (
+    Context, ValidationError, apply_update, evaluate_condition, get_item_size, normalize, parse_condition,
+    parse_projection, parse_update, project,
+)
+from pynamodb.connection.transport import AsyncTransport, Transport, TransportResponse
+from pynamodb.constants import (
+    ACTIVE, ALL, ALL_NEW, ALL_OLD, ATTRIBUTES, ATTR_DEFINITIONS, ATTR_NAME, ATTR_TYPE, BATCH_GET_ITEM,
+    BATCH_GET_PAGE_LIMIT, BATCH_WRITE_ITEM, BATCH_WRITE_PAGE_LIMIT, BILLING_MODE, CAMEL_COUNT, CAPACITY_UNITS,
+    CLIENT_REQUEST_TOKEN, CONDITION_EXPRESSION, CONSISTENT_READ, CONSUMED_CAPACITY, COUNT, CREATE_TABLE,
+    DELETE_ITEM, DELETE_REQUEST, DELETE_TABLE, DESCRIBE_TABLE, ENABLED, EXCLUSIVE_START_KEY,
+    EXCLUSIVE_START_TABLE_NAME, EXPRESSION_ATTRIBUTE_NAMES, EXPRESSION_ATTRIBUTE_VALUES, FILTER_EXPRESSION,
+    GET_ITEM, GLOBAL_SECONDARY_INDEXES, GLOBAL_SECONDARY_INDEX_UPDATES, INDEXES, INDEX_NAME, ITEM, ITEMS,
+    ITEM_COUNT, KEY, KEYS, KEYS_ONLY, KEY_CONDITION_EXPRESSION, KEY_SCHEMA, KEY_TYPE, LAST_EVALUATED_KEY, LIMIT,
+    LIST_TABLES, LOCAL_SECONDARY_INDEXES, NON_KEY_ATTRIBUTES, PROJECTION, PROJECTION_EXPRESSION, PROJECTION_TYPE,
+    PROVISIONED_BILLING_MODE, PROVISIONED_THROUGHPUT, PUT_ITEM, PUT_REQUEST, QUERY, READ_CAPACITY_UNITS,
+    REQUEST_ITEMS, RESPONSES, RETURN_CONSUMED_CAPACITY, RETURN_VALUES, RETURN_VALUES_ON_CONDITION_FAILURE, SCAN,
+    SCANNED_COUNT, SCAN_INDEX_FORWARD, SEGMENT, SELECT, STREAM_SPECIFICATION, TABLE_DESCRIPTION, TABLE_KEY,
+    TABLE_NAME, TABLE_STATUS, TIME_TO_LIVE_SPECIFICATION, TOTAL, TOTAL_SEGMENTS, TRANSACT_CONDITION_CHECK,
+    TRANSACT_DELETE, TRANSACT_GET, TRANSACT_GET_ITEMS, TRANSACT_ITEMS, TRANSACT_PUT, TRANSACT_UPDATE,
+    TRANSACT_WRITE_ITEMS, UNPROCESSED_ITEMS, UNPROCESSED_KEYS, UPDATED_NEW, UPDATED_OLD, UPDATE_EXPRESSION,
+    UPDATE_ITEM, UPDATE_TABLE, UPDATE_TIME_TO_LIVE, WRITE_CAPACITY_UNITS,
+)
+from pynamodb.types import HASH, RANGE
+
+DESCRIBE_TIME_TO_LIVE = 'DescribeTimeToLive'
+ERROR_TYPE_PREFIX = 'com.amazonaws.dynamodb.v20120810#'
+CONTENT_TYPE = 'application/x-amz-json-1.0'
+
+# The most data a query or scan evaluates for one page
+MAX_PAGE_BYTES = 1024 * 1024
+MAX_TRANSACTION_ITEMS = 100
+# How long the client request token of a transaction makes it idempotent
+CLIENT_REQUEST_TOKEN_SECONDS = 600
+
+_CREDENTIAL_SCOPE_PATTERN = re.compile(r'Credential=[^/]+/[^/]+/([^/]+)/')
+
+_NO_RANGE_KEY: Tuple = ()
+
+
+class MemoryDatabaseError(Exception):
+    """
+    An error response, e.g. a ``ConditionalCheckFailedException``
+    """
+
+    def __init__(self, code: str, message: str, **extra: Any) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.extra = extra
+
+    def to_response(self) -> Dict[str, Any]:
+        return {'__type': ERROR_TYPE_PREFIX + self.code, 'message': self.message, **self.extra}
+
+
+def _validation_error(message: str) -> MemoryDatabaseError:
+    return MemoryDatabaseError('ValidationException', message)
+
+
+# =============================================================================
+# Tables
+# =============================================================================
+
+def _get_key_names(key_schema: List[Dict[str, str]]) -> Tuple[str, Optional[str]]:
+    hash_keyname = range_keyname = None
+    for key in key_schema:
+        if key[KEY_TYPE] == HASH:
+            hash_keyname = key[ATTR_NAME]
+        elif key[KEY_TYPE] == RANGE:
+            range_keyname = key[ATTR_NAME]
+    if hash_keyname is None:
+        raise _validation_error("The key schema must have a HASH key")
+    return hash_keyname, range_keyname
+
+
+class _Index:
+    """
+    A secondary index: the keys of the table's items, per index partition, sorted by index range key
+    """
+
+    def __init__(self, description: Dict[str, Any], is_global: bool) -> None:
+        self.name: str = description[INDEX_NAME]
+        self.is_global = is_global
+        self.key_schema = description[KEY_SCHEMA]
+        self.hash_keyname, self.range_keyname = _get_key_names(self.key_schema)
+        self.projection = description.get(PROJECTION) or {PROJECTION_TYPE: ALL}
+        self.provisioned_throughput = description.get(PROVISIONED_THROUGHPUT)
+        self.partitions: Dict[Tuple, Dict[Tuple, Tuple[Tuple, Tuple]]] = {}
+
+    def get_position(self, item: Dict[str, Any], table_key: Tuple[Tuple, Tuple]) -> Optional[Tuple[Tuple, Tuple]]:
+        """
+        Returns the partition and position of an item in the index, or None if it doesn't have the index's keys
+        """
+        hash_value = item.get(self.hash_keyname)
+        if hash_value is None:
+            return None
+        range_value: Tuple = _NO_RANGE_KEY
+        if self.range_keyname is not None:
+            range_attribute = item.get(self.range_keyname)
+            if range_attribute is None:
+                return None
+            range_value = normalize(range_attribute)
+        return normalize(hash_value), (range_value, table_key)
+
+    def add(self, item: Dict[str, Any], table_key: Tuple[Tuple, Tuple]) -> None:
+        position = self.get_position(item, table_key)
+        if position is not None:
+            self.partitions.setdefault(position[0], {})[position[1]] = table_key
+
+    def remove(self, item: Dict[str, Any], table_key: Tuple[Tuple, Tuple]) -> None:
+        position = self.get_position(item, table_key)
+        if position is not None:
+            partition = self.partitions.get(position[0])
+            if partition is not None:
+                partition.pop(position[1], None)
+                if not partition:
+                    del self.partitions[position[0]]
+
+    def project(self, item: Dict[str, Any], table: '_Table') -> Dict[str, Any]:
+        projection_type = self.projection.get(PROJECTION_TYPE, ALL)
+        if projection_type == ALL:
+            return item
+        names = set(table.key_names) | {self.hash_keyname}
+        if self.range_keyname is not None:
+            names.add(self.range_keyname)
+        if projection_type != KEYS_ONLY:
+            names.update(self.projection.get(NON_KEY_ATTRIBUTES, []))
+        return {name: value for name, value in item.items() if name in names}
+
+    def describe(self, table: '_Table') -> Dict[str, Any]:
+        description = {
+            INDEX_NAME: self.name,
+            KEY_SCHEMA: self.key_schema,
+            PROJECTION: self.projection,
+            ITEM_COUNT: sum(len(partition) for partition in self.partitions.values()),
+            'IndexArn': '{}/index/{}'.format(table.arn, self.name),
+            'IndexSizeBytes': 0,
+        }
+        if self.is_global:
+            description['IndexStatus'] = ACTIVE
+            description[PROVISIONED_THROUGHPUT] = _describe_throughput(self.provisioned_throughput)
+        return description
+
+
+def _describe_throughput(throughput: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    throughput = throughput or {}
+    return {
+        READ_CAPACITY_UNITS: throughput.get(READ_CAPACITY_UNITS) or 0,
+        WRITE_CAPACITY_UNITS: throughput.get(WRITE_CAPACITY_UNITS) or 0,
+        'NumberOfDecreasesToday': 0,
+    }
+
+
+class _Table:
+    def __init__(self, request: Dict[str, Any]) -> None:
+        self.name: str = request[TABLE_NAME]
+        self.arn = 'arn:aws:dynamodb:local:000000000000:table/{}'.format(self.name)
+        self.created = datetime.now(timezone.utc).timestamp()
+        self.key_schema = request[KEY_SCHEMA]
+        self.hash_keyname, self.range_keyname = _get_key_names(self.key_schema)
+        self.key_names = [self.hash_keyname] + ([self.range_keyname] if self.range_keyname else [])
+        self.attribute_definitions = request.get(ATTR_DEFINITIONS, [])
+        self.attribute_types = {
+            definition[ATTR_NAME]: definition[ATTR_TYPE] for definition in self.attribute_definitions
+        }
+        if len(self.attribute_types) < len(self.attribute_definitions):
+            raise _validation_error("Cannot have two attributes with the same name")
+        for name in self.key_names:
+            if name not in self.attribute_types:
+                raise _validation_error("The key attribute {} is missing from the attribute definitions".format(name))
+        self.billing_mode = request.get(BILLING_MODE) or PROVISIONED_BILLING_MODE
+        self.provisioned_throughput = request.get(PROVISIONED_THROUGHPUT)
+        self.stream_specification = request.get(STREAM_SPECIFICATION)
+        self.time_to_live: Optional[Dict[str, Any]] = None
+        # {hash key: {range key: item}}, with normalized keys
+        self.partitions: Dict[Tuple, Dict[Tuple, Dict[str, Any]]] = {}
+        self.item_count = 0
+        self._sorted_keys: Optional[List[Tuple[Tuple, Tuple]]] = None
+        self.indexes: Dict[str, _Index] = {}
+        for description in request.get(GLOBAL_SECONDARY_INDEXES) or []:
+            self.add_index(_Index(description, is_global=True))
+        for description in request.get(LOCAL_SECONDARY_INDEXES) or []:
+            index = _Index(description, is_global=False)
+            if index.hash_keyname != self.hash_keyname:
+                raise _validation_error("A local secondary index must have the same hash key as its table")
+            self.add_index(index)
+
+    def add_index(self, index: _Index) -> None:
+        if index.name in self.indexes:
+            raise _validation_error("Duplicate index name: {}".format(index.name))
+        self.indexes[index.name] = index
+        for hash_value, partition in self.partitions.items():
+            for range_value, item in partition.items():
+                index.add(item, (hash_value, range_value))
+
+    def get_index(self, index_name: str) -> _Index:
+        index = self.indexes.get(index_name)
+        if index is None:
+            raise _validation_error("The table does not have the specified index: {}".format(index_name))
+        return index
+
+    def get_key(self, item: Optional[Dict[str, Any]], is_key: bool = False) -> Tuple[Tuple, Tuple]:
+        """
+        Returns the normalized key of an item, validating its key attributes
+        """
+        if not item:
+            raise _validation_error("One of the required keys was not given a value")
+        if is_key and len(item) != len(self.key_names):
+            raise _validation_error("The provided key element does not match the schema")
+        key = []
+        for name in self.key_names:
+            value = item.get(name)
+            if value is None:
+                raise _validation_error("One of the required keys was not given a value")
+            if self.attribute_types[name] not in value:
+                raise _validation_error("The provided key element does not match the schema")
+            (value_type, data), = value.items()
+            if value_type in ('S', 'B') and not data:
+                raise _validation_error("One or more parameter values are not valid. The AttributeValue for a key attribute cannot contain an empty string value.")
+            key.append(normalize(value))
+        return key[0], key[1] if len(key) > 1 else _NO_RANGE_KEY
+
+    def get(self, key: Tuple[Tuple, Tuple]) -> Optional[Dict[str, Any]]:
+        partition = self.partitions.get(key[0])
+        return partition.get(key[1]) if partition is not None else None
+
+    def put(self, key: Tuple[Tuple, Tuple], item: Optional[Dict[str, Any]]) -> None:
+        """
+        Replaces the item with `key`, or deletes it if `item` is None
+        """
+        partition = self.partitions.get(key[0])
+        old_item = partition.get(key[1]) if partition is not None else None
+        if old_item is not None:
+            for index in self.indexes.values():
+                index.remove(old_item, key)
+        if item is None:
+            if old_item is not None:
+                assert partition is not None
+                del partition[key[1]]
+                if not partition:
+                    del self.partitions[key[0]]
+                self.item_count -= 1
+                self._sorted_keys = None
+            return
+        if partition is None:
+            partition = self.partitions[key[0]] = {}
+        if old_item is None:
+            self.item_count += 1
+            self._sorted_keys = None
+        partition[key[1]] = item
+        for index in self.indexes.values():
+            index.add(item, key)
+
+    def validate(self, item: Dict[str, Any]) -> None:
+        """
+        Checks that the item's index keys have their defined type
+        """
+        for name, value in item.items():
+            attribute_type = self.attribute_types.get(name)
+            if attribute_type is not None and attribute_type not in value:
+                raise _validation_error(
+                    "One or more parameter values were invalid: Type mismatch for Index Key {}".format(name)
+                )
+
+    def get_sorted_keys(self) -> List[Tuple[Tuple, Tuple]]:
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(
+                (hash_value, range_value)
+                for hash_value, partition in self.partitions.items()
+                for range_value in partition
+            )
+        return self._sorted_keys
+
+    def get_key_attributes(self, item: Dict[str, Any], index: Optional[_Index] = None) -> Dict[str, Any]:
+        names = list(self.key_names)
+        if index is not None:
+            names += [index.hash_keyname] + ([index.range_keyname] if index.range_keyname else [])
+        return {name: item[name] for name in names if name in item}
+
+    def describe(self, status: str = ACTIVE) -> Dict[str, Any]:
+        description: Dict[str, Any] = {
+            TABLE_NAME: self.name,
+            TABLE_STATUS: status,
+            'TableArn': self.arn,
+            'TableId': str(uuid.uuid5(uuid.NAMESPACE_URL, self.arn)),
+            'CreationDateTime': self.created,
+            KEY_SCHEMA: self.key_schema,
+            ATTR_DEFINITIONS: self.attribute_definitions,
+            ITEM_COUNT: self.item_count,
+            'TableSizeBytes': 0,
+            PROVISIONED_THROUGHPUT: _describe_throughput(self.provisioned_throughput),
+            'BillingModeSummary': {BILLING_MODE: self.billing_mode},
+        }
+        global_indexes = [index.describe(self) for index in self.indexes.values() if index.is_global]
+        local_indexes = [index.describe(self) for index in self.indexes.values() if not index.is_global]
+        if global_indexes:
+            description[GLOBAL_SECONDARY_INDEXES] = global_indexes
+        if local_indexes:
+            description[LOCAL_SECONDARY_INDEXES] = local_indexes
+        if self.stream_specification:
+            description[STREAM_SPECIFICATION] = self.stream_specification
+        return description
+
+
+# =============================================================================
+# Database
+# =============================================================================
+
+class MemoryDatabase:
+    """
+    Tables and items held in memory, and the DynamoDB operations on them.
+    Every operation holds a lock for its whole duration, so each one, including transactions, is atomic.
+    """
+
+    def __init__(self) -> None:
+        # The tables of each region, as tables are regional in DynamoDB
+        self._regions: Dict[Optional[str], Dict[str, _Table]] = {}
+        # The tables of the region of the operation in progress
+        self._tables: Dict[str, _Table] = {}
+        # The time and items of each transaction's client request token
+        self._client_request_tokens: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.RLock()
+        self._operations: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            BATCH_GET_ITEM: self._batch_get_item,
+            BATCH_WRITE_ITEM: self._batch_write_item,
+            CREATE_TABLE: self._create_table,
+            DELETE_ITEM: self._delete_item,
+            DELETE_TABLE: self._delete_table,
+            DESCRIBE_TABLE: self._describe_table,
+            DESCRIBE_TIME_TO_LIVE: self._describe_time_to_live,
+            GET_ITEM: self._get_item,
+            LIST_TABLES: self._list_tables,
+            PUT_ITEM: self._put_item,
+            QUERY: self._query,
+            SCAN: self._scan,
+            TRANSACT_GET_ITEMS: self._transact_get_items,
+            TRANSACT_WRITE_ITEMS: self._transact_write_items,
+            UPDATE_ITEM: self._update_item,
+            UPDATE_TABLE: self._update_table,
+            UPDATE_TIME_TO_LIVE: self._update_time_to_live,
+        }
+
+    def handle(self, operation_name: str, request: Dict[str, Any], region: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Performs an operation on a request in wire format, returning the response in wire format.
+        Raises :class:`MemoryDatabaseError` for an error response.
+        """
+        operation = self._operations.get(operation_name)
+        if operation is None:
+            raise MemoryDatabaseError('UnknownOperationException', "Unsupported operation: {}".format(operation_name))
+        with self._lock:
+            self._tables = self._regions.setdefault(region, {})
+            try:
+                return operation(request)
+            except ValidationError as e:
+                raise _validation_error(str(e)) from e
+
+    def handle_request(self, request: AWSPreparedRequest) -> TransportResponse:
+        """
+        Performs the operation of a serialized request, returning the raw response
+        """
+        target = request.headers['X-Amz-Target']
+        if isinstance(target, bytes):
+            target = target.decode('utf-8')
+        body = cast(bytes, request.body or b'{}')
+        status_code = 200
+        match = _CREDENTIAL_SCOPE_PATTERN.search(request.headers.get('Authorization') or '')
+        region = match.group(1) if match is not None else None
+        try:
+            data = self.handle(target.rsplit('.', 1)[-1], json.loads(body), region)
+        except MemoryDatabaseError as e:
+            status_code = 400
+            data = e.to_response()
+        content = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        headers = {
+            'content-type': CONTENT_TYPE,
+            'content-length': str(len(content)),
+            'x-amzn-requestid': str(uuid.uuid4()),
+            'x-amz-crc32': str(zlib.crc32(content)),
+        }
+        return TransportResponse(status_code, headers, content)
+
+    def reset(self) -> None:
+        """
+        Deletes all tables
+        """
+        with self._lock:
+            self._regions = {}
+            self._tables = {}
+            self._client_request_tokens = {}
+
+    def _get_table(self, table_name: Optional[str]) -> _Table:
+        table = self._tables.get(table_name) if table_name is not None else None
+        if table is None:
+            raise MemoryDatabaseError(
+                'ResourceNotFoundException', "Requested resource not found: Table: {} not found".format(table_name),
+            )
+        return table
+
+    # Tables
+
+    def _create_table(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table_name = request[TABLE_NAME]
+        if table_name in self._tables:
+            raise MemoryDatabaseError('ResourceInUseException', "Table already exists: {}".format(table_name))
+        table = self._tables[table_name] = _Table(request)
+        return {TABLE_DESCRIPTION: table.describe()}
+
+    def _delete_table(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(request.get(TABLE_NAME))
+        del self._tables[table.name]
+        return {TABLE_DESCRIPTION: table.describe(status='DELETING')}
+
+    def _describe_table(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return {TABLE_KEY: self._get_table(request.get(TABLE_NAME)).describe()}
+
+    def _list_tables(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        names = sorted(self._tables)
+        start = request.get(EXCLUSIVE_START_TABLE_NAME)
+        if start is not None:
+            names = names[bisect_right(names, start):]
+        limit = request.get(LIMIT) or 100
+        response: Dict[str, Any] = {'TableNames': names[:limit]}
+        if len(names) > limit:
+            response['LastEvaluatedTableName'] = names[limit - 1]
+        return response
+
+    def _update_table(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(request.get(TABLE_NAME))
+        if request.get(BILLING_MODE):
+            table.billing_mode = request[BILLING_MODE]
+        if request.get(PROVISIONED_THROUGHPUT):
+            table.provisioned_throughput = request[PROVISIONED_THROUGHPUT]
+        for definition in request.get(ATTR_DEFINITIONS) or []:
+            if definition[ATTR_NAME] not in table.attribute_types:
+                table.attribute_definitions.append(definition)
+                table.attribute_types[definition[ATTR_NAME]] = definition[ATTR_TYPE]
+        for update in request.get(GLOBAL_SECONDARY_INDEX_UPDATES) or []:
+            if 'Create' in update:
+                table.add_index(_Index(update['Create'], is_global=True))
+            elif 'Delete' in update:
+                table.get_index(update['Delete'][INDEX_NAME])
+                del table.indexes[update['Delete'][INDEX_NAME]]
+            elif 'Update' in update:
+                index = table.get_index(update['Update'][INDEX_NAME])
+                index.provisioned_throughput = update['Update'].get(PROVISIONED_THROUGHPUT)
+        return {TABLE_DESCRIPTION: table.describe()}
+
+    def _update_time_to_live(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(request.get(TABLE_NAME))
+        table.time_to_live = request[TIME_TO_LIVE_SPECIFICATION]
+        return {TIME_TO_LIVE_SPECIFICATION: table.time_to_live}
+
+    def _describe_time_to_live(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(request.get(TABLE_NAME))
+        if table.time_to_live is None or not table.time_to_live.get(ENABLED):
+            return {'TimeToLiveDescription': {'TimeToLiveStatus': 'DISABLED'}}
+        return {'TimeToLiveDescription': {
+            'TimeToLiveStatus': 'ENABLED',
+            ATTR_NAME: table.time_to_live[ATTR_NAME],
+        }}
+
+    # Items
+
+    def _get_item(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(request.get(TABLE_NAME))
+        item = table.get(table.get_key(request.get(KEY), is_key=True))
+        response: Dict[str, Any] = {}
+        if item is not None:
+            response[ITEM] = _project(item, request)
+        units = _get_read_units(get_item_size(item) if item else 0, request.get(CONSISTENT_READ, False))
+        return _add_capacity(response, request, table.name, units)
+
+    def _put_item(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(request.get(TABLE_NAME))
+        key, old_item, new_item = self._prepare_put(table, request)
+        return self._write_item(table, request, key, old_item, new_item)
+
+    def _update_item(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(request.get(TABLE_NAME))
+        key, old_item, new_item, names = self._prepare_update(table, request)
+        return self._write_item(table, request, key, old_item, new_item, names)
+
+    def _delete_item(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(request.get(TABLE_NAME))
+        key, old_item = self._prepare_delete(table, request)
+        return self._write_item(table, request, key, old_item, None)
+
+    def _write_item(
+        self,
+        table: _Table,
+        request: Dict[str, Any],
+        key: Tuple[Tuple, Tuple],
+        old_item: Optional[Dict[str, Any]],
+        new_item: Optional[Dict[str, Any]],
+        names: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        table.put(key, new_item)
+        response: Dict[str, Any] = {}
+        attributes = _get_return_values(request.get(RETURN_VALUES), old_item, new_item, names)
+        if attributes:
+            response[ATTRIBUTES] = attributes
+        return _add_capacity(response, request, table.name, _get_write_units(old_item, new_item))
+
+    def _check_condition(self, request: Dict[str, Any], item: Optional[Dict[str, Any]]) -> None:
+        expression = request.get(CONDITION_EXPRESSION)
+        if expression and not evaluate_condition(parse_condition(expression), item or {}, _get_context(request)):
+            extra = {}
+            if item is not None and request.get(RETURN_VALUES_ON_CONDITION_FAILURE) == ALL_OLD:
+                extra[ITEM] = item
+            raise MemoryDatabaseError('ConditionalCheckFailedException', "The conditional request failed", **extra)
+
+    def _prepare_put(
+        self,
+        table: _Table,
+        request: Dict[str, Any],
+    ) -> Tuple[Tuple[Tuple, Tuple], Optional[Dict[str, Any]], Dict[str, Any]]:
+        item = request.get(ITEM)
+        key = table.get_key(item)
+        old_item = table.get(key)
+        self._check_condition(request, old_item)
+        assert item is not None
+        table.validate(item)
+        return key, old_item, item
+
+    def _prepare_update(
+        self,
+        table: _Table,
+        request: Dict[str, Any],
+    ) -> Tuple[Tuple[Tuple, Tuple], Optional[Dict[str, Any]], Dict[str, Any], List[str]]:
+        key_attributes = request.get(KEY)
+        key = table.get_key(key_attributes, is_key=True)
+        old_item = table.get(key)
+        self._check_condition(request, old_item)
+        item = old_item if old_item is not None else dict(key_attributes or {})
+        names: List[str] = []
+        expression = request.get(UPDATE_EXPRESSION)
+        if expression:
+            item, names = apply_update(item, parse_update(expression), _get_context(request))
+            for name in table.key_names:
+                if name in names:
+                    raise _validation_error(
+                        "One or more parameter values were invalid: Cannot update attribute {}. "
+                        "This attribute is part of the key".format(name)
+                    )
+            table.validate(item)
+        return key, old_item, item, names
+
+    def _prepare_delete(
+        self,
+        table: _Table,
+        request: Dict[str, Any],
+    ) -> Tuple[Tuple[Tuple, Tuple], Optional[Dict[str, Any]]]:
+        key = table.get_key(request.get(KEY), is_key=True)
+        old_item = table.get(key)
+        self._check_condition(request, old_item)
+        return key, old_item
+
+    # Queries and scans
+
+    def _query(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(request.get(TABLE_NAME))
+        index = self._get_read_index(table, request)
+        expression = request.get(KEY_CONDITION_EXPRESSION)
+        if not expression:
+            raise _validation_error("Either the KeyConditions or KeyConditionExpression parameter must be specified")
+        key_condition = parse_condition(expression)
+        context = _get_context(request)
+        hash_keyname = index.hash_keyname if index is not None else table.hash_keyname
+        hash_value = _get_hash_key_value(key_condition, hash_keyname, context)
+
+        # The position of each item in the partition, and its table key
+        positions: Sequence[Tuple]
+        keys: List[Tuple[Tuple, Tuple]]
+        if index is not None:
+            entries = sorted(index.partitions.get(hash_value, {}).items())
+            positions = [position for position, _ in entries]
+            keys = [key for _, key in entries]
+        else:
+            positions = sorted(table.partitions.get(hash_value, {}))
+            keys = [(hash_value, range_value) for range_value in positions]
+        forward = request.get(SCAN_INDEX_FORWARD, True)
+        start_key = request.get(EXCLUSIVE_START_KEY)
+        if start_key:
+            start = _get_position(table, index, start_key)
+            if forward:
+                keys = keys[bisect_right(positions, start):]
+            else:
+                keys = keys[:bisect_left(positions, start)]
+        if not forward:
+            keys.reverse()
+
+        return self._read_page(table, index, request, keys, key_condition)
+
+    def _scan(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(request.get(TABLE_NAME))
+        index = self._get_read_index(table, request)
+        segment, total_segments = request.get(SEGMENT), request.get(TOTAL_SEGMENTS)
+        if (segment is None) != (total_segments is None):
+            raise _validation_error("Segment and TotalSegments must be specified together")
+
+        positions: Sequence[Tuple]
+        keys: List[Tuple[Tuple, Tuple]]
+        if index is not None:
+            entries = sorted(
+                ((hash_value, position), key)
+                for hash_value, partition in index.partitions.items()
+                for position, key in partition.items()
+            )
+            positions = [position for position, _ in entries]
+            keys = [key for _, key in entries]
+        else:
+            positions = keys = table.get_sorted_keys()
+
+        start_key = request.get(EXCLUSIVE_START_KEY)
+        if start_key:
+            if index is None:
+                start = table.get_key(start_key)
+            else:
+                start = (normalize(start_key[index.hash_keyname]), _get_position(table, index, start_key))
+            keys = keys[bisect_right(positions, start):]
+        if total_segments:
+            keys = [
+                key for key in keys
+                if zlib.crc32(repr(key[0]).encode('utf-8')) % total_segments == segment
+            ]
+
+        return self._read_page(table, index, request, keys, None)
+
+    def _get_read_index(self, table: _Table, request: Dict[str, Any]) -> Optional[_Index]:
+        index_name = request.get(INDEX_NAME)
+        if index_name is None:
+            return None
+        index = table.get_index(index_name)
+        if index.is_global and request.get(CONSISTENT_READ):
+            raise _validation_error("Consistent reads are not supported on global secondary indexes")
+        return index
+
+    def _read_page(
+        self,
+        table: _Table,
+        index: Optional[_Index],
+        request: Dict[str, Any],
+        keys: List[Tuple[Tuple, Tuple]],
+        key_condition: Optional[Tuple],
+    ) -> Dict[str, Any]:
+        """
+        Evaluates the items with `keys`, in order, up to the request's limit or the page size, returning the page
+        """
+        context = _get_context(request)
+        filter_expression = request.get(FILTER_EXPRESSION)
+        filter_condition = parse_condition(filter_expression) if filter_expression else None
+        limit = request.get(LIMIT)
+        select_count = request.get(SELECT) == COUNT
+        page: List[Dict[str, Any]] = []
+        count = scanned_count = size = 0
+        last_item = None
+        for evaluated, key in enumerate(keys, start=1):
+            item = table.partitions[key[0]][key[1]]
+            if key_condition is not None and not evaluate_condition(key_condition, item, context):
+                continue
+            if index is not None:
+                item = index.project(item, table)
+            scanned_count += 1
+            size += get_item_size(item)
+            if filter_condition is None or evaluate_condition(filter_condition, item, context):
+                count += 1
+                if not select_count:
+                    page.append(_project(item, request))
+            if (limit is not None and scanned_count >= limit) or size >= MAX_PAGE_BYTES:
+                if evaluated < len(keys):
+                    last_item = item
+                break
+
+        response: Dict[str, Any] = {CAMEL_COUNT: count, SCANNED_COUNT: scanned_count}
+        if not select_count:
+            response[ITEMS] = page
+        if last_item is not None:
+            response[LAST_EVALUATED_KEY] = table.get_key_attributes(last_item, index)
+        units = _get_read_units(size, request.get(CONSISTENT_READ, False))
+        return _add_capacity(response, request, table.name, units)
+
+    # Batches
+
+    def _batch_get_item(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        request_items = request.get(REQUEST_ITEMS) or {}
+        if sum(len(keys_and_attributes.get(KEYS, [])) for keys_and_attributes in request_items.values()) > BATCH_GET_PAGE_LIMIT:
+            raise _validation_error("Too many items requested for the BatchGetItem call")
+        responses: Dict[str, List[Dict[str, Any]]] = {}
+        consumed_capacity = []
+        for table_name, keys_and_attributes in request_items.items():
+            table = self._get_table(table_name)
+            items = responses[table_name] = []
+            units = 0.0
+            for key_attributes in keys_and_attributes.get(KEYS, []):
+                item = table.get(table.get_key(key_attributes, is_key=True))
+                units += _get_read_units(get_item_size(item) if item else 0, keys_and_attributes.get(CONSISTENT_READ, False))
+                if item is not None:
+                    items.append(_project(item, keys_and_attributes))
+            consumed_capacity.append(_get_capacity(request, table_name, units))
+        response = {RESPONSES: responses, UNPROCESSED_KEYS: {}}
+        return _add_capacity_list(response, consumed_capacity)
+
+    def _batch_write_item(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        request_items = request.get(REQUEST_ITEMS) or {}
+        if sum(len(requests) for requests in request_items.values()) > BATCH_WRITE_PAGE_LIMIT:
+            raise _validation_error("Too many items requested for the BatchWriteItem call")
+        writes = []
+        for table_name, requests in request_items.items():
+            table = self._get_table(table_name)
+            for write_request in requests:
+                if PUT_REQUEST in write_request:
+                    item = write_request[PUT_REQUEST].get(ITEM)
+                    writes.append((table, table.get_key(item), item))
+                elif DELETE_REQUEST in write_request:
+                    writes.append((table, table.get_key(write_request[DELETE_REQUEST].get(KEY), is_key=True), None))
+                else:
+                    raise _validation_error("A write request must have a PutRequest or a DeleteRequest")
+        if len(set((table.name, key) for table, key, _ in writes)) < len(writes):
+            raise _validation_error("Provided list of item keys contains duplicates")
+        units: Dict[str, float] = {}
+        for table, key, item in writes:
+            units[table.name] = units.get(table.name, 0) + _get_write_units(table.get(key), item)
+            table.put(key, item)
+        response: Dict[str, Any] = {UNPROCESSED_ITEMS: {}}
+        return _add_capacity_list(response, [_get_capacity(request, name, units) for name, units in units.items()])
+
+    # Transactions
+
+    def _transact_get_items(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        transact_items = request.get(TRANSACT_ITEMS) or []
+        if len(transact_items) > MAX_TRANSACTION_ITEMS:
+            raise _validation_error("Member must have length less than or equal to {}".format(MAX_TRANSACTION_ITEMS))
+        responses = []
+        units: Dict[str, float] = {}
+        for transact_item in transact_items:
+            get_request = transact_item[TRANSACT_GET]
+            table = self._get_table(get_request.get(TABLE_NAME))
+            item = table.get(table.get_key(get_request.get(KEY), is_key=True))
+            responses.append({ITEM: _project(item, get_request)} if item is not None else {})
+            units[table.name] = units.get(table.name, 0) + 2 * _get_read_units(get_item_size(item) if item else 0, True)
+        response = {RESPONSES: responses}
+        return _add_capacity_list(response, [_get_capacity(request, name, units) for name, units in units.items()])
+
+    def _transact_write_items(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        transact_items = request.get(TRANSACT_ITEMS) or []
+        if len(transact_items) > MAX_TRANSACTION_ITEMS:
+            raise _validation_error("Member must have length less than or equal to {}".format(MAX_TRANSACTION_ITEMS))
+        token = request.get(CLIENT_REQUEST_TOKEN)
+        if token is not None:
+            now = time.monotonic()
+            serialized_items = json.dumps(transact_items, sort_keys=True)
+            previous = self._client_request_tokens.get(token)
+            if previous is not None and now - previous[0] < CLIENT_REQUEST_TOKEN_SECONDS:
+                if previous[1] != serialized_items:
+                    raise MemoryDatabaseError(
+                        'IdempotentParameterMismatchException',
+                        "The request uses the same client token as a previous, but non-identical request",
+                    )
+                return {}
+        writes: List[Tuple[_Table, Tuple[Tuple, Tuple], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]] = []
+        reasons: List[Dict[str, str]] = []
+        failed = False
+        for transact_item in transact_items:
+            (action, action_request), = transact_item.items()
+            table = self._get_table(action_request.get(TABLE_NAME))
+            try:
+                if action == TRANSACT_PUT:
+                    key, old_item, new_item = self._prepare_put(table, action_request)
+                elif action == TRANSACT_UPDATE:
+                    key, old_item, new_item, _ = self._prepare_update(table, action_request)
+                elif action == TRANSACT_DELETE:
+                    key, old_item = self._prepare_delete(table, action_request)
+                    new_item = None
+                elif action == TRANSACT_CONDITION_CHECK:
+                    if not action_request.get(CONDITION_EXPRESSION):
+                        raise _validation_error("A ConditionCheck must have a ConditionExpression")
+                    key, old_item = self._prepare_delete(table, action_request)
+                    new_item = old_item
+                else:
+                    raise _validation_error("Unsupported transaction action: {}".format(action))
+            except MemoryDatabaseError as e:
+                if e.code != 'ConditionalCheckFailedException':
+                    raise
+                failed = True
+                reasons.append({'Code': 'ConditionalCheckFailed', 'Message': e.message, **e.extra})
+                continue
+            writes.append((table, key, old_item, new_item))
+            reasons.append({'Code': 'None'})
+
+        keys = [(table.name, key) for table, key, _, _ in writes]
+        if len(set(keys)) < len(keys):
+            raise _validation_error("Transaction request cannot include multiple operations on one item")
+        if failed:
+            raise MemoryDatabaseError(
+                'TransactionCanceledException',
+                "Transaction cancelled, please refer cancellation reasons for specific reasons [{}]".format(
+                    ', '.join(reason['Code'] for reason in reasons)
+                ),
+                CancellationReasons=reasons,
+            )
+        if token is not None:
+            self._client_request_tokens[token] = (now, serialized_items)
+        units: Dict[str, float] = {}
+        for (table, key, old_item, new_item), transact_item in zip(writes, transact_items):
+            units[table.name] = units.get(table.name, 0) + 2 * _get_write_units(old_item, new_item)
+            if TRANSACT_CONDITION_CHECK not in transact_item:
+                table.put(key, new_item)
+        return _add_capacity_list({}, [_get_capacity(request, name, units) for name, units in units.items()])
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def _get_context(request: Dict[str, Any]) -> Context:
+    return Context(request.get(EXPRESSION_ATTRIBUTE_NAMES), request.get(EXPRESSION_ATTRIBUTE_VALUES))
+
+
+def _project(item: Dict[str, Any], request: Dict[str, Any]) -> Dict[str, Any]:
+    expression = request.get(PROJECTION_EXPRESSION)
+    if not expression:
+        return item
+    return project(item, parse_projection(expression), _get_context(request))
+
+
+def _get_hash_key_value(condition: Tuple, hash_keyname: str, context: Context) -> Tuple:
+    """
+    Returns the normalized value of the hash key equality in a key condition
+    """
+    conditions = [condition]
+    while conditions:
+        condition = conditions.pop()
+        if condition[0] == 'and':
+            conditions.extend(condition[1:])
+        elif condition[0] == 'compare' and condition[1] == '=':
+            for path, value in ((condition[2], condition[3]), (condition[3], condition[2])):
+                if path[0] == 'path' and value[0] == 'value' and context.resolve_path(path) == [hash_keyname]:
+                    return normalize(context.resolve_value(value[1]))
+    raise _validation_error("Query condition missed key schema element: {}".format(hash_keyname))
+
+
+def _get_position(table: _Table, index: Optional[_Index], start_key: Dict[str, Any]) -> Tuple:
+    """
+    Returns the position of an exclusive start key in a partition of the table or index
+    """
+    table_key = table.get_key(start_key)
+    if index is None:
+        return table_key[1]
+    position = index.get_position(start_key, table_key)
+    if position is None:
+        raise _validation_error("The provided starting key is invalid")
+    return position[1]
+
+
+def _get_return_values(
+    return_values: Optional[str],
+    old_item: Optional[Dict[str, Any]],
+    new_item: Optional[Dict[str, Any]],
+    names: Optional[List[str]],
+) -> Optional[Dict[str, Any]]:
+    if return_values == ALL_OLD:
+        return old_item
+    if return_values == ALL_NEW:
+        return new_item
+    if return_values == UPDATED_OLD and old_item is not None:
+        return {name: old_item[name] for name in names or [] if name in old_item}
+    if return_values == UPDATED_NEW and new_item is not None:
+        return {name: new_item[name] for name in names or [] if name in new_item}
+    return None
+
+
+def _get_read_units(size: int, consistent_read: bool) -> float:
+    units = float(max(1, math.ceil(size / 4096)))
+    return units if consistent_read else units / 2
+
+
+def _get_write_units(old_item: Optional[Dict[str, Any]], new_item: Optional[Dict[str, Any]]) -> float:
+    size = max(get_item_size(old_item) if old_item else 0, get_item_size(new_item) if new_item else 0)
+    return float(max(1, math.ceil(size / 1024)))
+
+
+def _get_capacity(request: Dict[str, Any], table_name: str, units: float) -> Optional[Dict[str, Any]]:
+    return_consumed_capacity = request.get(RETURN_CONSUMED_CAPACITY)
+    if return_consumed_capacity not in (TOTAL, INDEXES):
+        return None
+    capacity: Dict[str, Any] = {TABLE_NAME: table_name, CAPACITY_UNITS: units}
+    if return_consumed_capacity == INDEXES:
+        capacity[TABLE_KEY] = {CAPACITY_UNITS: units}
+    return capacity
+
+
+def _add_capacity(response: Dict[str, Any], request: Dict[str, Any], table_name: str, units: float) -> Dict[str, Any]:
+    capacity = _get_capacity(request, table_name, units)
+    if capacity is not None:
+        response[CONSUMED_CAPACITY] = capacity
+    return response
+
+
+def _add_capacity_list(response: Dict[str, Any], capacities: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    capacities = [capacity for capacity in capacities if capacity is not None]
+    if capacities:
+        response[CONSUMED_CAPACITY] = capacities
+    return response
+
+
+# =============================================================================
+# Transports
+# =============================================================================
+
+class MemoryTransport(Transport):
+    """
+    Sends requests to a :class:`MemoryDatabase`
+    """
+
+    def __init__(self, database: Optional[MemoryDatabase] = None) -> None:
+        self.database = database if database is not None else MemoryDatabase()
+
+    def send(self, request: AWSPreparedRequest) -> Any:
+        return self.database.handle_request(request)
+
+
+class AsyncMemoryTransport(AsyncTransport):
+    """
+    Sends requests from asyncio code to a :class:`MemoryDatabase`
+    """
+
+    def __init__(self, database: Optional[MemoryDatabase] = None) -> None:
+        self.database = database if database is not None else MemoryDatabase()
+
+    async def send(self, request: AWSPreparedRequest) -> Any:
+        return self.database.handle_request(request)
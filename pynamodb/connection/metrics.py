@@ -0,0 +1,296 @@
+"""
+Request metrics
+~~~~~~~~~~~~~~~
+
+A :class:`MetricsRegistry` records, for each table, index and operation, the latency of operations
+(including their retries), the sizes of requests and responses, errors, throttled attempts and the
+number of items read or written:
+
+.. code-block:: python
+
+    from pynamodb.connection.metrics import MetricsRegistry
+
+    registry = MetricsRegistry()
+
+    class Thread(Model):
+        class Meta:
+            table_name = 'Thread'
+            metrics = registry
+
+    # e.g. served on /metrics
+    text = registry.render_prometheus()
+
+Recording takes a single uncontended lock per operation and per attempt; nothing is recorded for
+connections without a registry.
+"""
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from pynamodb.connection import _fork
+from pynamodb.constants import (
+    BATCH_GET_ITEM, BATCH_WRITE_ITEM, CAMEL_COUNT, DELETE_ITEM, GET_ITEM, ITEM, PUT_ITEM, QUERY, REQUEST_ITEMS,
+    RESPONSES, SCAN, TRANSACT_GET_ITEMS, TRANSACT_ITEMS, TRANSACT_WRITE_ITEMS, UNPROCESSED_ITEMS, UPDATE_ITEM,
+)
+
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+DEFAULT_SIZE_BUCKETS: Tuple[float, ...] = (
+    256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216,
+)
+
+
+class MetricsKey(NamedTuple):
+    """
+    The table (or comma-separated tables), index and operation that metrics are recorded for
+    """
+    table_name: str
+    index_name: Optional[str]
+    operation_name: str
+
+
+class Histogram:
+    """
+    Counts of observed values by bucket.
+
+    :param buckets: the upper bounds of the buckets, in increasing order; values above the last bound
+        are counted in an additional bucket
+    """
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def __repr__(self) -> str:
+        return 'Histogram(count={}, sum={})'.format(self.count, self.sum)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def get_cumulative_counts(self) -> List[Tuple[float, int]]:
+        """
+        Returns the number of values at or below each bucket bound, ending with ``float('inf')``
+        """
+        cumulative = []
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return cumulative
+
+    def get_quantile(self, quantile: float) -> Optional[float]:
+        """
+        Returns an estimate of the given quantile (between 0 and 1), interpolated within its bucket,
+        or None if nothing has been observed
+        """
+        if self.count == 0:
+            return None
+        rank = quantile * self.count
+        lower = 0.0
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            if count and total + count >= rank:
+                return lower + (bound - lower) * (rank - total) / count
+            total += count
+            lower = bound
+        return lower
+
+    def copy(self) -> 'Histogram':
+        histogram = Histogram(self.buckets)
+        histogram.counts = list(self.counts)
+        histogram.count = self.count
+        histogram.sum = self.sum
+        return histogram
+
+
+class OperationMetrics:
+    """
+    The metrics recorded for a table, index and operation
+    """
+
+    def __init__(self, latency_buckets: Sequence[float], size_buckets: Sequence[float]) -> None:
+        #: The number of operations, and of operations that failed after any retries
+        self.requests = 0
+        self.errors = 0
+        #: The number of attempts that were throttled, including those that were retried
+        self.throttles = 0
+        #: The number of items read or written
+        self.items = 0
+        #: The time taken by operations in seconds, including retries
+        self.latency = Histogram(latency_buckets)
+        #: The sizes of the bodies of each attempt's request and response in bytes
+        self.request_bytes = Histogram(size_buckets)
+        self.response_bytes = Histogram(size_buckets)
+
+    def __repr__(self) -> str:
+        return 'OperationMetrics(requests={}, errors={}, throttles={}, items={})'.format(
+            self.requests, self.errors, self.throttles, self.items,
+        )
+
+    def copy(self) -> 'OperationMetrics':
+        metrics = OperationMetrics.__new__(OperationMetrics)
+        metrics.requests = self.requests
+        metrics.errors = self.errors
+        metrics.throttles = self.throttles
+        metrics.items = self.items
+        metrics.latency = self.latency.copy()
+        metrics.request_bytes = self.request_bytes.copy()
+        metrics.response_bytes = self.response_bytes.copy()
+        return metrics
+
+
+class MetricsRegistry:
+    """
+    Records metrics for the operations of the connections it is configured for.
+
+    :param latency_buckets: the bucket bounds of latency histograms, in seconds
+    :param size_buckets: the bucket bounds of request and response size histograms, in bytes
+    """
+
+    def __init__(
+        self,
+        latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        size_buckets: Sequence[float] = DEFAULT_SIZE_BUCKETS,
+    ) -> None:
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self._metrics: Dict[MetricsKey, OperationMetrics] = {}
+        self._lock = threading.Lock()
+        _fork.track_lock(self)
+
+    def _get(self, key: MetricsKey) -> OperationMetrics:
+        metrics = self._metrics.get(key)
+        if metrics is None:
+            metrics = self._metrics.setdefault(key, OperationMetrics(self.latency_buckets, self.size_buckets))
+        return metrics
+
+    def record_operation(self, key: MetricsKey, seconds: float, failed: bool = False, items: int = 0) -> None:
+        """
+        Records an operation, once any retries are over
+        """
+        with self._lock:
+            metrics = self._get(key)
+            metrics.requests += 1
+            if failed:
+                metrics.errors += 1
+            metrics.items += items
+            metrics.latency.observe(seconds)
+
+    def record_attempt(
+        self,
+        key: MetricsKey,
+        request_bytes: Optional[int],
+        response_bytes: Optional[int],
+        throttled: bool = False,
+    ) -> None:
+        """
+        Records a single attempt at an operation
+        """
+        with self._lock:
+            metrics = self._get(key)
+            if throttled:
+                metrics.throttles += 1
+            if request_bytes is not None:
+                metrics.request_bytes.observe(request_bytes)
+            if response_bytes is not None:
+                metrics.response_bytes.observe(response_bytes)
+
+    def snapshot(self) -> Dict[MetricsKey, OperationMetrics]:
+        """
+        Returns a copy of the metrics recorded so far
+        """
+        with self._lock:
+            return {key: metrics.copy() for key, metrics in self._metrics.items()}
+
+    def reset(self) -> Dict[MetricsKey, OperationMetrics]:
+        """
+        Clears the metrics, returning those recorded so far (e.g. to export them as deltas)
+        """
+        with self._lock:
+            metrics, self._metrics = self._metrics, {}
+        return metrics
+
+    def render_prometheus(self, prefix: str = 'pynamodb') -> str:
+        """
+        Returns the metrics in the Prometheus text exposition format
+        """
+        snapshot = sorted(self.snapshot().items(), key=lambda item: (item[0][0], item[0][1] or '', item[0][2]))
+        lines: List[str] = []
+        counters = (
+            ('requests_total', 'requests', 'DynamoDB operations'),
+            ('errors_total', 'errors', 'DynamoDB operations that failed'),
+            ('throttles_total', 'throttles', 'Throttled attempts at DynamoDB operations'),
+            ('items_total', 'items', 'Items read or written by DynamoDB operations'),
+        )
+        for name, attribute, description in counters:
+            lines.append('# HELP {}_{} {}'.format(prefix, name, description))
+            lines.append('# TYPE {}_{} counter'.format(prefix, name))
+            for key, metrics in snapshot:
+                lines.append('{}_{}{{{}}} {}'.format(prefix, name, _format_labels(key), getattr(metrics, attribute)))
+        histograms = (
+            ('request_duration_seconds', 'latency', 'Time taken by DynamoDB operations, including retries'),
+            ('request_size_bytes', 'request_bytes', 'Sizes of DynamoDB request bodies'),
+            ('response_size_bytes', 'response_bytes', 'Sizes of DynamoDB response bodies'),
+        )
+        for name, attribute, description in histograms:
+            lines.append('# HELP {}_{} {}'.format(prefix, name, description))
+            lines.append('# TYPE {}_{} histogram'.format(prefix, name))
+            for key, metrics in snapshot:
+                histogram: Histogram = getattr(metrics, attribute)
+                labels = _format_labels(key)
+                for bound, count in histogram.get_cumulative_counts():
+                    lines.append('{}_{}_bucket{{{},le="{}"}} {}'.format(prefix, name, labels, _format_bound(bound), count))
+                lines.append('{}_{}_sum{{{}}} {}'.format(prefix, name, labels, repr(float(histogram.sum))))
+                lines.append('{}_{}_count{{{}}} {}'.format(prefix, name, labels, histogram.count))
+        return '\n'.join(lines) + '\n'
+
+
+def count_items(operation_name: str, operation_kwargs: Mapping[str, Any], data: Mapping[str, Any]) -> int:
+    """
+    Returns the number of items read or written by a successful operation
+    """
+    if operation_name == GET_ITEM:
+        return 1 if data.get(ITEM) else 0
+    if operation_name in (QUERY, SCAN):
+        return data.get(CAMEL_COUNT, 0)
+    if operation_name in (BATCH_GET_ITEM, TRANSACT_GET_ITEMS):
+        responses = data.get(RESPONSES) or {}
+        if isinstance(responses, dict):
+            return sum(len(items) for items in responses.values())
+        return len(responses)
+    if operation_name in (PUT_ITEM, UPDATE_ITEM, DELETE_ITEM):
+        return 1
+    if operation_name == BATCH_WRITE_ITEM:
+        written = sum(len(requests) for requests in operation_kwargs.get(REQUEST_ITEMS, {}).values())
+        unprocessed = sum(len(requests) for requests in (data.get(UNPROCESSED_ITEMS) or {}).values())
+        return written - unprocessed
+    if operation_name == TRANSACT_WRITE_ITEMS:
+        return len(operation_kwargs.get(TRANSACT_ITEMS, ()))
+    return 0
+
+
+def get_response_bytes(response: Mapping[str, Any]) -> Optional[int]:
+    """
+    Returns the size of a parsed response's body, from its ``Content-Length`` header
+    """
+    content_length = response.get('ResponseMetadata', {}).get('HTTPHeaders', {}).get('content-length')
+    return int(content_length) if content_length is not None else None
+
+
+def _format_labels(key: MetricsKey) -> str:
+    return 'table="{}",index="{}",operation="{}"'.format(
+        _escape(key.table_name), _escape(key.index_name or ''), _escape(key.operation_name),
+    )
+
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
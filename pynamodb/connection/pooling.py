@@ -0,0 +1,150 @@
+"""
+Connection pool metrics and sizing
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Each botocore client, and each transport with a connection pool, keeps :class:`PoolMetrics` for its pool:
+
+.. code-block:: python
+
+    metrics = Thread._get_connection().connection.pool_metrics
+    print(metrics.in_use, metrics.idle, metrics.wait_seconds / max(metrics.checkouts, 1))
+
+A pool that is too small shows up as time spent waiting for a free connection or, with botocore's
+default non-blocking pools, as connections opened for a single request and closed again when the pool
+is already full. With :class:`PoolAutoSizing`, requests wait for a pooled connection instead, and the
+pool grows, up to a cap, when a request has waited for longer than a threshold. The pool grows to the
+number of concurrent requests observed by the connection, so a burst of load resizes it once rather
+than one connection at a time. Pools never shrink, but idle connections can be closed with
+``max_connection_idle_seconds``.
+"""
+import threading
+import weakref
+from typing import Any, Dict
+
+from pynamodb.connection import _fork
+
+
+class PoolAutoSizing:
+    """
+    Grows a connection pool while requests wait for a free connection.
+
+    :param max_pool_connections: the size the pool may grow to
+    :param wait_threshold_seconds: how long a request may wait for a free connection before the pool grows
+    """
+
+    def __init__(self, max_pool_connections: int = 100, wait_threshold_seconds: float = 0.005) -> None:
+        if max_pool_connections < 1:
+            raise ValueError("max_pool_connections must be at least 1")
+        self.max_pool_connections = max_pool_connections
+        self.wait_threshold_seconds = wait_threshold_seconds
+
+    def __repr__(self) -> str:
+        return 'PoolAutoSizing(max_pool_connections={}, wait_threshold_seconds={})'.format(
+            self.max_pool_connections, self.wait_threshold_seconds,
+        )
+
+    def get_pool_size(self, pool_size: int, peak_in_flight: int) -> int:
+        """
+        Returns the size to grow a pool of `pool_size` connections to, after a request has waited too long
+        for a connection, given the highest number of concurrent requests observed
+        """
+        return min(max(pool_size + 1, peak_in_flight), self.max_pool_connections)
+
+
+class PoolMetrics:
+    """
+    Counters for a connection pool, or for the pools of a client connected to several hosts.
+
+    Times are in seconds and counters are totals since the pool was created.
+    """
+
+    def __init__(self, pool_size: int) -> None:
+        #: The number of connections the pool holds
+        self.pool_size = pool_size
+        #: The number of times the pool has grown
+        self.resizes = 0
+        #: The number of connections checked out of the pool
+        self.in_use = 0
+        self.peak_in_use = 0
+        #: The number of requests being dispatched through the pool, including those waiting for a connection
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        #: The number of times a connection was checked out, and the time spent waiting for one
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        #: The number of network connections opened and closed
+        self.connections_opened = 0
+        self.connections_closed = 0
+        self._pools: 'weakref.WeakSet[Any]' = weakref.WeakSet()
+        self._lock = threading.Lock()
+        _fork.track_lock(self)
+
+    def __repr__(self) -> str:
+        return 'PoolMetrics({})'.format(', '.join('{}={}'.format(k, v) for k, v in self.as_dict().items()))
+
+    @property
+    def idle(self) -> int:
+        """
+        The number of open connections waiting in the pool to be reused
+        """
+        return sum(pool._count_idle() for pool in list(self._pools))
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Returns the current values of the metrics
+        """
+        return {
+            'pool_size': self.pool_size,
+            'resizes': self.resizes,
+            'in_use': self.in_use,
+            'peak_in_use': self.peak_in_use,
+            'idle': self.idle,
+            'in_flight': self.in_flight,
+            'peak_in_flight': self.peak_in_flight,
+            'checkouts': self.checkouts,
+            'wait_seconds': self.wait_seconds,
+            'max_wait_seconds': self.max_wait_seconds,
+            'connections_opened': self.connections_opened,
+            'connections_closed': self.connections_closed,
+        }
+
+    def add_pool(self, pool: Any) -> None:
+        """
+        Adds a pool, which must have a ``_count_idle()`` method, to those the metrics are kept for
+        """
+        self._pools.add(pool)
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def request_finished(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.in_use -= 1
+
+    def record_opened(self) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_closed(self) -> None:
+        with self._lock:
+            self.connections_closed += 1
+
+    def record_resize(self, pool_size: int) -> None:
+        with self._lock:
+            self.pool_size = pool_size
+            self.resizes += 1
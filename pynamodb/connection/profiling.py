@@ -0,0 +1,281 @@
+"""
+Phase profiling
+~~~~~~~~~~~~~~~
+
+Splits the time taken by operations into phases, to show which layer a slow operation spends its time in:
+
+``build``
+    building the request's arguments, e.g. serializing keys and expressions (only for model methods)
+``serialize``
+    encoding the arguments as the request body
+``sign``
+    signing the request
+``send``
+    sending the request and waiting for the response
+``parse``
+    decoding the response
+``deserialize``
+    building model instances from the response, and the rest of the model method (only for model methods)
+``retry_wait``
+    waiting before a failed request is retried
+
+Once a profiler is set, the phases of each operation are passed to it as :class:`RequestTimings`.
+:class:`PhaseProfiler` aggregates them into percentiles per model, operation and phase:
+
+.. code-block:: python
+
+    from pynamodb.connection.profiling import PhaseProfiler, set_profiler
+
+    profiler = PhaseProfiler()
+    set_profiler(profiler)
+    ...
+    print(profiler.format_report())
+
+The phases of ``get``, ``save``, ``update``, ``delete`` and ``refresh`` (and their asyncio variants) are recorded
+for the model; other operations, such as the pages of queries and scans, are recorded by the connection,
+without the ``build`` and ``deserialize`` phases. The phases of a hedged request and its hedge overlap.
+Without a profiler, the instrumentation costs one global lookup per phase.
+"""
+import asyncio
+import logging
+import threading
+import time
+from contextvars import ContextVar, Token
+from functools import wraps
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, TypeVar, cast
+
+from pynamodb.connection.metrics import Histogram
+
+BUILD = 'build'
+SERIALIZE = 'serialize'
+SIGN = 'sign'
+SEND = 'send'
+PARSE = 'parse'
+DESERIALIZE = 'deserialize'
+RETRY_WAIT = 'retry_wait'
+
+PHASES = (BUILD, SERIALIZE, SIGN, SEND, PARSE, DESERIALIZE, RETRY_WAIT)
+
+DEFAULT_PHASE_BUCKETS: Tuple[float, ...] = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+_F = TypeVar('_F', bound=Callable[..., Any])
+
+_profiler: Optional[Callable[['RequestTimings'], None]] = None
+_current_timings: 'ContextVar[Optional[RequestTimings]]' = ContextVar('pynamodb_request_timings', default=None)
+
+
+class RequestTimings:
+    """
+    The time spent in each phase of an operation, in seconds
+    """
+
+    def __init__(self, model_name: Optional[str] = None, operation_name: Optional[str] = None) -> None:
+        #: The model class the operation was made through, or None for connection operations
+        self.model_name = model_name
+        #: The DynamoDB operation, e.g. ``GetItem``, or None if no request was sent
+        self.operation_name = operation_name
+        self.phases: Dict[str, float] = {}
+        self._last = time.perf_counter()
+        self._token: Optional[Token] = None
+
+    def __repr__(self) -> str:
+        return 'RequestTimings(model_name={}, operation_name={}, phases={})'.format(
+            self.model_name, self.operation_name, self.phases,
+        )
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.phases.values())
+
+    def mark(self, phase: str) -> None:
+        """
+        Ends `phase`, adding the time since the previous phase ended to it
+        """
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+
+def set_profiler(profiler: Optional[Callable[[RequestTimings], None]]) -> None:
+    """
+    Sets the function the phases of each operation are passed to, e.g. a :class:`PhaseProfiler`,
+    or None to stop profiling
+    """
+    global _profiler
+    _profiler = profiler
+
+
+def get_profiler() -> Optional[Callable[[RequestTimings], None]]:
+    return _profiler
+
+
+def mark_phase(phase: str) -> None:
+    """
+    Ends `phase` of the operation being profiled, if any
+    """
+    if _profiler is not None:
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.mark(phase)
+
+
+def start_operation(operation_name: str) -> Optional[RequestTimings]:
+    """
+    Called as a request is dispatched. Ends the ``build`` phase of the model method being profiled, or
+    returns new timings to pass to :func:`finish_timings` if the request isn't made by one.
+    """
+    if _profiler is None:
+        return None
+    timings = _current_timings.get()
+    if timings is None:
+        return _start_timings(None, operation_name)
+    timings.mark(BUILD)
+    if timings.operation_name is None:
+        timings.operation_name = operation_name
+    return None
+
+
+def finish_timings(timings: RequestTimings, phase: Optional[str] = None) -> None:
+    """
+    Ends `phase`, if given, and passes the timings to the profiler
+    """
+    if phase is not None:
+        timings.mark(phase)
+    if timings._token is not None:
+        _current_timings.reset(timings._token)
+        timings._token = None
+    profiler = _profiler
+    if profiler is not None:
+        try:
+            profiler(timings)
+        except Exception:
+            log.exception("Profiler threw an exception.")
+
+
+def profiled(fn: _F) -> _F:
+    """
+    Records the phases of a model method, whose first argument is the model class or instance
+    """
+    if asyncio.iscoroutinefunction(fn):
+        @wraps(fn)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            timings = _start_model_timings(args[0])
+            if timings is None:
+                return await fn(*args, **kwargs)
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                finish_timings(timings, DESERIALIZE)
+        return cast(_F, async_wrapper)
+
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        timings = _start_model_timings(args[0])
+        if timings is None:
+            return fn(*args, **kwargs)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            finish_timings(timings, DESERIALIZE)
+    return cast(_F, wrapper)
+
+
+def _start_model_timings(model: Any) -> Optional[RequestTimings]:
+    if _profiler is None or _current_timings.get() is not None:
+        return None
+    model_cls = model if isinstance(model, type) else type(model)
+    return _start_timings(model_cls.__name__, None)
+
+
+def _start_timings(model_name: Optional[str], operation_name: Optional[str]) -> RequestTimings:
+    timings = RequestTimings(model_name, operation_name)
+    timings._token = _current_timings.set(timings)
+    return timings
+
+
+class PhaseKey(NamedTuple):
+    model_name: Optional[str]
+    operation_name: Optional[str]
+    phase: str
+
+
+class PhaseSummary(NamedTuple):
+    """
+    Percentiles of the time spent in a phase, in seconds, estimated from a histogram
+    """
+    samples: int
+    total_seconds: float
+    p50: Optional[float]
+    p90: Optional[float]
+    p99: Optional[float]
+
+
+class PhaseProfiler:
+    """
+    A profiler aggregating the time spent in each phase per model, operation and phase.
+
+    :param buckets: the bucket bounds, in seconds, of the histograms percentiles are estimated from
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_PHASE_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[PhaseKey, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, timings: RequestTimings) -> None:
+        with self._lock:
+            for phase, seconds in timings.phases.items():
+                key = PhaseKey(timings.model_name, timings.operation_name, phase)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(self.buckets)
+                histogram.observe(seconds)
+
+    def get_summaries(self) -> Dict[PhaseKey, PhaseSummary]:
+        """
+        Returns the percentiles of each model, operation and phase recorded so far
+        """
+        with self._lock:
+            histograms = [(key, histogram.copy()) for key, histogram in self._histograms.items()]
+        return {
+            key: PhaseSummary(
+                samples=histogram.count,
+                total_seconds=histogram.sum,
+                p50=histogram.get_quantile(0.5),
+                p90=histogram.get_quantile(0.9),
+                p99=histogram.get_quantile(0.99),
+            )
+            for key, histogram in histograms
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms = {}
+
+    def format_report(self) -> str:
+        """
+        Returns the summaries as a table, in milliseconds, with the phases of each operation in order
+        """
+        def sort_key(item: Tuple[PhaseKey, PhaseSummary]) -> Tuple[str, str, int]:
+            key = item[0]
+            return key.model_name or '', key.operation_name or '', PHASES.index(key.phase) if key.phase in PHASES else len(PHASES)
+
+        lines: List[str] = ['{:<20} {:<20} {:<12} {:>8} {:>10} {:>10} {:>10}'.format(
+            'model', 'operation', 'phase', 'samples', 'p50 ms', 'p90 ms', 'p99 ms',
+        )]
+        for key, summary in sorted(self.get_summaries().items(), key=sort_key):
+            lines.append('{:<20} {:<20} {:<12} {:>8} {:>10} {:>10} {:>10}'.format(
+                key.model_name or '-', key.operation_name or '-', key.phase, summary.samples,
+                _format_ms(summary.p50), _format_ms(summary.p90), _format_ms(summary.p99),
+            ))
+        return '\n'.join(lines)
+
+
+def _format_ms(seconds: Optional[float]) -> str:
+    return '-' if seconds is None else '{:.3f}'.format(seconds * 1000)
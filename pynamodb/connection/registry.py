@@ -0,0 +1,102 @@
+"""
+A process-wide registry of botocore clients.
+
+Each botocore client owns its own connection pool, so creating one per model class means as many pools
+(and TLS handshakes) as there are models. Connections created with ``share_clients`` enabled get their
+client from this registry instead, keyed on everything that affects how the client sends requests.
+"""
+import os
+import threading
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from pynamodb.connection._botocore_private import BotocoreBaseClientPrivate
+from pynamodb.settings import get_settings_value
+
+
+class ClientRegistry:
+    """
+    Caches botocore clients by key, so connections with the same configuration share a connection pool
+    """
+
+    def __init__(self, max_pool_connections: Optional[int] = None) -> None:
+        self._lock = threading.Lock()
+        self._clients: Dict[Hashable, BotocoreBaseClientPrivate] = {}
+        self._max_pool_connections = max_pool_connections
+        self._pid = os.getpid()
+
+    @property
+    def max_pool_connections(self) -> int:
+        """
+        The size of the connection pool of every client in the registry
+        """
+        if self._max_pool_connections is not None:
+            return self._max_pool_connections
+        return get_settings_value('max_pool_connections')
+
+    @max_pool_connections.setter
+    def max_pool_connections(self, value: Optional[int]) -> None:
+        # Only clients created after this point use the new size
+        self._max_pool_connections = value
+
+    def get_client(
+        self,
+        key: Hashable,
+        create_client: Callable[[int], BotocoreBaseClientPrivate],
+    ) -> BotocoreBaseClientPrivate:
+        """
+        Returns the client for `key`, calling `create_client` with the pool size to create it if needed
+        """
+        if self._pid != os.getpid():
+            self.reset_after_fork()
+        client = self._clients.get(key)
+        if client is not None and _has_credentials(client):
+            return client
+        # botocore client creation is not thread safe
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None or not _has_credentials(client):
+                client = self._clients[key] = create_client(self.max_pool_connections)
+            return client
+
+    def clients(self) -> Tuple[BotocoreBaseClientPrivate, ...]:
+        """
+        Returns the clients currently in the registry
+        """
+        with self._lock:
+            return tuple(self._clients.values())
+
+    def clear(self) -> None:
+        """
+        Removes every client from the registry, closing their connection pools
+        """
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        for client in clients.values():
+            _close_client(client)
+
+    def reset_after_fork(self) -> None:
+        """
+        Removes every client from the registry in a forked child,
+        leaving their connection pools (which belong to the parent) open
+        """
+        # The lock may have been held by another thread of the parent when it forked
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._pid = os.getpid()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+def _has_credentials(client: BotocoreBaseClientPrivate) -> bool:
+    # botocore may cache empty credentials, permanently poisoning the client (see Connection.client)
+    return not (client._request_signer and not client._request_signer._credentials)
+
+
+def _close_client(client: BotocoreBaseClientPrivate) -> None:
+    close = getattr(client, 'close', None)
+    if close is not None:
+        close()
+
+
+client_registry = ClientRegistry()
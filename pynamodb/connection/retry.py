@@ -0,0 +1,193 @@
+"""
+Retry policy
+~~~~~~~~~~~~
+
+Failed requests, and the unprocessed items of batch requests, are retried with decorrelated jitter
+backoff: each delay is drawn at random between a base delay and three times the previous delay, which
+spreads out the retries of many clients failing at the same time better than exponential backoff does.
+Throttling errors back off from a longer base delay than transient errors, since retrying them soon
+only adds to the load that caused them.
+
+Every retry also needs a token from a :class:`RetryBudget`, which is shared by all connections in the
+process by default. Each request adds a fraction of a token, so that during a brownout retries add at
+most that fraction of extra load, instead of multiplying it by the number of attempts.
+"""
+import logging
+import random
+import threading
+import time
+from typing import Optional
+
+from botocore.exceptions import ClientError, ConnectionError, HTTPClientError
+
+from pynamodb.connection import _fork
+from pynamodb.settings import get_settings_value
+
+log = logging.getLogger(__name__)
+
+THROTTLING = 'throttling'
+TRANSIENT = 'transient'
+
+# Error codes retried by botocore's "standard" retry mode that DynamoDB can return
+THROTTLING_ERROR_CODES = frozenset([
+    'ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded',
+    'TransactionInProgressException', 'LimitExceededException',
+])
+TRANSIENT_ERROR_CODES = frozenset(['RequestTimeout', 'RequestTimeoutException', 'PriorRequestNotComplete'])
+TRANSIENT_STATUS_CODES = frozenset([500, 502, 503, 504])
+CONNECTION_EXCEPTIONS = (ConnectionError, HTTPClientError)
+
+
+def classify_error(error: Exception) -> Optional[str]:
+    """
+    Returns ``THROTTLING`` or ``TRANSIENT`` if `error` is worth retrying, or None
+    """
+    if isinstance(error, ClientError):
+        code = error.response.get('Error', {}).get('Code')
+        if code in THROTTLING_ERROR_CODES:
+            return THROTTLING
+        if code in TRANSIENT_ERROR_CODES:
+            return TRANSIENT
+        if error.response.get('ResponseMetadata', {}).get('HTTPStatusCode') in TRANSIENT_STATUS_CODES:
+            return TRANSIENT
+        return None
+    if isinstance(error, CONNECTION_EXCEPTIONS):
+        return TRANSIENT
+    return None
+
+
+class RetryBudget:
+    """
+    Limits retries to a fraction of the requests sent, plus a small number of retries per second
+    so that processes sending few requests can still retry.
+
+    :param ratio: the number of retries each request adds to the budget
+    :param min_retries_per_second: the number of retries added to the budget every second
+    :param max_balance: the maximum number of retries that can be saved up
+    """
+
+    def __init__(self, ratio: float = 0.1, min_retries_per_second: float = 10.0, max_balance: float = 100.0) -> None:
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_balance = max_balance
+        self.requests = 0
+        self.retries = 0
+        self.rejected = 0
+        self._balance = max_balance
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        _fork.track_lock(self)
+
+    def record_request(self) -> None:
+        """
+        Adds a request to the budget
+        """
+        with self._lock:
+            self.requests += 1
+            self._balance = min(self.max_balance, self._balance + self.ratio)
+
+    def try_acquire(self) -> bool:
+        """
+        Takes a retry from the budget, returning False if there are none left
+        """
+        with self._lock:
+            now = time.monotonic()
+            balance = self._balance + (now - self._updated_at) * self.min_retries_per_second
+            self._updated_at = now
+            if balance < 1:
+                self._balance = balance
+                self.rejected += 1
+                return False
+            self._balance = min(self.max_balance, balance) - 1
+            self.retries += 1
+            return True
+
+
+DEFAULT_RETRY_BUDGET = RetryBudget()
+
+
+class RetryPolicy:
+    """
+    Decides whether, and after how long, to retry a failed request.
+
+    :param base_delay_seconds: the minimum delay before retrying a transient error
+    :param throttling_base_delay_seconds: the minimum delay before retrying a throttling error,
+        or unprocessed batch items
+    :param max_delay_seconds: the maximum delay before retrying
+    :param budget: the budget retries are taken from, shared by all connections by default.
+        If None, retries are only limited by the number of attempts.
+    """
+
+    def __init__(
+        self,
+        base_delay_seconds: float = 0.025,
+        throttling_base_delay_seconds: float = 0.5,
+        max_delay_seconds: float = 20.0,
+        budget: Optional[RetryBudget] = DEFAULT_RETRY_BUDGET,
+    ) -> None:
+        self.base_delay_seconds = base_delay_seconds
+        self.throttling_base_delay_seconds = throttling_base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.budget = budget
+
+    def record_request(self) -> None:
+        """
+        Records that a request is about to be sent for the first time
+        """
+        if self.budget is not None:
+            self.budget.record_request()
+
+    def get_retry_delay(
+        self,
+        kind: Optional[str],
+        attempt_number: int,
+        max_attempts: Optional[int],
+        previous_delay: Optional[float],
+    ) -> Optional[float]:
+        """
+        Returns how long to wait before retrying, or None if the request should not be retried
+
+        :param kind: ``THROTTLING``, ``TRANSIENT`` or None if the failure can't be retried
+        :param attempt_number: the number of attempts made so far
+        :param max_attempts: the maximum number of attempts, or None if it isn't limited
+        :param previous_delay: the delay before the previous attempt, if any
+        """
+        if kind is None or (max_attempts is not None and attempt_number >= max_attempts):
+            return None
+        if self.budget is not None and not self.budget.try_acquire():
+            log.debug("Not retrying: the retry budget is exhausted")
+            return None
+        return self.get_backoff_delay(kind, previous_delay)
+
+    def get_backoff_delay(self, kind: str, previous_delay: Optional[float]) -> float:
+        """
+        Returns a decorrelated jitter delay following `previous_delay`, without taking a retry from the budget
+        """
+        base_delay = self.throttling_base_delay_seconds if kind == THROTTLING else self.base_delay_seconds
+        upper_bound = max(base_delay, (previous_delay or base_delay) * 3)
+        return min(self.max_delay_seconds, random.uniform(base_delay, upper_bound))
+
+    def get_error_retry_delay(
+        self,
+        error: Exception,
+        attempt_number: int,
+        max_attempts: Optional[int],
+        previous_delay: Optional[float],
+    ) -> Optional[float]:
+        """
+        Returns how long to wait before retrying a request that failed with `error`,
+        or None if it should not be retried
+        """
+        return self.get_retry_delay(classify_error(error), attempt_number, max_attempts, previous_delay)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def get_retry_policy(policy: Optional[RetryPolicy]) -> RetryPolicy:
+    """
+    Returns `policy`, or the ``retry_policy`` setting, or the default policy
+    """
+    if policy is None:
+        policy = get_settings_value('retry_policy')
+    return policy if policy is not None else DEFAULT_RETRY_POLICY
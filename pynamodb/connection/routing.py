@@ -0,0 +1,164 @@
+"""
+Endpoint routing
+~~~~~~~~~~~~~~~~
+
+A connection is normally bound to a single region or host. The replicas of a global table, or the nodes
+of a DynamoDB-compatible cluster such as ScyllaDB Alternator, are equivalent endpoints for the same data.
+An :class:`EndpointRouter` holds several of them: eventually consistent reads go to the healthy endpoint
+with the lowest recent latency (an exponentially weighted moving average), writes go to a home endpoint, and
+both fail over to the other endpoints when an endpoint returns ``5xx`` or connection errors.
+
+Strongly consistent reads, ``TransactGetItems`` and control plane operations such as ``DescribeTable`` are
+routed like writes, since another replica may not have the latest writes to the home endpoint, and
+transactions are only isolated from the other transactions of their own region.
+
+Each attempt at a request, including retries, is routed separately, so a retried read is sent to a
+different endpoint than the one that failed.
+"""
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional, Sequence, Union
+
+from pynamodb.connection import _fork
+from pynamodb.connection.retry import TRANSIENT, classify_error
+from pynamodb.constants import BATCH_GET_ITEM, CONSISTENT_READ, GET_ITEM, QUERY, REQUEST_ITEMS, SCAN
+
+log = logging.getLogger(__name__)
+
+# Operations that can be sent to any endpoint, unless they are strongly consistent
+READ_OPERATIONS = frozenset([BATCH_GET_ITEM, GET_ITEM, QUERY, SCAN])
+
+
+class Endpoint(NamedTuple):
+    """
+    A region, or a host (with the region used to sign requests to it)
+    """
+    region: Optional[str] = None
+    host: Optional[str] = None
+
+
+class EndpointRouter:
+    """
+    Chooses the endpoint each request is sent to.
+
+    :param endpoints: the equivalent endpoints requests can be sent to
+    :param home: the endpoint writes are sent to, the first endpoint by default
+    :param ewma_alpha: the weight of each new latency in the moving average of an endpoint's latency
+    :param unhealthy_seconds: how long an endpoint is avoided after a ``5xx`` or connection error
+    :param exploration_ratio: the fraction of reads sent to a random endpoint other than the fastest one,
+        so that the latencies of the other endpoints stay up to date
+    :param failover_writes: if False, writes are only ever sent to the home endpoint
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[Endpoint],
+        home: Optional[Endpoint] = None,
+        ewma_alpha: float = 0.2,
+        unhealthy_seconds: float = 30.0,
+        exploration_ratio: float = 0.05,
+        failover_writes: bool = True,
+    ) -> None:
+        if not endpoints:
+            raise ValueError("At least one endpoint is required")
+        self.endpoints = list(endpoints)
+        if home is None:
+            home = self.endpoints[0]
+        elif home not in self.endpoints:
+            raise ValueError("The home endpoint must be one of the endpoints")
+        self.home = home
+        self.ewma_alpha = ewma_alpha
+        self.unhealthy_seconds = unhealthy_seconds
+        self.exploration_ratio = exploration_ratio
+        self.failover_writes = failover_writes
+        self._latencies: Dict[Endpoint, float] = {}
+        self._unhealthy_until: Dict[Endpoint, float] = {}
+        self._lock = threading.Lock()
+        _fork.track_lock(self)
+
+    def get_latency(self, endpoint: Endpoint) -> Optional[float]:
+        """
+        Returns the moving average of the endpoint's latency in seconds, or None if it hasn't been measured
+        """
+        return self._latencies.get(endpoint)
+
+    def is_healthy(self, endpoint: Endpoint) -> bool:
+        """
+        Returns False while the endpoint is avoided after a failure
+        """
+        return self._unhealthy_until.get(endpoint, 0.0) <= time.monotonic()
+
+    def get_endpoint(
+        self,
+        operation_name: str,
+        previous: Optional[Endpoint] = None,
+        operation_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Endpoint:
+        """
+        Returns the endpoint to send a request to
+
+        :param operation_name: the operation being sent
+        :param previous: the endpoint the previous attempt at the request failed on, if any
+        :param operation_kwargs: the request's arguments, used to find strongly consistent reads
+        """
+        healthy = [endpoint for endpoint in self.endpoints if self.is_healthy(endpoint)]
+        if not is_eventually_consistent_read(operation_name, operation_kwargs):
+            if self.home in healthy or not self.failover_writes or not healthy:
+                return self.home
+            return healthy[0]
+        # With every endpoint failing, keep trying all of them rather than none
+        candidates = healthy or list(self.endpoints)
+        if previous is not None and len(candidates) > 1 and previous in candidates:
+            candidates.remove(previous)
+        # Endpoints that haven't been measured yet come first, so that they get measured
+        candidates.sort(key=lambda endpoint: self._latencies.get(endpoint, 0.0))
+        if previous is None and len(candidates) > 1 and random.random() < self.exploration_ratio:
+            return random.choice(candidates[1:])
+        return candidates[0]
+
+    def record_latency(self, endpoint: Endpoint, seconds: float) -> None:
+        """
+        Records the latency of a successful request
+        """
+        with self._lock:
+            latency = self._latencies.get(endpoint)
+            self._latencies[endpoint] = seconds if latency is None else latency + self.ewma_alpha * (seconds - latency)
+            self._unhealthy_until.pop(endpoint, None)
+
+    def record_failure(self, endpoint: Endpoint, error: Exception) -> None:
+        """
+        Records a failed request, avoiding the endpoint for a while if the error means it is unavailable
+        """
+        if classify_error(error) != TRANSIENT:
+            return
+        with self._lock:
+            if self.is_healthy(endpoint):
+                log.info("Routing requests away from %s after %s", endpoint, error)
+            self._unhealthy_until[endpoint] = time.monotonic() + self.unhealthy_seconds
+
+
+def is_eventually_consistent_read(operation_name: str, operation_kwargs: Optional[Dict[str, Any]]) -> bool:
+    """
+    Returns True if the request can be answered by any replica
+    """
+    if operation_name not in READ_OPERATIONS:
+        return False
+    if not operation_kwargs:
+        return True
+    if operation_name == BATCH_GET_ITEM:
+        return not any(
+            keys_and_attributes.get(CONSISTENT_READ)
+            for keys_and_attributes in operation_kwargs.get(REQUEST_ITEMS, {}).values()
+        )
+    return not operation_kwargs.get(CONSISTENT_READ)
+
+
+def get_endpoint_router(endpoints: Optional[Union[Sequence[Endpoint], EndpointRouter]]) -> Optional[EndpointRouter]:
+    """
+    Returns a router for `endpoints`, which may be a router already, or None for a single-endpoint connection
+    """
+    if endpoints is None or isinstance(endpoints, EndpointRouter):
+        return endpoints
+    return EndpointRouter(endpoints)
@@ -0,0 +1,174 @@
+"""
+Slow operation log
+~~~~~~~~~~~~~~~~~~
+
+:class:`SlowOperationLog` is a :class:`~pynamodb.connection.tracing.SpanExporter` that records the traced
+operations taking longer than a latency threshold, and the queries and scans returning only a small fraction
+of the items they evaluated, such as filter-heavy queries and accidental scans:
+
+.. code-block:: python
+
+    from pynamodb.connection.slow_log import SlowOperationLog
+    from pynamodb.connection.tracing import set_span_exporter
+
+    set_span_exporter(SlowOperationLog(latency_threshold_seconds=0.5, min_scan_efficiency=0.1))
+
+Each slow operation is logged as a warning, and the latest ones are kept in :attr:`SlowOperationLog.entries`.
+Entries include the key condition and filter expressions with attribute names resolved and values redacted,
+so that they can be logged without leaking data. To also export spans elsewhere, pass that exporter as
+the log's ``exporter``.
+"""
+import logging
+import re
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from pynamodb.connection.tracing import Span, SpanExporter
+from pynamodb.constants import EXPRESSION_ATTRIBUTE_NAMES, FILTER_EXPRESSION, INDEX_NAME, KEY_CONDITION_EXPRESSION
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+LATENCY = 'latency'
+SCAN_EFFICIENCY = 'scan_efficiency'
+
+REDACTED_VALUE = '?'
+
+_PLACEHOLDER_PATTERN = re.compile(r'[#:][A-Za-z0-9_]+')
+
+
+class SlowOperation:
+    """
+    A slow operation, and why it was considered slow
+    """
+
+    def __init__(self, span: Span, reasons: List[str]) -> None:
+        #: :data:`LATENCY` and/or :data:`SCAN_EFFICIENCY`
+        self.reasons = reasons
+        self.name = span.name
+        self.trace_id = span.trace_id
+        self.table_name = span.table_name
+        self.operation_name = span.operation_name
+        self.duration_seconds = span.duration_seconds
+        self.requests = span.requests
+        self.pages = span.pages
+        self.scanned_count = span.scanned_count
+        self.item_count = span.item_count
+        self.capacity_units = span.capacity_units
+        self.error = span.error
+        operation_kwargs = span.operation_kwargs or {}
+        self.index_name: Optional[str] = operation_kwargs.get(INDEX_NAME)
+        names = operation_kwargs.get(EXPRESSION_ATTRIBUTE_NAMES) or {}
+        #: The expressions of the operation, with attribute names resolved and values redacted
+        self.key_condition = resolve_expression(operation_kwargs.get(KEY_CONDITION_EXPRESSION), names)
+        self.filter_expression = resolve_expression(operation_kwargs.get(FILTER_EXPRESSION), names)
+
+    def __repr__(self) -> str:
+        return 'SlowOperation({})'.format(self.format())
+
+    @property
+    def scan_efficiency(self) -> Optional[float]:
+        """
+        The fraction of the items evaluated that were returned, for queries and scans
+        """
+        if not self.scanned_count:
+            return None
+        return self.item_count / self.scanned_count
+
+    def format(self) -> str:
+        parts = ['{} on {}'.format(self.name, self.table_name)]
+        if self.index_name is not None:
+            parts.append('index={}'.format(self.index_name))
+        parts.append('duration={:.3f}s'.format(self.duration_seconds))
+        parts.append('requests={}'.format(self.requests))
+        if self.pages:
+            parts.append('pages={}'.format(self.pages))
+        if self.scanned_count:
+            parts.append('returned={}/{}'.format(self.item_count, self.scanned_count))
+        parts.append('capacity_units={}'.format(self.capacity_units))
+        if self.key_condition is not None:
+            parts.append('key_condition={!r}'.format(self.key_condition))
+        if self.filter_expression is not None:
+            parts.append('filter={!r}'.format(self.filter_expression))
+        parts.append('reasons={}'.format(','.join(self.reasons)))
+        return ' '.join(parts)
+
+
+class SlowOperationLog(SpanExporter):
+    """
+    Records the traced operations that are slow or evaluate many more items than they return
+
+    :param latency_threshold_seconds: operations taking longer are recorded, unless None
+    :param min_scan_efficiency: queries and scans returning a smaller fraction of the items they evaluated
+        are recorded, unless None
+    :param min_scanned_count: the number of items a query or scan must evaluate for its efficiency to count
+    :param max_entries: the number of latest entries kept
+    :param exporter: an exporter all spans are passed on to
+    """
+
+    def __init__(
+        self,
+        latency_threshold_seconds: Optional[float] = 1.0,
+        min_scan_efficiency: Optional[float] = 0.1,
+        min_scanned_count: int = 100,
+        max_entries: int = 100,
+        exporter: Optional[SpanExporter] = None,
+    ) -> None:
+        self.latency_threshold_seconds = latency_threshold_seconds
+        self.min_scan_efficiency = min_scan_efficiency
+        self.min_scanned_count = min_scanned_count
+        self.exporter = exporter
+        self._entries: Deque[SlowOperation] = deque(maxlen=max_entries)
+
+    @property
+    def entries(self) -> List[SlowOperation]:
+        """
+        The latest slow operations, oldest first
+        """
+        return list(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def export(self, span: Span) -> None:
+        if self.exporter is not None:
+            try:
+                self.exporter.export(span)
+            except Exception:
+                log.exception("Span exporter threw an exception.")
+        reasons = self.get_reasons(span)
+        if reasons:
+            entry = SlowOperation(span, reasons)
+            self._entries.append(entry)
+            log.warning("Slow operation: %s", entry.format())
+
+    def get_reasons(self, span: Span) -> List[str]:
+        """
+        Returns why the operation of `span` is considered slow, if it is
+        """
+        reasons = []
+        if self.latency_threshold_seconds is not None and span.duration_seconds > self.latency_threshold_seconds:
+            reasons.append(LATENCY)
+        if (
+            self.min_scan_efficiency is not None
+            and span.scanned_count >= max(self.min_scanned_count, 1)
+            and span.item_count / span.scanned_count < self.min_scan_efficiency
+        ):
+            reasons.append(SCAN_EFFICIENCY)
+        return reasons
+
+
+def resolve_expression(expression: Optional[str], names: Dict[str, Any]) -> Optional[str]:
+    """
+    Replaces the attribute name placeholders of `expression` by the names, and its value placeholders by ``?``
+    """
+    if expression is None:
+        return None
+
+    def resolve(match: Any) -> str:
+        placeholder = match.group(0)
+        if placeholder[0] == ':':
+            return REDACTED_VALUE
+        return names.get(placeholder, placeholder)
+
+    return _PLACEHOLDER_PATTERN.sub(resolve, expression)
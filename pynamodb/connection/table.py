@@ -3,9 +3,18 @@ PynamoDB Connection classes
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~
 """
 
-from typing import Any, Dict, Mapping, Optional, Sequence
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
 
 from pynamodb.connection.base import Connection, MetaTable
+from pynamodb.connection.capacity import CapacityLedger
+from pynamodb.connection.circuit_breaker import CircuitBreaker
+from pynamodb.connection.hedging import HedgingPolicy
+from pynamodb.connection.hot_keys import HotKeyDetector
+from pynamodb.connection.metrics import MetricsRegistry
+from pynamodb.connection.pooling import PoolAutoSizing
+from pynamodb.connection.routing import Endpoint, EndpointRouter
+from pynamodb.connection.retry import RetryPolicy
+from pynamodb.connection.transport import Transport
 from pynamodb.constants import DEFAULT_BILLING_MODE, KEY
 from pynamodb.expressions.condition import Condition
 from pynamodb.expressions.update import Action
@@ -31,6 +40,20 @@ class TableConnection:
         aws_session_token: Optional[str] = None,
         *,
         meta_table: Optional[MetaTable] = None,
+        transport: Optional[Transport] = None,
+        tcp_nodelay: Optional[bool] = None,
+        tcp_keepalive: Optional[bool] = None,
+        share_clients: Optional[bool] = None,
+        max_connection_idle_seconds: Optional[float] = None,
+        max_connection_lifetime_seconds: Optional[float] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        endpoints: Optional[Union[Sequence[Endpoint], EndpointRouter]] = None,
+        pool_auto_sizing: Optional[PoolAutoSizing] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        capacity_ledger: Optional[CapacityLedger] = None,
+        hot_keys: Optional[HotKeyDetector] = None,
     ) -> None:
         self.table_name = table_name
         self.connection = Connection(region=region,
@@ -42,7 +65,21 @@ class TableConnection:
                                      extra_headers=extra_headers,
                                      aws_access_key_id=aws_access_key_id,
                                      aws_secret_access_key=aws_secret_access_key,
-                                     aws_session_token=aws_session_token)
+                                     aws_session_token=aws_session_token,
+                                     transport=transport,
+                                     tcp_nodelay=tcp_nodelay,
+                                     tcp_keepalive=tcp_keepalive,
+                                     share_clients=share_clients,
+                                     max_connection_idle_seconds=max_connection_idle_seconds,
+                                     max_connection_lifetime_seconds=max_connection_lifetime_seconds,
+                                     hedging=hedging,
+                                     retry_policy=retry_policy,
+                                     circuit_breaker=circuit_breaker,
+                                     endpoints=endpoints,
+                                     pool_auto_sizing=pool_auto_sizing,
+                                     metrics=metrics,
+                                     capacity_ledger=capacity_ledger,
+                                     hot_keys=hot_keys)
 
         if meta_table is not None:
             self.connection.add_meta_table(meta_table)
@@ -178,6 +215,7 @@ class TableConnection:
         consistent_read: Optional[bool] = None,
         return_consumed_capacity: Optional[str] = None,
         attributes_to_get: Optional[Any] = None,
+        hedge: Optional[bool] = None,
     ) -> Dict:
         """
         Performs the batch get item operation
@@ -188,6 +226,7 @@ class TableConnection:
             consistent_read=consistent_read,
             return_consumed_capacity=return_consumed_capacity,
             attributes_to_get=attributes_to_get,
+            hedge=hedge,
         )
 
     def get_item(
@@ -196,6 +235,7 @@ class TableConnection:
         range_key: Optional[str] = None,
         consistent_read: bool = False,
         attributes_to_get: Optional[Any] = None,
+        hedge: Optional[bool] = None,
     ) -> Dict:
         """
         Performs the GetItem operation and returns the result
@@ -206,6 +246,7 @@ class TableConnection:
             range_key=range_key,
             consistent_read=consistent_read,
             attributes_to_get=attributes_to_get,
+            hedge=hedge,
         )
 
     def scan(
@@ -249,6 +290,7 @@ class TableConnection:
         return_consumed_capacity: Optional[str] = None,
         scan_index_forward: Optional[bool] = None,
         select: Optional[str] = None,
+        hedge: Optional[bool] = None,
     ) -> Dict:
         """
         Performs the Query operation and returns the result
@@ -266,6 +308,7 @@ class TableConnection:
             return_consumed_capacity=return_consumed_capacity,
             scan_index_forward=scan_index_forward,
             select=select,
+            hedge=hedge,
         )
 
     def describe_table(self) -> Dict:
@@ -0,0 +1,212 @@
+"""
+Tracing
+~~~~~~~
+
+A single model operation such as a scan or ``batch_get`` can send many requests: one per page, plus the
+retries of failed requests and the requests resending unprocessed items. Tracing groups them into a
+:class:`Span` per logical operation, which records the number of requests, pages, retries and unprocessed
+items, and the total time taken. Each finished span is passed to a :class:`SpanExporter`, e.g. to forward it
+to an application's tracer:
+
+.. code-block:: python
+
+    from pynamodb.connection.tracing import SpanExporter, set_span_exporter
+
+    class LoggingExporter(SpanExporter):
+        def export(self, span):
+            log.info("%s: %d pages, %d retries in %.3fs", span.name, span.pages, span.retries, span.duration_seconds)
+
+    set_span_exporter(LoggingExporter())
+
+Spans are created by ``query``, ``scan``, ``batch_get``, batch writes (one span per commit) and transactions,
+including their asyncio variants. The span of a query or scan ends once its last page has been fetched, or when
+its result iterator is garbage collected. While a span is active, receivers of the ``pre_dynamodb_send`` and
+``post_dynamodb_send`` :doc:`signals <signals>` can get it, and its ``trace_id``, from :func:`get_current_span`,
+including when the signals are sent from a background thread.
+
+:class:`~pynamodb.connection.slow_log.SlowOperationLog` is an exporter recording slow and inefficient operations.
+"""
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from pynamodb.connection.capacity import parse_consumed_capacity
+from pynamodb.constants import CAMEL_COUNT, CONSUMED_CAPACITY, SCANNED_COUNT
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+_exporter: Optional['SpanExporter'] = None
+_current_span: 'ContextVar[Optional[Span]]' = ContextVar('pynamodb_span', default=None)
+
+
+class Span:
+    """
+    A logical operation and the requests it has sent
+    """
+
+    def __init__(self, name: str, model_name: Optional[str] = None, table_name: Optional[str] = None) -> None:
+        #: Identifies the span, and the requests sent for it
+        self.trace_id = uuid.uuid4().hex
+        #: The operation, e.g. ``Thread.scan``
+        self.name = name
+        self.model_name = model_name
+        self.table_name = table_name
+        #: The :func:`time.time` the span started and ended at
+        self.start_time = time.time()
+        self.end_time: Optional[float] = None
+        self.duration_seconds = 0.0
+        #: The number of requests dispatched, including those resending unprocessed items
+        self.requests = 0
+        #: The number of pages of results fetched
+        self.pages = 0
+        #: The number of failed requests retried, and of requests resending unprocessed items
+        self.retries = 0
+        #: The number of unprocessed items or keys returned
+        self.unprocessed_items = 0
+        #: The exception the operation failed with, if any
+        self.error: Optional[BaseException] = None
+        #: The DynamoDB operation and arguments of the first request that succeeded
+        self.operation_name: Optional[str] = None
+        self.operation_kwargs: Optional[Dict[str, Any]] = None
+        #: The number of items evaluated, and of items returned, by Query and Scan requests
+        self.scanned_count = 0
+        self.item_count = 0
+        #: The capacity units consumed by the requests
+        self.capacity_units = 0.0
+        self._start = time.perf_counter()
+
+    def __repr__(self) -> str:
+        return 'Span(name={}, trace_id={}, requests={}, pages={}, retries={}, unprocessed_items={})'.format(
+            self.name, self.trace_id, self.requests, self.pages, self.retries, self.unprocessed_items,
+        )
+
+    def record_response(self, operation_name: str, operation_kwargs: Dict[str, Any], data: Optional[Dict]) -> None:
+        """
+        Adds the response to a request sent for the span
+        """
+        if self.operation_name is None:
+            self.operation_name = operation_name
+            self.operation_kwargs = operation_kwargs
+        if not data:
+            return
+        self.scanned_count += data.get(SCANNED_COUNT, 0)
+        self.item_count += data.get(CAMEL_COUNT, 0)
+        consumed_capacity = data.get(CONSUMED_CAPACITY)
+        if consumed_capacity is not None:
+            for _, read_capacity_units, write_capacity_units in parse_consumed_capacity(
+                operation_name, operation_kwargs, consumed_capacity,
+            ):
+                self.capacity_units += read_capacity_units + write_capacity_units
+
+    @property
+    def finished(self) -> bool:
+        return self.end_time is not None
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """
+        Ends the span and exports it, unless it has already ended
+        """
+        if self.end_time is not None:
+            return
+        self.duration_seconds = time.perf_counter() - self._start
+        self.end_time = self.start_time + self.duration_seconds
+        self.error = error
+        exporter = _exporter
+        if exporter is not None:
+            try:
+                exporter.export(self)
+            except Exception:
+                log.exception("Span exporter threw an exception.")
+
+
+class SpanExporter:
+    """
+    Receives finished spans
+    """
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError()
+
+
+class InMemorySpanExporter(SpanExporter):
+    """
+    Keeps finished spans in a list, e.g. for tests
+    """
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def clear(self) -> None:
+        self.spans = []
+
+
+def set_span_exporter(exporter: Optional[SpanExporter]) -> None:
+    """
+    Sets the exporter finished spans are passed to, or None to stop tracing
+    """
+    global _exporter
+    _exporter = exporter
+
+
+def get_span_exporter() -> Optional[SpanExporter]:
+    return _exporter
+
+
+def start_span(name: str, model_name: Optional[str] = None, table_name: Optional[str] = None) -> Optional[Span]:
+    """
+    Returns a new span if tracing is enabled, or None
+    """
+    if _exporter is None:
+        return None
+    return Span(name, model_name=model_name, table_name=table_name)
+
+
+def get_current_span() -> Optional[Span]:
+    """
+    Returns the span requests are currently sent for, if any
+    """
+    if _exporter is None:
+        return None
+    return _current_span.get()
+
+
+@contextmanager
+def use_span(span: Optional[Span]) -> Iterator[Optional[Span]]:
+    """
+    Makes `span` current in the block, if it isn't None
+    """
+    if span is None:
+        yield None
+        return
+    token = _current_span.set(span)
+    try:
+        yield span
+    finally:
+        _current_span.reset(token)
+
+
+@contextmanager
+def traced(name: str, model_name: Optional[str] = None, table_name: Optional[str] = None) -> Iterator[Optional[Span]]:
+    """
+    Starts a span if tracing is enabled, makes it current in the block and finishes it at the end of the block
+    """
+    span = start_span(name, model_name=model_name, table_name=table_name)
+    if span is None:
+        yield None
+        return
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.finish(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.finish()
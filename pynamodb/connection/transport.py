@@ -0,0 +1,288 @@
+"""
+HTTP transports
+~~~~~~~~~~~~~~~
+
+A transport sends a request that PynamoDB has already serialized and signed, and returns the raw
+HTTP response. PynamoDB keeps ownership of serialization, signing, retries and error mapping, so a
+transport only has to move bytes.
+
+Transports must raise botocore's connection exceptions (e.g. ``EndpointConnectionError``,
+``ConnectTimeoutError``, ``ReadTimeoutError``) for network failures so they can be retried.
+"""
+import asyncio
+import os
+import ssl
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Tuple, Union, cast
+from urllib.parse import urlsplit
+
+from botocore.awsrequest import AWSPreparedRequest
+from botocore.httpsession import URLLib3Session
+from botocore.utils import get_environ_proxies
+
+from pynamodb.connection._async_http import AsyncHTTPConnectionPool
+from pynamodb.connection._pool import get_pool_classes, get_pool_metrics
+from pynamodb.connection.pooling import PoolAutoSizing, PoolMetrics
+
+if TYPE_CHECKING:
+    from pynamodb.connection.base import Connection
+
+
+class TransportResponse:
+    """
+    A fully read HTTP response.
+
+    Any object with ``status_code``, ``headers`` and ``content`` attributes may be returned by a transport,
+    e.g. botocore's ``AWSResponse``.
+    """
+
+    def __init__(self, status_code: int, headers: Mapping[str, str], content: bytes) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+
+class Transport:
+    """
+    Sends signed requests and returns raw responses
+    """
+    #: The metrics of the transport's connection pool, if it has one
+    pool_metrics: Optional[PoolMetrics] = None
+
+    def send(self, request: AWSPreparedRequest) -> Any:
+        """
+        Sends `request` and returns a response with ``status_code``, ``headers`` and ``content``
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Releases any pooled connections
+        """
+
+    def open_connections(self, endpoint_url: str, count: int) -> int:
+        """
+        Opens up to `count` pooled connections to `endpoint_url` ahead of the first request,
+        returning how many were opened. Transports without a connection pool open none.
+        """
+        return 0
+
+    def after_fork(self) -> None:
+        """
+        Called in a forked child, to replace any connections shared with the parent process.
+        Transports are shared between connections, so this may be called more than once per fork.
+        """
+
+
+class BotocoreTransport(Transport):
+    """
+    Sends requests through the connection pool of the connection's botocore client
+    """
+
+    def __init__(self, connection: 'Connection') -> None:
+        self.connection = connection
+
+    @property  # type: ignore[override]
+    def pool_metrics(self) -> Optional[PoolMetrics]:
+        return get_pool_metrics(self.connection.client._endpoint.http_session)
+
+    def send(self, request: AWSPreparedRequest) -> Any:
+        return self.connection.client._endpoint.http_session.send(request)
+
+    def open_connections(self, endpoint_url: str, count: int) -> int:
+        return _open_urllib3_connections(self.connection.client._endpoint.http_session, endpoint_url, count)
+
+
+class URLLib3Transport(Transport):
+    """
+    Sends requests through a dedicated urllib3 pool, which can be tuned independently of the botocore client
+    """
+
+    def __init__(
+        self,
+        max_pool_connections: int = 10,
+        connect_timeout_seconds: Optional[float] = None,
+        read_timeout_seconds: Optional[float] = None,
+        verify: bool = True,
+        proxies: Optional[Dict[str, str]] = None,
+        socket_options: Optional[Any] = None,
+        max_connection_idle_seconds: Optional[float] = None,
+        max_connection_lifetime_seconds: Optional[float] = None,
+        pool_auto_sizing: Optional[PoolAutoSizing] = None,
+    ) -> None:
+        self._session_kwargs: Dict[str, Any] = {
+            'verify': verify,
+            'proxies': proxies,
+            'timeout': (connect_timeout_seconds, read_timeout_seconds),
+            'max_pool_connections': max_pool_connections,
+            'socket_options': socket_options,
+        }
+        self._max_connection_idle_seconds = max_connection_idle_seconds
+        self._max_connection_lifetime_seconds = max_connection_lifetime_seconds
+        self._pool_auto_sizing = pool_auto_sizing
+        self._create_session()
+
+    def _create_session(self) -> None:
+        self._pid = os.getpid()
+        self.session = URLLib3Session(**self._session_kwargs)
+        self.pool_metrics = PoolMetrics(self._session_kwargs['max_pool_connections'])
+        self.session._pool_classes_by_scheme.update(get_pool_classes(  # type: ignore[attr-defined]
+            self.pool_metrics,
+            self._max_connection_idle_seconds,
+            self._max_connection_lifetime_seconds,
+            self._pool_auto_sizing,
+        ))
+
+    def send(self, request: AWSPreparedRequest) -> Any:
+        return self.session.send(request)
+
+    def open_connections(self, endpoint_url: str, count: int) -> int:
+        return _open_urllib3_connections(self.session, endpoint_url, count)
+
+    def after_fork(self) -> None:
+        if self._pid != os.getpid():
+            # The parent's pool is abandoned rather than closed, since its sockets are still in use there
+            self._create_session()
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class AsyncTransport:
+    """
+    Sends signed requests and returns raw responses from asyncio code
+    """
+    #: The metrics of the transport's connection pool, if it has one
+    pool_metrics: Optional[PoolMetrics] = None
+
+    async def send(self, request: AWSPreparedRequest) -> Any:
+        """
+        Sends `request` and returns a response with ``status_code``, ``headers`` and ``content``
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """
+        Releases any pooled connections
+        """
+
+
+class AsyncHTTPTransport(AsyncTransport):
+    """
+    Sends requests over pools of keep-alive asyncio connections, one per endpoint.
+
+    Pools are bound to an event loop, so new ones are created when the transport is used from another loop.
+    Certificates are verified against `verify` when it is the path of a CA bundle, and not at all when it is False.
+    Connections are always made directly to the endpoint: HTTP proxies aren't supported, and a ValueError is
+    raised for an endpoint that the ``HTTP_PROXY`` or ``HTTPS_PROXY`` environment variables send through one.
+    """
+
+    def __init__(
+        self,
+        max_pool_connections: int = 10,
+        connect_timeout_seconds: Optional[float] = None,
+        read_timeout_seconds: Optional[float] = None,
+        max_connection_idle_seconds: Optional[float] = None,
+        max_connection_lifetime_seconds: Optional[float] = None,
+        pool_auto_sizing: Optional[PoolAutoSizing] = None,
+        verify: Union[bool, str] = True,
+        tcp_nodelay: bool = True,
+        tcp_keepalive: bool = False,
+    ) -> None:
+        self.max_pool_connections = max_pool_connections
+        self.connect_timeout_seconds = connect_timeout_seconds
+        self.read_timeout_seconds = read_timeout_seconds
+        self.max_connection_idle_seconds = max_connection_idle_seconds
+        self.max_connection_lifetime_seconds = max_connection_lifetime_seconds
+        self.pool_auto_sizing = pool_auto_sizing
+        self.tcp_nodelay = tcp_nodelay
+        self.tcp_keepalive = tcp_keepalive
+        # Created once, since loading the CA bundle reads files
+        self._ssl_context = _create_ssl_context(verify)
+        # Shared by the pools created for each event loop
+        self.pool_metrics = PoolMetrics(max_pool_connections)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Pools by endpoint URL, for the event loop the transport was last used from
+        self._pools: Dict[str, AsyncHTTPConnectionPool] = {}
+
+    async def send(self, request: AWSPreparedRequest) -> Any:
+        endpoint_url, path = _split_url(request.url)
+        body = request.body or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        return await self._get_pool(endpoint_url).request(
+            request.method, path, cast(Mapping[str, str], request.headers), cast(bytes, body),
+        )
+
+    async def close(self) -> None:
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            await pool.close()
+
+    def _get_pool(self, endpoint_url: str) -> AsyncHTTPConnectionPool:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # The connections of another loop can't be used from this one
+            pools, self._pools = self._pools, {}
+            for old_pool in pools.values():
+                old_pool.close_idle()
+            self._loop = loop
+        pool = self._pools.get(endpoint_url)
+        if pool is None:
+            if get_environ_proxies(endpoint_url).get(urlsplit(endpoint_url).scheme):
+                raise ValueError(
+                    "AsyncHTTPTransport doesn't support HTTP proxies, which are configured for {}".format(endpoint_url)
+                )
+            pool = self._pools[endpoint_url] = AsyncHTTPConnectionPool(
+                endpoint_url,
+                max_pool_connections=self.max_pool_connections,
+                connect_timeout_seconds=self.connect_timeout_seconds,
+                read_timeout_seconds=self.read_timeout_seconds,
+                max_connection_idle_seconds=self.max_connection_idle_seconds,
+                max_connection_lifetime_seconds=self.max_connection_lifetime_seconds,
+                pool_metrics=self.pool_metrics,
+                auto_sizing=self.pool_auto_sizing,
+                ssl_context=self._ssl_context,
+                tcp_nodelay=self.tcp_nodelay,
+                tcp_keepalive=self.tcp_keepalive,
+            )
+        return pool
+
+
+def _create_ssl_context(verify: Union[bool, str]) -> ssl.SSLContext:
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+    if isinstance(verify, str):
+        if os.path.isdir(verify):
+            return ssl.create_default_context(capath=verify)
+        return ssl.create_default_context(cafile=verify)
+    return ssl.create_default_context()
+
+
+def _open_urllib3_connections(session: Any, endpoint_url: str, count: int) -> int:
+    """
+    Connects (including the TLS handshake) up to `count` idle connections of a botocore urllib3 session's pool
+    """
+    proxy_url = session._proxy_config.proxy_url_for(endpoint_url)
+    pool = session._get_connection_manager(endpoint_url, proxy_url).connection_from_url(endpoint_url)
+    session._setup_ssl_cert(pool, endpoint_url, session._verify)
+    connections = []
+    try:
+        # Check out every connection first so that each one is new rather than the same one reused
+        for _ in range(min(count, pool.pool.qsize())):
+            connection = pool._get_conn()
+            if getattr(connection, 'sock', None) is None:
+                connection.connect()
+            connections.append(connection)
+    finally:
+        for connection in connections:
+            pool._put_conn(connection)
+    return len(connections)
+
+
+def _split_url(url: str) -> Tuple[str, str]:
+    parts = urlsplit(url)
+    path = (parts.path or '/') + ('?' + parts.query if parts.query else '')
+    return '{}://{}'.format(parts.scheme, parts.netloc), path
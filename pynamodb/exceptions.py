@@ -121,6 +121,24 @@ class TableDoesNotExist(PynamoDBException):
         super(TableDoesNotExist, self).__init__(msg)
 
 
+class CircuitBreakerOpenError(PynamoDBConnectionError):
+    """
+    Raised instead of sending a request to a table or index whose circuit breaker is open
+    """
+    def __init__(self, table_name: str, index_name: Optional[str] = None) -> None:
+        self.table_name = table_name
+        self.index_name = index_name
+        name = table_name if index_name is None else '{}/{}'.format(table_name, index_name)
+        super(CircuitBreakerOpenError, self).__init__("Circuit breaker is open for `{}`".format(name))
+
+
+class DeadlineExceededError(PynamoDBConnectionError):
+    """
+    Raised when an operation can't complete before the deadline of its call settings
+    """
+    msg = "Deadline exceeded"
+
+
 @dataclass
 class CancellationReason:
     """
@@ -1,6 +1,7 @@
 """
 DynamoDB Models for PynamoDB
 """
+import asyncio
 import random
 import time
 import logging
@@ -9,6 +10,8 @@ import sys
 from copy import deepcopy
 from inspect import getmembers
 from typing import Any
+from typing import ContextManager
+from typing import AsyncIterator
 from typing import Dict
 from typing import Generic
 from typing import Iterable
@@ -34,15 +37,28 @@ else:
 
 from pynamodb.expressions.update import Action
 from pynamodb.exceptions import DoesNotExist, TableDoesNotExist, TableError, InvalidStateError, PutError, \
-    AttributeNullError
+    AttributeNullError, GetError, DeadlineExceededError
 from pynamodb.attributes import (
     AttributeContainer, AttributeContainerMeta, TTLAttribute, VersionAttribute
 )
+from pynamodb.connection.async_table import AsyncTableConnection
+from pynamodb.connection.call_settings import CallSettings, get_call_settings, use_call_settings
+from pynamodb.connection.capacity import CapacityLedger, use_capacity_ledger
+from pynamodb.connection.circuit_breaker import CircuitBreaker
+from pynamodb.connection.hedging import HedgingPolicy
+from pynamodb.connection.hot_keys import HotKeyDetector
+from pynamodb.connection.retry import THROTTLING, RetryPolicy, get_retry_policy
+from pynamodb.connection.metrics import MetricsRegistry
+from pynamodb.connection.pooling import PoolAutoSizing
+from pynamodb.connection.profiling import profiled
+from pynamodb.connection.routing import Endpoint, EndpointRouter
 from pynamodb.connection.table import TableConnection
+from pynamodb.connection.tracing import Span, get_current_span, start_span, traced, use_span
+from pynamodb.connection.transport import AsyncTransport, Transport
 from pynamodb.expressions.condition import Condition
 from pynamodb.types import HASH, RANGE
 from pynamodb.indexes import Index
-from pynamodb.pagination import ResultIterator
+from pynamodb.pagination import AsyncResultIterator, ResultIterator
 from pynamodb.settings import get_settings_value
 from pynamodb import constants
 from pynamodb.constants import (
@@ -66,9 +82,9 @@ log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
 
-class BatchWrite(Generic[_T]):
+class _BaseBatchWrite(Generic[_T]):
     """
-    A class for batch writes
+    State shared by the blocking and asyncio batch writers
     """
     def __init__(self, model: Type[_T], auto_commit: bool = True):
         self.model = model
@@ -76,6 +92,96 @@ class BatchWrite(Generic[_T]):
         self.max_operations = BATCH_WRITE_PAGE_LIMIT
         self.pending_operations: List[Dict[str, Any]] = []
         self.failed_operations: List[Any] = []
+        # Commits use the call settings in effect when the batch was created
+        self._call_settings = get_call_settings()
+        self._capacity_ledger = CapacityLedger()
+
+    @property
+    def consumed_capacity(self) -> CapacityLedger:
+        """
+        The capacity consumed by the batch's commits so far
+        """
+        return self._capacity_ledger
+
+    def _is_full(self) -> bool:
+        if len(self.pending_operations) == self.max_operations:
+            if not self.auto_commit:
+                raise ValueError("DynamoDB allows a maximum of 25 batch operations")
+            return True
+        return False
+
+    def _pop_pending_operations(self) -> Tuple[List[Any], List[Any]]:
+        put_items = []
+        delete_items = []
+        for item in self.pending_operations:
+            if item['action'] == PUT:
+                put_items.append(item['item'].serialize())
+            elif item['action'] == DELETE:
+                delete_items.append(item['item']._get_keys())
+        self.pending_operations = []
+        return put_items, delete_items
+
+    def _get_unprocessed_items(
+        self,
+        data: Dict[str, Any],
+        retries: int,
+        sent_count: int,
+        previous_delay: Optional[float],
+    ) -> Tuple[List[Any], List[Any], float]:
+        """
+        Returns the put and delete items left unprocessed by a BatchWriteItem response,
+        and how long to wait before resending them
+        """
+        unprocessed_items = data.get(UNPROCESSED_ITEMS, {}).get(self.model.Meta.table_name)
+        if not unprocessed_items:
+            return [], [], 0
+        span = get_current_span()
+        if span is not None:
+            span.unprocessed_items += len(unprocessed_items)
+        # TODO: it is somewhat unintuitive that we retry unprocessed items max_retry_attempts times,
+        # since each `batch_write_item` operation is also subject to max_retry_attempts
+        call_settings = get_call_settings()
+        max_retry_attempts = self.model.Meta.max_retry_attempts
+        if call_settings is not None and call_settings.max_retry_attempts is not None:
+            max_retry_attempts = call_settings.max_retry_attempts
+        if retries + 1 >= max_retry_attempts:
+            self.failed_operations = unprocessed_items
+            raise PutError("Failed to batch write items: max_retry_attempts exceeded")
+        # Items are left unprocessed when the table is throttled. A request that wrote some of
+        # its items made progress, so resending the rest doesn't count against the retry budget.
+        retry_policy = get_retry_policy(self.model.Meta.retry_policy)
+        if len(unprocessed_items) < sent_count:
+            delay: Optional[float] = retry_policy.get_backoff_delay(THROTTLING, None)
+        else:
+            delay = retry_policy.get_retry_delay(THROTTLING, retries + 1, None, previous_delay)
+        if delay is None:
+            self.failed_operations = unprocessed_items
+            raise PutError("Failed to batch write items: retry budget exhausted")
+        if call_settings is not None:
+            remaining = call_settings.get_remaining_seconds()
+            if remaining is not None and remaining <= delay:
+                self.failed_operations = unprocessed_items
+                raise DeadlineExceededError("Deadline exceeded before unprocessed items could be resent")
+        put_items = []
+        delete_items = []
+        for item in unprocessed_items:
+            if PUT_REQUEST in item:
+                put_items.append(item.get(PUT_REQUEST).get(ITEM))
+            elif DELETE_REQUEST in item:
+                delete_items.append(item.get(DELETE_REQUEST).get(KEY))
+        if span is not None:
+            span.retries += 1
+        log.info(
+            "Resending %d unprocessed keys for batch operation (retry %d) in %.3f seconds",
+            len(unprocessed_items), retries + 1, delay,
+        )
+        return put_items, delete_items, delay
+
+
+class BatchWrite(_BaseBatchWrite[_T]):
+    """
+    A class for batch writes
+    """
 
     def save(self, put_item: _T) -> None:
         """
@@ -90,11 +196,8 @@ class BatchWrite(Generic[_T]):
 
         :param put_item: Should be an instance of a `Model` to be written
         """
-        if len(self.pending_operations) == self.max_operations:
-            if not self.auto_commit:
-                raise ValueError("DynamoDB allows a maximum of 25 batch operations")
-            else:
-                self.commit()
+        if self._is_full():
+            self.commit()
         self.pending_operations.append({"action": PUT, "item": put_item})
 
     def delete(self, del_item: _T) -> None:
@@ -110,11 +213,8 @@ class BatchWrite(Generic[_T]):
 
         :param del_item: Should be an instance of a `Model` to be deleted
         """
-        if len(self.pending_operations) == self.max_operations:
-            if not self.auto_commit:
-                raise ValueError("DynamoDB allows a maximum of 25 batch operations")
-            else:
-                self.commit()
+        if self._is_full():
+            self.commit()
         self.pending_operations.append({"action": DELETE, "item": del_item})
 
     def __enter__(self):
@@ -132,45 +232,89 @@ class BatchWrite(Generic[_T]):
         Writes all of the changes that are pending
         """
         log.debug("%s committing batch operation", self.model)
-        put_items = []
-        delete_items = []
-        for item in self.pending_operations:
-            if item['action'] == PUT:
-                put_items.append(item['item'].serialize())
-            elif item['action'] == DELETE:
-                delete_items.append(item['item']._get_keys())
-        self.pending_operations = []
-        if not len(put_items) and not len(delete_items):
-            return
-        data = self.model._get_connection().batch_write_item(
-            put_items=put_items,
-            delete_items=delete_items,
-        )
-        if data is None:
-            return
+        put_items, delete_items = self._pop_pending_operations()
         retries = 0
-        unprocessed_items = data.get(UNPROCESSED_ITEMS, {}).get(self.model.Meta.table_name)
-        while unprocessed_items:
-            # TODO: we should consider using exponential backoff here
-            # TODO: it is somewhat unintuitive that we retry unprocessed items max_retry_attempts times,
-            # since each `batch_write_item` operation is also subject to max_retry_attempts
-            retries += 1
-            if retries >= self.model.Meta.max_retry_attempts:
-                self.failed_operations = unprocessed_items
-                raise PutError("Failed to batch write items: max_retry_attempts exceeded")
-            put_items = []
-            delete_items = []
-            for item in unprocessed_items:
-                if PUT_REQUEST in item:
-                    put_items.append(item.get(PUT_REQUEST).get(ITEM))  # type: ignore
-                elif DELETE_REQUEST in item:
-                    delete_items.append(item.get(DELETE_REQUEST).get(KEY))  # type: ignore
-            log.info("Resending %d unprocessed keys for batch operation (retry %d)", len(unprocessed_items), retries)
-            data = self.model._get_connection().batch_write_item(
-                put_items=put_items,
-                delete_items=delete_items,
-            )
-            unprocessed_items = data.get(UNPROCESSED_ITEMS, {}).get(self.model.Meta.table_name)
+        delay: Optional[float] = None
+        with use_call_settings(self._call_settings), self.model._trace('batch_write'), \
+                use_capacity_ledger(self._capacity_ledger):
+            while put_items or delete_items:
+                data = self.model._get_connection().batch_write_item(
+                    put_items=put_items,
+                    delete_items=delete_items,
+                )
+                if data is None:
+                    return
+                put_items, delete_items, delay = self._get_unprocessed_items(
+                    data, retries, len(put_items) + len(delete_items), delay,
+                )
+                if put_items or delete_items:
+                    time.sleep(delay)
+                retries += 1
+
+
+class AsyncBatchWrite(_BaseBatchWrite[_T]):
+    """
+    A class for batch writes from asyncio code
+
+    Use it as an asynchronous context manager and await :meth:`save` and :meth:`delete`.
+    """
+    async def save(self, put_item: _T) -> None:
+        """
+        This adds `put_item` to the list of pending operations to be performed.
+
+        See :meth:`BatchWrite.save`.
+
+        :param put_item: Should be an instance of a `Model` to be written
+        """
+        if self._is_full():
+            await self.commit()
+        self.pending_operations.append({"action": PUT, "item": put_item})
+
+    async def delete(self, del_item: _T) -> None:
+        """
+        This adds `del_item` to the list of pending operations to be performed.
+
+        See :meth:`BatchWrite.delete`.
+
+        :param del_item: Should be an instance of a `Model` to be deleted
+        """
+        if self._is_full():
+            await self.commit()
+        self.pending_operations.append({"action": DELETE, "item": del_item})
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """
+        This ensures that all pending operations are committed when
+        the context is exited
+        """
+        return await self.commit()
+
+    async def commit(self) -> None:
+        """
+        Writes all of the changes that are pending
+        """
+        log.debug("%s committing batch operation", self.model)
+        put_items, delete_items = self._pop_pending_operations()
+        retries = 0
+        delay: Optional[float] = None
+        with use_call_settings(self._call_settings), self.model._trace('batch_write'), \
+                use_capacity_ledger(self._capacity_ledger):
+            while put_items or delete_items:
+                data = await self.model._get_async_connection().batch_write_item(
+                    put_items=put_items,
+                    delete_items=delete_items,
+                )
+                if data is None:
+                    return
+                put_items, delete_items, delay = self._get_unprocessed_items(
+                    data, retries, len(put_items) + len(delete_items), delay,
+                )
+                if put_items or delete_items:
+                    await asyncio.sleep(delay)
+                retries += 1
 
 
 class MetaProtocol(Protocol):
@@ -187,6 +331,20 @@ class MetaProtocol(Protocol):
     aws_access_key_id: Optional[str]
     aws_secret_access_key: Optional[str]
     aws_session_token: Optional[str]
+    transport: Optional[Transport]
+    async_transport: Optional[AsyncTransport]
+    tcp_nodelay: bool
+    tcp_keepalive: bool
+    share_clients: bool
+    max_connection_idle_seconds: Optional[float]
+    max_connection_lifetime_seconds: Optional[float]
+    hedging: Optional[HedgingPolicy]
+    retry_policy: Optional[RetryPolicy]
+    circuit_breaker: Optional[CircuitBreaker]
+    endpoints: Optional[Union[Sequence[Endpoint], EndpointRouter]]
+    pool_auto_sizing: Optional[PoolAutoSizing]
+    metrics: Optional[MetricsRegistry]
+    hot_keys: Optional[HotKeyDetector]
     billing_mode: Optional[str]
     tags: Optional[Dict[str, str]]
     stream_view_type: Optional[str]
@@ -204,6 +362,7 @@ class MetaModel(AttributeContainerMeta):
         super().__init__(name, bases, namespace, discriminator)
         MetaModel._initialize_indexes(self)
         cls = cast(Type['Model'], self)
+        cls._capacity_ledger = CapacityLedger()
         for attr_name, attribute in cls.get_attributes().items():
             if attribute.is_hash_key:
                 if cls._hash_keyname and cls._hash_keyname != attr_name:
@@ -251,6 +410,34 @@ class MetaModel(AttributeContainerMeta):
                         setattr(attr_obj, 'aws_secret_access_key', None)
                     if not hasattr(attr_obj, 'aws_session_token'):
                         setattr(attr_obj, 'aws_session_token', None)
+                    if not hasattr(attr_obj, 'transport'):
+                        setattr(attr_obj, 'transport', get_settings_value('transport'))
+                    if not hasattr(attr_obj, 'async_transport'):
+                        setattr(attr_obj, 'async_transport', get_settings_value('async_transport'))
+                    if not hasattr(attr_obj, 'tcp_nodelay'):
+                        setattr(attr_obj, 'tcp_nodelay', get_settings_value('tcp_nodelay'))
+                    if not hasattr(attr_obj, 'tcp_keepalive'):
+                        setattr(attr_obj, 'tcp_keepalive', get_settings_value('tcp_keepalive'))
+                    if not hasattr(attr_obj, 'share_clients'):
+                        setattr(attr_obj, 'share_clients', get_settings_value('share_clients'))
+                    if not hasattr(attr_obj, 'max_connection_idle_seconds'):
+                        setattr(attr_obj, 'max_connection_idle_seconds', get_settings_value('max_connection_idle_seconds'))
+                    if not hasattr(attr_obj, 'max_connection_lifetime_seconds'):
+                        setattr(attr_obj, 'max_connection_lifetime_seconds', get_settings_value('max_connection_lifetime_seconds'))
+                    if not hasattr(attr_obj, 'hedging'):
+                        setattr(attr_obj, 'hedging', get_settings_value('hedging'))
+                    if not hasattr(attr_obj, 'retry_policy'):
+                        setattr(attr_obj, 'retry_policy', get_settings_value('retry_policy'))
+                    if not hasattr(attr_obj, 'circuit_breaker'):
+                        setattr(attr_obj, 'circuit_breaker', get_settings_value('circuit_breaker'))
+                    if not hasattr(attr_obj, 'endpoints'):
+                        setattr(attr_obj, 'endpoints', get_settings_value('endpoints'))
+                    if not hasattr(attr_obj, 'pool_auto_sizing'):
+                        setattr(attr_obj, 'pool_auto_sizing', get_settings_value('pool_auto_sizing'))
+                    if not hasattr(attr_obj, 'metrics'):
+                        setattr(attr_obj, 'metrics', get_settings_value('metrics'))
+                    if not hasattr(attr_obj, 'hot_keys'):
+                        setattr(attr_obj, 'hot_keys', get_settings_value('hot_keys'))
 
             # create a custom Model.DoesNotExist derived from pynamodb.exceptions.DoesNotExist,
             # so that "except Model.DoesNotExist:" would not catch other models' exceptions
@@ -288,6 +475,8 @@ class Model(AttributeContainer, metaclass=MetaModel):
     _hash_keyname: Optional[str] = None
     _range_keyname: Optional[str] = None
     _connection: Optional[TableConnection] = None
+    _async_connection: Optional[AsyncTableConnection] = None
+    _capacity_ledger: CapacityLedger
     DoesNotExist: Type[DoesNotExist] = DoesNotExist
     _version_attribute_name: Optional[str] = None
 
@@ -322,31 +511,153 @@ class Model(AttributeContainer, metaclass=MetaModel):
         items: Iterable[Union[_KeyType, Iterable[_KeyType]]],
         consistent_read: Optional[bool] = None,
         attributes_to_get: Optional[Sequence[str]] = None,
+        hedge: Optional[bool] = None,
     ) -> Iterator[_T]:
         """
         BatchGetItem for this model
 
+        :param items: Should be a list of hash keys to retrieve, or a list of
+            tuples if range keys are used.
+        :param hedge: If set, overrides whether slow requests are hedged, see :class:`~pynamodb.connection.hedging.HedgingPolicy`
+        """
+        # Items are fetched lazily, with the call settings in effect now
+        return cls._batch_get(items, consistent_read, attributes_to_get, hedge, get_call_settings())
+
+    @classmethod
+    def _batch_get(
+        cls: Type[_T],
+        items: Iterable[Union[_KeyType, Iterable[_KeyType]]],
+        consistent_read: Optional[bool],
+        attributes_to_get: Optional[Sequence[str]],
+        hedge: Optional[bool],
+        call_settings: Optional[CallSettings],
+    ) -> Iterator[_T]:
+        # Started on the first iteration, so that items that are never iterated over don't leave a span open
+        span = cls._start_span('batch_get')
+        try:
+            for keys_to_get in cls._get_batch_get_key_pages(items):
+                delay: Optional[float] = None
+                while keys_to_get:
+                    with use_call_settings(call_settings), use_span(span):
+                        page, unprocessed_keys = cls._batch_get_page(
+                            keys_to_get,
+                            consistent_read=consistent_read,
+                            attributes_to_get=attributes_to_get,
+                            hedge=hedge,
+                        )
+                    if span is not None:
+                        span.pages += 1
+                    for batch_item in page:
+                        yield cls.from_raw_data(batch_item)
+                    unprocessed_keys = unprocessed_keys or []
+                    if unprocessed_keys:
+                        with use_call_settings(call_settings), use_span(span):
+                            delay = cls._get_batch_get_retry_delay(len(keys_to_get), len(unprocessed_keys), delay)
+                        time.sleep(delay)
+                    keys_to_get = unprocessed_keys
+        except Exception as e:
+            if span is not None:
+                span.finish(e)
+            raise
+        finally:
+            if span is not None:
+                span.finish()
+
+    @classmethod
+    def abatch_get(
+        cls: Type[_T],
+        items: Iterable[Union[_KeyType, Iterable[_KeyType]]],
+        consistent_read: Optional[bool] = None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+        hedge: Optional[bool] = None,
+    ) -> AsyncIterator[_T]:
+        """
+        BatchGetItem for this model, for use with ``async for``
+
         :param items: Should be a list of hash keys to retrieve, or a list of
             tuples if range keys are used.
         """
+        return cls._abatch_get(items, consistent_read, attributes_to_get, hedge, get_call_settings())
+
+    @classmethod
+    async def _abatch_get(
+        cls: Type[_T],
+        items: Iterable[Union[_KeyType, Iterable[_KeyType]]],
+        consistent_read: Optional[bool],
+        attributes_to_get: Optional[Sequence[str]],
+        hedge: Optional[bool],
+        call_settings: Optional[CallSettings],
+    ) -> AsyncIterator[_T]:
+        # Started on the first iteration, so that items that are never iterated over don't leave a span open
+        span = cls._start_span('batch_get')
+        try:
+            for keys_to_get in cls._get_batch_get_key_pages(items):
+                delay: Optional[float] = None
+                while keys_to_get:
+                    with use_call_settings(call_settings), use_span(span):
+                        data = await cls._get_async_connection().batch_get_item(
+                            keys_to_get, consistent_read=consistent_read, attributes_to_get=attributes_to_get, hedge=hedge,
+                        )
+                    page, unprocessed_keys = cls._parse_batch_get_page(data)
+                    if span is not None:
+                        span.pages += 1
+                    for batch_item in page:
+                        yield cls.from_raw_data(batch_item)
+                    unprocessed_keys = unprocessed_keys or []
+                    if unprocessed_keys:
+                        with use_call_settings(call_settings), use_span(span):
+                            delay = cls._get_batch_get_retry_delay(len(keys_to_get), len(unprocessed_keys), delay)
+                        await asyncio.sleep(delay)
+                    keys_to_get = unprocessed_keys
+        except Exception as e:
+            if span is not None:
+                span.finish(e)
+            raise
+        finally:
+            if span is not None:
+                span.finish()
+
+    @classmethod
+    def _get_batch_get_retry_delay(
+        cls,
+        requested_key_count: int,
+        unprocessed_key_count: int,
+        previous_delay: Optional[float],
+    ) -> float:
+        """
+        Returns how long to wait before requesting the keys left unprocessed by BatchGetItem
+        """
+        retry_policy = get_retry_policy(cls.Meta.retry_policy)
+        # As with batch writes, only requests that made no progress count against the retry budget
+        if unprocessed_key_count < requested_key_count:
+            delay: Optional[float] = retry_policy.get_backoff_delay(THROTTLING, None)
+        else:
+            delay = retry_policy.get_retry_delay(THROTTLING, 0, None, previous_delay)
+        if delay is None:
+            raise GetError("Failed to batch get items: retry budget exhausted")
+        call_settings = get_call_settings()
+        if call_settings is not None:
+            call_settings.check_deadline(delay)
+        span = get_current_span()
+        if span is not None:
+            span.unprocessed_items += unprocessed_key_count
+            span.retries += 1
+        log.debug("Resending %d unprocessed keys for batch get in %.3f seconds", unprocessed_key_count, delay)
+        return delay
+
+    @classmethod
+    def _get_batch_get_key_pages(cls, items: Iterable[Union[_KeyType, Iterable[_KeyType]]]) -> Iterator[List[Any]]:
+        """
+        Serializes the keys to get, in pages of at most BATCH_GET_PAGE_LIMIT keys
+        """
         items = set(items)
         hash_key_attribute = cls._hash_key_attribute()
         range_key_attribute = cls._range_key_attribute()
         keys_to_get: List[Any] = []
         while items:
             if len(keys_to_get) == BATCH_GET_PAGE_LIMIT:
-                while keys_to_get:
-                    page, unprocessed_keys = cls._batch_get_page(
-                        keys_to_get,
-                        consistent_read=consistent_read,
-                        attributes_to_get=attributes_to_get,
-                    )
-                    for batch_item in page:
-                        yield cls.from_raw_data(batch_item)
-                    if unprocessed_keys:
-                        keys_to_get = unprocessed_keys
-                    else:
-                        keys_to_get = []
+                yield keys_to_get
+                keys_to_get = []
             item = items.pop()
             if range_key_attribute:
                 if isinstance(item, str):
@@ -367,19 +678,8 @@ class Model(AttributeContainer, metaclass=MetaModel):
                 keys_to_get.append({
                     hash_key_attribute.attr_name: hash_key_ser
                 })
-
-        while keys_to_get:
-            page, unprocessed_keys = cls._batch_get_page(
-                keys_to_get,
-                consistent_read=consistent_read,
-                attributes_to_get=attributes_to_get,
-            )
-            for batch_item in page:
-                yield cls.from_raw_data(batch_item)
-            if unprocessed_keys:
-                keys_to_get = unprocessed_keys
-            else:
-                keys_to_get = []
+        if keys_to_get:
+            yield keys_to_get
 
     @classmethod
     def batch_write(cls: Type[_T], auto_commit: bool = True) -> BatchWrite[_T]:
@@ -394,6 +694,16 @@ class Model(AttributeContainer, metaclass=MetaModel):
         """
         return BatchWrite(cls, auto_commit=auto_commit)
 
+    @classmethod
+    def abatch_write(cls: Type[_T], auto_commit: bool = True) -> AsyncBatchWrite[_T]:
+        """
+        Returns an AsyncBatchWrite asynchronous context manager for a batch operation.
+
+        :param auto_commit: See :meth:`batch_write`.
+        """
+        return AsyncBatchWrite(cls, auto_commit=auto_commit)
+
+    @profiled
     def delete(self, condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Any:
         """
         Deletes this object from DynamoDB.
@@ -411,6 +721,20 @@ class Model(AttributeContainer, metaclass=MetaModel):
 
         return self._get_connection().delete_item(hk_value, range_key=rk_value, condition=condition)
 
+    @profiled
+    async def adelete(self, condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Any:
+        """
+        Deletes this object from DynamoDB, see :meth:`delete`.
+        """
+        hk_value, rk_value = self._get_hash_range_key_serialized_values()
+
+        version_condition = self._handle_version_attribute()
+        if add_version_condition and version_condition is not None:
+            condition &= version_condition
+
+        return await self._get_async_connection().delete_item(hk_value, range_key=rk_value, condition=condition)
+
+    @profiled
     def update(self, actions: List[Action], condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Any:
         """
         Updates an item using the UpdateItem operation.
@@ -434,13 +758,27 @@ class Model(AttributeContainer, metaclass=MetaModel):
             condition &= version_condition
 
         data = self._get_connection().update_item(hk_value, range_key=rk_value, return_values=ALL_NEW, condition=condition, actions=actions)
-        item_data = data[ATTRIBUTES]
-        stored_cls = self._get_discriminator_class(item_data)
-        if stored_cls and stored_cls != type(self):
-            raise ValueError("Cannot update this item from the returned class: {}".format(stored_cls.__name__))
-        self.deserialize(item_data)
+        self._deserialize_returned_item(data[ATTRIBUTES], 'update')
+        return data
+
+    @profiled
+    async def aupdate(self, actions: List[Action], condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Any:
+        """
+        Updates an item using the UpdateItem operation, see :meth:`update`.
+        """
+        if not isinstance(actions, list) or len(actions) == 0:
+            raise TypeError("the value of `actions` is expected to be a non-empty list")
+
+        hk_value, rk_value = self._get_hash_range_key_serialized_values()
+        version_condition = self._handle_version_attribute(actions=actions)
+        if add_version_condition and version_condition is not None:
+            condition &= version_condition
+
+        data = await self._get_async_connection().update_item(hk_value, range_key=rk_value, return_values=ALL_NEW, condition=condition, actions=actions)
+        self._deserialize_returned_item(data[ATTRIBUTES], 'update')
         return data
 
+    @profiled
     def save(self, condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Dict[str, Any]:
         """
         Save this object to dynamodb
@@ -450,6 +788,17 @@ class Model(AttributeContainer, metaclass=MetaModel):
         self.update_local_version_attribute()
         return data
 
+    @profiled
+    async def asave(self, condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Dict[str, Any]:
+        """
+        Save this object to dynamodb, see :meth:`save`.
+        """
+        args, kwargs = self._get_save_args(condition=condition, add_version_condition=add_version_condition)
+        data = await self._get_async_connection().put_item(*args, **kwargs)
+        self.update_local_version_attribute()
+        return data
+
+    @profiled
     def refresh(self, consistent_read: bool = False) -> None:
         """
         Retrieves this object's data from dynamodb and syncs this local object
@@ -463,9 +812,24 @@ class Model(AttributeContainer, metaclass=MetaModel):
         item_data = attrs.get(ITEM, None)
         if item_data is None:
             raise self.DoesNotExist("This item does not exist in the table.")
+        self._deserialize_returned_item(item_data, 'refresh')
+
+    @profiled
+    async def arefresh(self, consistent_read: bool = False) -> None:
+        """
+        Retrieves this object's data from dynamodb and syncs this local object, see :meth:`refresh`.
+        """
+        hk_value, rk_value = self._get_hash_range_key_serialized_values()
+        attrs = await self._get_async_connection().get_item(hk_value, range_key=rk_value, consistent_read=consistent_read)
+        item_data = attrs.get(ITEM, None)
+        if item_data is None:
+            raise self.DoesNotExist("This item does not exist in the table.")
+        self._deserialize_returned_item(item_data, 'refresh')
+
+    def _deserialize_returned_item(self, item_data: Dict[str, Any], operation: str) -> None:
         stored_cls = self._get_discriminator_class(item_data)
         if stored_cls and stored_cls != type(self):
-            raise ValueError("Cannot refresh this item from the returned class: {}".format(stored_cls.__name__))
+            raise ValueError("Cannot {} this item from the returned class: {}".format(operation, stored_cls.__name__))
         self.deserialize(item_data)
 
     def get_update_kwargs_from_instance(
@@ -524,12 +888,14 @@ class Model(AttributeContainer, metaclass=MetaModel):
         )
 
     @classmethod
+    @profiled
     def get(
         cls: Type[_T],
         hash_key: _KeyType,
         range_key: Optional[_KeyType] = None,
         consistent_read: bool = False,
         attributes_to_get: Optional[Sequence[Text]] = None,
+        hedge: Optional[bool] = None,
     ) -> _T:
         """
         Returns a single object using the provided keys
@@ -538,6 +904,7 @@ class Model(AttributeContainer, metaclass=MetaModel):
         :param range_key: The range key of the desired item, only used when appropriate.
         :param consistent_read:
         :param attributes_to_get:
+        :param hedge: If set, overrides whether slow requests are hedged, see :class:`~pynamodb.connection.hedging.HedgingPolicy`
         :raises ModelInstance.DoesNotExist: if the object to be updated does not exist
         """
         hash_key, range_key = cls._serialize_keys(hash_key, range_key)
@@ -547,6 +914,35 @@ class Model(AttributeContainer, metaclass=MetaModel):
             range_key=range_key,
             consistent_read=consistent_read,
             attributes_to_get=attributes_to_get,
+            hedge=hedge,
+        )
+        if data:
+            item_data = data.get(ITEM)
+            if item_data:
+                return cls.from_raw_data(item_data)
+        raise cls.DoesNotExist()
+
+    @classmethod
+    @profiled
+    async def aget(
+        cls: Type[_T],
+        hash_key: _KeyType,
+        range_key: Optional[_KeyType] = None,
+        consistent_read: bool = False,
+        attributes_to_get: Optional[Sequence[Text]] = None,
+        hedge: Optional[bool] = None,
+    ) -> _T:
+        """
+        Returns a single object using the provided keys, see :meth:`get`.
+        """
+        hash_key, range_key = cls._serialize_keys(hash_key, range_key)
+
+        data = await cls._get_async_connection().get_item(
+            hash_key,
+            range_key=range_key,
+            consistent_read=consistent_read,
+            attributes_to_get=attributes_to_get,
+            hedge=hedge,
         )
         if data:
             item_data = data.get(ITEM)
@@ -640,6 +1036,7 @@ class Model(AttributeContainer, metaclass=MetaModel):
         attributes_to_get: Optional[Iterable[str]] = None,
         page_size: Optional[int] = None,
         rate_limit: Optional[float] = None,
+        hedge: Optional[bool] = None,
     ) -> ResultIterator[_T]:
         """
         Provides a high level query API
@@ -656,7 +1053,87 @@ class Model(AttributeContainer, metaclass=MetaModel):
         :param attributes_to_get: If set, only returns these elements
         :param page_size: Page size of the query to DynamoDB
         :param rate_limit: If set then consumed capacity will be limited to this amount per second
+        :param hedge: If set, overrides whether slow requests are hedged, see :class:`~pynamodb.connection.hedging.HedgingPolicy`
         """
+        query_args, query_kwargs = cls._get_query_args(
+            hash_key,
+            range_key_condition=range_key_condition,
+            filter_condition=filter_condition,
+            consistent_read=consistent_read,
+            index_name=index_name,
+            scan_index_forward=scan_index_forward,
+            limit=limit,
+            last_evaluated_key=last_evaluated_key,
+            attributes_to_get=attributes_to_get,
+            page_size=page_size,
+        )
+        query_kwargs['hedge'] = hedge
+        return ResultIterator(
+            cls._get_connection().query,
+            query_args,
+            query_kwargs,
+            map_fn=cls.from_raw_data,
+            limit=limit,
+            rate_limit=rate_limit,
+            span=cls._start_span('query'),
+        )
+
+    @classmethod
+    def aquery(
+        cls: Type[_T],
+        hash_key: _KeyType,
+        range_key_condition: Optional[Condition] = None,
+        filter_condition: Optional[Condition] = None,
+        consistent_read: bool = False,
+        index_name: Optional[str] = None,
+        scan_index_forward: Optional[bool] = None,
+        limit: Optional[int] = None,
+        last_evaluated_key: Optional[Dict[str, Dict[str, Any]]] = None,
+        attributes_to_get: Optional[Iterable[str]] = None,
+        page_size: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        hedge: Optional[bool] = None,
+    ) -> AsyncResultIterator[_T]:
+        """
+        Provides a high level query API for use with ``async for``, see :meth:`query`.
+        """
+        query_args, query_kwargs = cls._get_query_args(
+            hash_key,
+            range_key_condition=range_key_condition,
+            filter_condition=filter_condition,
+            consistent_read=consistent_read,
+            index_name=index_name,
+            scan_index_forward=scan_index_forward,
+            limit=limit,
+            last_evaluated_key=last_evaluated_key,
+            attributes_to_get=attributes_to_get,
+            page_size=page_size,
+        )
+        query_kwargs['hedge'] = hedge
+        return AsyncResultIterator(
+            cls._get_async_connection().query,
+            query_args,
+            query_kwargs,
+            map_fn=cls.from_raw_data,
+            limit=limit,
+            rate_limit=rate_limit,
+            span=cls._start_span('query'),
+        )
+
+    @classmethod
+    def _get_query_args(
+        cls,
+        hash_key: _KeyType,
+        range_key_condition: Optional[Condition],
+        filter_condition: Optional[Condition],
+        consistent_read: bool,
+        index_name: Optional[str],
+        scan_index_forward: Optional[bool],
+        limit: Optional[int],
+        last_evaluated_key: Optional[Dict[str, Dict[str, Any]]],
+        attributes_to_get: Optional[Iterable[str]],
+        page_size: Optional[int],
+    ) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
         if index_name:
             hash_key = cls._indexes[index_name]._hash_key_attribute().serialize(hash_key)
         else:
@@ -681,15 +1158,7 @@ class Model(AttributeContainer, metaclass=MetaModel):
             limit=page_size,
             attributes_to_get=attributes_to_get,
         )
-
-        return ResultIterator(
-            cls._get_connection().query,
-            query_args,
-            query_kwargs,
-            map_fn=cls.from_raw_data,
-            limit=limit,
-            rate_limit=rate_limit,
-        )
+        return query_args, query_kwargs
 
     @classmethod
     def scan(
@@ -719,6 +1188,78 @@ class Model(AttributeContainer, metaclass=MetaModel):
         :param rate_limit: If set then consumed capacity will be limited to this amount per second
         :param attributes_to_get: If set, specifies the properties to include in the projection expression
         """
+        scan_args, scan_kwargs = cls._get_scan_args(
+            filter_condition=filter_condition,
+            segment=segment,
+            total_segments=total_segments,
+            limit=limit,
+            last_evaluated_key=last_evaluated_key,
+            page_size=page_size,
+            consistent_read=consistent_read,
+            index_name=index_name,
+            attributes_to_get=attributes_to_get,
+        )
+        return ResultIterator(
+            cls._get_connection().scan,
+            scan_args,
+            scan_kwargs,
+            map_fn=cls.from_raw_data,
+            limit=limit,
+            rate_limit=rate_limit,
+            span=cls._start_span('scan'),
+        )
+
+    @classmethod
+    def ascan(
+        cls: Type[_T],
+        filter_condition: Optional[Condition] = None,
+        segment: Optional[int] = None,
+        total_segments: Optional[int] = None,
+        limit: Optional[int] = None,
+        last_evaluated_key: Optional[Dict[str, Dict[str, Any]]] = None,
+        page_size: Optional[int] = None,
+        consistent_read: Optional[bool] = None,
+        index_name: Optional[str] = None,
+        rate_limit: Optional[float] = None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+    ) -> AsyncResultIterator[_T]:
+        """
+        Iterates through all items in the table with ``async for``, see :meth:`scan`.
+        """
+        scan_args, scan_kwargs = cls._get_scan_args(
+            filter_condition=filter_condition,
+            segment=segment,
+            total_segments=total_segments,
+            limit=limit,
+            last_evaluated_key=last_evaluated_key,
+            page_size=page_size,
+            consistent_read=consistent_read,
+            index_name=index_name,
+            attributes_to_get=attributes_to_get,
+        )
+        return AsyncResultIterator(
+            cls._get_async_connection().scan,
+            scan_args,
+            scan_kwargs,
+            map_fn=cls.from_raw_data,
+            limit=limit,
+            rate_limit=rate_limit,
+            span=cls._start_span('scan'),
+        )
+
+    @classmethod
+    def _get_scan_args(
+        cls,
+        filter_condition: Optional[Condition],
+        segment: Optional[int],
+        total_segments: Optional[int],
+        limit: Optional[int],
+        last_evaluated_key: Optional[Dict[str, Dict[str, Any]]],
+        page_size: Optional[int],
+        consistent_read: Optional[bool],
+        index_name: Optional[str],
+        attributes_to_get: Optional[Sequence[str]],
+    ) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
         # If this class has a discriminator attribute, filter the scan to only return instances of this class.
         discriminator_attr = cls._get_discriminator_attribute()
         if discriminator_attr:
@@ -738,15 +1279,7 @@ class Model(AttributeContainer, metaclass=MetaModel):
             index_name=index_name,
             attributes_to_get=attributes_to_get
         )
-
-        return ResultIterator(
-            cls._get_connection().scan,
-            scan_args,
-            scan_kwargs,
-            map_fn=cls.from_raw_data,
-            limit=limit,
-            rate_limit=rate_limit,
-        )
+        return scan_args, scan_kwargs
 
     @classmethod
     def exists(cls: Type[_T]) -> bool:
@@ -1016,7 +1549,7 @@ class Model(AttributeContainer, metaclass=MetaModel):
         return self._serialize_keys(hash_key, range_key)
 
     @classmethod
-    def _batch_get_page(cls, keys_to_get, consistent_read, attributes_to_get):
+    def _batch_get_page(cls, keys_to_get, consistent_read, attributes_to_get, hedge=None):
         """
         Returns a single page from BatchGetItem
         Also returns any unprocessed items
@@ -1024,15 +1557,38 @@ class Model(AttributeContainer, metaclass=MetaModel):
         :param keys_to_get: A list of keys
         :param consistent_read: Whether or not this needs to be consistent
         :param attributes_to_get: A list of attributes to return
+        :param hedge: Whether to hedge the request
         """
         log.debug("Fetching a BatchGetItem page")
         data = cls._get_connection().batch_get_item(
-            keys_to_get, consistent_read=consistent_read, attributes_to_get=attributes_to_get,
+            keys_to_get, consistent_read=consistent_read, attributes_to_get=attributes_to_get, hedge=hedge,
         )
+        return cls._parse_batch_get_page(data)
+
+    @classmethod
+    def _parse_batch_get_page(cls, data: Dict[str, Any]) -> Tuple[Any, Any]:
+        """
+        Returns the items and unprocessed keys of a BatchGetItem response
+        """
         item_data = data.get(RESPONSES).get(cls.Meta.table_name)  # type: ignore
         unprocessed_items = data.get(UNPROCESSED_KEYS).get(cls.Meta.table_name, {}).get(KEYS, None)  # type: ignore
         return item_data, unprocessed_items
 
+    @classmethod
+    def get_consumed_capacity(cls) -> CapacityLedger:
+        """
+        Returns the ledger of the capacity consumed by requests made by this model
+        """
+        return cls._capacity_ledger
+
+    @classmethod
+    def _start_span(cls, operation: str) -> Optional[Span]:
+        return start_span('{}.{}'.format(cls.__name__, operation), model_name=cls.__name__, table_name=cls.Meta.table_name)
+
+    @classmethod
+    def _trace(cls, operation: str) -> ContextManager[Optional[Span]]:
+        return traced('{}.{}'.format(cls.__name__, operation), model_name=cls.__name__, table_name=cls.Meta.table_name)
+
     @classmethod
     def _get_connection(cls) -> TableConnection:
         """
@@ -1088,9 +1644,59 @@ class Model(AttributeContainer, metaclass=MetaModel):
                                               extra_headers=cls.Meta.extra_headers,
                                               aws_access_key_id=cls.Meta.aws_access_key_id,
                                               aws_secret_access_key=cls.Meta.aws_secret_access_key,
-                                              aws_session_token=cls.Meta.aws_session_token)
+                                              aws_session_token=cls.Meta.aws_session_token,
+                                              transport=cls.Meta.transport,
+                                              tcp_nodelay=cls.Meta.tcp_nodelay,
+                                              tcp_keepalive=cls.Meta.tcp_keepalive,
+                                              share_clients=cls.Meta.share_clients,
+                                              max_connection_idle_seconds=cls.Meta.max_connection_idle_seconds,
+                                              max_connection_lifetime_seconds=cls.Meta.max_connection_lifetime_seconds,
+                                              hedging=cls.Meta.hedging,
+                                              retry_policy=cls.Meta.retry_policy,
+                                              circuit_breaker=cls.Meta.circuit_breaker,
+                                              endpoints=cls.Meta.endpoints,
+                                              pool_auto_sizing=cls.Meta.pool_auto_sizing,
+                                              metrics=cls.Meta.metrics,
+                                              capacity_ledger=cls._capacity_ledger,
+                                              hot_keys=cls.Meta.hot_keys)
         return cls._connection
 
+    @classmethod
+    def _get_async_connection(cls) -> AsyncTableConnection:
+        """
+        Returns a (cached) asyncio connection
+        """
+        if cls._async_connection is None or cls._async_connection.table_name != cls.Meta.table_name:
+            # Built from the model's schema, without a DescribeTable request
+            meta_table = cls._get_connection().get_meta_table()
+            cls._async_connection = AsyncTableConnection(cls.Meta.table_name,
+                                                         meta_table=meta_table,
+                                                         region=cls.Meta.region,
+                                                         host=cls.Meta.host,
+                                                         connect_timeout_seconds=cls.Meta.connect_timeout_seconds,
+                                                         read_timeout_seconds=cls.Meta.read_timeout_seconds,
+                                                         max_retry_attempts=cls.Meta.max_retry_attempts,
+                                                         max_pool_connections=cls.Meta.max_pool_connections,
+                                                         extra_headers=cls.Meta.extra_headers,
+                                                         aws_access_key_id=cls.Meta.aws_access_key_id,
+                                                         aws_secret_access_key=cls.Meta.aws_secret_access_key,
+                                                         aws_session_token=cls.Meta.aws_session_token,
+                                                         transport=cls.Meta.async_transport,
+                                                         tcp_nodelay=cls.Meta.tcp_nodelay,
+                                                         tcp_keepalive=cls.Meta.tcp_keepalive,
+                                                         share_clients=cls.Meta.share_clients,
+                                                         max_connection_idle_seconds=cls.Meta.max_connection_idle_seconds,
+                                                         max_connection_lifetime_seconds=cls.Meta.max_connection_lifetime_seconds,
+                                                         hedging=cls.Meta.hedging,
+                                                         retry_policy=cls.Meta.retry_policy,
+                                                         circuit_breaker=cls.Meta.circuit_breaker,
+                                                         endpoints=cls.Meta.endpoints,
+                                                         pool_auto_sizing=cls.Meta.pool_auto_sizing,
+                                                         metrics=cls.Meta.metrics,
+                                                         capacity_ledger=cls._capacity_ledger,
+                                                         hot_keys=cls.Meta.hot_keys)
+        return cls._async_connection
+
     @classmethod
     def _serialize_value(cls, attr, value):
         """
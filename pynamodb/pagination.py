@@ -1,6 +1,11 @@
+import asyncio
 import time
-from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TypeVar
+import weakref
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Generic, Iterable, Iterator, Optional, TypeVar
 
+from pynamodb.connection.call_settings import CallSettings, get_call_settings, use_call_settings
+from pynamodb.connection.capacity import CapacityLedger, use_capacity_ledger
+from pynamodb.connection.tracing import Span, use_span
 from pynamodb.constants import (CAMEL_COUNT, ITEMS, LAST_EVALUATED_KEY, SCANNED_COUNT,
                                 CONSUMED_CAPACITY, TOTAL, CAPACITY_UNITS)
 
@@ -53,10 +58,23 @@ class RateLimiter:
         :return: None
         """
 
-        self._time_module.sleep(max(0, self._consumed/float(self.rate_limit) - (self._time_module.time()-self._time_of_last_acquire)))
+        self._time_module.sleep(self._get_delay())
         self._consumed = 0
         self._time_of_last_acquire = self._time_module.time()
 
+    async def aacquire(self) -> None:
+        """
+        Like :meth:`acquire`, but suspends the running coroutine rather than blocking the event loop
+
+        :return: None
+        """
+        await asyncio.sleep(self._get_delay())
+        self._consumed = 0
+        self._time_of_last_acquire = self._time_module.time()
+
+    def _get_delay(self) -> float:
+        return max(0, self._consumed/float(self.rate_limit) - (self._time_module.time()-self._time_of_last_acquire))
+
     @property
     def rate_limit(self) -> float:
         """
@@ -71,12 +89,9 @@ class RateLimiter:
         self._rate_limit = rate_limit
 
 
-class PageIterator(Iterator[_T]):
+class _BasePageIterator(Generic[_T]):
     """
-    PageIterator handles Query and Scan result pagination.
-
-    https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/Query.Pagination.html
-    https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/Scan.html#Scan.Pagination
+    State shared by the blocking and asyncio page iterators
     """
     def __init__(
         self,
@@ -84,6 +99,7 @@ class PageIterator(Iterator[_T]):
         args: Any,
         kwargs: Dict[str, Any],
         rate_limit: Optional[float] = None,
+        span: Optional[Span] = None,
     ) -> None:
         self._operation = operation
         self._args = args
@@ -94,32 +110,37 @@ class PageIterator(Iterator[_T]):
         self._rate_limiter = None
         if rate_limit:
             self._rate_limiter = RateLimiter(rate_limit)
-
-    def __iter__(self) -> Iterator[_T]:
-        return self
-
-    def __next__(self) -> _T:
-        if self._is_last_page:
-            raise StopIteration()
-
+        # Pages are fetched with the call settings in effect when the iterator was created
+        self._call_settings = get_call_settings()
+        self._capacity_ledger = CapacityLedger()
+        self._span = span
+        if span is not None:
+            # The span of an iterator that isn't consumed to the end ends when it is garbage collected
+            weakref.finalize(self, span.finish)
+
+    def _prepare_next_page(self, call_settings: Optional[CallSettings]) -> None:
         self._kwargs['exclusive_start_key'] = self._last_evaluated_key
-
         if self._rate_limiter:
-            self._rate_limiter.acquire()
             self._kwargs['return_consumed_capacity'] = TOTAL
-        page = self._operation(*self._args, **self._kwargs)
+            if call_settings is not None:
+                call_settings.check_deadline(self._rate_limiter._get_delay())
+
+    def _update_from_page(self, page: Any) -> None:
         self._last_evaluated_key = page.get(LAST_EVALUATED_KEY)
         self._is_last_page = self._last_evaluated_key is None
         self._total_scanned_count += page[SCANNED_COUNT]
+        if self._span is not None:
+            self._span.pages += 1
+            if self._is_last_page:
+                self._span.finish()
 
         if self._rate_limiter:
             consumed_capacity = page.get(CONSUMED_CAPACITY, {}).get(CAPACITY_UNITS, 0)
             self._rate_limiter.consume(consumed_capacity)
 
-        return page
-
-    def next(self) -> _T:
-        return self.__next__()
+    def _finish_span(self, error: Optional[BaseException] = None) -> None:
+        if self._span is not None:
+            self._span.finish(error)
 
     @property
     def key_names(self) -> Iterable[str]:
@@ -147,47 +168,96 @@ class PageIterator(Iterator[_T]):
     def total_scanned_count(self) -> int:
         return self._total_scanned_count
 
+    @property
+    def consumed_capacity(self) -> CapacityLedger:
+        """
+        The capacity consumed by the pages fetched so far
+        """
+        return self._capacity_ledger
+
 
-class ResultIterator(Iterator[_T]):
+class PageIterator(_BasePageIterator[_T], Iterator[_T]):
     """
-    ResultIterator handles Query and Scan item pagination.
+    PageIterator handles Query and Scan result pagination.
 
     https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/Query.Pagination.html
     https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/Scan.html#Scan.Pagination
     """
+    def __iter__(self) -> Iterator[_T]:
+        return self
+
+    def __next__(self) -> _T:
+        if self._is_last_page:
+            raise StopIteration()
+
+        with use_call_settings(self._call_settings) as call_settings, use_span(self._span), \
+                use_capacity_ledger(self._capacity_ledger):
+            self._prepare_next_page(call_settings)
+            if self._rate_limiter:
+                self._rate_limiter.acquire()
+            try:
+                page = self._operation(*self._args, **self._kwargs)
+            except Exception as e:
+                self._finish_span(e)
+                raise
+        self._update_from_page(page)
+        return page
+
+    def next(self) -> _T:
+        return self.__next__()
+
+
+class AsyncPageIterator(_BasePageIterator[_T], AsyncIterator[_T]):
+    """
+    AsyncPageIterator handles Query and Scan result pagination for an asyncio operation.
+    """
+    _operation: Callable[..., Awaitable[Any]]
+
+    def __aiter__(self) -> AsyncIterator[_T]:
+        return self
+
+    async def __anext__(self) -> _T:
+        if self._is_last_page:
+            raise StopAsyncIteration()
+
+        with use_call_settings(self._call_settings) as call_settings, use_span(self._span), \
+                use_capacity_ledger(self._capacity_ledger):
+            self._prepare_next_page(call_settings)
+            if self._rate_limiter:
+                await self._rate_limiter.aacquire()
+            try:
+                page = await self._operation(*self._args, **self._kwargs)
+            except Exception as e:
+                self._finish_span(e)
+                raise
+        self._update_from_page(page)
+        return page
+
+
+class _BaseResultIterator(Generic[_T]):
+    """
+    State shared by the blocking and asyncio result iterators
+    """
+    page_iter: _BasePageIterator
+
     def __init__(
         self,
-        operation: Callable,
-        args: Any,
-        kwargs: Dict[str, Any],
         map_fn: Optional[Callable] = None,
         limit: Optional[int] = None,
-        rate_limit: Optional[float] = None,
     ) -> None:
-        self.page_iter: PageIterator = PageIterator(operation, args, kwargs, rate_limit)
         self._map_fn = map_fn
         self._limit = limit
         self._total_count = 0
         self._index = 0
         self._count = 0
 
-    def _get_next_page(self) -> None:
-        page = next(self.page_iter)
+    def _update_from_page(self, page: Any) -> None:
         self._count = page[CAMEL_COUNT]
         self._items = page.get(ITEMS)  # not returned if 'Select' is set to 'COUNT'
         self._index = 0 if self._items else self._count
         self._total_count += self._count
 
-    def __iter__(self) -> Iterator[_T]:
-        return self
-
-    def __next__(self) -> _T:
-        if self._limit == 0:
-            raise StopIteration
-
-        while self._index == self._count:
-            self._get_next_page()
-
+    def _next_item(self) -> Any:
         item = self._items[self._index]
         self._index += 1
         if self._limit is not None:
@@ -196,9 +266,6 @@ class ResultIterator(Iterator[_T]):
             item = self._map_fn(item)
         return item
 
-    def next(self) -> _T:
-        return self.__next__()
-
     @property
     def last_evaluated_key(self) -> Optional[Dict[str, Dict[str, Any]]]:
         if self._index == self._count:
@@ -216,3 +283,86 @@ class ResultIterator(Iterator[_T]):
     @property
     def total_count(self) -> int:
         return self._total_count
+
+    @property
+    def consumed_capacity(self) -> CapacityLedger:
+        """
+        The capacity consumed by the pages fetched so far
+        """
+        return self.page_iter.consumed_capacity
+
+
+class ResultIterator(_BaseResultIterator[_T], Iterator[_T]):
+    """
+    ResultIterator handles Query and Scan item pagination.
+
+    https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/Query.Pagination.html
+    https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/Scan.html#Scan.Pagination
+    """
+    def __init__(
+        self,
+        operation: Callable,
+        args: Any,
+        kwargs: Dict[str, Any],
+        map_fn: Optional[Callable] = None,
+        limit: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        span: Optional[Span] = None,
+    ) -> None:
+        super().__init__(map_fn=map_fn, limit=limit)
+        self.page_iter: PageIterator = PageIterator(operation, args, kwargs, rate_limit, span)
+
+    def _get_next_page(self) -> None:
+        self._update_from_page(next(self.page_iter))
+
+    def __iter__(self) -> Iterator[_T]:
+        return self
+
+    def __next__(self) -> _T:
+        if self._limit == 0:
+            self.page_iter._finish_span()
+            raise StopIteration
+
+        while self._index == self._count:
+            self._get_next_page()
+
+        return self._next_item()
+
+    def next(self) -> _T:
+        return self.__next__()
+
+
+class AsyncResultIterator(_BaseResultIterator[_T], AsyncIterator[_T]):
+    """
+    AsyncResultIterator handles Query and Scan item pagination for an asyncio operation.
+
+    Use it with ``async for``; pages are fetched as the items of the previous page are consumed.
+    """
+    def __init__(
+        self,
+        operation: Callable[..., Awaitable[Any]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        map_fn: Optional[Callable] = None,
+        limit: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        span: Optional[Span] = None,
+    ) -> None:
+        super().__init__(map_fn=map_fn, limit=limit)
+        self.page_iter: AsyncPageIterator = AsyncPageIterator(operation, args, kwargs, rate_limit, span)
+
+    async def _get_next_page(self) -> None:
+        self._update_from_page(await self.page_iter.__anext__())
+
+    def __aiter__(self) -> AsyncIterator[_T]:
+        return self
+
+    async def __anext__(self) -> _T:
+        if self._limit == 0:
+            self.page_iter._finish_span()
+            raise StopAsyncIteration
+
+        while self._index == self._count:
+            await self._get_next_page()
+
+        return self._next_item()
@@ -5,6 +5,15 @@ falls silently back to a noop.
 This implementation was taken from Flask:
 https://github.com/pallets/flask/blob/master/flask/signals.py
 """
+import contextvars
+import logging
+import os
+import threading
+from queue import SimpleQueue
+from typing import Any, Optional
+
+log = logging.getLogger(__name__)
+
 signals_available = False
 
 
@@ -31,8 +40,8 @@ class _FakeSignal(object):
                            'not installed.')
 
     send = lambda *a, **kw: None  # noqa
-    connect = disconnect = has_receivers_for = receivers_for = \
-        temporarily_connected_to = _fail
+    has_receivers_for = lambda *a, **kw: False  # noqa
+    connect = disconnect = receivers_for = temporarily_connected_to = _fail
     del _fail
 
 
@@ -48,3 +57,87 @@ _signals = Namespace()
 
 pre_dynamodb_send = _signals.signal('pre_dynamodb_send')
 post_dynamodb_send = _signals.signal('post_dynamodb_send')
+dynamodb_request_hedged = _signals.signal('dynamodb_request_hedged')
+circuit_breaker_state_changed = _signals.signal('circuit_breaker_state_changed')
+
+
+class _BackgroundSender(object):
+    """
+    Sends signals from a daemon thread, so that slow receivers don't add latency to requests.
+    Receivers run in a copy of the sender's context, so that context variables such as the current span are kept.
+    Signals are dropped if `max_pending` of them are already waiting to be sent.
+    """
+
+    def __init__(self, max_pending: int = 10000) -> None:
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._queue: Optional[SimpleQueue] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def send(self, signal: Any, sender: Any, **kwargs: Any) -> None:
+        queue = self._get_queue()
+        if queue.qsize() >= self.max_pending:
+            self.dropped += 1
+            log.warning("Dropped a %s signal, %s signals are waiting to be sent", signal.name, self.max_pending)
+            return
+        queue.put((signal, sender, kwargs, contextvars.copy_context()))
+
+    def flush(self) -> None:
+        queue = self._queue
+        if queue is not None and self._pid == os.getpid():
+            flushed = threading.Event()
+            queue.put((None, flushed, None, None))
+            flushed.wait()
+
+    def _get_queue(self) -> SimpleQueue:
+        queue = self._queue
+        if queue is None or self._pid != os.getpid():
+            with self._lock:
+                # The thread doesn't survive a fork, so forked children start their own
+                if self._queue is None or self._pid != os.getpid():
+                    self._queue = SimpleQueue()
+                    self._pid = os.getpid()
+                    thread = threading.Thread(target=self._run, args=(self._queue,), name='pynamodb-signals')
+                    thread.daemon = True
+                    thread.start()
+                queue = self._queue
+        return queue
+
+    @staticmethod
+    def _run(queue: SimpleQueue) -> None:
+        while True:
+            signal, sender, kwargs, context = queue.get()
+            if signal is None:
+                sender.set()
+                continue
+            try:
+                context.run(signal.send, sender, **kwargs)
+            except Exception:
+                log.exception("%s callback threw an exception.", signal.name)
+
+
+_background_sender = _BackgroundSender()
+
+
+def _reset_after_fork() -> None:
+    # The lock may have been held by another thread of the parent when it forked
+    _background_sender._lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def send_in_background(signal: Any, sender: Any, **kwargs: Any) -> None:
+    """
+    Sends `signal` from a background thread
+    """
+    _background_sender.send(signal, sender, **kwargs)
+
+
+def flush_background_signals() -> None:
+    """
+    Waits until the signals sent from the background thread have been received
+    """
+    _background_sender.flush()
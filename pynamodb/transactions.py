@@ -1,6 +1,8 @@
 from typing import Tuple, TypeVar, Type, Any, List, Optional, Dict, Union, Text, Generic
 
 from pynamodb.connection import Connection
+from pynamodb.connection.capacity import CapacityLedger, use_capacity_ledger
+from pynamodb.connection.tracing import traced
 from pynamodb.constants import ITEM, RESPONSES
 from pynamodb.expressions.condition import Condition
 from pynamodb.expressions.update import Action
@@ -19,6 +21,14 @@ class Transaction:
     def __init__(self, connection: Connection, return_consumed_capacity: Optional[str] = None) -> None:
         self._connection = connection
         self._return_consumed_capacity = return_consumed_capacity
+        self._capacity_ledger = CapacityLedger()
+
+    @property
+    def consumed_capacity(self) -> CapacityLedger:
+        """
+        The capacity consumed by the transaction, once committed
+        """
+        return self._capacity_ledger
 
     def _commit(self):
         raise NotImplementedError()
@@ -62,10 +72,11 @@ class TransactGet(Transaction):
             model.update_with_raw_data(data.get(ITEM))
 
     def _commit(self) -> Any:
-        response = self._connection.transact_get_items(
-            get_items=self._get_items,
-            return_consumed_capacity=self._return_consumed_capacity
-        )
+        with traced('TransactGet'), use_capacity_ledger(self._capacity_ledger):
+            response = self._connection.transact_get_items(
+                get_items=self._get_items,
+                return_consumed_capacity=self._return_consumed_capacity
+            )
 
         results = response[RESPONSES]
         self._results = results
@@ -129,15 +140,16 @@ class TransactWrite(Transaction):
         self._models_for_version_attribute_update.append(model)
 
     def _commit(self) -> Any:
-        response = self._connection.transact_write_items(
-            condition_check_items=self._condition_check_items,
-            delete_items=self._delete_items,
-            put_items=self._put_items,
-            update_items=self._update_items,
-            client_request_token=self._client_request_token,
-            return_consumed_capacity=self._return_consumed_capacity,
-            return_item_collection_metrics=self._return_item_collection_metrics,
-        )
+        with traced('TransactWrite'), use_capacity_ledger(self._capacity_ledger):
+            response = self._connection.transact_write_items(
+                condition_check_items=self._condition_check_items,
+                delete_items=self._delete_items,
+                put_items=self._put_items,
+                update_items=self._update_items,
+                client_request_token=self._client_request_token,
+                return_consumed_capacity=self._return_consumed_capacity,
+                return_item_collection_metrics=self._return_item_collection_metrics,
+            )
         for model in self._models_for_version_attribute_update:
             model.update_local_version_attribute()
         return response
@@ -0,0 +1,436 @@
+"""
+Tests for the asyncio API
+"""
+import asyncio
+import json
+import os
+import socket
+import ssl
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from pynamodb.connection import AsyncConnection, Connection
+from pynamodb.connection.base import MetaTable
+from pynamodb.connection.transport import AsyncHTTPTransport, AsyncTransport, TransportResponse
+from pynamodb.constants import (
+    BATCH_WRITE_ITEM, BATCH_GET_ITEM, GET_ITEM, ITEM, PUT_ITEM, QUERY, RESPONSES, SCAN, UNPROCESSED_ITEMS,
+    UNPROCESSED_KEYS,
+)
+from pynamodb.exceptions import DoesNotExist, PutError
+from pynamodb.models import Model
+
+ASYNC_PATCH_METHOD = 'pynamodb.connection.async_base.AsyncConnection._make_api_call'
+
+TABLE_DATA = {
+    'TableName': 'AsyncThread',
+    'KeySchema': [
+        {'AttributeName': 'forum', 'KeyType': 'HASH'},
+        {'AttributeName': 'subject', 'KeyType': 'RANGE'},
+    ],
+    'AttributeDefinitions': [
+        {'AttributeName': 'forum', 'AttributeType': 'S'},
+        {'AttributeName': 'subject', 'AttributeType': 'S'},
+    ],
+}
+
+
+class AsyncThread(Model):
+    class Meta:
+        table_name = 'AsyncThread'
+
+    forum = UnicodeAttribute(hash_key=True)
+    subject = UnicodeAttribute(range_key=True)
+    views = NumberAttribute(default=0)
+
+
+class FakeAsyncApi:
+    """
+    Records calls made through AsyncConnection._make_api_call and replays canned responses
+    """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    async def __call__(self, operation_name, operation_kwargs):
+        self.calls.append((operation_name, operation_kwargs))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+async def _no_sleep(delay):
+    pass
+
+
+def _item(forum, subject, views=0):
+    return {'forum': {'S': forum}, 'subject': {'S': subject}, 'views': {'N': str(views)}}
+
+
+@pytest.fixture(autouse=True)
+def reset_connections():
+    AsyncThread._connection = None
+    AsyncThread._async_connection = None
+
+
+def test_aget():
+    fake = FakeAsyncApi({ITEM: _item('f', 's', 3)})
+    with patch(ASYNC_PATCH_METHOD, new=fake):
+        item = asyncio.run(AsyncThread.aget('f', 's'))
+    assert item.views == 3
+    assert fake.calls[0][0] == GET_ITEM
+    assert fake.calls[0][1]['Key'] == {'forum': {'S': 'f'}, 'subject': {'S': 's'}}
+
+
+def test_aget_does_not_exist():
+    fake = FakeAsyncApi({})
+    with patch(ASYNC_PATCH_METHOD, new=fake):
+        with pytest.raises(DoesNotExist):
+            asyncio.run(AsyncThread.aget('f', 's'))
+
+
+def test_asave_and_arefresh():
+    fake = FakeAsyncApi({}, {ITEM: _item('f', 's', 5)})
+    thread = AsyncThread('f', 's', views=1)
+
+    async def run():
+        await thread.asave()
+        await thread.arefresh()
+
+    with patch(ASYNC_PATCH_METHOD, new=fake):
+        asyncio.run(run())
+    assert fake.calls[0][0] == PUT_ITEM
+    assert fake.calls[0][1]['Item']['views'] == {'N': '1'}
+    assert thread.views == 5
+
+
+def test_aquery():
+    fake = FakeAsyncApi(
+        {'Items': [_item('f', 'a')], 'Count': 1, 'ScannedCount': 1, 'LastEvaluatedKey': {'forum': {'S': 'f'}, 'subject': {'S': 'a'}}},
+        {'Items': [_item('f', 'b')], 'Count': 1, 'ScannedCount': 1},
+    )
+
+    async def run():
+        results = AsyncThread.aquery('f', AsyncThread.subject >= 'a')
+        items = [item async for item in results]
+        return results, items
+
+    with patch(ASYNC_PATCH_METHOD, new=fake):
+        results, items = asyncio.run(run())
+    assert [item.subject for item in items] == ['a', 'b']
+    assert results.total_count == 2
+    assert [call[0] for call in fake.calls] == [QUERY, QUERY]
+    assert fake.calls[1][1]['ExclusiveStartKey'] == {'forum': {'S': 'f'}, 'subject': {'S': 'a'}}
+
+
+def test_ascan_limit():
+    fake = FakeAsyncApi({'Items': [_item('f', 'a'), _item('f', 'b')], 'Count': 2, 'ScannedCount': 2})
+
+    async def run():
+        return [item async for item in AsyncThread.ascan(limit=1)]
+
+    with patch(ASYNC_PATCH_METHOD, new=fake):
+        items = asyncio.run(run())
+    assert [item.subject for item in items] == ['a']
+    assert fake.calls[0][0] == SCAN
+
+
+def test_abatch_get():
+    fake = FakeAsyncApi(
+        {
+            RESPONSES: {'AsyncThread': [_item('f', 'a')]},
+            UNPROCESSED_KEYS: {'AsyncThread': {'Keys': [{'forum': {'S': 'f'}, 'subject': {'S': 'b'}}]}},
+        },
+        {RESPONSES: {'AsyncThread': [_item('f', 'b')]}, UNPROCESSED_KEYS: {}},
+    )
+
+    async def run():
+        return [item async for item in AsyncThread.abatch_get([('f', 'a'), ('f', 'b')])]
+
+    with patch(ASYNC_PATCH_METHOD, new=fake), patch('asyncio.sleep', new=_no_sleep):
+        items = asyncio.run(run())
+    assert sorted(item.subject for item in items) == ['a', 'b']
+    assert [call[0] for call in fake.calls] == [BATCH_GET_ITEM, BATCH_GET_ITEM]
+
+
+def test_abatch_write_retries_unprocessed_items():
+    unprocessed = {'AsyncThread': [{'PutRequest': {'Item': _item('f', 'b')}}]}
+    fake = FakeAsyncApi({UNPROCESSED_ITEMS: unprocessed}, {})
+
+    async def run():
+        async with AsyncThread.abatch_write() as batch:
+            await batch.save(AsyncThread('f', 'a'))
+            await batch.save(AsyncThread('f', 'b'))
+
+    with patch(ASYNC_PATCH_METHOD, new=fake), patch('asyncio.sleep', new=_no_sleep):
+        asyncio.run(run())
+    assert [call[0] for call in fake.calls] == [BATCH_WRITE_ITEM, BATCH_WRITE_ITEM]
+    assert len(fake.calls[0][1]['RequestItems']['AsyncThread']) == 2
+    assert fake.calls[1][1]['RequestItems']['AsyncThread'] == [{'PutRequest': {'Item': _item('f', 'b')}}]
+
+
+def test_abatch_write_max_retries():
+    unprocessed = {'AsyncThread': [{'PutRequest': {'Item': _item('f', 'a')}}]}
+    fake = FakeAsyncApi(*[{UNPROCESSED_ITEMS: unprocessed}] * AsyncThread.Meta.max_retry_attempts)
+
+    async def run():
+        async with AsyncThread.abatch_write() as batch:
+            await batch.save(AsyncThread('f', 'a'))
+
+    with patch(ASYNC_PATCH_METHOD, new=fake), patch('asyncio.sleep', new=_no_sleep):
+        with pytest.raises(PutError):
+            asyncio.run(run())
+
+
+async def _serve_dynamodb(handler):
+    async def handle(reader, writer):
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            headers = {}
+            while True:
+                header = await reader.readline()
+                if header in (b'\r\n', b''):
+                    break
+                name, value = header.decode().split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers['content-length']))
+            status, response = handler(headers['x-amz-target'].split('.')[-1], json.loads(body))
+            content = json.dumps(response).encode()
+            writer.write(
+                b'HTTP/1.1 %d OK\r\nContent-Type: application/x-amz-json-1.0\r\n'
+                b'x-amzn-RequestId: request-id\r\nContent-Length: %d\r\n\r\n' % (status, len(content)) + content
+            )
+            await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, '127.0.0.1', 0)
+
+
+def test_async_connection_http_round_trip():
+    def handler(operation_name, body):
+        if operation_name == 'GetItem':
+            return 200, {ITEM: {'forum': {'S': body['Key']['forum']['S']}, 'data': {'B': 'aGk='}}}
+        return 400, {'__type': 'com.amazonaws.dynamodb.v20120810#ResourceNotFoundException', 'message': 'Not found'}
+
+    async def run():
+        server = await _serve_dynamodb(handler)
+        port = server.sockets[0].getsockname()[1]
+        async with AsyncConnection(host='http://127.0.0.1:{}'.format(port), max_pool_connections=4) as conn:
+            conn.add_meta_table(MetaTable(TABLE_DATA))
+            results = await asyncio.gather(*[conn.get_item('AsyncThread', 'f', 's') for _ in range(10)])
+            pool, = conn._transport._pools.values()
+            assert len(pool._idle) <= 4
+            with pytest.raises(PutError) as excinfo:
+                await conn.put_item('AsyncThread', 'f', 's')
+        server.close()
+        await server.wait_closed()
+        return results, excinfo
+
+    results, excinfo = asyncio.run(run())
+    assert results[0][ITEM] == {'forum': {'S': 'f'}, 'data': {'B': b'hi'}}
+    assert excinfo.value.cause_response_code == 'ResourceNotFoundException'
+    assert excinfo.value.cause_response_message == 'Not found'
+
+
+def test_async_connection_transport():
+    class RecordingAsyncTransport(AsyncTransport):
+        def __init__(self):
+            self.requests = []
+            self.closed = False
+
+        async def send(self, request):
+            self.requests.append(request)
+            return TransportResponse(200, {}, json.dumps({ITEM: _item('f', 's')}).encode())
+
+        async def close(self):
+            self.closed = True
+
+    transport = RecordingAsyncTransport()
+
+    async def run():
+        async with AsyncConnection(transport=transport) as conn:
+            conn.add_meta_table(MetaTable(TABLE_DATA))
+            return await conn.get_item('AsyncThread', 'f', 's')
+
+    assert asyncio.run(run())[ITEM] == _item('f', 's')
+    assert transport.requests[0].headers['X-Amz-Target'] == 'DynamoDB_20120810.GetItem'
+    assert transport.closed
+
+
+def test_async_connection_creates_client_off_the_event_loop():
+    class RecordingAsyncTransport(AsyncTransport):
+        async def send(self, request):
+            return TransportResponse(200, {}, json.dumps({ITEM: _item('f', 's')}).encode())
+
+    create_client = Connection._create_client
+    client_threads = []
+
+    def record_thread(connection, *args):
+        client_threads.append(threading.current_thread())
+        return create_client(connection, *args)
+
+    async def run():
+        async with AsyncConnection(transport=RecordingAsyncTransport()) as conn:
+            conn.add_meta_table(MetaTable(TABLE_DATA))
+            with patch.object(conn.connection, '_prepare_to_sign', wraps=conn.connection._prepare_to_sign) as prepare:
+                for _ in range(2):
+                    await conn.get_item('AsyncThread', 'f', 's')
+            return prepare.call_count
+
+    with patch.object(Connection, '_create_client', record_thread):
+        # the client and credentials are only prepared once, in a thread
+        assert asyncio.run(run()) == 1
+    assert len(client_threads) == 1
+    assert client_threads[0] is not threading.main_thread()
+
+
+def test_async_transport_reuses_connections_between_endpoints():
+    def handler(operation_name, body):
+        return 200, {ITEM: _item('f', 's')}
+
+    async def run():
+        servers = [await _serve_dynamodb(handler) for _ in range(2)]
+        hosts = ['http://127.0.0.1:{}'.format(server.sockets[0].getsockname()[1]) for server in servers]
+        transport = AsyncHTTPTransport()
+        connections = [AsyncConnection(host=host, transport=transport) for host in hosts]
+        for conn in connections:
+            conn.add_meta_table(MetaTable(TABLE_DATA))
+        for _ in range(3):
+            for conn in connections:
+                await conn.get_item('AsyncThread', 'f', 's')
+        metrics = transport.pool_metrics.as_dict()
+        await transport.close()
+        for server in servers:
+            server.close()
+            await server.wait_closed()
+        return metrics
+
+    metrics = asyncio.run(run())
+    # one connection per endpoint, reused by each request to it
+    assert metrics['connections_opened'] == 2
+    assert metrics['connections_closed'] == 0
+
+
+def test_async_transport_closes_pools_of_other_loops():
+    def handler(operation_name, body):
+        return 200, {ITEM: _item('f', 's')}
+
+    transport = AsyncHTTPTransport()
+
+    async def run():
+        server = await _serve_dynamodb(handler)
+        conn = AsyncConnection(host='http://127.0.0.1:{}'.format(server.sockets[0].getsockname()[1]), transport=transport)
+        conn.add_meta_table(MetaTable(TABLE_DATA))
+        await conn.get_item('AsyncThread', 'f', 's')
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(run())
+    asyncio.run(run())
+    assert transport.pool_metrics.connections_opened == 2
+    # the first loop's connection was closed when the transport was used from the second loop
+    assert transport.pool_metrics.connections_closed == 1
+
+
+def test_async_connection_max_connection_idle_seconds():
+    connections = []
+
+    def handler(operation_name, body):
+        return 200, {ITEM: _item('f', 's')}
+
+    async def run():
+        server = await _serve_dynamodb(handler)
+        port = server.sockets[0].getsockname()[1]
+        async with AsyncConnection(host='http://127.0.0.1:{}'.format(port), max_connection_idle_seconds=0) as conn:
+            conn.add_meta_table(MetaTable(TABLE_DATA))
+            for _ in range(2):
+                await conn.get_item('AsyncThread', 'f', 's')
+                pool, = conn._transport._pools.values()
+                connections.append(pool._idle[-1][0])
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(run())
+    # The idle connection had expired by the second request, so a new one was opened
+    assert connections[0] is not connections[1]
+
+
+def test_async_transport_ssl_context(tmp_path):
+    transport = AsyncHTTPTransport(verify=False)
+    assert transport._ssl_context.verify_mode == ssl.CERT_NONE
+    assert not transport._ssl_context.check_hostname
+
+    missing_bundle = str(tmp_path / 'missing.pem')
+    with pytest.raises(FileNotFoundError):
+        AsyncHTTPTransport(verify=missing_bundle)
+    with patch.dict(os.environ, {'AWS_CA_BUNDLE': missing_bundle}), pytest.raises(FileNotFoundError):
+        AsyncConnection()
+
+    async def get_pool():
+        return transport._get_pool('https://dynamodb.us-east-1.amazonaws.com')
+
+    pool = asyncio.run(get_pool())
+    assert pool._ssl_context is transport._ssl_context
+
+
+def test_async_transport_proxies():
+    async def get_pool(endpoint_url):
+        return AsyncHTTPTransport()._get_pool(endpoint_url)
+
+    with patch.dict(os.environ, {'HTTPS_PROXY': 'http://proxy:3128', 'NO_PROXY': 'localhost'}):
+        with pytest.raises(ValueError, match="doesn't support HTTP proxies"):
+            asyncio.run(get_pool('https://dynamodb.us-east-1.amazonaws.com'))
+        asyncio.run(get_pool('http://localhost:8000'))
+
+
+def test_async_transport_socket_options():
+    async def handler(reader, writer):
+        await reader.readuntil(b'\r\n\r\n')
+
+    async def run(tcp_nodelay, tcp_keepalive):
+        server = await asyncio.start_server(handler, '127.0.0.1', 0)
+        transport = AsyncHTTPTransport(tcp_nodelay=tcp_nodelay, tcp_keepalive=tcp_keepalive)
+        pool = transport._get_pool('http://127.0.0.1:{}'.format(server.sockets[0].getsockname()[1]))
+        _, writer = await pool._open()
+        sock = writer.get_extra_info('socket')
+        options = (
+            sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY) != 0,
+            sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE) != 0,
+        )
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return options
+
+    assert asyncio.run(run(True, False)) == (True, False)
+    assert asyncio.run(run(False, True)) == (False, True)
+
+
+def test_model_async_connection_settings():
+    transport = AsyncHTTPTransport()
+
+    class SettingsThread(AsyncThread):
+        class Meta:
+            table_name = 'AsyncThread'
+            async_transport = transport
+            tcp_nodelay = False
+            tcp_keepalive = True
+            share_clients = True
+
+    SettingsThread._async_connection = None
+    connection = SettingsThread._get_async_connection().connection
+    assert connection._transport is transport
+    assert (connection.connection._tcp_nodelay, connection.connection._tcp_keepalive) == (False, True)
+    assert connection.connection._share_clients is True
+    assert SettingsThread._get_connection().connection._share_clients is True
+    assert AsyncThread._get_connection().connection._share_clients is False
+
+    connection = AsyncThread._get_async_connection().connection
+    assert isinstance(connection._transport, AsyncHTTPTransport)
+    assert (connection._transport.tcp_nodelay, connection._transport.tcp_keepalive) == (True, False)
@@ -0,0 +1,103 @@
+"""
+Tests for attribute profiling
+"""
+from pynamodb.attribute_profiling import (
+    DESERIALIZE, SERIALIZE, AttributeKey, AttributeProfiler, get_value_size,
+)
+from pynamodb.attributes import ListAttribute, MapAttribute, NumberAttribute, UnicodeAttribute
+from pynamodb.models import Model
+
+
+class AuthorMap(MapAttribute):
+    name = UnicodeAttribute()
+    karma = NumberAttribute(null=True)
+
+
+class ReplyMap(MapAttribute):
+    body = UnicodeAttribute()
+    author = AuthorMap()
+
+
+class ProfiledThread(Model):
+    class Meta:
+        table_name = 'ProfiledThread'
+
+    forum = UnicodeAttribute(hash_key=True)
+    author = AuthorMap(null=True)
+    replies = ListAttribute(of=ReplyMap, null=True)
+    tags = ListAttribute(null=True)
+
+
+class OtherThread(Model):
+    class Meta:
+        table_name = 'OtherThread'
+
+    forum = UnicodeAttribute(hash_key=True)
+    author = AuthorMap(null=True)
+
+
+def _thread():
+    return ProfiledThread(
+        'general',
+        author=AuthorMap(name='ann', karma=3),
+        replies=[ReplyMap(body='hi', author=AuthorMap(name='bob')), ReplyMap(body='yo', author=AuthorMap(name='cy'))],
+        tags=['a', 'b'],
+    )
+
+
+def test_get_value_size():
+    assert get_value_size(None) == 0
+    assert get_value_size('héllo') == 6
+    assert get_value_size(b'abc') == 3
+    assert get_value_size(True) == 1
+    assert get_value_size({'name': {'S': 'ann'}}) == 4 + 1 + 3
+    assert get_value_size([{'S': 'a'}, {'N': '10'}]) == 2 + 3
+
+
+def test_serialize_and_deserialize():
+    with AttributeProfiler() as profiler:
+        profiler.profile(ProfiledThread)
+        data = _thread().serialize()
+        thread = ProfiledThread.from_raw_data(data)
+    assert thread.replies[1].author.name == 'cy'
+
+    stats = profiler.get_stats()
+    assert set(key.path for key in stats if key.operation == SERIALIZE) == {
+        'forum', 'author', 'author.name', 'author.karma', 'replies', 'replies[].body', 'replies[].author',
+        'replies[].author.name', 'tags',
+    }
+    assert stats[AttributeKey('ProfiledThread', 'replies[].body', SERIALIZE)].calls == 2
+    assert stats[AttributeKey('ProfiledThread', 'replies[].author.name', DESERIALIZE)].calls == 2
+    forum = stats[AttributeKey('ProfiledThread', 'forum', SERIALIZE)]
+    assert forum.calls == 1
+    assert forum.total_bytes == len('general')
+    assert stats[AttributeKey('ProfiledThread', 'forum', DESERIALIZE)].total_bytes == len('general')
+    # map attributes include the time of their nested attributes
+    author = stats[AttributeKey('ProfiledThread', 'author', SERIALIZE)]
+    assert author.total_seconds >= stats[AttributeKey('ProfiledThread', 'author.name', SERIALIZE)].total_seconds
+
+    report = profiler.format_report(limit=3).splitlines()
+    assert report[0].split() == ['model', 'attribute', 'operation', 'calls', 'total', 'ms', 'mean', 'us', 'bytes']
+    assert len(report) == 4
+
+
+def test_stop():
+    profiler = AttributeProfiler()
+    profiler.profile(ProfiledThread)
+    profiler.stop()
+    assert 'serialize' not in ProfiledThread.forum.__dict__
+    _thread().serialize()
+    assert profiler.get_stats() == {}
+
+
+def test_shared_attributes():
+    with AttributeProfiler() as profiler:
+        profiler.profile(OtherThread)
+        # the nested attributes of AuthorMap are shared by both models, but only recorded for profiled ones
+        _thread().serialize()
+        OtherThread('general', author=AuthorMap(name='ann')).serialize()
+    assert {key.model_name for key in profiler.get_stats()} == {'OtherThread'}
+    assert profiler.get_stats()[AttributeKey('OtherThread', 'author.name', SERIALIZE)].calls == 1
+
+    profiler.reset()
+    assert profiler.get_stats() == {}
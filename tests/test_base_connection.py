@@ -3,6 +3,7 @@ Tests for the base connection class
 """
 import base64
 import json
+import socket
 from datetime import datetime
 from uuid import UUID
 
@@ -11,17 +12,25 @@ from unittest import mock
 from unittest.mock import patch
 
 import botocore.exceptions
-from botocore.awsrequest import AWSResponse
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest, AWSResponse
 from botocore.client import ClientError
+from botocore.credentials import Credentials, RefreshableCredentials
 from botocore.exceptions import BotoCoreError
 
 import pytest
 from freezegun import freeze_time
 
 from pynamodb.connection import Connection
+from pynamodb.connection._pool import get_pool_classes
+from pynamodb.connection._signing import SigV4Signer
 from pynamodb.connection.base import MetaTable
+from pynamodb.connection.pooling import PoolMetrics
+from pynamodb.connection.registry import ClientRegistry
+from pynamodb.connection.transport import Transport, TransportResponse, URLLib3Transport
 from pynamodb.exceptions import (
-    TableError, DeleteError, PutError, ScanError, GetError, UpdateError, TableDoesNotExist, VerboseClientError)
+    TableError, DeleteError, PutError, ScanError, GetError, UpdateError, TableDoesNotExist, VerboseClientError,
+    CancellationReason)
 from pynamodb.constants import (
     UNPROCESSED_ITEMS, STRING, BINARY, DEFAULT_ENCODING, TABLE_KEY,
     PAY_PER_REQUEST_BILLING_MODE)
@@ -1640,7 +1649,7 @@ def test_connection_update_time_to_live__fail():
         (
             "LEGACY",
             {
-                'total_max_attempts': 4,
+                'total_max_attempts': 1,
                 'mode': 'standard',
             },
         ),
@@ -1698,3 +1707,325 @@ def test_connection_client_retry_configuration__init__(
     """Test that the __init__ properly sets the `_retry_configuration` attribute."""
     unit_under_test = Connection(retry_configuration=retry_configuration)
     assert unit_under_test._retry_configuration == expected_retry_configuration
+
+
+def _lean_response(status_code, content, headers=None):
+    response = AWSResponse(
+        url='',
+        status_code=status_code,
+        headers={'x-amzn-RequestId': 'abcdef', **(headers or {})},
+        raw='',
+    )
+    response._content = json.dumps(content).encode('utf-8')
+    return response
+
+
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_connection_lean_codec__get_item(send_mock):
+    send_mock.return_value = _lean_response(200, {
+        'Item': {
+            'ForumName': {'S': 'foo'},
+            'Data': {'B': base64.b64encode(b'\x00\x01').decode()},
+            'Nested': {'M': {'Tags': {'BS': [base64.b64encode(b'\x02').decode()]}}},
+        },
+        'ConsumedCapacity': {'TableName': 'Thread', 'CapacityUnits': 0.5},
+    })
+    c = Connection(lean_codec=True, extra_headers={'foo': 'bar'})
+    c.add_meta_table(MetaTable(DESCRIBE_TABLE_DATA[TABLE_KEY]))
+
+    data = c.get_item('Thread', 'foo', 'bar')
+    assert data['Item'] == {
+        'ForumName': {'S': 'foo'},
+        'Data': {'B': b'\x00\x01'},
+        'Nested': {'M': {'Tags': {'BS': [b'\x02']}}},
+    }
+    assert data['ConsumedCapacity'] == {'TableName': 'Thread', 'CapacityUnits': 0.5}
+    assert data['ResponseMetadata']['RequestId'] == 'abcdef'
+
+    request = send_mock.call_args[0][0]
+    assert request.headers['X-Amz-Target'] == 'DynamoDB_20120810.GetItem'
+    assert request.headers['foo'] == 'bar'
+    assert 'Authorization' in request.headers
+    assert json.loads(request.body) == {
+        'TableName': 'Thread',
+        'Key': {'ForumName': {'S': 'foo'}, 'Subject': {'S': 'bar'}},
+        'ConsistentRead': False,
+        'ReturnConsumedCapacity': 'TOTAL',
+    }
+
+
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_connection_lean_codec__encodes_binary(send_mock):
+    send_mock.return_value = _lean_response(200, {})
+    c = Connection(lean_codec=True)
+    c.add_meta_table(MetaTable(DESCRIBE_TABLE_DATA[TABLE_KEY]))
+
+    put_item = {'ForumName': {'S': 'foo'}, 'Subject': {'S': 'bar'}, 'Data': {'B': b'\x00'}}
+    c.batch_write_item('Thread', put_items=[put_item])
+
+    body = json.loads(send_mock.call_args[0][0].body)
+    assert body['RequestItems']['Thread'] == [
+        {'PutRequest': {'Item': {'ForumName': {'S': 'foo'}, 'Subject': {'S': 'bar'}, 'Data': {'B': 'AA=='}}}},
+    ]
+
+
+def test_connection_batch_write_item__reuses_attribute_value_maps():
+    c = Connection()
+    c.add_meta_table(MetaTable(DESCRIBE_TABLE_DATA[TABLE_KEY]))
+    put_item = {'ForumName': {'S': 'foo'}, 'Subject': {'S': 'bar'}}
+    operation_kwargs = c._get_batch_write_item_kwargs('Thread', put_items=[put_item], delete_items=[put_item])
+    requests = operation_kwargs['RequestItems']['Thread']
+    assert requests[0]['DeleteRequest']['Key'] is put_item
+    assert requests[1]['PutRequest']['Item'] is put_item
+
+
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_connection_lean_codec__wraps_verbose_client_error(send_mock):
+    send_mock.side_effect = [
+        _lean_response(400, {
+            '__type': 'com.amazonaws.dynamodb.v20120810#ProvisionedThroughputExceededException',
+            'message': 'Slow down',
+        }),
+        _lean_response(400, {
+            '__type': 'com.amazonaws.dynamodb.v20120810#TransactionCanceledException',
+            'message': 'Transaction cancelled',
+            'CancellationReasons': [
+                {'Code': 'None'},
+                {'Code': 'ConditionalCheckFailed', 'Message': 'Failed', 'Item': {'Data': {'B': 'AA=='}}},
+            ],
+        }),
+    ]
+    c = Connection(lean_codec=True, max_retry_attempts=1)
+
+    with patch('time.sleep'):
+        with pytest.raises(VerboseClientError) as excinfo:
+            c._make_api_call('TransactWriteItems', {
+                'TransactItems': [{'Put': {'Item': {'id': {'S': 'x'}}, 'TableName': 'table_one'}}],
+            })
+    assert send_mock.call_count == 2
+    assert (
+        'An error occurred (TransactionCanceledException) on request (abcdef) on table (table_one) '
+        'when calling the TransactWriteItems operation: Transaction cancelled'
+        in str(excinfo.value)
+    )
+    assert excinfo.value.cancellation_reasons == [
+        None,
+        CancellationReason(code='ConditionalCheckFailed', message='Failed', raw_item={'Data': {'B': b'\x00'}}),
+    ]
+
+
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_connection_lean_codec__not_used_for_control_plane(send_mock):
+    send_mock.return_value = _lean_response(200, {'Table': {'TableName': 'Thread', 'CreationDateTime': 1421866952.062}})
+    c = Connection(lean_codec=True)
+    data = c._make_api_call('DescribeTable', {'TableName': 'Thread'})
+    # botocore parses timestamps into datetimes
+    assert isinstance(data['Table']['CreationDateTime'], datetime)
+
+
+class RecordingTransport(Transport):
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def send(self, request):
+        self.requests.append(request)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.mark.parametrize('lean_codec', [False, True])
+def test_connection_transport(lean_codec):
+    transport = RecordingTransport(
+        TransportResponse(500, {'x-amzn-RequestId': 'abcdef'}, b'{"__type": "InternalServerError"}'),
+        botocore.exceptions.ReadTimeoutError(endpoint_url='http://lyft.com'),
+        TransportResponse(200, {}, json.dumps(GET_ITEM_DATA).encode()),
+    )
+    c = Connection(transport=transport, lean_codec=lean_codec, extra_headers={'foo': 'bar'})
+    c.add_meta_table(MetaTable(DESCRIBE_TABLE_DATA[TABLE_KEY]))
+
+    with patch('time.sleep'):
+        data = c.get_item('Thread', 'foo', 'bar')
+    assert data['Item'] == GET_ITEM_DATA['Item']
+    assert data['ResponseMetadata']['RetryAttempts'] == 2
+    assert len(transport.requests) == 3
+    request = transport.requests[0]
+    assert request.method == 'POST'
+    assert request.headers['foo'] == 'bar'
+    assert 'Authorization' in request.headers
+    assert json.loads(request.body)['Key'] == {'ForumName': {'S': 'foo'}, 'Subject': {'S': 'bar'}}
+
+
+def test_connection_transport__wraps_verbose_client_error():
+    transport = RecordingTransport(
+        TransportResponse(400, {'x-amzn-RequestId': 'abcdef'}, json.dumps({
+            '__type': 'com.amazonaws.dynamodb.v20120810#ResourceNotFoundException',
+            'message': 'Requested resource not found',
+        }).encode()),
+    )
+    c = Connection(transport=transport)
+    with pytest.raises(TableDoesNotExist):
+        c.describe_table('Thread')
+    assert len(transport.requests) == 1
+
+
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_connection_urllib3_transport(send_mock):
+    send_mock.return_value = _lean_response(200, {'TableNames': ['Thread']})
+    transport = URLLib3Transport(max_pool_connections=2, connect_timeout_seconds=1, read_timeout_seconds=2)
+    c = Connection(transport=transport)
+    assert c._make_api_call('ListTables', {})['TableNames'] == ['Thread']
+    assert send_mock.call_count == 1
+
+
+def test_connection_share_clients():
+    registry = ClientRegistry(max_pool_connections=25)
+    with patch('pynamodb.connection.base.client_registry', registry):
+        c1 = Connection(region='us-west-2', share_clients=True, max_pool_connections=5)
+        c2 = Connection(region='us-west-2', share_clients=True)
+        c3 = Connection(region='us-west-2', share_clients=True, read_timeout_seconds=1)
+        c4 = Connection(region='us-west-2', share_clients=True, aws_access_key_id='a', aws_secret_access_key='b')
+        c5 = Connection(region='us-west-2')
+
+        assert c1.client is c2.client
+        assert c3.client is not c1.client
+        assert c4.client is not c1.client
+        assert c5.client is not c1.client
+        assert len(registry) == 3
+        # The pool size is configured for the whole registry
+        assert c1.client.meta.config.max_pool_connections == 25
+        assert c5.client.meta.config.max_pool_connections == 10
+
+        registry.clear()
+        assert len(registry) == 0
+
+
+def test_client_registry_replaces_client_without_credentials():
+    registry = ClientRegistry()
+    create_client = mock.Mock()
+    create_client.return_value._request_signer._credentials = None
+    registry.get_client('key', create_client)
+    registry.get_client('key', create_client)
+    assert create_client.call_count == 2
+    create_client.return_value._request_signer._credentials = True
+    assert registry.get_client('key', create_client) is create_client.return_value
+    assert create_client.call_count == 2
+    create_client.assert_called_with(10)
+
+
+def test_connection_sessions_share_data_loader():
+    c1 = Connection()
+    c2 = Connection()
+    assert c1.session.get_component('data_loader') is c2.session.get_component('data_loader')
+
+
+@pytest.mark.parametrize('transport', [None, URLLib3Transport(max_pool_connections=2)])
+def test_connection_warmup__opens_connections(transport):
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(5)
+    try:
+        host = 'http://127.0.0.1:{}'.format(server.getsockname()[1])
+        c = Connection(host=host, transport=transport, max_pool_connections=2)
+        assert c.warmup() == 0
+        assert c.warmup(open_connections=5) == 2
+        accepted = [server.accept()[0] for _ in range(2)]
+        for conn in accepted:
+            conn.close()
+    finally:
+        server.close()
+
+
+@freeze_time('2024-01-02 03:04:05')
+@pytest.mark.parametrize('token', [None, 'token'])
+@pytest.mark.parametrize('url', ['https://dynamodb.us-east-1.amazonaws.com/', 'http://localhost:8000/'])
+def test_sigv4_signer__matches_botocore(token, url):
+    credentials = Credentials('access_key', 'secret_key', token)
+    headers = {
+        'X-Amz-Target': 'DynamoDB_20120810.GetItem',
+        'Content-Type': 'application/x-amz-json-1.0',
+        'User-Agent': 'pynamodb',
+    }
+    body = b'{"TableName": "Thread"}'
+    expected = AWSRequest(method='POST', url=url, data=body, headers=headers)
+    SigV4Auth(credentials, 'dynamodb', 'us-east-1').add_auth(expected)
+
+    SigV4Signer(credentials, 'us-east-1', 'dynamodb').sign('POST', url, headers, body)
+    assert headers['Authorization'] == expected.headers['Authorization']
+    assert headers['X-Amz-Date'] == expected.headers['X-Amz-Date']
+    assert headers.get('X-Amz-Security-Token') == expected.headers.get('X-Amz-Security-Token')
+
+
+def test_sigv4_signer__refreshes_credentials_before_expiry():
+    refresh = mock.Mock(return_value={
+        'access_key': 'access_key', 'secret_key': 'secret_key', 'token': 'token',
+        'expiry_time': '2024-01-02T04:00:00Z',
+    })
+    with freeze_time('2024-01-02 03:00:00'):
+        credentials = RefreshableCredentials.create_from_metadata(refresh(), refresh, 'test')
+        signer = SigV4Signer(credentials, 'us-east-1', 'dynamodb')
+        signer.get_credentials()
+        with patch.object(credentials, 'get_frozen_credentials') as get_frozen_credentials:
+            signer.get_credentials()
+        assert not get_frozen_credentials.called
+    with freeze_time('2024-01-02 03:50:00'):
+        assert signer.get_credentials().token == 'token'
+    assert refresh.call_count == 2
+
+
+def test_connection_transport__signs_with_cached_signer():
+    transport = RecordingTransport(
+        TransportResponse(200, {}, json.dumps(GET_ITEM_DATA).encode()),
+        TransportResponse(200, {}, json.dumps(GET_ITEM_DATA).encode()),
+    )
+    c = Connection(transport=transport, extra_headers={'foo': 'bar'})
+    c.add_meta_table(MetaTable(DESCRIBE_TABLE_DATA[TABLE_KEY]))
+    c.get_item('Thread', 'foo', 'bar')
+    signer = c._signer
+    c.get_item('Thread', 'foo', 'bar')
+    assert c._signer is signer
+    for request in transport.requests:
+        assert request.headers['Authorization'].startswith('AWS4-HMAC-SHA256 Credential=')
+        # Extra headers are added after signing
+        assert 'foo' not in request.headers['Authorization']
+        assert request.headers['foo'] == 'bar'
+
+
+def test_connection_socket_options():
+    c = Connection(tcp_nodelay=False, tcp_keepalive=True, max_connection_idle_seconds=60)
+    http_session = c.client._endpoint.http_session
+    assert http_session._socket_options == [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    assert http_session._pool_classes_by_scheme['https'].max_idle_seconds == 60
+    assert http_session._pool_classes_by_scheme['https'].max_lifetime_seconds is None
+
+    c = Connection()
+    http_session = c.client._endpoint.http_session
+    assert http_session._socket_options == [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+    assert http_session._pool_classes_by_scheme['https'].max_idle_seconds is None
+
+
+@pytest.mark.parametrize('max_idle_seconds, max_lifetime_seconds', [(10, None), (None, 10)])
+def test_expiring_connection_pool(max_idle_seconds, max_lifetime_seconds):
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(5)
+    try:
+        pool_cls = get_pool_classes(PoolMetrics(1), max_idle_seconds, max_lifetime_seconds)['http']
+        pool = pool_cls('127.0.0.1', server.getsockname()[1], maxsize=1)
+        with patch('time.monotonic', return_value=100):
+            conn = pool._get_conn()
+            conn.connect()
+            pool._put_conn(conn)
+        with patch('time.monotonic', return_value=105):
+            assert pool._get_conn().sock is not None
+            pool._put_conn(conn)
+        with patch('time.monotonic', return_value=112):
+            # Idle for 7 seconds, but open for 12
+            assert (pool._get_conn().sock is None) == (max_lifetime_seconds is not None)
+            pool._put_conn(conn)
+        with patch('time.monotonic', return_value=125):
+            assert pool._get_conn().sock is None
+    finally:
+        server.close()
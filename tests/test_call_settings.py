@@ -0,0 +1,211 @@
+"""
+Tests for call settings
+"""
+import asyncio
+import json
+import socket
+import time
+from unittest import mock
+from unittest.mock import patch
+
+import pytest
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import ReadTimeoutError
+
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.connection import AsyncConnection, Connection
+from pynamodb.connection.call_settings import CallSettings, call_settings, get_call_settings, use_call_settings
+from pynamodb.connection.retry import RetryPolicy
+from pynamodb.connection.transport import URLLib3Transport
+from pynamodb.constants import BATCH_GET_ITEM, GET_ITEM, QUERY, UNPROCESSED_ITEMS
+from pynamodb.exceptions import DeadlineExceededError
+from pynamodb.models import Model
+
+PATCH_METHOD = 'pynamodb.connection.Connection._make_api_call'
+
+GET_ITEM_KWARGS = {'TableName': 'Thread', 'Key': {'id': {'S': '1'}}}
+
+
+def _response(status_code, content):
+    response = mock.Mock(spec=AWSResponse)
+    response.status_code = status_code
+    response.headers = {}
+    response.text = json.dumps(content)
+    response.content = response.text.encode()
+    return response
+
+
+class SettingsModel(Model):
+    class Meta:
+        table_name = 'SettingsModel'
+        retry_policy = RetryPolicy(budget=None)
+
+    key = UnicodeAttribute(hash_key=True)
+
+
+@pytest.fixture
+def server():
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(10)
+    yield server
+    server.close()
+
+
+class RecordingApi:
+    """
+    Records the call settings in effect for each request
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.call_settings = []
+
+    def __call__(self, operation_name, operation_kwargs):
+        self.call_settings.append(get_call_settings())
+        return self.responses.pop(0)
+
+
+def test_call_settings_deadline():
+    with patch('time.monotonic', return_value=100.0) as monotonic:
+        settings = CallSettings(timeout_seconds=2, read_timeout_seconds=5)
+        assert settings.deadline == 102.0
+        assert CallSettings(timeout_seconds=2, deadline=101.0).deadline == 101.0
+        assert settings.get_remaining_seconds() == 2.0
+        assert settings.get_read_timeout(None) == 2.0
+        assert CallSettings(read_timeout_seconds=0.5).get_read_timeout(10) == 0.5
+        assert CallSettings().get_read_timeout(10) == 10
+        assert CallSettings().get_remaining_seconds() is None
+
+        settings.check_deadline(1.5)
+        with pytest.raises(DeadlineExceededError):
+            settings.check_deadline(2.5)
+        monotonic.return_value = 103.0
+        with pytest.raises(DeadlineExceededError, match='before GetItem could be sent'):
+            settings.check_deadline(operation_name=GET_ITEM)
+
+
+def test_call_settings_nesting():
+    with patch('time.monotonic', return_value=100.0):
+        assert get_call_settings() is None
+        with call_settings(timeout_seconds=1, max_retry_attempts=2) as outer:
+            assert get_call_settings() is outer
+            with call_settings(timeout_seconds=5, read_timeout_seconds=0.1, consistent_read=True) as inner:
+                assert inner is not None
+                # the outer deadline still applies
+                assert inner.deadline == 101.0
+                assert inner.read_timeout_seconds == 0.1
+                assert inner.max_retry_attempts == 2
+                assert inner.consistent_read
+            assert get_call_settings() is outer
+            with use_call_settings(None) as settings:
+                assert settings is outer
+        assert get_call_settings() is None
+
+
+def test_dispatch_deadline_exceeded():
+    with patch(PATCH_METHOD) as req:
+        with call_settings(deadline=0):
+            with pytest.raises(DeadlineExceededError):
+                Connection().dispatch(GET_ITEM, dict(GET_ITEM_KWARGS))
+    req.assert_not_called()
+
+
+def test_dispatch_consistent_read():
+    with patch(PATCH_METHOD) as req:
+        req.return_value = {}
+        c = Connection()
+        with call_settings(consistent_read=True):
+            c.dispatch(GET_ITEM, dict(GET_ITEM_KWARGS))
+            c.dispatch(QUERY, {'TableName': 'Thread', 'IndexName': 'Forum-index'})
+            c.dispatch(BATCH_GET_ITEM, {'RequestItems': {'Thread': {'Keys': []}}})
+    assert req.call_args_list[0][0][1]['ConsistentRead'] is True
+    assert 'ConsistentRead' not in req.call_args_list[1][0][1]
+    assert req.call_args_list[2][0][1]['RequestItems']['Thread']['ConsistentRead'] is True
+
+
+@mock.patch('time.sleep')
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_max_retry_attempts(send_mock, sleep_mock):
+    send_mock.return_value = _response(500, {'__type': 'InternalServerError', 'message': 'down'})
+    c = Connection(max_retry_attempts=5, retry_policy=RetryPolicy(budget=None))
+    with call_settings(max_retry_attempts=1):
+        with pytest.raises(Exception):
+            c._make_api_call(GET_ITEM, GET_ITEM_KWARGS)
+    assert send_mock.call_count == 2
+
+
+@mock.patch('time.sleep')
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_retries_stop_at_deadline(send_mock, sleep_mock):
+    send_mock.return_value = _response(400, {'__type': 'ThrottlingException', 'message': 'slow down'})
+    c = Connection(max_retry_attempts=5, retry_policy=RetryPolicy(throttling_base_delay_seconds=1, budget=None))
+    with call_settings(timeout_seconds=0.5):
+        with pytest.raises(DeadlineExceededError, match='before GetItem could be retried') as exc_info:
+            c._make_api_call(GET_ITEM, GET_ITEM_KWARGS)
+    assert exc_info.value.cause_response_code == 'ThrottlingException'
+    assert send_mock.call_count == 1
+    sleep_mock.assert_not_called()
+
+
+@pytest.mark.parametrize('transport', [None, URLLib3Transport(read_timeout_seconds=10)])
+def test_read_timeout(server, transport):
+    # the server accepts connections, but never responds
+    host = 'http://127.0.0.1:{}'.format(server.getsockname()[1])
+    c = Connection(host=host, read_timeout_seconds=10, max_retry_attempts=0, transport=transport)
+    start = time.monotonic()
+    with call_settings(timeout_seconds=0.3):
+        with pytest.raises(ReadTimeoutError):
+            c._make_api_call(GET_ITEM, GET_ITEM_KWARGS)
+    assert time.monotonic() - start < 2
+
+
+def test_query_pages_keep_settings():
+    page = {'Count': 1, 'ScannedCount': 1, 'Items': [{'key': {'S': '1'}}]}
+    api = RecordingApi([dict(page, LastEvaluatedKey={'key': {'S': '1'}}), page])
+    with patch(PATCH_METHOD, new=api):
+        with call_settings(timeout_seconds=10) as settings:
+            results = SettingsModel.query('1')
+        # pages fetched after the block has exited keep its deadline
+        assert get_call_settings() is None
+        assert len(list(results)) == 2
+    assert len(api.call_settings) == 2
+    assert all(s is not None and s.deadline == settings.deadline for s in api.call_settings)
+
+
+def test_batch_get_keeps_settings():
+    api = RecordingApi([{'Responses': {'SettingsModel': [{'key': {'S': '1'}}]}, 'UnprocessedKeys': {}}])
+    with patch(PATCH_METHOD, new=api):
+        with call_settings(timeout_seconds=10) as settings:
+            items = SettingsModel.batch_get(['1'])
+        assert [item.key for item in items] == ['1']
+    assert api.call_settings[0].deadline == settings.deadline
+
+
+@mock.patch('time.sleep')
+def test_batch_write_deadline(sleep_mock):
+    unprocessed = [{'PutRequest': {'Item': {'key': {'S': '1'}}}}]
+    with patch(PATCH_METHOD) as req:
+        req.return_value = {UNPROCESSED_ITEMS: {'SettingsModel': unprocessed}}
+        with call_settings(timeout_seconds=0.1):
+            batch = SettingsModel.batch_write()
+        batch.save(SettingsModel('1'))
+        with pytest.raises(DeadlineExceededError):
+            batch.commit()
+    assert req.call_count == 1
+    assert batch.failed_operations == unprocessed
+    sleep_mock.assert_not_called()
+
+
+def test_async_deadline():
+    class SlowTransport:
+        async def send(self, request):
+            await asyncio.sleep(5)
+
+    async def get_item():
+        with call_settings(timeout_seconds=0.05):
+            await c.dispatch(GET_ITEM, dict(GET_ITEM_KWARGS))
+
+    c = AsyncConnection(transport=SlowTransport(), retry_policy=RetryPolicy(budget=None))
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(get_item())
@@ -0,0 +1,195 @@
+"""
+Tests for the consumed capacity ledgers
+"""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.connection import AsyncConnection, Connection
+from pynamodb.connection.capacity import (
+    CapacityKey, CapacityLedger, CapacityUsage, get_process_ledger, parse_consumed_capacity, track_consumed_capacity,
+)
+from pynamodb.constants import (
+    BATCH_WRITE_ITEM, GET_ITEM, PUT_ITEM, QUERY, SCAN, TRANSACT_GET_ITEMS, TRANSACT_WRITE_ITEMS,
+)
+from pynamodb.models import Model
+from pynamodb.transactions import TransactGet, TransactWrite
+
+PATCH_METHOD = 'pynamodb.connection.Connection._make_api_call'
+ASYNC_PATCH_METHOD = 'pynamodb.connection.async_base.AsyncConnection._make_api_call'
+
+
+def _page(key, units, last_evaluated_key=None):
+    page = {
+        'Count': 1,
+        'ScannedCount': 1,
+        'Items': [{'key': {'S': key}}],
+        'ConsumedCapacity': {'TableName': 'CapacityModel', 'CapacityUnits': units},
+    }
+    if last_evaluated_key is not None:
+        page['LastEvaluatedKey'] = {'key': {'S': last_evaluated_key}}
+    return page
+
+
+class CapacityModel(Model):
+    class Meta:
+        table_name = 'CapacityModel'
+
+    key = UnicodeAttribute(hash_key=True)
+
+
+@pytest.fixture(autouse=True)
+def reset_ledgers():
+    yield
+    CapacityModel.get_consumed_capacity().reset()
+
+
+def test_parse_consumed_capacity():
+    assert parse_consumed_capacity(GET_ITEM, {}, {'TableName': 'Thread', 'CapacityUnits': 0.5}) == [
+        (CapacityKey('Thread', None, GET_ITEM), 0.5, 0.0),
+    ]
+    assert parse_consumed_capacity(
+        QUERY, {'IndexName': 'Forum-index'}, {'TableName': 'Thread', 'CapacityUnits': 2.0},
+    ) == [(CapacityKey('Thread', 'Forum-index', QUERY), 2.0, 0.0)]
+    assert parse_consumed_capacity(PUT_ITEM, {}, {'TableName': 'Thread', 'CapacityUnits': 1.0}) == [
+        (CapacityKey('Thread', None, PUT_ITEM), 0.0, 1.0),
+    ]
+    # Broken down by index, with ReturnConsumedCapacity=INDEXES
+    assert parse_consumed_capacity(PUT_ITEM, {}, {
+        'TableName': 'Thread',
+        'CapacityUnits': 3.0,
+        'Table': {'CapacityUnits': 1.0},
+        'GlobalSecondaryIndexes': {'Forum-index': {'CapacityUnits': 1.0}},
+        'LocalSecondaryIndexes': {'Date-index': {'CapacityUnits': 1.0}},
+    }) == [
+        (CapacityKey('Thread', None, PUT_ITEM), 0.0, 1.0),
+        (CapacityKey('Thread', 'Forum-index', PUT_ITEM), 0.0, 1.0),
+        (CapacityKey('Thread', 'Date-index', PUT_ITEM), 0.0, 1.0),
+    ]
+    # Transactions report the read and write units of each table
+    assert parse_consumed_capacity(TRANSACT_WRITE_ITEMS, {}, [
+        {'TableName': 'Thread', 'CapacityUnits': 6.0, 'ReadCapacityUnits': 2.0, 'WriteCapacityUnits': 4.0},
+        {'TableName': 'Forum', 'CapacityUnits': 2.0},
+    ]) == [
+        (CapacityKey('Thread', None, TRANSACT_WRITE_ITEMS), 2.0, 4.0),
+        (CapacityKey('Forum', None, TRANSACT_WRITE_ITEMS), 0.0, 2.0),
+    ]
+    assert parse_consumed_capacity(BATCH_WRITE_ITEM, {}, None) == []
+
+
+def test_ledger():
+    ledger = CapacityLedger()
+    ledger.record(CapacityKey('Thread', None, QUERY), 1.5, 0.0)
+    ledger.record(CapacityKey('Thread', 'Forum-index', QUERY), 2.0, 0.0)
+    ledger.record(CapacityKey('Thread', None, PUT_ITEM), 0.0, 1.0)
+    ledger.record(CapacityKey('Forum', None, PUT_ITEM), 0.0, 3.0)
+    assert ledger.read_capacity_units == 3.5
+    assert ledger.write_capacity_units == 4.0
+    assert ledger.capacity_units == 7.5
+    assert ledger.get_usage(table_name='Thread') == CapacityUsage(3.5, 1.0)
+    assert ledger.get_usage(table_name='Thread', index_name=None) == CapacityUsage(1.5, 1.0)
+    assert ledger.get_usage(index_name='Forum-index') == CapacityUsage(2.0, 0.0)
+    assert ledger.get_usage(operation_name=PUT_ITEM) == CapacityUsage(0.0, 4.0)
+
+    snapshot = ledger.snapshot()
+    ledger.record(CapacityKey('Thread', None, QUERY), 1.0, 0.0)
+    # a snapshot isn't affected by later requests
+    assert snapshot[CapacityKey('Thread', None, QUERY)] == CapacityUsage(1.5, 0.0)
+
+    usage = ledger.reset()
+    assert usage[CapacityKey('Thread', None, QUERY)] == CapacityUsage(2.5, 0.0)
+    assert ledger.snapshot() == {}
+    assert ledger.capacity_units == 0.0
+
+
+def test_connection_and_process_ledgers():
+    before = get_process_ledger().read_capacity_units
+    conn = Connection()
+    with patch(PATCH_METHOD) as req:
+        req.return_value = {'ConsumedCapacity': {'TableName': 'Thread', 'CapacityUnits': 0.5}}
+        conn.dispatch(GET_ITEM, {'TableName': 'Thread', 'Key': {'id': {'S': '1'}}})
+    assert conn.capacity_ledger.snapshot() == {CapacityKey('Thread', None, GET_ITEM): CapacityUsage(0.5, 0.0)}
+    assert get_process_ledger().read_capacity_units == before + 0.5
+
+
+def test_track_consumed_capacity():
+    with patch(PATCH_METHOD) as req:
+        req.return_value = {'ConsumedCapacity': {'TableName': 'CapacityModel', 'CapacityUnits': 1.0}}
+        with track_consumed_capacity() as outer:
+            CapacityModel('1').save()
+            with track_consumed_capacity() as inner:
+                CapacityModel('2').save()
+        CapacityModel('3').save()
+    assert outer.write_capacity_units == 2.0
+    assert inner.write_capacity_units == 1.0
+    assert CapacityModel.get_consumed_capacity().get_usage(operation_name=PUT_ITEM) == CapacityUsage(0.0, 3.0)
+
+
+def test_result_iterator():
+    with patch(PATCH_METHOD) as req:
+        req.side_effect = [_page('1', 0.5, last_evaluated_key='1'), _page('2', 1.0)]
+        results = CapacityModel.scan()
+        assert results.consumed_capacity.capacity_units == 0.0
+        next(results)
+        assert results.consumed_capacity.read_capacity_units == 0.5
+        list(results)
+        assert results.consumed_capacity.read_capacity_units == 1.5
+    assert CapacityModel.get_consumed_capacity().snapshot() == {
+        CapacityKey('CapacityModel', None, SCAN): CapacityUsage(1.5, 0.0),
+    }
+
+
+def test_batch_write():
+    with patch(PATCH_METHOD) as req:
+        req.return_value = {'ConsumedCapacity': [{'TableName': 'CapacityModel', 'CapacityUnits': 2.0}]}
+        with CapacityModel.batch_write() as batch:
+            batch.save(CapacityModel('1'))
+            batch.save(CapacityModel('2'))
+    assert batch.consumed_capacity.snapshot() == {
+        CapacityKey('CapacityModel', None, BATCH_WRITE_ITEM): CapacityUsage(0.0, 2.0),
+    }
+
+
+def test_transactions():
+    conn = Connection()
+    with patch(PATCH_METHOD) as req:
+        req.return_value = {
+            'Responses': [{'Item': {'key': {'S': '1'}}}],
+            'ConsumedCapacity': [{'TableName': 'CapacityModel', 'CapacityUnits': 2.0}],
+        }
+        with TransactGet(connection=conn) as transaction:
+            transaction.get(CapacityModel, '1')
+        assert transaction.consumed_capacity.get_usage() == CapacityUsage(2.0, 0.0)
+        assert transaction.consumed_capacity.snapshot().popitem()[0].operation_name == TRANSACT_GET_ITEMS
+
+        req.return_value = {'ConsumedCapacity': [{'TableName': 'CapacityModel', 'CapacityUnits': 4.0}]}
+        with TransactWrite(connection=conn) as transaction:
+            transaction.save(CapacityModel('1'))
+        assert transaction.consumed_capacity.get_usage() == CapacityUsage(0.0, 4.0)
+
+
+def test_async():
+    async def query():
+        results = CapacityModel.aquery('1')
+        return [item.key async for item in results], results.consumed_capacity
+
+    with patch(ASYNC_PATCH_METHOD) as req:
+        req.side_effect = [_page('1', 0.5, last_evaluated_key='1'), _page('2', 0.5)]
+        keys, ledger = asyncio.run(query())
+    assert keys == ['1', '2']
+    assert ledger.read_capacity_units == 1.0
+    assert CapacityModel.get_consumed_capacity().read_capacity_units == 1.0
+    assert CapacityModel._get_async_connection().connection.capacity_ledger is CapacityModel.get_consumed_capacity()
+
+
+def test_async_connection():
+    async def get_item():
+        conn = AsyncConnection()
+        await conn.dispatch(GET_ITEM, {'TableName': 'Thread', 'Key': {'id': {'S': '1'}}})
+        return conn.capacity_ledger
+
+    with patch(ASYNC_PATCH_METHOD) as req:
+        req.return_value = {'ConsumedCapacity': {'TableName': 'Thread', 'CapacityUnits': 0.5}}
+        assert asyncio.run(get_item()).read_capacity_units == 0.5
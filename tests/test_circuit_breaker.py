@@ -0,0 +1,184 @@
+"""
+Tests for the circuit breaker
+"""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from botocore.client import ClientError
+
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.connection import AsyncConnection, Connection
+from pynamodb.connection.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from pynamodb.constants import GET_ITEM, PUT_ITEM, QUERY
+from pynamodb.exceptions import CircuitBreakerOpenError, GetError
+from pynamodb.models import Model
+from pynamodb.signals import circuit_breaker_state_changed
+
+PATCH_METHOD = 'pynamodb.connection.Connection._make_api_call'
+ASYNC_PATCH_METHOD = 'pynamodb.connection.async_base.AsyncConnection._make_api_call'
+
+
+def _client_error(code):
+    return ClientError({'Error': {'Code': code, 'Message': 'problem'}}, GET_ITEM)
+
+
+class BreakerModel(Model):
+    class Meta:
+        table_name = 'BreakerModel'
+        circuit_breaker = CircuitBreaker(min_requests=2)
+
+    key = UnicodeAttribute(hash_key=True)
+
+
+def test_breaker_opens_on_failures():
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, min_requests=4)
+    keys = [('Thread', None)]
+    breaker.record(keys)
+    breaker.record(keys)
+    breaker.record(keys, _client_error('ThrottlingException'))
+    assert breaker.get_state('Thread') == CLOSED
+    breaker.record(keys, _client_error('ThrottlingException'))
+    assert breaker.get_state('Thread') == OPEN
+    with pytest.raises(CircuitBreakerOpenError) as exc_info:
+        breaker.before_request(keys)
+    assert exc_info.value.table_name == 'Thread'
+    assert exc_info.value.index_name is None
+
+
+def test_breaker_ignores_client_errors():
+    breaker = CircuitBreaker(min_requests=2)
+    keys = [('Thread', None)]
+    for _ in range(10):
+        breaker.record(keys, _client_error('ConditionalCheckFailedException'))
+    assert breaker.get_state('Thread') == CLOSED
+
+
+def test_breaker_window():
+    breaker = CircuitBreaker(min_requests=2, window_seconds=10)
+    keys = [('Thread', None)]
+    with patch('time.monotonic', return_value=100.0) as monotonic:
+        breaker.record(keys, _client_error('ThrottlingException'))
+        # the failure is forgotten once the window has passed
+        monotonic.return_value = 111.0
+        breaker.record(keys)
+        breaker.record(keys)
+        breaker.record(keys, _client_error('ThrottlingException'))
+        assert breaker.get_state('Thread') == CLOSED
+
+
+def test_breaker_half_open():
+    breaker = CircuitBreaker(min_requests=1, open_seconds=5, probe_count=2)
+    keys = [('Thread', None)]
+    with patch('time.monotonic', return_value=100.0) as monotonic:
+        breaker.record(keys, _client_error('ThrottlingException'))
+        assert breaker.get_state('Thread') == OPEN
+
+        monotonic.return_value = 105.0
+        breaker.before_request(keys)
+        assert breaker.get_state('Thread') == HALF_OPEN
+        breaker.before_request(keys)
+        # no more than probe_count probes are let through
+        with pytest.raises(CircuitBreakerOpenError):
+            breaker.before_request(keys)
+
+        # a failed probe opens the circuit again
+        breaker.record(keys)
+        breaker.record(keys, _client_error('ThrottlingException'))
+        assert breaker.get_state('Thread') == OPEN
+        with pytest.raises(CircuitBreakerOpenError):
+            breaker.before_request(keys)
+
+        # and successful probes close it
+        monotonic.return_value = 110.0
+        for _ in range(2):
+            breaker.before_request(keys)
+            breaker.record(keys)
+        assert breaker.get_state('Thread') == CLOSED
+
+
+def test_breaker_signals():
+    breaker = CircuitBreaker(min_requests=1, open_seconds=0, probe_count=1)
+    keys = [('Thread', 'Forum-index')]
+    recorded = []
+
+    def record_state_change(sender, table_name, index_name, old_state, new_state):
+        recorded.append((sender, table_name, index_name, old_state, new_state))
+
+    circuit_breaker_state_changed.connect(record_state_change)
+    try:
+        breaker.record(keys, _client_error('ThrottlingException'))
+        breaker.before_request(keys)
+        breaker.record(keys)
+    finally:
+        circuit_breaker_state_changed.disconnect(record_state_change)
+
+    assert recorded == [
+        (breaker, 'Thread', 'Forum-index', CLOSED, OPEN),
+        (breaker, 'Thread', 'Forum-index', OPEN, HALF_OPEN),
+        (breaker, 'Thread', 'Forum-index', HALF_OPEN, CLOSED),
+    ]
+
+
+def test_dispatch_fails_fast():
+    breaker = CircuitBreaker(min_requests=2)
+    c = Connection(circuit_breaker=breaker)
+    with patch(PATCH_METHOD) as req:
+        req.side_effect = _client_error('ProvisionedThroughputExceededException')
+        for _ in range(2):
+            with pytest.raises(ClientError):
+                c.dispatch(GET_ITEM, {'TableName': 'Thread'})
+        assert req.call_count == 2
+
+        with pytest.raises(CircuitBreakerOpenError, match='Circuit breaker is open for `Thread`'):
+            c.dispatch(PUT_ITEM, {'TableName': 'Thread'})
+        assert req.call_count == 2
+
+        # other tables and indexes have their own circuits
+        req.side_effect = None
+        req.return_value = {}
+        c.dispatch(GET_ITEM, {'TableName': 'Forum'})
+        c.dispatch(QUERY, {'TableName': 'Thread', 'IndexName': 'Forum-index'})
+        assert req.call_count == 4
+
+
+def test_dispatch_multiple_tables():
+    breaker = CircuitBreaker(min_requests=1)
+    breaker.record([('Forum', None)], _client_error('ThrottlingException'))
+    with patch(PATCH_METHOD) as req:
+        with pytest.raises(CircuitBreakerOpenError):
+            Connection(circuit_breaker=breaker).dispatch(
+                'BatchGetItem', {'RequestItems': {'Thread': {}, 'Forum': {}}},
+            )
+    req.assert_not_called()
+
+
+def test_model_circuit_breaker():
+    with patch(PATCH_METHOD) as req:
+        req.side_effect = _client_error('ThrottlingException')
+        for _ in range(2):
+            with pytest.raises(GetError):
+                BreakerModel.get('foo')
+        with pytest.raises(CircuitBreakerOpenError):
+            BreakerModel.get('foo')
+    assert req.call_count == 2
+
+
+def test_async_dispatch_fails_fast():
+    breaker = CircuitBreaker(min_requests=1)
+    calls = []
+
+    async def make_api_call(self, operation_name, operation_kwargs):
+        calls.append(operation_name)
+        raise _client_error('ThrottlingException')
+
+    async def dispatch_twice():
+        c = AsyncConnection(circuit_breaker=breaker)
+        with pytest.raises(ClientError):
+            await c.dispatch(GET_ITEM, {'TableName': 'Thread'})
+        with pytest.raises(CircuitBreakerOpenError):
+            await c.dispatch(GET_ITEM, {'TableName': 'Thread'})
+
+    with patch(ASYNC_PATCH_METHOD, new=make_api_call):
+        asyncio.run(dispatch_twice())
+    assert calls == [GET_ITEM]
@@ -0,0 +1,112 @@
+"""
+Tests for resetting connections in forked processes
+"""
+import os
+import threading
+import time
+from unittest import mock
+from unittest.mock import patch
+
+import pytest
+
+import pynamodb
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.connection import Connection
+from pynamodb.connection import _fork
+from pynamodb.connection.hedging import HedgingPolicy
+from pynamodb.connection.registry import ClientRegistry
+from pynamodb.connection.retry import DEFAULT_RETRY_BUDGET, RetryBudget
+from pynamodb.connection.transport import URLLib3Transport
+from pynamodb.models import Model
+
+
+class ForkModel(Model):
+    class Meta:
+        table_name = 'ForkModel'
+
+    key = UnicodeAttribute(hash_key=True)
+
+
+@pytest.fixture
+def after_fork_callbacks():
+    with patch.object(_fork, '_after_fork_callbacks', []) as callbacks:
+        yield callbacks
+
+
+def test_after_fork_in_child_resets_connections():
+    transport = URLLib3Transport()
+    c = Connection(transport=transport)
+    client = c.client
+    session = transport.session
+    with patch('os.getpid', return_value=os.getpid() + 1):
+        _fork.after_fork_in_child()
+        assert c._client is None
+        assert c.client is not client
+        assert transport.session is not session
+
+
+def test_connection_detects_pid_change():
+    c = Connection()
+    client = c.client
+    assert c.client is client
+    with patch('os.getpid', return_value=os.getpid() + 1):
+        assert c.client is not client
+
+
+def test_client_registry_detects_pid_change():
+    registry = ClientRegistry()
+    create_client = mock.Mock()
+    client = registry.get_client('key', create_client)
+    with patch('os.getpid', return_value=os.getpid() + 1):
+        registry.get_client('key', create_client)
+        assert create_client.call_count == 2
+    # The parent's client was abandoned rather than closed
+    assert not client.close.called
+
+
+def test_warmup_rewarm_after_fork(after_fork_callbacks):
+    with patch.object(_fork, '_rewarm_models', {}) as rewarm_models, \
+            patch('pynamodb.connection.base.Connection.warmup', autospec=True, return_value=0) as warmup_mock:
+        pynamodb.warmup([ForkModel], open_connections=1, rewarm_after_fork=True)
+        pynamodb.warmup([ForkModel], open_connections=2, rewarm_after_fork=True)
+        # the models are only warmed up once, with the most connections asked for
+        assert rewarm_models == {ForkModel: 2}
+        assert after_fork_callbacks == []
+        main_thread = threading.current_thread()
+        with patch.object(_fork, '_rewarm', wraps=_fork._rewarm) as rewarm_mock:
+            _fork.after_fork_in_child()
+            for thread in threading.enumerate():
+                if thread.name == 'pynamodb-warmup':
+                    thread.join()
+    assert rewarm_mock.call_count == 1
+    assert warmup_mock.call_count == 3
+    assert warmup_mock.call_args == ((ForkModel._get_connection().connection,), {'open_connections': 2})
+    assert main_thread is threading.current_thread()
+
+
+def test_after_fork_in_child_resets_locks():
+    budget = RetryBudget()
+    policy = HedgingPolicy(max_workers=1)
+    assert policy.submit(time.sleep, 0.01) is not None
+    # held by a thread that doesn't exist in the child
+    budget._lock.acquire()
+    policy._lock.acquire()
+    with patch('os.getpid', return_value=os.getpid() + 1):
+        _fork.after_fork_in_child()
+    assert budget.try_acquire()
+    assert policy._in_flight == 0
+    assert policy._executor is None
+    policy.record_request()
+    assert DEFAULT_RETRY_BUDGET in _fork._lock_owners
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork')
+def test_fork():
+    c = Connection()
+    c.client
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if c._client is None and c._pid == os.getpid() else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert c._client is not None
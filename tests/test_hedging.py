@@ -0,0 +1,228 @@
+"""
+Tests for request hedging
+"""
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from pynamodb.connection import AsyncConnection, Connection
+from pynamodb.connection import hedging as hedging_module
+from pynamodb.connection.hedging import HedgingPolicy, get_hedging_policy
+from pynamodb.constants import GET_ITEM, PUT_ITEM, QUERY
+from pynamodb.signals import dynamodb_request_hedged, pre_dynamodb_send
+
+PATCH_METHOD = 'pynamodb.connection.Connection._make_api_call'
+ASYNC_PATCH_METHOD = 'pynamodb.connection.async_base.AsyncConnection._make_api_call'
+
+
+def _warm_policy(operation_name=GET_ITEM, latency=0.01):
+    policy = HedgingPolicy(min_samples=1, window_size=10, min_delay_seconds=0)
+    policy.record_latency(operation_name, latency)
+    return policy
+
+
+class SlowFirstApi:
+    """
+    The first call blocks until the test releases it, later calls return immediately
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+
+    def __call__(self, operation_name, operation_kwargs):
+        self.calls.append((operation_name, operation_kwargs))
+        if len(self.calls) == 1:
+            self.release.wait(5)
+            return {'Item': {'attempt': {'S': 'first'}}}
+        return {'Item': {'attempt': {'S': 'hedge'}}}
+
+
+def test_policy_delay():
+    policy = HedgingPolicy(percentile=90, min_samples=10, window_size=100, min_delay_seconds=0.001)
+    for i in range(9):
+        policy.record_latency(GET_ITEM, i / 100)
+    assert policy.get_delay(GET_ITEM) is None
+    policy.record_latency(GET_ITEM, 0.09)
+    assert policy.get_delay(GET_ITEM) == 0.09
+    assert policy.get_delay(QUERY) is None
+
+    # the percentile is only recomputed once a tenth of the window has been replaced
+    for _ in range(9):
+        policy.record_latency(GET_ITEM, 1)
+    assert policy.get_delay(GET_ITEM) == 0.09
+    policy.record_latency(GET_ITEM, 1)
+    assert policy.get_delay(GET_ITEM) == 1
+
+
+def test_policy_min_delay():
+    policy = HedgingPolicy(min_samples=1, min_delay_seconds=0.5)
+    policy.record_latency(GET_ITEM, 0.01)
+    assert policy.get_delay(GET_ITEM) == 0.5
+
+
+def test_policy_percentile_validation():
+    with pytest.raises(ValueError):
+        HedgingPolicy(percentile=100)
+
+
+def test_get_hedging_policy():
+    policy = HedgingPolicy()
+    assert get_hedging_policy(policy, None) is policy
+    assert get_hedging_policy(None, None) is None
+    assert get_hedging_policy(policy, False) is None
+    assert get_hedging_policy(policy, True) is policy
+    with patch.object(hedging_module, '_default_policy', None):
+        default_policy = get_hedging_policy(None, True)
+        assert isinstance(default_policy, HedgingPolicy)
+        assert get_hedging_policy(None, True) is default_policy
+
+
+def test_hedged_get_item():
+    policy = _warm_policy()
+    api = SlowFirstApi()
+    recorded = []
+    hedges = []
+
+    # the documented receiver signature still works with hedging
+    def record_pre_dynamodb_send(sender, operation_name, table_name, req_uuid):
+        recorded.append(req_uuid)
+
+    def record_hedge(sender, operation_name, table_name, req_uuid, hedge_req_uuid):
+        hedges.append((operation_name, req_uuid, hedge_req_uuid))
+
+    pre_dynamodb_send.connect(record_pre_dynamodb_send)
+    dynamodb_request_hedged.connect(record_hedge)
+    try:
+        with patch(PATCH_METHOD, new=api):
+            c = Connection(hedging=policy)
+            data = c.dispatch(GET_ITEM, {'TableName': 'Thread', 'Key': {'id': {'S': '1'}}})
+    finally:
+        api.release.set()
+        pre_dynamodb_send.disconnect(record_pre_dynamodb_send)
+        dynamodb_request_hedged.disconnect(record_hedge)
+
+    assert data == {'Item': {'attempt': {'S': 'hedge'}}}
+    assert len(api.calls) == 2
+    assert api.calls[0][1] == api.calls[1][1]
+    assert api.calls[0][1] is not api.calls[1][1]
+    assert policy.requests == 1
+    assert policy.hedges == 1
+    assert policy.hedge_rate == 1.0
+    req_uuid, hedge_uuid = recorded
+    assert hedge_uuid != req_uuid
+    assert hedges == [(GET_ITEM, req_uuid, hedge_uuid)]
+
+
+def test_fast_request_not_hedged():
+    policy = _warm_policy(latency=5)
+    with patch(PATCH_METHOD) as req:
+        req.return_value = {}
+        Connection(hedging=policy).dispatch(GET_ITEM, {'TableName': 'Thread'})
+    assert req.call_count == 1
+    assert policy.requests == 1
+    assert policy.hedges == 0
+
+
+def test_busy_policy_not_hedged():
+    policy = HedgingPolicy(min_samples=1, window_size=10, min_delay_seconds=0, max_workers=1)
+    policy.record_latency(GET_ITEM, 0.01)
+    busy = threading.Event()
+    assert policy.submit(busy.wait, 5) is not None
+    api = SlowFirstApi()
+    api.release.set()
+    try:
+        with patch(PATCH_METHOD, new=api):
+            # with every thread busy, the request is sent from the caller's thread rather than queued
+            data = Connection(hedging=policy).dispatch(GET_ITEM, {'TableName': 'Thread'})
+    finally:
+        busy.set()
+    assert data == {'Item': {'attempt': {'S': 'first'}}}
+    assert len(api.calls) == 1
+    assert policy.requests == 1
+    assert policy.hedges == 0
+
+
+def test_policy_counts_concurrent_requests():
+    policy = HedgingPolicy(window_size=10000)
+
+    def record():
+        for _ in range(1000):
+            policy.record_request()
+            policy.record_latency(GET_ITEM, 0.01)
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert policy.requests == 8000
+    assert len(policy._latencies[GET_ITEM]) == 8000
+
+
+def test_policy_threads_released():
+    policy = HedgingPolicy(max_workers=1)
+    assert policy.submit(lambda: 1).result() == 1
+    # the thread is available again once the function has returned
+    assert policy.submit(lambda: 2).result() == 2
+
+
+def test_hedged_request_failure():
+    policy = _warm_policy()
+    release = threading.Event()
+    calls = []
+
+    def make_api_call(self, operation_name, operation_kwargs):
+        calls.append(operation_name)
+        if len(calls) == 1:
+            release.wait(5)
+            raise ValueError('first')
+        release.set()
+        raise ValueError('hedge')
+
+    with patch(PATCH_METHOD, new=make_api_call):
+        with pytest.raises(ValueError, match='first'):
+            Connection(hedging=policy).dispatch(GET_ITEM, {'TableName': 'Thread'})
+    assert len(calls) == 2
+
+
+def test_writes_not_hedged():
+    policy = _warm_policy(PUT_ITEM)
+    api = SlowFirstApi()
+    api.release.set()
+    with patch(PATCH_METHOD, new=api):
+        Connection(hedging=policy).dispatch(PUT_ITEM, {'TableName': 'Thread'})
+    assert len(api.calls) == 1
+    assert policy.requests == 0
+
+
+def test_hedge_argument():
+    policy = _warm_policy()
+    api = SlowFirstApi()
+    api.release.set()
+    with patch(PATCH_METHOD, new=api):
+        Connection(hedging=policy).dispatch(GET_ITEM, {'TableName': 'Thread'}, hedge=False)
+    assert len(api.calls) == 1
+    assert policy.requests == 0
+
+
+def test_async_hedged_get_item():
+    policy = _warm_policy()
+    calls = []
+
+    async def make_api_call(self, operation_name, operation_kwargs):
+        calls.append(operation_name)
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+            return {'Item': {'attempt': {'S': 'first'}}}
+        return {'Item': {'attempt': {'S': 'hedge'}}}
+
+    with patch(ASYNC_PATCH_METHOD, new=make_api_call):
+        c = AsyncConnection(hedging=policy)
+        data = asyncio.run(c.dispatch(GET_ITEM, {'TableName': 'Thread'}))
+
+    assert data == {'Item': {'attempt': {'S': 'hedge'}}}
+    assert calls == [GET_ITEM, GET_ITEM]
+    assert policy.hedges == 1
@@ -0,0 +1,150 @@
+"""
+Tests for hot key detection
+"""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.connection.hot_keys import CountMinSketch, HotKey, HotKeyDetector
+from pynamodb.indexes import AllProjection, GlobalSecondaryIndex
+from pynamodb.models import Model
+from pynamodb.transactions import TransactWrite
+
+PATCH_METHOD = 'pynamodb.connection.Connection._make_api_call'
+ASYNC_PATCH_METHOD = 'pynamodb.connection.async_base.AsyncConnection._make_api_call'
+
+
+class ForumIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = 'forum-index'
+        projection = AllProjection()
+
+    forum = UnicodeAttribute(hash_key=True)
+
+
+class HotModel(Model):
+    class Meta:
+        table_name = 'HotModel'
+        hot_keys = HotKeyDetector(top_k=3)
+
+    key = UnicodeAttribute(hash_key=True)
+    sort = UnicodeAttribute(range_key=True)
+    forum = UnicodeAttribute(null=True)
+    forum_index = ForumIndex()
+
+
+@pytest.fixture(autouse=True)
+def reset_detector():
+    yield
+    HotModel.Meta.hot_keys.reset()
+
+
+def test_count_min_sketch():
+    sketch = CountMinSketch(width=64, depth=4)
+    for i in range(1000):
+        sketch.add(str(i % 100))
+    sketch.add('hot', 500)
+    assert sketch.estimate('hot') >= 500
+    # estimates are never too low, and rarely much too high
+    assert all(sketch.estimate(str(i)) >= 10 for i in range(100))
+    assert sketch.estimate('hot') < 500 + 1500 * 2 / 64 * 2
+
+
+def test_top_k():
+    detector = HotKeyDetector(top_k=2)
+    for key in ['a'] * 5 + ['b'] * 3 + ['c'] * 1 + ['d'] * 4:
+        detector.record('Thread', None, key)
+    assert detector.get_hot_keys('Thread') == [HotKey('a', 5, 5 / 13), HotKey('d', 4, 4 / 13)]
+    assert detector.get_hot_keys('Thread', limit=1) == [HotKey('a', 5, 5 / 13)]
+    assert detector.get_sampled_count('Thread') == 13
+    assert detector.get_hot_keys('Thread', 'forum-index') == []
+    detector.reset()
+    assert detector.get_hot_keys('Thread') == []
+
+
+def test_sample_rate():
+    with pytest.raises(ValueError):
+        HotKeyDetector(sample_rate=0)
+    detector = HotKeyDetector(sample_rate=0.5)
+    with patch('random.random', side_effect=[0.2, 0.7]):
+        for _ in range(2):
+            detector.observe('GetItem', {'TableName': 'Thread', 'Key': {'id': {'S': '1'}}}, lambda _: None)
+    assert detector.get_sampled_count('Thread') == 0
+
+
+def test_model_requests():
+    detector = HotModel.Meta.hot_keys
+    with patch(PATCH_METHOD) as req:
+        req.return_value = {}
+        HotModel('hot', 'a').save()
+        HotModel('hot', 'b').delete()
+        with pytest.raises(HotModel.DoesNotExist):
+            HotModel.get('hot', 'c')
+        req.return_value = {'Attributes': {'key': {'S': 'cold'}, 'sort': {'S': 'a'}, 'forum': {'S': 'x'}}}
+        HotModel('cold', 'a').update(actions=[HotModel.forum.set('x')])
+
+        req.return_value = {}
+        with HotModel.batch_write() as batch:
+            batch.save(HotModel('hot', 'd'))
+            batch.delete(HotModel('warm', 'a'))
+
+        req.return_value = {'Responses': {'HotModel': []}, 'UnprocessedKeys': {}}
+        list(HotModel.batch_get([('hot', 'e')]))
+
+        req.return_value = {}
+        with TransactWrite(connection=HotModel._get_connection().connection) as transaction:
+            transaction.save(HotModel('warm', 'b'))
+
+    assert detector.get_hot_keys('HotModel') == [HotKey('hot', 5, 5 / 8), HotKey('warm', 2, 2 / 8), HotKey('cold', 1, 1 / 8)]
+
+
+def test_query():
+    detector = HotModel.Meta.hot_keys
+    with patch(PATCH_METHOD) as req:
+        req.return_value = {'Count': 0, 'ScannedCount': 0, 'Items': []}
+        list(HotModel.query('hot', HotModel.sort.startswith('a'), filter_condition=HotModel.forum == 'x'))
+        list(HotModel.forum_index.query('general'))
+        list(HotModel.scan())
+    assert detector.get_hot_keys('HotModel') == [HotKey('hot', 1, 1.0)]
+    assert detector.get_hot_keys('HotModel', 'forum-index') == [HotKey('general', 1, 1.0)]
+
+
+def test_async():
+    async def get():
+        await HotModel('hot', 'a').asave()
+
+    with patch(ASYNC_PATCH_METHOD) as req:
+        req.return_value = {}
+        asyncio.run(get())
+    assert HotModel.Meta.hot_keys.get_hot_keys('HotModel') == [HotKey('hot', 1, 1.0)]
+
+
+def test_detection_errors_do_not_fail_requests():
+    detector = HotModel.Meta.hot_keys
+    with patch(PATCH_METHOD) as req:
+        req.return_value = {'Count': 0, 'ScannedCount': 0, 'Items': []}
+        # an index that isn't in the table's description is skipped
+        HotModel._get_connection().connection.dispatch('Query', {
+            'TableName': 'HotModel',
+            'IndexName': 'missing-index',
+            'KeyConditionExpression': '#0 = :0',
+            'ExpressionAttributeNames': {'#0': 'forum'},
+            'ExpressionAttributeValues': {':0': {'S': 'general'}},
+        })
+        with patch.object(detector, 'observe', side_effect=RuntimeError):
+            list(HotModel.query('hot'))
+    assert req.call_count == 2
+    assert detector.get_hot_keys('HotModel') == []
+    assert detector.get_hot_keys('HotModel', 'missing-index') == []
+
+
+def test_async_detection_errors_do_not_fail_requests():
+    async def save():
+        await HotModel('hot', 'a').asave()
+
+    with patch(ASYNC_PATCH_METHOD) as req, patch.object(HotModel.Meta.hot_keys, 'observe', side_effect=RuntimeError):
+        req.return_value = {}
+        asyncio.run(save())
+    assert req.call_count == 1
@@ -0,0 +1,310 @@
+"""
+Tests for the in-memory database
+"""
+import asyncio
+import threading
+
+import pytest
+
+from pynamodb.attributes import ListAttribute, MapAttribute, NumberAttribute, NumberSetAttribute, UnicodeAttribute
+from pynamodb.connection import AsyncConnection, Connection
+from pynamodb.connection.memory import AsyncMemoryTransport, MemoryDatabase, MemoryDatabaseError, MemoryTransport
+from pynamodb.exceptions import DeleteError, PutError, TableDoesNotExist, TransactWriteError, UpdateError
+from pynamodb.indexes import AllProjection, GlobalSecondaryIndex, KeysOnlyProjection, LocalSecondaryIndex
+from pynamodb.models import Model
+from pynamodb.transactions import TransactGet, TransactWrite
+
+DATABASE = MemoryDatabase()
+TRANSPORT = MemoryTransport(DATABASE)
+
+
+class AuthorIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = 'author-index'
+        projection = KeysOnlyProjection()
+
+    author = UnicodeAttribute(hash_key=True)
+    views = NumberAttribute(range_key=True)
+
+
+class ViewsIndex(LocalSecondaryIndex):
+    class Meta:
+        index_name = 'views-index'
+        projection = AllProjection()
+
+    forum = UnicodeAttribute(hash_key=True)
+    views = NumberAttribute(range_key=True)
+
+
+class Details(MapAttribute):
+    summary = UnicodeAttribute(null=True)
+    scores = ListAttribute(of=NumberAttribute, null=True)
+
+
+class Thread(Model):
+    class Meta:
+        table_name = 'Thread'
+        transport = TRANSPORT
+
+    forum = UnicodeAttribute(hash_key=True)
+    subject = UnicodeAttribute(range_key=True)
+    author = UnicodeAttribute(null=True)
+    views = NumberAttribute(null=True)
+    tags = NumberSetAttribute(null=True)
+    details = Details(null=True)
+    body = UnicodeAttribute(null=True)
+    author_index = AuthorIndex()
+    views_index = ViewsIndex()
+
+
+class Counter(Model):
+    class Meta:
+        table_name = 'Counter'
+        transport = TRANSPORT
+
+    name = UnicodeAttribute(hash_key=True)
+    value = NumberAttribute(default=0)
+
+
+@pytest.fixture(autouse=True)
+def tables():
+    Thread.create_table(billing_mode='PAY_PER_REQUEST')
+    Counter.create_table(billing_mode='PAY_PER_REQUEST')
+    yield
+    DATABASE.reset()
+
+
+def _threads(count, forum='general', **kwargs):
+    threads = [
+        Thread(forum, 'subject-{:03d}'.format(i), author='ann' if i % 2 else 'bob', views=i, **kwargs)
+        for i in range(count)
+    ]
+    with Thread.batch_write() as batch:
+        for thread in threads:
+            batch.save(thread)
+    return threads
+
+
+def test_tables():
+    assert Thread.exists()
+    description = Thread.describe_table()
+    assert description['TableStatus'] == 'ACTIVE'
+    assert [index['IndexName'] for index in description['GlobalSecondaryIndexes']] == ['author-index']
+    assert Connection(transport=TRANSPORT).list_tables()['TableNames'] == ['Counter', 'Thread']
+    Counter.delete_table()
+    assert not Counter.exists()
+    with pytest.raises(TableDoesNotExist):
+        Connection(transport=TRANSPORT).describe_table('Counter')
+
+
+def test_tables_are_regional():
+    connection = Connection(region='eu-west-1', transport=TRANSPORT)
+    assert connection.list_tables()['TableNames'] == []
+
+
+def test_items():
+    thread = Thread('general', 'hello', author='ann', views=1, details=Details(summary='hi', scores=[1, 2]))
+    thread.save()
+    fetched = Thread.get('general', 'hello')
+    assert fetched.author == 'ann'
+    assert fetched.details.scores == [1, 2]
+    assert Thread.get('general', 'hello', attributes_to_get=['author']).views is None
+    assert Thread.count() == 1
+
+    with pytest.raises(PutError) as exc_info:
+        thread.save(condition=Thread.forum.does_not_exist())
+    assert exc_info.value.cause_response_code == 'ConditionalCheckFailedException'
+    thread.save(condition=Thread.views == 1)
+
+    thread.delete()
+    with pytest.raises(Thread.DoesNotExist):
+        Thread.get('general', 'hello')
+    with pytest.raises(DeleteError):
+        thread.delete(condition=Thread.forum.exists())
+
+
+def test_update():
+    thread = Thread('general', 'hello', views=1, tags={1, 2}, details=Details(summary='hi', scores=[1]))
+    thread.save()
+    thread.update(actions=[
+        Thread.views.set(Thread.views + 10),
+        Thread.author.set(Thread.author | 'ann'),
+        Thread.tags.add({3}),
+        Thread.details.scores.set(Thread.details.scores.append([2, 3])),
+        Thread.details.summary.remove(),
+    ])
+    assert thread.views == 11
+    assert thread.author == 'ann'
+    assert thread.tags == {1, 2, 3}
+    assert thread.details.scores == [1, 2, 3]
+    assert thread.details.summary is None
+
+    thread.update(actions=[Thread.tags.delete({1, 2, 3}), Thread.author.remove(), Thread.views.add(-1)])
+    assert thread.tags is None
+    assert thread.author is None
+    assert thread.views == 10
+
+    with pytest.raises(UpdateError):
+        thread.update(actions=[Thread.views.set(0)], condition=Thread.views > 10)
+
+    counter = Counter('visits')
+    for _ in range(3):
+        counter.update(actions=[Counter.value.add(1)])
+    assert Counter.get('visits').value == 3
+
+
+def test_query():
+    _threads(10)
+    _threads(3, forum='other')
+    assert [thread.views for thread in Thread.query('general', Thread.subject.between('subject-002', 'subject-004'))] == [2, 3, 4]
+    assert [thread.views for thread in Thread.query('general', Thread.subject.startswith('subject-00'), scan_index_forward=False, limit=2)] == [9, 8]
+    assert [thread.views for thread in Thread.query('general', filter_condition=Thread.views.is_in(1, 5, 7))] == [1, 5, 7]
+    assert Thread.count('general', Thread.subject < 'subject-005') == 5
+
+    # pages of 3 items
+    results = Thread.query('general', filter_condition=Thread.author == 'ann', page_size=3)
+    assert [thread.views for thread in results] == [1, 3, 5, 7, 9]
+    assert results.page_iter.total_scanned_count == 10
+    assert Thread.query('other', page_size=3).page_iter.last_evaluated_key is None
+
+
+def test_query_pages_over_one_megabyte():
+    _threads(30, body='x' * 100000)
+    pages = list(Thread.query('general').page_iter)
+    # each page stops at the item that brings it to 1 MB
+    assert [page['Count'] for page in pages] == [11, 11, 8]
+
+
+def test_indexes():
+    threads = _threads(6)
+    # global secondary index, with only the keys projected
+    results = list(Thread.author_index.query('ann', Thread.views >= 3))
+    assert [(thread.subject, thread.views, thread.author, thread.forum) for thread in results] == [
+        ('subject-003', 3, 'ann', 'general'), ('subject-005', 5, 'ann', 'general'),
+    ]
+    # local secondary index
+    assert [thread.subject for thread in Thread.views_index.query('general', Thread.views < 2, scan_index_forward=False)] == [
+        'subject-001', 'subject-000',
+    ]
+    # indexes are updated by writes
+    threads[3].update(actions=[Thread.author.set('cy')])
+    threads[5].delete()
+    assert [thread.views for thread in Thread.author_index.query('ann')] == [1]
+    assert sorted(thread.views for thread in Thread.author_index.scan()) == [0, 1, 2, 3, 4]
+    with pytest.raises(Exception, match='Consistent reads are not supported on global secondary indexes'):
+        list(Thread.author_index.query('ann', consistent_read=True))
+
+
+def test_scan():
+    _threads(20)
+    _threads(20, forum='other')
+    assert Thread.count() == 40
+    assert len(list(Thread.scan(page_size=7))) == 40
+    segments = [list(Thread.scan(segment=segment, total_segments=2)) for segment in range(2)]
+    assert sorted(len(segment) for segment in segments) == [20, 20]
+    assert sum(1 for _ in Thread.scan(Thread.views >= 15)) == 10
+
+
+def test_batch_get():
+    _threads(5)
+    keys = [('general', 'subject-{:03d}'.format(i)) for i in range(7)]
+    assert sorted(thread.views for thread in Thread.batch_get(keys)) == [0, 1, 2, 3, 4]
+
+
+def test_transactions():
+    connection = Connection(transport=TRANSPORT)
+    Counter('a', value=1).save()
+    Counter('c', value=1).save()
+    for _ in range(2):
+        # committing the same transaction again has no effect
+        with TransactWrite(connection=connection, client_request_token='token') as transaction:
+            transaction.save(Counter('b', value=2))
+            transaction.update(Counter('a'), actions=[Counter.value.add(1)])
+            transaction.condition_check(Counter, 'c', condition=Counter.value == 1)
+
+    with TransactGet(connection=connection) as transaction:
+        a = transaction.get(Counter, 'a')
+        b = transaction.get(Counter, 'b')
+    assert (a.get().value, b.get().value) == (2, 2)
+
+    with pytest.raises(TransactWriteError) as exc_info:
+        with TransactWrite(connection=connection) as transaction:
+            transaction.delete(Counter('b'))
+            transaction.save(Counter('a', value=5), condition=Counter.name.does_not_exist())
+    assert exc_info.value.cause_response_code == 'TransactionCanceledException'
+    assert [reason and reason.code for reason in exc_info.value.cancellation_reasons] == [None, 'ConditionalCheckFailed']
+    # nothing was written
+    assert Counter.get('b').value == 2
+    assert Counter.get('a').value == 2
+
+
+def test_thread_safety():
+    Counter('visits').save()
+
+    def visit():
+        for _ in range(50):
+            Counter('visits').update(actions=[Counter.value.add(1)])
+
+    threads = [threading.Thread(target=visit) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert Counter.get('visits').value == 200
+
+
+def test_async():
+    async def run():
+        async with AsyncConnection(transport=AsyncMemoryTransport(DATABASE)) as connection:
+            await connection.describe_table('Counter')
+            await connection.put_item('Counter', 'async', attributes={'value': {'N': '1'}})
+            return await connection.get_item('Counter', 'async')
+
+    assert asyncio.run(run())['Item']['value'] == {'N': '1'}
+    assert Counter.get('async').value == 1
+
+
+def test_errors():
+    database = MemoryDatabase()
+    with pytest.raises(MemoryDatabaseError) as exc_info:
+        database.handle('GetItem', {'TableName': 'Missing', 'Key': {'id': {'S': '1'}}})
+    assert exc_info.value.code == 'ResourceNotFoundException'
+    database.handle('CreateTable', {
+        'TableName': 'Table',
+        'KeySchema': [{'AttributeName': 'id', 'KeyType': 'HASH'}],
+        'AttributeDefinitions': [{'AttributeName': 'id', 'AttributeType': 'S'}],
+        'BillingMode': 'PAY_PER_REQUEST',
+    })
+    with pytest.raises(MemoryDatabaseError, match='Invalid expression'):
+        database.handle('Scan', {'TableName': 'Table', 'FilterExpression': '#a = = :b'})
+    with pytest.raises(MemoryDatabaseError, match='does not match the schema'):
+        database.handle('PutItem', {'TableName': 'Table', 'Item': {'id': {'N': '1'}}})
+    database.handle('PutItem', {'TableName': 'Table', 'Item': {'id': {'S': '1'}}})
+    with pytest.raises(MemoryDatabaseError, match='part of the key'):
+        database.handle('UpdateItem', {
+            'TableName': 'Table',
+            'Key': {'id': {'S': '1'}},
+            'UpdateExpression': 'SET #id = :id',
+            'ExpressionAttributeNames': {'#id': 'id'},
+            'ExpressionAttributeValues': {':id': {'S': '2'}},
+        })
+
+
+def test_async_model():
+    class AsyncCounter(Model):
+        class Meta:
+            table_name = 'Counter'
+            transport = TRANSPORT
+            async_transport = AsyncMemoryTransport(DATABASE)
+
+        name = UnicodeAttribute(hash_key=True)
+        value = NumberAttribute(default=0)
+
+    async def run():
+        await AsyncCounter('async', value=1).asave()
+        counter = await AsyncCounter.aget('async')
+        await counter.aupdate(actions=[AsyncCounter.value.add(1)])
+        return counter
+
+    assert asyncio.run(run()).value == 2
+    assert Counter.get('async').value == 2
@@ -0,0 +1,186 @@
+"""
+Tests for request metrics
+"""
+import asyncio
+import json
+from unittest import mock
+from unittest.mock import patch
+
+import pytest
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import ClientError
+
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.connection import AsyncConnection, Connection
+from pynamodb.connection.metrics import Histogram, MetricsKey, MetricsRegistry, count_items
+from pynamodb.connection.retry import RetryPolicy
+from pynamodb.constants import BATCH_GET_ITEM, BATCH_WRITE_ITEM, GET_ITEM, PUT_ITEM, QUERY, TRANSACT_WRITE_ITEMS
+from pynamodb.models import Model
+
+PATCH_METHOD = 'pynamodb.connection.Connection._make_api_call'
+
+GET_ITEM_KWARGS = {'TableName': 'Thread', 'Key': {'id': {'S': '1'}}}
+
+
+def _response(status_code, content):
+    response = mock.Mock(spec=AWSResponse)
+    response.status_code = status_code
+    response.text = json.dumps(content)
+    response.content = response.text.encode()
+    response.headers = {'content-length': str(len(response.content))}
+    return response
+
+
+class MetricsModel(Model):
+    class Meta:
+        table_name = 'MetricsModel'
+        metrics = MetricsRegistry()
+
+    key = UnicodeAttribute(hash_key=True)
+
+
+def test_histogram():
+    histogram = Histogram((1, 10, 100))
+    for value in (0.5, 1, 5, 50, 500):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1, 1]
+    assert histogram.count == 5
+    assert histogram.sum == 556.5
+    assert histogram.get_cumulative_counts() == [(1, 2), (10, 3), (100, 4), (float('inf'), 5)]
+    assert histogram.get_quantile(0.5) == 5.5
+    assert histogram.get_quantile(1) == 100
+    assert Histogram((1,)).get_quantile(0.5) is None
+
+
+def test_count_items():
+    assert count_items(GET_ITEM, {}, {'Item': {'id': {'S': '1'}}}) == 1
+    assert count_items(GET_ITEM, {}, {}) == 0
+    assert count_items(QUERY, {}, {'Count': 3, 'Items': []}) == 3
+    assert count_items(BATCH_GET_ITEM, {}, {'Responses': {'Thread': [{}, {}], 'Forum': [{}]}}) == 3
+    assert count_items(PUT_ITEM, {}, {}) == 1
+    batch_write_kwargs = {'RequestItems': {'Thread': [{'PutRequest': {}}, {'PutRequest': {}}, {'DeleteRequest': {}}]}}
+    assert count_items(BATCH_WRITE_ITEM, batch_write_kwargs, {'UnprocessedItems': {'Thread': [{'PutRequest': {}}]}}) == 2
+    assert count_items(TRANSACT_WRITE_ITEMS, {'TransactItems': [{}, {}]}, {}) == 2
+
+
+def test_snapshot_and_reset():
+    registry = MetricsRegistry(latency_buckets=(0.1, 1), size_buckets=(100,))
+    key = MetricsKey('Thread', None, GET_ITEM)
+    registry.record_operation(key, 0.05, items=1)
+    registry.record_attempt(key, 50, 150, throttled=True)
+
+    snapshot = registry.snapshot()
+    registry.record_operation(key, 2, failed=True)
+    # a snapshot isn't affected by later operations
+    assert snapshot[key].requests == 1
+    assert snapshot[key].latency.counts == [1, 0, 0]
+
+    metrics = registry.reset()[key]
+    assert metrics.requests == 2
+    assert metrics.errors == 1
+    assert metrics.throttles == 1
+    assert metrics.items == 1
+    assert metrics.latency.counts == [1, 0, 1]
+    assert metrics.request_bytes.counts == [1, 0]
+    assert metrics.response_bytes.counts == [0, 1]
+    assert registry.snapshot() == {}
+
+
+def test_render_prometheus():
+    registry = MetricsRegistry(latency_buckets=(0.1, 1), size_buckets=(100,))
+    key = MetricsKey('Thread', 'Forum-"index"', QUERY)
+    registry.record_operation(key, 0.5, items=3)
+    registry.record_attempt(key, 50, None)
+    text = registry.render_prometheus(prefix='app')
+    labels = 'table="Thread",index="Forum-\\"index\\"",operation="Query"'
+    assert '# TYPE app_requests_total counter\napp_requests_total{' + labels + '} 1\n' in text
+    assert 'app_items_total{' + labels + '} 3\n' in text
+    assert 'app_errors_total{' + labels + '} 0\n' in text
+    assert '# TYPE app_request_duration_seconds histogram\n' in text
+    assert (
+        'app_request_duration_seconds_bucket{' + labels + ',le="0.1"} 0\n'
+        'app_request_duration_seconds_bucket{' + labels + ',le="1.0"} 1\n'
+        'app_request_duration_seconds_bucket{' + labels + ',le="+Inf"} 1\n'
+        'app_request_duration_seconds_sum{' + labels + '} 0.5\n'
+        'app_request_duration_seconds_count{' + labels + '} 1\n'
+    ) in text
+    assert 'app_request_size_bytes_count{' + labels + '} 1\n' in text
+    assert 'app_response_size_bytes_count{' + labels + '} 0\n' in text
+
+
+def test_dispatch_records_operations():
+    registry = MetricsRegistry()
+    c = Connection(metrics=registry)
+    with patch(PATCH_METHOD) as req:
+        req.return_value = {'Count': 2, 'Items': [{}, {}]}
+        c.dispatch(QUERY, {'TableName': 'Thread', 'IndexName': 'Forum-index'})
+        req.side_effect = ClientError({'Error': {'Code': 'ValidationException'}}, GET_ITEM)
+        with pytest.raises(ClientError):
+            c.dispatch(GET_ITEM, dict(GET_ITEM_KWARGS))
+
+    snapshot = registry.snapshot()
+    query = snapshot[MetricsKey('Thread', 'Forum-index', QUERY)]
+    assert query.requests == 1
+    assert query.items == 2
+    assert query.latency.count == 1
+    get_item = snapshot[MetricsKey('Thread', None, GET_ITEM)]
+    assert get_item.errors == 1
+    assert get_item.items == 0
+
+
+def test_dispatch_without_registry():
+    with patch('pynamodb.connection.metrics.MetricsRegistry.record_operation') as record_operation:
+        with patch(PATCH_METHOD) as req:
+            req.return_value = {}
+            Connection().dispatch(GET_ITEM, dict(GET_ITEM_KWARGS))
+    record_operation.assert_not_called()
+
+
+@mock.patch('time.sleep')
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+@pytest.mark.parametrize('lean_codec', [False, True])
+def test_attempts(send_mock, sleep_mock, lean_codec):
+    throttled = _response(400, {'__type': 'ThrottlingException', 'message': 'slow down'})
+    item = _response(200, {'Item': {'id': {'S': '1'}}})
+    send_mock.side_effect = [throttled, item]
+    registry = MetricsRegistry()
+    c = Connection(metrics=registry, lean_codec=lean_codec, retry_policy=RetryPolicy(budget=None))
+    c.dispatch(GET_ITEM, dict(GET_ITEM_KWARGS))
+
+    metrics = registry.snapshot()[MetricsKey('Thread', None, GET_ITEM)]
+    assert metrics.requests == 1
+    assert metrics.items == 1
+    assert metrics.throttles == 1
+    assert metrics.request_bytes.count == 2
+    assert metrics.request_bytes.sum == 2 * len(send_mock.call_args[0][0].body)
+    assert metrics.response_bytes.count == 2
+    assert metrics.response_bytes.sum == len(throttled.content) + len(item.content)
+
+
+def test_model_metrics():
+    with patch(PATCH_METHOD) as req:
+        req.return_value = {'Item': {'key': {'S': '1'}}}
+        MetricsModel.get('1')
+    metrics = MetricsModel.Meta.metrics.reset()
+    assert metrics[MetricsKey('MetricsModel', None, GET_ITEM)].items == 1
+
+
+def test_async_metrics():
+    class Transport:
+        async def send(self, request):
+            self.body = request.body
+            return _response(200, {'Item': {'id': {'S': '1'}}})
+
+    transport = Transport()
+    registry = MetricsRegistry()
+
+    async def get_item():
+        conn = AsyncConnection(transport=transport, metrics=registry)
+        return await conn.dispatch(GET_ITEM, dict(GET_ITEM_KWARGS))
+
+    asyncio.run(get_item())
+    metrics = registry.snapshot()[MetricsKey('Thread', None, GET_ITEM)]
+    assert metrics.requests == 1
+    assert metrics.items == 1
+    assert metrics.request_bytes.sum == len(transport.body)
+    assert metrics.response_bytes.count == 1
@@ -13,6 +13,8 @@ from unittest import TestCase
 from botocore.client import ClientError
 import pytest
 
+import pynamodb
+
 from .deep_eq import deep_eq
 from pynamodb.exceptions import DoesNotExist, TableError, PutError, AttributeDeserializationError
 from pynamodb.constants import (
@@ -1752,7 +1754,8 @@ class ModelTestCase(TestCase):
             self.assertEqual(item.overidden_user_name, CUSTOM_ATTR_NAME_ITEM_DATA['Item']['user_name']['S'])
             self.assertEqual(item.overidden_user_id, CUSTOM_ATTR_NAME_ITEM_DATA['Item']['user_id']['S'])
 
-    def test_batch_get(self):
+    @patch('time.sleep')
+    def test_batch_get(self, sleep_mock):
         """
         Model.batch_get
         """
@@ -1997,7 +2000,8 @@ class ModelTestCase(TestCase):
                     batch.save(item)
 
 
-    def test_batch_write_with_unprocessed(self):
+    @patch('time.sleep')
+    def test_batch_write_with_unprocessed(self, sleep_mock):
         picture_blob = b'FFD8FFD8'
 
         items = []
@@ -2036,7 +2040,8 @@ class ModelTestCase(TestCase):
 
             self.assertEqual(len(req.mock_calls), 2)
 
-    def test_batch_write_raises_put_error(self):
+    @patch('time.sleep')
+    def test_batch_write_raises_put_error(self, sleep_mock):
         items = []
         for idx in range(10):
             items.append(BatchModel(
@@ -3456,3 +3461,14 @@ def test_delete_with_wait(mocker):
     assert result == mock__get_connection.return_value.delete_table.return_value
     # Should have called exists 3 times.
     assert mock_exists.call_count == 3
+
+
+def test_warmup():
+    UserModel._connection = None
+    SimpleUserModel._connection = None
+    with patch('pynamodb.connection.base.Connection.warmup', autospec=True, return_value=0) as warmup_mock:
+        assert pynamodb.warmup([UserModel, SimpleUserModel], open_connections=2) == 0
+    assert UserModel._connection.get_meta_table().hash_keyname == 'user_name'
+    assert SimpleUserModel._connection.get_meta_table().hash_keyname == 'user_name'
+    assert warmup_mock.call_args_list[0] == ((UserModel._connection.connection,), {'open_connections': 2})
+    assert warmup_mock.call_count == 2
@@ -0,0 +1,217 @@
+"""
+Tests for connection pool metrics and sizing
+"""
+import asyncio
+import json
+import socket
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from botocore.awsrequest import AWSHTTPConnectionPool
+from urllib3.exceptions import EmptyPoolError
+from urllib3.util.timeout import Timeout
+
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.connection import AsyncConnection, Connection
+from pynamodb.connection._pool import get_pool_classes, request_timeouts
+from pynamodb.connection.pooling import PoolAutoSizing, PoolMetrics
+from pynamodb.connection.transport import URLLib3Transport
+from pynamodb.constants import GET_ITEM
+from pynamodb.models import Model
+
+PATCH_METHOD = 'pynamodb.connection.Connection._make_api_call'
+
+GET_ITEM_KWARGS = {'TableName': 'Thread', 'Key': {'id': {'S': '1'}}}
+
+
+class AutoSizedModel(Model):
+    class Meta:
+        table_name = 'AutoSizedModel'
+        pool_auto_sizing = PoolAutoSizing(max_pool_connections=50)
+
+    key = UnicodeAttribute(hash_key=True)
+
+
+@pytest.fixture
+def server():
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(10)
+    yield server
+    server.close()
+
+
+def test_auto_sizing_pool_size():
+    auto_sizing = PoolAutoSizing(max_pool_connections=20)
+    assert auto_sizing.get_pool_size(10, 0) == 11
+    # the pool grows to the concurrency observed in one step
+    assert auto_sizing.get_pool_size(10, 15) == 15
+    assert auto_sizing.get_pool_size(10, 30) == 20
+    assert auto_sizing.get_pool_size(20, 30) == 20
+    with pytest.raises(ValueError):
+        PoolAutoSizing(max_pool_connections=0)
+
+
+def test_pool_metrics(server):
+    metrics = PoolMetrics(2)
+    pool = get_pool_classes(metrics)['http']('127.0.0.1', server.getsockname()[1], maxsize=2)
+    conn = pool._get_conn()
+    conn.connect()
+    assert metrics.in_use == 1
+    assert metrics.idle == 0
+    pool._put_conn(conn)
+    assert metrics.in_use == 0
+    assert metrics.idle == 1
+
+    # a pooled connection is reused
+    pool._put_conn(pool._get_conn())
+    assert metrics.checkouts == 2
+    assert metrics.connections_opened == 1
+    assert metrics.peak_in_use == 1
+    assert metrics.wait_seconds >= 0
+
+    pool.close()
+    assert metrics.connections_closed == 1
+    assert metrics.idle == 0
+    assert metrics.as_dict()['connections_closed'] == 1
+
+
+def test_pool_grows_while_waiting(server):
+    metrics = PoolMetrics(1)
+    metrics.peak_in_flight = 3
+    auto_sizing = PoolAutoSizing(max_pool_connections=4, wait_threshold_seconds=0.01)
+    pool = get_pool_classes(metrics, auto_sizing=auto_sizing)['http']('127.0.0.1', server.getsockname()[1], maxsize=1)
+    assert pool.block
+
+    first = pool._get_conn()
+    # the pool is empty, so the next request waits, then grows the pool to the concurrency observed
+    second = pool._get_conn()
+    assert second is not first
+    assert metrics.pool_size == 3
+    assert metrics.resizes == 1
+    assert metrics.max_wait_seconds >= 0.01
+
+    third = pool._get_conn()
+    assert metrics.resizes == 1
+    fourth = pool._get_conn()
+    assert metrics.pool_size == 4
+    for conn in (first, second, third, fourth):
+        pool._put_conn(conn)
+    assert metrics.in_use == 0
+
+
+def test_pool_at_cap_waits(server):
+    metrics = PoolMetrics(1)
+    auto_sizing = PoolAutoSizing(max_pool_connections=1, wait_threshold_seconds=0.01)
+    pool = get_pool_classes(metrics, auto_sizing=auto_sizing)['http']('127.0.0.1', server.getsockname()[1], maxsize=1)
+    conn = pool._get_conn()
+    release = threading.Timer(0.05, pool._put_conn, [conn])
+    release.start()
+    assert pool._get_conn() is conn
+    release.join()
+    assert metrics.resizes == 0
+    assert metrics.max_wait_seconds >= 0.04
+
+
+def test_pool_timeouts_are_limited_by_the_deadline(server):
+    metrics = PoolMetrics(1)
+    pool = get_pool_classes(metrics)['http'](
+        '127.0.0.1', server.getsockname()[1], maxsize=1, block=True, timeout=Timeout(connect=10, read=10),
+    )
+    with patch.object(AWSHTTPConnectionPool, 'urlopen') as urlopen:
+        with request_timeouts(5, deadline=time.monotonic() + 0.5):
+            pool.urlopen('POST', '/')
+    timeout = urlopen.call_args[1]['timeout']
+    assert timeout.connect_timeout <= 0.5
+    assert timeout.read_timeout <= 0.5
+    assert urlopen.call_args[1]['pool_timeout'] <= 0.5
+
+    # waiting for a pooled connection stops at the deadline
+    conn = pool._get_conn()
+    start = time.monotonic()
+    with request_timeouts(None, deadline=time.monotonic() + 0.1):
+        with pytest.raises(EmptyPoolError):
+            pool.urlopen('POST', '/', retries=False)
+    assert time.monotonic() - start < 1
+    pool._put_conn(conn)
+
+
+def test_connection_pool_metrics():
+    c = Connection()
+    metrics = c.pool_metrics
+    assert metrics is not None
+    assert metrics.pool_size == 10
+    assert c.client._endpoint.http_session._pool_classes_by_scheme['https'].pool_metrics is metrics
+    assert Connection(transport=URLLib3Transport(max_pool_connections=5)).pool_metrics.pool_size == 5
+
+    auto_sizing = PoolAutoSizing()
+    c = Connection(pool_auto_sizing=auto_sizing)
+    assert c.client._endpoint.http_session._pool_classes_by_scheme['https'].auto_sizing is auto_sizing
+    assert c._get_client_key() != Connection()._get_client_key()
+
+
+def test_dispatch_counts_in_flight_requests():
+    transport = URLLib3Transport()
+    c = Connection(transport=transport)
+    in_flight = []
+
+    def make_api_call(self, operation_name, operation_kwargs):
+        in_flight.append(transport.pool_metrics.in_flight)
+        return {}
+
+    with patch(PATCH_METHOD, new=make_api_call):
+        c.dispatch(GET_ITEM, dict(GET_ITEM_KWARGS))
+    assert in_flight == [1]
+    assert transport.pool_metrics.in_flight == 0
+    assert transport.pool_metrics.peak_in_flight == 1
+
+
+def test_model_pool_auto_sizing():
+    connection = AutoSizedModel._get_connection().connection
+    assert connection._pool_auto_sizing is AutoSizedModel.Meta.pool_auto_sizing
+
+
+def test_async_pool_metrics():
+    async def handle(reader, writer):
+        while await reader.readline():
+            headers = {}
+            while True:
+                header = await reader.readline()
+                if header in (b'\r\n', b''):
+                    break
+                name, value = header.decode().split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+            await reader.readexactly(int(headers['content-length']))
+            await asyncio.sleep(0.02)
+            writer.write(b'HTTP/1.1 200 OK\r\nx-amzn-RequestId: request-id\r\nContent-Length: 2\r\n\r\n{}')
+            await writer.drain()
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with AsyncConnection(
+            host='http://127.0.0.1:{}'.format(port),
+            max_pool_connections=1,
+            pool_auto_sizing=PoolAutoSizing(max_pool_connections=3, wait_threshold_seconds=0.005),
+        ) as conn:
+            await asyncio.gather(*[conn.dispatch(GET_ITEM, dict(GET_ITEM_KWARGS)) for _ in range(4)])
+            metrics = conn.pool_metrics
+            assert metrics.peak_in_flight == 4
+            assert metrics.idle == metrics.connections_opened
+        assert metrics.idle == 0
+        server.close()
+        await server.wait_closed()
+        return metrics
+
+    metrics = asyncio.run(run())
+    assert metrics.in_flight == 0
+    assert metrics.in_use == 0
+    assert metrics.checkouts == 4
+    # the requests waiting behind the first one grew the pool
+    assert metrics.resizes >= 1
+    assert metrics.pool_size == 3
+    assert metrics.connections_closed == metrics.connections_opened
+    assert json.loads(json.dumps(metrics.as_dict())) == metrics.as_dict()
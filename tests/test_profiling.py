@@ -0,0 +1,162 @@
+"""
+Tests for phase profiling
+"""
+import asyncio
+import json
+from unittest import mock
+from unittest.mock import patch
+
+import pytest
+from botocore.awsrequest import AWSResponse
+
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.connection import Connection
+from pynamodb.connection.profiling import (
+    BUILD, DESERIALIZE, PARSE, RETRY_WAIT, SEND, SERIALIZE, SIGN, PhaseKey, PhaseProfiler, RequestTimings,
+    get_profiler, set_profiler,
+)
+from pynamodb.connection.retry import RetryPolicy
+from pynamodb.constants import GET_ITEM, PUT_ITEM
+from pynamodb.models import Model
+
+GET_ITEM_KWARGS = {'TableName': 'Thread', 'Key': {'id': {'S': '1'}}}
+
+
+def _response(status_code, content):
+    response = mock.Mock(spec=AWSResponse)
+    response.status_code = status_code
+    response.headers = {}
+    response.text = json.dumps(content)
+    response.content = response.text.encode()
+    return response
+
+
+class ProfiledModel(Model):
+    class Meta:
+        table_name = 'ProfiledModel'
+        retry_policy = RetryPolicy(budget=None)
+
+    key = UnicodeAttribute(hash_key=True)
+
+
+class LeanProfiledModel(Model):
+    class Meta:
+        table_name = 'LeanProfiledModel'
+        lean_codec = True
+
+    key = UnicodeAttribute(hash_key=True)
+
+
+@pytest.fixture
+def timings():
+    recorded = []
+    set_profiler(recorded.append)
+    yield recorded
+    set_profiler(None)
+
+
+def test_request_timings():
+    with patch('time.perf_counter', side_effect=[1.0, 1.5, 2.0, 3.0]):
+        timings = RequestTimings('Thread', GET_ITEM)
+        timings.mark(BUILD)
+        timings.mark(SEND)
+        timings.mark(BUILD)
+    assert timings.phases == {BUILD: 1.5, SEND: 0.5}
+    assert timings.total_seconds == 2.0
+
+
+def test_phase_profiler():
+    profiler = PhaseProfiler(buckets=(0.001, 0.01, 0.1))
+    for seconds in (0.0005, 0.005, 0.05):
+        timings = RequestTimings('Thread', GET_ITEM)
+        timings.phases = {SEND: seconds, PARSE: 0.0001}
+        profiler(timings)
+    summaries = profiler.get_summaries()
+    send = summaries[PhaseKey('Thread', GET_ITEM, SEND)]
+    assert send.samples == 3
+    assert send.total_seconds == pytest.approx(0.0555)
+    assert send.p50 == pytest.approx(0.0055)
+    assert send.p99 == pytest.approx(0.0973)
+    report = profiler.format_report().splitlines()
+    assert report[0].split() == ['model', 'operation', 'phase', 'samples', 'p50', 'ms', 'p90', 'ms', 'p99', 'ms']
+    # phases are listed in the order they happen
+    assert [line.split()[2] for line in report[1:]] == [SEND, PARSE]
+
+    profiler.reset()
+    assert profiler.get_summaries() == {}
+
+
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_model_get(send_mock, timings):
+    send_mock.return_value = _response(200, {'Item': {'key': {'S': '1'}}})
+    ProfiledModel.get('1')
+
+    assert len(timings) == 1
+    assert timings[0].model_name == 'ProfiledModel'
+    assert timings[0].operation_name == GET_ITEM
+    assert set(timings[0].phases) == {BUILD, SERIALIZE, SIGN, SEND, PARSE, DESERIALIZE}
+
+
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_lean_codec(send_mock, timings):
+    send_mock.return_value = _response(200, {})
+    LeanProfiledModel('1').save()
+    assert timings[0].operation_name == PUT_ITEM
+    assert set(timings[0].phases) == {BUILD, SERIALIZE, SIGN, SEND, PARSE, DESERIALIZE}
+
+
+@mock.patch('time.sleep')
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_retries(send_mock, sleep_mock, timings):
+    send_mock.side_effect = [
+        _response(400, {'__type': 'ThrottlingException', 'message': 'slow down'}),
+        _response(200, {'Item': {'key': {'S': '1'}}}),
+    ]
+    ProfiledModel.get('1')
+    assert RETRY_WAIT in timings[0].phases
+
+
+def test_connection_operations(timings):
+    with patch('pynamodb.connection.Connection._make_api_call') as req:
+        req.return_value = {}
+        Connection().dispatch(GET_ITEM, dict(GET_ITEM_KWARGS))
+    assert len(timings) == 1
+    assert timings[0].model_name is None
+    assert timings[0].operation_name == GET_ITEM
+
+
+def test_failed_operations(timings):
+    with patch('pynamodb.connection.Connection._make_api_call') as req:
+        req.return_value = {}
+        with pytest.raises(ProfiledModel.DoesNotExist):
+            ProfiledModel.get('1')
+    assert len(timings) == 1
+    assert DESERIALIZE in timings[0].phases
+
+
+def test_profiler_errors():
+    def profiler(timings):
+        raise ValueError()
+
+    set_profiler(profiler)
+    try:
+        assert get_profiler() is profiler
+        with patch('pynamodb.connection.Connection._make_api_call') as req:
+            req.return_value = {}
+            Connection().dispatch(GET_ITEM, dict(GET_ITEM_KWARGS))
+    finally:
+        set_profiler(None)
+
+
+def test_async(timings):
+    class Transport:
+        async def send(self, request):
+            return _response(200, {'Item': {'key': {'S': '1'}}})
+
+    ProfiledModel._get_async_connection().connection._transport = Transport()
+    try:
+        asyncio.run(ProfiledModel.aget('1'))
+    finally:
+        ProfiledModel._async_connection = None
+    assert timings[0].model_name == 'ProfiledModel'
+    assert set(timings[0].phases) == {BUILD, SERIALIZE, SIGN, SEND, PARSE, DESERIALIZE}
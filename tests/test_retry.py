@@ -0,0 +1,212 @@
+"""
+Tests for the retry policy
+"""
+import json
+from unittest import mock
+from unittest.mock import patch
+
+import botocore.exceptions
+import pytest
+from botocore.awsrequest import AWSResponse
+from botocore.client import ClientError
+
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.connection import Connection
+from pynamodb.connection import retry
+from pynamodb.connection.retry import (
+    THROTTLING, TRANSIENT, RetryBudget, RetryPolicy, classify_error, get_retry_policy,
+)
+from pynamodb.constants import UNPROCESSED_ITEMS, UNPROCESSED_KEYS, RESPONSES
+from pynamodb.exceptions import GetError, PutError
+from pynamodb.models import Model
+
+PATCH_METHOD = 'pynamodb.connection.Connection._make_api_call'
+
+
+def _client_error(code=None, status_code=400):
+    return ClientError({
+        'Error': {'Code': code, 'Message': 'problem'},
+        'ResponseMetadata': {'HTTPStatusCode': status_code},
+    }, 'GetItem')
+
+
+def _response(status_code, content):
+    response = mock.Mock(spec=AWSResponse)
+    response.status_code = status_code
+    response.headers = {}
+    response.text = json.dumps(content)
+    response.content = response.text.encode()
+    return response
+
+
+class RetryModel(Model):
+    class Meta:
+        table_name = 'RetryModel'
+        max_retry_attempts = 5
+        retry_policy = RetryPolicy(budget=None)
+
+    key = UnicodeAttribute(hash_key=True)
+
+
+def test_classify_error():
+    assert classify_error(_client_error('ProvisionedThroughputExceededException')) == THROTTLING
+    assert classify_error(_client_error('ThrottlingException')) == THROTTLING
+    assert classify_error(_client_error('RequestTimeout')) == TRANSIENT
+    assert classify_error(_client_error('InternalServerError', 500)) == TRANSIENT
+    assert classify_error(botocore.exceptions.ReadTimeoutError(endpoint_url='http://localhost')) == TRANSIENT
+    assert classify_error(botocore.exceptions.EndpointConnectionError(endpoint_url='http://localhost')) == TRANSIENT
+    assert classify_error(_client_error('ConditionalCheckFailedException')) is None
+    assert classify_error(_client_error('ValidationException')) is None
+    assert classify_error(ValueError()) is None
+
+
+def test_retry_budget():
+    with patch('time.monotonic', return_value=100.0) as monotonic:
+        budget = RetryBudget(ratio=0.5, min_retries_per_second=1, max_balance=2)
+        assert budget.try_acquire()
+        assert budget.try_acquire()
+        assert not budget.try_acquire()
+
+        # each request adds a fraction of a retry
+        budget.record_request()
+        assert not budget.try_acquire()
+        budget.record_request()
+        assert budget.try_acquire()
+
+        # and the budget is topped up over time
+        monotonic.return_value = 101.0
+        assert budget.try_acquire()
+        assert not budget.try_acquire()
+
+        # up to its maximum balance
+        monotonic.return_value = 200.0
+        assert budget.try_acquire()
+        assert budget.try_acquire()
+        assert not budget.try_acquire()
+
+    assert budget.requests == 2
+    assert budget.retries == 6
+    assert budget.rejected == 4
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(base_delay_seconds=0.1, throttling_base_delay_seconds=1, max_delay_seconds=5, budget=None)
+    with patch('random.uniform', side_effect=lambda low, high: high):
+        assert policy.get_retry_delay(TRANSIENT, 1, 3, None) == pytest.approx(0.3)
+        assert policy.get_retry_delay(TRANSIENT, 2, 3, 0.3) == pytest.approx(0.9)
+        assert policy.get_retry_delay(THROTTLING, 1, 3, None) == 3
+        assert policy.get_retry_delay(THROTTLING, 2, 3, 3) == 5
+    with patch('random.uniform', side_effect=lambda low, high: low):
+        assert policy.get_retry_delay(TRANSIENT, 1, 3, None) == 0.1
+        assert policy.get_retry_delay(THROTTLING, 2, 3, 3) == 1
+    assert policy.get_retry_delay(TRANSIENT, 3, 3, 0.1) is None
+    assert policy.get_retry_delay(None, 1, 3, None) is None
+    assert policy.get_retry_delay(TRANSIENT, 10, None, None) is not None
+
+
+def test_retry_policy_budget():
+    budget = RetryBudget(min_retries_per_second=0, max_balance=1)
+    policy = RetryPolicy(budget=budget)
+    assert policy.get_error_retry_delay(_client_error('ThrottlingException'), 1, 3, None) is not None
+    assert policy.get_error_retry_delay(_client_error('ThrottlingException'), 1, 3, None) is None
+    assert policy.get_backoff_delay(THROTTLING, None) >= policy.throttling_base_delay_seconds
+
+
+def test_get_retry_policy():
+    policy = RetryPolicy()
+    assert get_retry_policy(policy) is policy
+    assert get_retry_policy(None) is retry.DEFAULT_RETRY_POLICY
+    with patch('pynamodb.connection.retry.get_settings_value', return_value=policy):
+        assert get_retry_policy(None) is policy
+
+
+@mock.patch('time.sleep')
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_connection_retries_throttling(send_mock, sleep_mock):
+    throttled = _response(400, {'__type': 'ProvisionedThroughputExceededException', 'message': 'slow down'})
+    send_mock.side_effect = [throttled, throttled, _response(200, {})]
+    policy = RetryPolicy(throttling_base_delay_seconds=0.5, budget=None)
+    c = Connection(max_retry_attempts=3, retry_policy=policy)
+
+    data = c._make_api_call('GetItem', {'TableName': 'Thread', 'Key': {'id': {'S': '1'}}})
+
+    assert send_mock.call_count == 3
+    assert data['ResponseMetadata']['RetryAttempts'] == 2
+    assert 'MaxAttemptsReached' not in data['ResponseMetadata']
+    delays = [call[0][0] for call in sleep_mock.call_args_list]
+    assert len(delays) == 2
+    assert all(delay >= 0.5 for delay in delays)
+
+
+@mock.patch('time.sleep')
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_connection_retry_budget_exhausted(send_mock, sleep_mock):
+    throttled = _response(400, {'__type': 'ThrottlingException', 'message': 'slow down'})
+    send_mock.return_value = throttled
+    policy = RetryPolicy(budget=RetryBudget(ratio=0, min_retries_per_second=0, max_balance=1))
+    c = Connection(max_retry_attempts=3, retry_policy=policy)
+
+    with pytest.raises(ClientError):
+        c._make_api_call('GetItem', {'TableName': 'Thread', 'Key': {'id': {'S': '1'}}})
+
+    # a single retry was left in the budget
+    assert send_mock.call_count == 2
+    assert policy.budget.rejected == 1
+
+
+@mock.patch('time.sleep')
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_connection_does_not_retry_client_errors(send_mock, sleep_mock):
+    send_mock.return_value = _response(400, {'__type': 'ValidationException', 'message': 'bad'})
+    c = Connection(max_retry_attempts=3, retry_policy=RetryPolicy(budget=None))
+
+    with pytest.raises(ClientError):
+        c._make_api_call('GetItem', {'TableName': 'Thread', 'Key': {'id': {'S': '1'}}})
+    assert send_mock.call_count == 1
+    sleep_mock.assert_not_called()
+
+
+@mock.patch('time.sleep')
+def test_batch_write_backs_off(sleep_mock):
+    unprocessed = [{'PutRequest': {'Item': {'key': {'S': str(i)}}}} for i in range(2)]
+    with patch(PATCH_METHOD) as req:
+        req.side_effect = [
+            {UNPROCESSED_ITEMS: {'RetryModel': unprocessed}},
+            {UNPROCESSED_ITEMS: {'RetryModel': unprocessed}},
+            {},
+        ]
+        with RetryModel.batch_write() as batch:
+            for i in range(3):
+                batch.save(RetryModel(str(i)))
+
+    assert req.call_count == 3
+    assert sleep_mock.call_count == 2
+    assert all(call[0][0] >= 0.5 for call in sleep_mock.call_args_list)
+
+
+@mock.patch('time.sleep')
+def test_batch_write_retry_budget_exhausted(sleep_mock):
+    unprocessed = [{'PutRequest': {'Item': {'key': {'S': '0'}}}}]
+    policy = RetryPolicy(budget=RetryBudget(ratio=0, min_retries_per_second=0, max_balance=1))
+    with patch.object(RetryModel.Meta, 'retry_policy', policy), patch(PATCH_METHOD) as req:
+        req.return_value = {UNPROCESSED_ITEMS: {'RetryModel': unprocessed}}
+        batch = RetryModel.batch_write()
+        batch.save(RetryModel('0'))
+        with pytest.raises(PutError, match='retry budget exhausted'):
+            batch.commit()
+
+    # the first resend made no progress, so used up the budget
+    assert req.call_count == 2
+    assert batch.failed_operations == unprocessed
+
+
+@mock.patch('time.sleep')
+def test_batch_get_retry_budget_exhausted(sleep_mock):
+    keys = {'Keys': [{'key': {'S': '0'}}]}
+    policy = RetryPolicy(budget=RetryBudget(ratio=0, min_retries_per_second=0, max_balance=0))
+    with patch.object(RetryModel.Meta, 'retry_policy', policy), patch(PATCH_METHOD) as req:
+        req.return_value = {RESPONSES: {'RetryModel': []}, UNPROCESSED_KEYS: {'RetryModel': keys}}
+        with pytest.raises(GetError, match='retry budget exhausted'):
+            list(RetryModel.batch_get(['0']))
+    assert req.call_count == 1
+    sleep_mock.assert_not_called()
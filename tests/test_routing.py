@@ -0,0 +1,218 @@
+"""
+Tests for endpoint routing
+"""
+import asyncio
+import json
+from unittest import mock
+from unittest.mock import patch
+
+import pytest
+from botocore.awsrequest import AWSResponse
+from botocore.client import ClientError
+
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.connection import AsyncConnection, Connection
+from pynamodb.connection.retry import RetryPolicy
+from pynamodb.connection.routing import Endpoint, EndpointRouter, get_endpoint_router
+from pynamodb.constants import BATCH_GET_ITEM, DESCRIBE_TABLE, GET_ITEM, LIST_TABLES, PUT_ITEM, QUERY, TRANSACT_GET_ITEMS
+from pynamodb.models import Model
+
+NODE_1 = Endpoint(region='us-east-1', host='http://node1:8000')
+NODE_2 = Endpoint(host='http://node2:8000')
+NODE_3 = Endpoint(host='http://node3:8000')
+
+GET_ITEM_KWARGS = {'TableName': 'Thread', 'Key': {'id': {'S': '1'}}}
+
+
+def _client_error(code, status_code=400):
+    return ClientError({
+        'Error': {'Code': code, 'Message': 'problem'},
+        'ResponseMetadata': {'HTTPStatusCode': status_code},
+    }, GET_ITEM)
+
+
+def _response(status_code, content):
+    response = mock.Mock(spec=AWSResponse)
+    response.status_code = status_code
+    response.headers = {}
+    response.text = json.dumps(content)
+    response.content = response.text.encode()
+    return response
+
+
+class RoutedModel(Model):
+    class Meta:
+        table_name = 'RoutedModel'
+        endpoints = [Endpoint(region='us-east-1'), Endpoint(region='eu-west-1')]
+
+    key = UnicodeAttribute(hash_key=True)
+
+
+def test_router_validation():
+    with pytest.raises(ValueError):
+        EndpointRouter([])
+    with pytest.raises(ValueError):
+        EndpointRouter([NODE_1], home=NODE_2)
+    router = EndpointRouter([NODE_1, NODE_2])
+    assert router.home == NODE_1
+    assert get_endpoint_router(router) is router
+    assert get_endpoint_router(None) is None
+    assert get_endpoint_router([NODE_2, NODE_1]).home == NODE_2
+
+
+def test_reads_use_fastest_endpoint():
+    router = EndpointRouter([NODE_1, NODE_2, NODE_3], ewma_alpha=0.5, exploration_ratio=0)
+    router.record_latency(NODE_1, 0.01)
+    router.record_latency(NODE_2, 0.02)
+    # endpoints that haven't been measured are tried first
+    assert router.get_endpoint(GET_ITEM) == NODE_3
+    router.record_latency(NODE_3, 0.03)
+    assert router.get_endpoint(GET_ITEM) == NODE_1
+
+    router.record_latency(NODE_1, 0.05)
+    assert router.get_latency(NODE_1) == pytest.approx(0.03)
+    assert router.get_endpoint(QUERY) == NODE_2
+
+    # a retry goes to another endpoint
+    assert router.get_endpoint(QUERY, previous=NODE_2) == NODE_1
+
+
+def test_consistent_reads_use_home_endpoint():
+    router = EndpointRouter([NODE_1, NODE_2], home=NODE_2, exploration_ratio=0)
+    router.record_latency(NODE_1, 0.01)
+    router.record_latency(NODE_2, 0.02)
+    assert router.get_endpoint(GET_ITEM, operation_kwargs=GET_ITEM_KWARGS) == NODE_1
+    assert router.get_endpoint(GET_ITEM, operation_kwargs=dict(GET_ITEM_KWARGS, ConsistentRead=True)) == NODE_2
+    assert router.get_endpoint(QUERY, operation_kwargs={'TableName': 'Thread', 'ConsistentRead': False}) == NODE_1
+    assert router.get_endpoint(QUERY, operation_kwargs={'TableName': 'Thread', 'ConsistentRead': True}) == NODE_2
+    batch_get_kwargs = {'RequestItems': {
+        'Thread': {'Keys': [{'id': {'S': '1'}}]},
+        'Reply': {'Keys': [{'id': {'S': '1'}}], 'ConsistentRead': True},
+    }}
+    assert router.get_endpoint(BATCH_GET_ITEM, operation_kwargs=batch_get_kwargs) == NODE_2
+    del batch_get_kwargs['RequestItems']['Reply']
+    assert router.get_endpoint(BATCH_GET_ITEM, operation_kwargs=batch_get_kwargs) == NODE_1
+    # transactional reads and control plane operations are routed like writes
+    for operation_name in (TRANSACT_GET_ITEMS, DESCRIBE_TABLE, LIST_TABLES):
+        assert router.get_endpoint(operation_name, operation_kwargs={}) == NODE_2
+
+
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_connection_routes_consistent_reads_home(send_mock):
+    send_mock.return_value = _response(200, {'Item': {'id': {'S': '1'}}})
+    router = EndpointRouter([NODE_1, NODE_2], exploration_ratio=0)
+    router.record_latency(NODE_1, 0.05)
+    router.record_latency(NODE_2, 0.01)
+    c = Connection(endpoints=router, retry_policy=RetryPolicy(budget=None))
+    c._make_api_call(GET_ITEM, dict(GET_ITEM_KWARGS, ConsistentRead=True))
+    c._make_api_call(GET_ITEM, GET_ITEM_KWARGS)
+    urls = [call[0][0].url for call in send_mock.call_args_list]
+    assert urls[0].startswith(NODE_1.host)
+    assert urls[1].startswith(NODE_2.host)
+
+
+def test_reads_explore():
+    router = EndpointRouter([NODE_1, NODE_2], exploration_ratio=0.1)
+    router.record_latency(NODE_1, 0.01)
+    router.record_latency(NODE_2, 0.02)
+    with patch('random.random', return_value=0.05):
+        assert router.get_endpoint(GET_ITEM) == NODE_2
+    with patch('random.random', return_value=0.5):
+        assert router.get_endpoint(GET_ITEM) == NODE_1
+
+
+def test_writes_use_home_endpoint():
+    router = EndpointRouter([NODE_1, NODE_2, NODE_3], home=NODE_2)
+    router.record_latency(NODE_1, 0.01)
+    router.record_latency(NODE_2, 0.02)
+    assert router.get_endpoint(PUT_ITEM) == NODE_2
+
+    router.record_failure(NODE_2, _client_error('InternalServerError', 500))
+    assert not router.is_healthy(NODE_2)
+    assert router.get_endpoint(PUT_ITEM) == NODE_1
+    router.failover_writes = False
+    assert router.get_endpoint(PUT_ITEM) == NODE_2
+
+
+def test_unhealthy_endpoints():
+    router = EndpointRouter([NODE_1, NODE_2], unhealthy_seconds=10, exploration_ratio=0)
+    with patch('time.monotonic', return_value=100.0) as monotonic:
+        # errors that say nothing about the endpoint's health are ignored
+        router.record_failure(NODE_1, _client_error('ThrottlingException'))
+        router.record_failure(NODE_1, _client_error('ConditionalCheckFailedException'))
+        assert router.is_healthy(NODE_1)
+
+        router.record_failure(NODE_1, _client_error('InternalServerError', 500))
+        assert router.get_endpoint(GET_ITEM) == NODE_2
+        router.record_failure(NODE_2, _client_error('ServiceUnavailable', 503))
+        # with every endpoint unhealthy, all of them are still tried
+        assert router.get_endpoint(GET_ITEM, previous=NODE_2) == NODE_1
+
+        monotonic.return_value = 110.0
+        assert router.is_healthy(NODE_1)
+
+
+@mock.patch('time.sleep')
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_connection_fails_over(send_mock, sleep_mock):
+    def send(request):
+        if request.url.startswith(NODE_1.host):
+            return _response(500, {'__type': 'InternalServerError', 'message': 'down'})
+        return _response(200, {'Item': {'id': {'S': '1'}}})
+
+    send_mock.side_effect = send
+    router = EndpointRouter([NODE_1, NODE_2], exploration_ratio=0)
+    c = Connection(endpoints=router, max_retry_attempts=2, retry_policy=RetryPolicy(budget=None))
+    assert c.region == 'us-east-1'
+    assert c.host == NODE_1.host
+
+    data = c._make_api_call(GET_ITEM, GET_ITEM_KWARGS)
+    assert data['Item'] == {'id': {'S': '1'}}
+    assert [call[0][0].url.split('/')[2] for call in send_mock.call_args_list] == ['node1:8000', 'node2:8000']
+    assert not router.is_healthy(NODE_1)
+    assert router.get_latency(NODE_2) is not None
+
+    # writes to the unhealthy home endpoint fail over too
+    send_mock.reset_mock()
+    c._make_api_call(PUT_ITEM, {'TableName': 'Thread', 'Item': {'id': {'S': '1'}}})
+    assert [call[0][0].url.split('/')[2] for call in send_mock.call_args_list] == ['node2:8000']
+
+
+def test_endpoint_connections():
+    c = Connection(endpoints=[NODE_1, NODE_2])
+    assert c._get_endpoint_connection(NODE_1) is c
+    node_2 = c._get_endpoint_connection(NODE_2)
+    assert node_2 is c._get_endpoint_connection(NODE_2)
+    assert node_2.host == NODE_2.host
+    assert node_2.region == 'us-east-1'
+    assert node_2._tables is c._tables
+    assert node_2.client.meta.endpoint_url == NODE_2.host
+    assert c.client.meta.endpoint_url == NODE_1.host
+
+
+def test_model_endpoints():
+    connection = RoutedModel._get_connection().connection
+    assert connection.region == 'us-east-1'
+    assert connection._router is not None
+    assert connection._router.endpoints == list(RoutedModel.Meta.endpoints)
+
+
+def test_async_connection_fails_over():
+    hosts = []
+
+    class FakeTransport:
+        async def send(self, request):
+            hosts.append(request.url.split('/')[2])
+            if len(hosts) == 1:
+                return _response(503, {'__type': 'ServiceUnavailable', 'message': 'down'})
+            return _response(200, {'Item': {'id': {'S': '1'}}})
+
+    async def no_sleep(delay):
+        pass
+
+    router = EndpointRouter([NODE_1, NODE_2], exploration_ratio=0)
+    c = AsyncConnection(endpoints=router, transport=FakeTransport(), retry_policy=RetryPolicy(budget=None))
+    with patch('asyncio.sleep', new=no_sleep):
+        data = asyncio.run(c._make_api_call(GET_ITEM, GET_ITEM_KWARGS))
+    assert data['Item'] == {'id': {'S': '1'}}
+    assert hosts == ['node1:8000', 'node2:8000']
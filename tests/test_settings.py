@@ -32,5 +32,21 @@ def test_default_settings():
         'region': None,
         'max_pool_connections': 10,
         'extra_headers': None,
-        'retry_configuration': 'LEGACY'
+        'retry_configuration': 'LEGACY',
+        'lean_codec': False,
+        'transport': None,
+        'async_transport': None,
+        'share_clients': False,
+        'tcp_nodelay': True,
+        'tcp_keepalive': False,
+        'max_connection_idle_seconds': None,
+        'max_connection_lifetime_seconds': None,
+        'hedging': None,
+        'retry_policy': None,
+        'circuit_breaker': None,
+        'endpoints': None,
+        'pool_auto_sizing': None,
+        'background_signals': False,
+        'metrics': None,
+        'hot_keys': None,
     }
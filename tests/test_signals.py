@@ -1,9 +1,10 @@
+import threading
 import unittest.mock
 import pytest
 
 from pynamodb.connection import Connection
 from pynamodb.signals import _FakeNamespace
-from pynamodb.signals import pre_dynamodb_send, post_dynamodb_send
+from pynamodb.signals import flush_background_signals, pre_dynamodb_send, post_dynamodb_send
 
 try:
     import blinker
@@ -90,9 +91,44 @@ def test_signal_exception_post_signal(mock_uuid, mock_req):
         post_dynamodb_send.disconnect(record_post_dynamodb_send)
 
 
+@unittest.mock.patch(PATCH_METHOD)
+@unittest.mock.patch('pynamodb.connection.base.uuid')
+def test_no_receivers(mock_uuid, mock_req):
+    mock_req.return_value = {}
+    with unittest.mock.patch.object(pre_dynamodb_send, 'send') as mock_send:
+        Connection().dispatch('GetItem', {'TableName': 'MyTable'})
+    mock_uuid.uuid4.assert_not_called()
+    mock_send.assert_not_called()
+
+
+@unittest.mock.patch(PATCH_METHOD)
+def test_background_signals(mock_req):
+    recorded = []
+
+    def record_post_dynamodb_send(sender, operation_name, table_name, req_uuid):
+        recorded.append((operation_name, table_name, threading.current_thread()))
+
+    def failing_receiver(sender, operation_name, table_name, req_uuid):
+        raise ValueError()
+
+    mock_req.return_value = {}
+    post_dynamodb_send.connect(record_post_dynamodb_send)
+    pre_dynamodb_send.connect(failing_receiver)
+    try:
+        Connection(background_signals=True).dispatch('GetItem', {'TableName': 'MyTable'})
+        flush_background_signals()
+    finally:
+        post_dynamodb_send.disconnect(record_post_dynamodb_send)
+        pre_dynamodb_send.disconnect(failing_receiver)
+    assert len(recorded) == 1
+    assert recorded[0][:2] == ('GetItem', 'MyTable')
+    assert recorded[0][2] is not threading.current_thread()
+
+
 def test_fake_signals():
     _signals = _FakeNamespace()
     pre_dynamodb_send = _signals.signal('pre_dynamodb_send')
     with pytest.raises(RuntimeError):
         pre_dynamodb_send.connect(lambda x: x)
+    assert not pre_dynamodb_send.has_receivers_for(object)
     pre_dynamodb_send.send(object, operation_name="UPDATE", table_name="TEST", req_uuid="something")
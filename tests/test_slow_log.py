@@ -0,0 +1,136 @@
+"""
+Tests for the slow operation log
+"""
+import asyncio
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from pynamodb.connection.slow_log import LATENCY, SCAN_EFFICIENCY, SlowOperationLog, resolve_expression
+from pynamodb.connection.tracing import InMemorySpanExporter, Span, set_span_exporter
+from pynamodb.constants import QUERY, SCAN
+from pynamodb.indexes import AllProjection, GlobalSecondaryIndex
+from pynamodb.models import Model
+
+PATCH_METHOD = 'pynamodb.connection.Connection._make_api_call'
+ASYNC_PATCH_METHOD = 'pynamodb.connection.async_base.AsyncConnection._make_api_call'
+
+
+def _page(count, scanned_count, last_evaluated_key=None):
+    page = {
+        'Count': count,
+        'ScannedCount': scanned_count,
+        'Items': [{'key': {'S': str(i)}} for i in range(count)],
+        'ConsumedCapacity': {'TableName': 'SlowModel', 'CapacityUnits': 10.0},
+    }
+    if last_evaluated_key is not None:
+        page['LastEvaluatedKey'] = {'key': {'S': last_evaluated_key}}
+    return page
+
+
+class StatusIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = 'status-index'
+        projection = AllProjection()
+
+    status = UnicodeAttribute(hash_key=True)
+
+
+class SlowModel(Model):
+    class Meta:
+        table_name = 'SlowModel'
+
+    key = UnicodeAttribute(hash_key=True)
+    status = UnicodeAttribute(null=True)
+    views = NumberAttribute(null=True)
+    status_index = StatusIndex()
+
+
+@pytest.fixture
+def slow_log():
+    slow_log = SlowOperationLog(latency_threshold_seconds=None, min_scan_efficiency=0.1, min_scanned_count=100)
+    set_span_exporter(slow_log)
+    yield slow_log
+    set_span_exporter(None)
+
+
+def test_resolve_expression():
+    assert resolve_expression(None, {}) is None
+    assert resolve_expression(
+        '(#0 = :0 AND #1.#2[1] > :1)', {'#0': 'status', '#1': 'stats', '#2': 'views'},
+    ) == '(status = ? AND stats.views[1] > ?)'
+
+
+def test_filter_heavy_query(slow_log, caplog):
+    with patch(PATCH_METHOD) as req:
+        req.side_effect = [_page(1, 400, last_evaluated_key='1'), _page(2, 100)]
+        with caplog.at_level(logging.WARNING, logger='pynamodb.connection.slow_log'):
+            results = list(SlowModel.status_index.query('active', filter_condition=SlowModel.views > 1000))
+    assert len(results) == 3
+
+    entry, = slow_log.entries
+    assert entry.reasons == [SCAN_EFFICIENCY]
+    assert entry.name == 'SlowModel.query'
+    assert entry.operation_name == QUERY
+    assert entry.table_name == 'SlowModel'
+    assert entry.index_name == 'status-index'
+    assert entry.key_condition == 'status = ?'
+    assert entry.filter_expression == 'views > ?'
+    assert entry.pages == 2
+    assert entry.requests == 2
+    assert entry.scanned_count == 500
+    assert entry.item_count == 3
+    assert entry.scan_efficiency == 0.006
+    assert entry.capacity_units == 20.0
+    # values are redacted from the log
+    assert 'active' not in caplog.text and '1000' not in caplog.text
+    assert 'returned=3/500' in caplog.text
+
+
+def test_efficient_operations(slow_log):
+    with patch(PATCH_METHOD) as req:
+        req.side_effect = [_page(20, 100), _page(5, 90)]
+        list(SlowModel.scan())
+        # too few items evaluated for the efficiency to count
+        list(SlowModel.scan(SlowModel.views > 1000))
+    assert slow_log.entries == []
+
+
+def test_latency(slow_log):
+    slow_log.latency_threshold_seconds = 0.0
+    slow_log.min_scan_efficiency = None
+    with patch(PATCH_METHOD) as req:
+        req.return_value = _page(1, 1000)
+        list(SlowModel.scan())
+    entry, = slow_log.entries
+    assert entry.reasons == [LATENCY]
+    assert entry.operation_name == SCAN
+    assert entry.key_condition is None
+    assert entry.filter_expression is None
+
+
+def test_max_entries_and_exporter():
+    exporter = InMemorySpanExporter()
+    slow_log = SlowOperationLog(latency_threshold_seconds=0.0, max_entries=2, exporter=exporter)
+    for name in ('a', 'b', 'c'):
+        span = Span(name)
+        span.duration_seconds = 0.5
+        slow_log.export(span)
+    assert [entry.name for entry in slow_log.entries] == ['b', 'c']
+    assert [span.name for span in exporter.spans] == ['a', 'b', 'c']
+    slow_log.clear()
+    assert slow_log.entries == []
+
+
+def test_async_scan(slow_log):
+    async def scan():
+        return [item async for item in SlowModel.ascan()]
+
+    with patch(ASYNC_PATCH_METHOD) as req:
+        req.return_value = _page(0, 1000)
+        asyncio.run(scan())
+    entry, = slow_log.entries
+    assert entry.name == 'SlowModel.scan'
+    assert entry.scan_efficiency == 0.0
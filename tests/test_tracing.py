@@ -0,0 +1,233 @@
+"""
+Tests for tracing
+"""
+import asyncio
+import gc
+import json
+from unittest import mock
+from unittest.mock import patch
+
+import pytest
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import ClientError
+
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.connection import Connection
+from pynamodb.connection.retry import RetryPolicy
+from pynamodb.connection.tracing import InMemorySpanExporter, get_current_span, set_span_exporter, start_span, traced
+from pynamodb.constants import UNPROCESSED_ITEMS, UNPROCESSED_KEYS
+from pynamodb.models import Model
+from pynamodb.signals import flush_background_signals, pre_dynamodb_send
+from pynamodb.transactions import TransactWrite
+
+PATCH_METHOD = 'pynamodb.connection.Connection._make_api_call'
+ASYNC_PATCH_METHOD = 'pynamodb.connection.async_base.AsyncConnection._make_api_call'
+
+
+def _response(status_code, content):
+    response = mock.Mock(spec=AWSResponse)
+    response.status_code = status_code
+    response.headers = {}
+    response.text = json.dumps(content)
+    response.content = response.text.encode()
+    return response
+
+
+def _page(key, last_evaluated_key=None):
+    page = {'Count': 1, 'ScannedCount': 1, 'Items': [{'key': {'S': key}}]}
+    if last_evaluated_key is not None:
+        page['LastEvaluatedKey'] = {'key': {'S': last_evaluated_key}}
+    return page
+
+
+class TracedModel(Model):
+    class Meta:
+        table_name = 'TracedModel'
+        retry_policy = RetryPolicy(budget=None)
+
+    key = UnicodeAttribute(hash_key=True)
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    set_span_exporter(exporter)
+    yield exporter
+    set_span_exporter(None)
+
+
+def test_tracing_disabled():
+    assert start_span('Thread.scan') is None
+    with traced('TransactWrite') as span:
+        assert span is None
+        assert get_current_span() is None
+
+
+def test_scan(exporter):
+    with patch(PATCH_METHOD) as req:
+        req.side_effect = [_page('1', last_evaluated_key='1'), _page('2')]
+        results = TracedModel.scan()
+        assert exporter.spans == []
+        assert [item.key for item in results] == ['1', '2']
+
+    span, = exporter.spans
+    assert span.name == 'TracedModel.scan'
+    assert span.model_name == 'TracedModel'
+    assert span.table_name == 'TracedModel'
+    assert span.requests == 2
+    assert span.pages == 2
+    assert span.finished
+    assert span.end_time >= span.start_time
+    assert span.error is None
+
+
+def test_query_limit(exporter):
+    with patch(PATCH_METHOD) as req:
+        req.return_value = _page('1', last_evaluated_key='1')
+        assert len(list(TracedModel.query('1', limit=1))) == 1
+    assert exporter.spans[0].name == 'TracedModel.query'
+    assert exporter.spans[0].pages == 1
+
+
+def test_abandoned_iterator(exporter):
+    with patch(PATCH_METHOD) as req:
+        req.return_value = _page('1', last_evaluated_key='1')
+        results = TracedModel.scan()
+        next(results)
+    assert exporter.spans == []
+    del results
+    gc.collect()
+    assert exporter.spans[0].pages == 1
+
+
+def test_failed_scan(exporter):
+    with patch(PATCH_METHOD) as req:
+        req.side_effect = ClientError({'Error': {'Code': 'ValidationException'}}, 'Scan')
+        with pytest.raises(Exception):
+            list(TracedModel.scan())
+    assert exporter.spans[0].error is not None
+
+
+@mock.patch('time.sleep')
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_retries(send_mock, sleep_mock, exporter):
+    send_mock.side_effect = [
+        _response(500, {'__type': 'InternalServerError', 'message': 'down'}),
+        _response(200, _page('1')),
+    ]
+    list(TracedModel.scan())
+    span, = exporter.spans
+    assert span.requests == 1
+    assert span.retries == 1
+
+
+@mock.patch('time.sleep')
+def test_batch_get(sleep_mock, exporter):
+    with patch(PATCH_METHOD) as req:
+        req.side_effect = [
+            {
+                'Responses': {'TracedModel': [{'key': {'S': '1'}}]},
+                UNPROCESSED_KEYS: {'TracedModel': {'Keys': [{'key': {'S': '2'}}]}},
+            },
+            {'Responses': {'TracedModel': [{'key': {'S': '2'}}]}, UNPROCESSED_KEYS: {}},
+        ]
+        assert sorted(item.key for item in TracedModel.batch_get(['1', '2'])) == ['1', '2']
+    span, = exporter.spans
+    assert span.name == 'TracedModel.batch_get'
+    assert span.requests == 2
+    assert span.pages == 2
+    assert span.retries == 1
+    assert span.unprocessed_items == 1
+
+
+def test_batch_get_span_starts_when_iterated(exporter):
+    with patch.object(TracedModel, '_start_span', wraps=TracedModel._start_span) as start_span_mock:
+        items = TracedModel.batch_get(['1'])
+        TracedModel.abatch_get(['1'])
+        assert start_span_mock.call_count == 0
+        with patch(PATCH_METHOD) as req:
+            req.return_value = {'Responses': {'TracedModel': [{'key': {'S': '1'}}]}, UNPROCESSED_KEYS: {}}
+            assert [item.key for item in items] == ['1']
+        assert start_span_mock.call_count == 1
+    span, = exporter.spans
+    assert span.name == 'TracedModel.batch_get'
+
+
+@mock.patch('time.sleep')
+def test_batch_write(sleep_mock, exporter):
+    with patch(PATCH_METHOD) as req:
+        req.side_effect = [
+            {UNPROCESSED_ITEMS: {'TracedModel': [{'PutRequest': {'Item': {'key': {'S': '2'}}}}]}},
+            {},
+        ]
+        with TracedModel.batch_write() as batch:
+            batch.save(TracedModel('1'))
+            batch.save(TracedModel('2'))
+    span, = exporter.spans
+    assert span.name == 'TracedModel.batch_write'
+    assert span.requests == 2
+    assert span.retries == 1
+    assert span.unprocessed_items == 1
+
+
+def test_transaction(exporter):
+    with patch(PATCH_METHOD) as req:
+        req.return_value = {}
+        with TransactWrite(connection=Connection()) as transaction:
+            transaction.save(TracedModel('1'))
+    span, = exporter.spans
+    assert span.name == 'TransactWrite'
+    assert span.requests == 1
+
+
+def test_signals(exporter):
+    recorded = []
+
+    # the documented receiver signature still works while tracing
+    def record(sender, operation_name, table_name, req_uuid):
+        span = get_current_span()
+        recorded.append(span and span.trace_id)
+
+    pre_dynamodb_send.connect(record)
+    try:
+        with patch(PATCH_METHOD) as req:
+            req.return_value = _page('1')
+            list(TracedModel.scan())
+            TracedModel('1').save()
+    finally:
+        pre_dynamodb_send.disconnect(record)
+    # requests made outside of a span have no trace id
+    assert recorded == [exporter.spans[0].trace_id, None]
+
+
+def test_background_signals(exporter):
+    recorded = []
+
+    def record(sender, operation_name, table_name, req_uuid):
+        span = get_current_span()
+        recorded.append(span and span.trace_id)
+
+    pre_dynamodb_send.connect(record)
+    try:
+        with patch(PATCH_METHOD) as req:
+            req.return_value = _page('1')
+            connection = Connection(background_signals=True)
+            with traced('scan') as span:
+                connection.scan('TracedModel')
+            flush_background_signals()
+    finally:
+        pre_dynamodb_send.disconnect(record)
+    assert recorded == [span.trace_id]
+
+
+def test_async_query(exporter):
+    async def query():
+        return [item.key async for item in TracedModel.aquery('1')]
+
+    with patch(ASYNC_PATCH_METHOD) as req:
+        req.side_effect = [_page('1', last_evaluated_key='1'), _page('2')]
+        assert asyncio.run(query()) == ['1', '2']
+    span, = exporter.spans
+    assert span.name == 'TracedModel.query'
+    assert span.requests == 2
+    assert span.pages == 2